@@ -3,6 +3,7 @@ import os
 import re
 from typing import Any
 from ai_scientist.utils.token_tracker import track_token_usage
+from ai_scientist.utils.llm_cache import MISS, cache_lookup, cache_store
 
 import anthropic
 import backoff
@@ -325,6 +326,17 @@ def get_response_from_llm(
     if msg_history is None:
         msg_history = []
 
+    cache_key, cached = cache_lookup(
+        temperature,
+        model=model,
+        system_message=system_message,
+        msg_history=msg_history,
+        prompt=msg,
+    )
+    if cached is not MISS:
+        content, new_msg_history = cached
+        return content, new_msg_history
+
     if "claude" in model:
         new_msg_history = msg_history + [
             {
@@ -509,6 +521,7 @@ def get_response_from_llm(
         print("*" * 21 + " LLM END " + "*" * 21)
         print()
 
+    cache_store(cache_key, [content, new_msg_history])
     return content, new_msg_history
 
 
@@ -20,6 +20,7 @@ from ai_scientist.llm import (
 from ai_scientist.utils.token_tracker import track_token_usage
 
 from ai_scientist.tools.semantic_scholar import search_for_papers
+from ai_scientist.utils.latex_build import compile_latex_incremental, file_digest
 
 from ai_scientist.perform_vlm_review import (
     generate_vlm_img_review,
@@ -42,7 +43,12 @@ def remove_accents_and_clean(s):
     return ascii_str
 
 
-def compile_latex(cwd, pdf_file, timeout=30):
+def compile_latex(cwd, pdf_file, timeout=30, incremental=True):
+    if incremental:
+        # reuses cached builds and skips bibtex/extra passes when possible
+        compile_latex_incremental(cwd, pdf_file, timeout=timeout)
+        return
+
     print("GENERATING LATEX")
 
     commands = [
@@ -235,6 +241,10 @@ def extract_page_line_counts(pdf_file, first_page, last_page):
     return page_lines
 
 
+# (PDF content digest, page_limit) -> result of check_page_limit
+_page_limit_cache = {}
+
+
 def check_page_limit(pdf_file, page_limit=4, timeout=30):
     """
     Compile the LaTeX project in a temporary folder, then determine where the
@@ -251,12 +261,18 @@ def check_page_limit(pdf_file, page_limit=4, timeout=30):
       - 'available': if used_lines < allowed_lines (number of lines still available)
 
     If compilation or extraction fails, returns None.
+    Results are cached by PDF content, so a PDF reused from the LaTeX build
+    cache is not scanned again.
     """
     try:
         # Ensure the PDF was produced
         if not osp.exists(pdf_file):
             return None
 
+        cache_key = (file_digest(pdf_file), page_limit)
+        if cache_key in _page_limit_cache:
+            return dict(_page_limit_cache[cache_key])
+
         # Locate the first occurrence of "References" using the cleaned extraction
         ref_pos = detect_references_position_clean(pdf_file)
         if ref_pos is None:
@@ -293,6 +309,7 @@ def check_page_limit(pdf_file, page_limit=4, timeout=30):
             result["excess"] = used_lines - allowed_lines
         else:
             result["available"] = allowed_lines - used_lines
+        _page_limit_cache[cache_key] = dict(result)
         return result
 
     except Exception as e:
@@ -17,6 +17,12 @@ from ai_scientist.llm import (
 )
 
 from ai_scientist.tools.semantic_scholar import search_for_papers
+from ai_scientist.utils.latex_build import (
+    BUILD_CACHE_DIR,
+    cached_pdf_path,
+    compile_latex_incremental,
+    latex_input_digest,
+)
 
 from ai_scientist.perform_vlm_review import generate_vlm_img_review
 from ai_scientist.vlm import create_client as create_vlm_client
@@ -36,7 +42,12 @@ def remove_accents_and_clean(s):
     return ascii_str
 
 
-def compile_latex(cwd, pdf_file, timeout=30):
+def compile_latex(cwd, pdf_file, timeout=30, incremental=True):
+    if incremental:
+        # reuses cached builds and skips bibtex/extra passes when possible
+        compile_latex_incremental(cwd, pdf_file, timeout=timeout)
+        return
+
     print("GENERATING LATEX")
 
     commands = [
@@ -79,40 +90,61 @@ def compile_latex(cwd, pdf_file, timeout=30):
         print(traceback.format_exc())
 
 
+# LaTeX input digest -> result of detect_pages_before_impact
+_impact_location_cache = {}
+
+
 def detect_pages_before_impact(latex_folder, timeout=30):
     """
     Temporarily copy the latex folder, compile, and detect on which page
     the phrase "Impact Statement" appears.
     Returns a tuple (page_number, line_number) if found, otherwise None.
+
+    Results are cached per LaTeX input, and if compile_latex already built the
+    current input, its cached PDF is searched instead of compiling again.
     """
+    digest = latex_input_digest(latex_folder)
+    if digest in _impact_location_cache:
+        return _impact_location_cache[digest]
+
     temp_dir = osp.join(latex_folder, f"_temp_compile_{uuid.uuid4().hex}")
     try:
-        shutil.copytree(latex_folder, temp_dir, dirs_exist_ok=True)
-
-        # Compile in the temp folder
-        commands = [
-            ["pdflatex", "-interaction=nonstopmode", "template.tex"],
-            ["bibtex", "template"],
-            ["pdflatex", "-interaction=nonstopmode", "template.tex"],
-            ["pdflatex", "-interaction=nonstopmode", "template.tex"],
-        ]
-        for command in commands:
-            try:
-                subprocess.run(
-                    command,
-                    cwd=temp_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    timeout=timeout,
-                )
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-                return None
+        temp_pdf_file = cached_pdf_path(latex_folder)
+        if temp_pdf_file is not None:
+            os.makedirs(temp_dir)
+        else:
+            shutil.copytree(
+                latex_folder,
+                temp_dir,
+                dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns(BUILD_CACHE_DIR),
+            )
+
+            # Compile in the temp folder
+            commands = [
+                ["pdflatex", "-interaction=nonstopmode", "template.tex"],
+                ["bibtex", "template"],
+                ["pdflatex", "-interaction=nonstopmode", "template.tex"],
+                ["pdflatex", "-interaction=nonstopmode", "template.tex"],
+            ]
+            for command in commands:
+                try:
+                    subprocess.run(
+                        command,
+                        cwd=temp_dir,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        timeout=timeout,
+                    )
+                except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+                    return None
 
-        temp_pdf_file = osp.join(temp_dir, "template.pdf")
-        if not osp.exists(temp_pdf_file):
-            return None
+            temp_pdf_file = osp.join(temp_dir, "template.pdf")
+            if not osp.exists(temp_pdf_file):
+                return None
 
+        result = None
         # Try page-by-page extraction to detect "Impact Statement"
         for i in range(1, 51):
             page_txt = osp.join(temp_dir, f"page_{i}.txt")
@@ -138,8 +170,12 @@ def detect_pages_before_impact(latex_folder, timeout=30):
             lines = page_content.split("\n")
             for idx, line in enumerate(lines):
                 if "Impact Statement" in line:
-                    return (i, idx + 1)
-        return None
+                    result = (i, idx + 1)
+                    break
+            if result is not None:
+                break
+        _impact_location_cache[digest] = result
+        return result
     except Exception:
         return None
     finally:
@@ -7,6 +7,7 @@ from pathlib import Path
 import logging
 from .parallel_agent import ParallelAgent
 from .journal import Journal, Node
+from .checkpoint import IncrementalCheckpoint, load_incremental_checkpoint
 from .ledger import LedgerManager, ActionRecord, FailedAttempt
 from .magentic_orchestrator import MagenticOrchestrator
 import copy
@@ -202,6 +203,12 @@ class AgentManager:
         self.ledger_manager.initialize_from_task(self.task_desc)
         logger.info(f"LedgerManager initialized: {self.ledger_manager}")
 
+        # "incremental" appends only new nodes per save, "pickle" dumps everything
+        self.checkpoint_format = cfg.get("checkpoint_format", "pickle")
+        self._incremental_checkpoint: Optional[IncrementalCheckpoint] = None
+        # set by load_checkpoint: the restored main stage has already finished
+        self._resumed = False
+
         # Create initial stage
         self._create_initial_stage()
 
@@ -288,6 +295,9 @@ Your research idea:\n\n
         if self.current_stage is None:
             logger.warning("Cannot save checkpoint: current_stage is None")
             return
+        if self.checkpoint_format == "incremental":
+            self._save_incremental_checkpoint()
+            return
         stage_name = "stage_" + self.current_stage.name
         save_path = (
             Path(self.workspace_dir).parent
@@ -309,6 +319,59 @@ Your research idea:\n\n
         with open(save_path, "wb") as f:
             pickle.dump(checkpoint, f)
 
+    def _checkpoint_dir(self) -> Path:
+        return (
+            Path(self.workspace_dir).parent
+            / "logs"
+            / Path(self.workspace_dir).name
+            / "checkpoint"
+        )
+
+    def _save_incremental_checkpoint(self):
+        """Append new/changed nodes to the per-stage logs and rewrite the state header"""
+        if self._incremental_checkpoint is None:
+            self._incremental_checkpoint = IncrementalCheckpoint(self._checkpoint_dir())
+        state = {
+            "stages": self.stages,
+            "stage_history": self.stage_history,
+            "completed_stages": self.completed_stages,
+            "current_stage_number": self.current_stage_number,
+            "task_desc": self.task_desc,
+            "cfg": self.cfg,
+            "workspace_dir": self.workspace_dir,
+            "current_stage": self.current_stage,
+            "ledger_manager": self.ledger_manager,  # Magentic-One Ledger
+        }
+        num_written = self._incremental_checkpoint.save(self.journals, state)
+        print(
+            f"Saved checkpoint to {self._incremental_checkpoint.checkpoint_dir} "
+            f"({num_written} new node records)"
+        )
+
+    def load_checkpoint(self, checkpoint_dir: Path):
+        """Restore manager state from an incremental checkpoint.
+
+        Checkpoints are written when a main stage finishes, so run() continues
+        with the next main stage. Later saves append to the same logs.
+        """
+        checkpoint_dir = Path(checkpoint_dir)
+        state, journals = load_incremental_checkpoint(checkpoint_dir)
+        self.journals = journals
+        self.stages = state["stages"]
+        self.stage_history = state["stage_history"]
+        self.completed_stages = state["completed_stages"]
+        self.current_stage_number = state["current_stage_number"]
+        # pickled together with stages, so it is the same Stage object
+        self.current_stage = state["current_stage"]
+        self.ledger_manager = state["ledger_manager"]
+        self.checkpoint_format = "incremental"
+        self._incremental_checkpoint = IncrementalCheckpoint(checkpoint_dir)
+        self._resumed = True
+        logger.info(
+            f"Restored checkpoint from {checkpoint_dir}: "
+            f"{sum(len(j) for j in self.journals.values())} nodes in {len(self.journals)} journals"
+        )
+
     def _update_ledger_for_node(self, node: Node, stage: Stage, duration: float = 0.0) -> None:
         """
         Update the Magentic-One ledger system after processing a node.
@@ -674,6 +737,27 @@ Your research idea:\n\n
             return copied_node
         return None
 
+    def _get_seed_eval_candidates(self, stage_name: str, best_node: Node) -> List[Node]:
+        """Best node plus the next-best good nodes, up to multi_seed_eval.num_candidates"""
+        num_candidates = self.cfg.agent.multi_seed_eval.get("num_candidates", 1)
+        candidates = [best_node]
+        ranked = sorted(
+            (
+                n
+                for n in self.journals[stage_name].good_nodes
+                if not n.is_seed_node and not n.is_seed_agg_node and n.id != best_node.id
+            ),
+            key=lambda n: n.metric,
+            reverse=True,
+        )
+        for node in ranked[: max(0, num_candidates - 1)]:
+            # clean copies, like _get_best_implementation
+            copied_node = copy.deepcopy(node)
+            copied_node.parent = None
+            copied_node.children = set()
+            candidates.append(copied_node)
+        return candidates
+
     def _generate_substage_goal(self, main_stage_goal: str, journal: Journal) -> str:
         """Generate the next sub-stage goal based on what has been done so far.
 
@@ -851,6 +935,9 @@ Your research idea:\n\n
             return
 
         # Legacy orchestration
+        if self._resumed:
+            self._resumed = False
+            self._advance_main_stage()
         while self.current_stage:  # Main stage loop
             main_stage = self.parse_stage_names(self.current_stage.name)[0]
             print(f"[green]Starting main stage: {main_stage}[/green]")
@@ -921,15 +1008,13 @@ Your research idea:\n\n
                                     current_substage.name
                                 )
                                 if best_node:
-                                    seed_nodes = agent._run_multi_seed_evaluation(
-                                        best_node
-                                    )
-                                    if step_callback:
-                                        step_callback(
-                                            current_substage,
-                                            self.journals[current_substage.name],
+                                    # seeds of all candidates run as pool jobs,
+                                    # each aggregated as soon as its seeds finish
+                                    agent.run_multi_seed_evaluation(
+                                        self._get_seed_eval_candidates(
+                                            current_substage.name, best_node
                                         )
-                                    agent._run_plot_aggregation(best_node, seed_nodes)
+                                    )
                                     if step_callback:
                                         step_callback(
                                             current_substage,
@@ -984,30 +1069,33 @@ Your research idea:\n\n
                                 current_substage = None
                             break
             self._save_checkpoint()
-            # Main stage complete - create next main stage
-            if self.current_stage:
-                next_main_stage = self._create_next_main_stage(
-                    self.stages[-1], self.journals[self.stages[-1].name]
-                )
-                if next_main_stage:
-                    # Record main stage transition
-                    self.stage_history.append(
-                        StageTransition(
-                            from_stage=self.stages[-1].name,
-                            to_stage=next_main_stage.name,
-                            reason=f"Moving to {next_main_stage.description}",
-                            config_adjustments={},
-                        )
+            self._advance_main_stage()
+
+    def _advance_main_stage(self):
+        """Main stage complete - create the next main stage, or finish."""
+        if self.current_stage:
+            next_main_stage = self._create_next_main_stage(
+                self.stages[-1], self.journals[self.stages[-1].name]
+            )
+            if next_main_stage:
+                # Record main stage transition
+                self.stage_history.append(
+                    StageTransition(
+                        from_stage=self.stages[-1].name,
+                        to_stage=next_main_stage.name,
+                        reason=f"Moving to {next_main_stage.description}",
+                        config_adjustments={},
                     )
+                )
 
-                    self.stages.append(next_main_stage)
-                    self.journals[next_main_stage.name] = Journal()
-                    self.current_stage = next_main_stage
-                else:
-                    # Exit the outer loop if no more main stages
-                    logger.info(f"Completed stage: {self.current_stage.name}")
-                    logger.info("No more stages to run -- exiting the loop...")
-                    self.current_stage = None
+                self.stages.append(next_main_stage)
+                self.journals[next_main_stage.name] = Journal()
+                self.current_stage = next_main_stage
+            else:
+                # Exit the outer loop if no more main stages
+                logger.info(f"Completed stage: {self.current_stage.name}")
+                logger.info("No more stages to run -- exiting the loop...")
+                self.current_stage = None
 
     def _create_stage_analysis_prompt(
         self,
@@ -2,6 +2,8 @@ import json
 import logging
 from typing import Optional
 
+from ai_scientist.utils.llm_cache import MISS, cache_lookup, cache_store
+
 from . import backend_anthropic, backend_openai
 from .utils import FunctionSpec, OutputType, PromptType, compile_prompt_to_md
 
@@ -63,6 +65,7 @@ def query(
     component: str = "",
     node_id: str = "",
     collect_training_data: bool = True,
+    priority: str = "normal",
     **model_kwargs,
 ) -> OutputType:
     """
@@ -82,6 +85,7 @@ def query(
         component (str, optional): Component name for training data context (e.g., "draft_engine").
         node_id (str, optional): Node ID for training data context.
         collect_training_data (bool, optional): Whether to collect training data for this call. Defaults to True.
+        priority (str, optional): Rate-limit priority class ("high", "normal" or "low"), see backend.rate_limit.
 
     Returns:
         OutputType: A string completion if func_spec is None, otherwise a dict with the function call details.
@@ -127,13 +131,32 @@ def query(
     else:
         query_func = backend_openai.query
 
+    compiled_system_message = (
+        compile_prompt_to_md(system_message) if system_message else None
+    )
+    compiled_user_message = compile_prompt_to_md(user_message) if user_message else None
+
+    # Serve identical requests from the shared response cache (if enabled)
+    cache_key, cached_output = cache_lookup(
+        model_kwargs.get("temperature"),
+        system_message=compiled_system_message,
+        user_message=compiled_user_message,
+        func_spec=func_spec.as_openai_tool_dict if func_spec else None,
+        **model_kwargs,
+    )
+    if cached_output is not MISS:
+        logger.debug(f"LLM cache hit for {model}")
+        return cached_output
+
     # Execute query
     output, req_time, in_tok_count, out_tok_count, info = query_func(
-        system_message=compile_prompt_to_md(system_message) if system_message else None,
-        user_message=compile_prompt_to_md(user_message) if user_message else None,
+        system_message=compiled_system_message,
+        user_message=compiled_user_message,
         func_spec=func_spec,
+        priority=priority,
         **model_kwargs,
     )
+    cache_store(cache_key, output)
 
     # Collect training data if enabled
     if collect_training_data:
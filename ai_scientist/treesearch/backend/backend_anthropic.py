@@ -1,6 +1,7 @@
 import time
 import os
 
+from .rate_limit import rate_limited
 from .utils import FunctionSpec, OutputType, opt_messages_to_list, backoff_create
 from funcy import notnone, once, select_values
 import anthropic
@@ -22,9 +23,16 @@ def query(
     system_message: str | None,
     user_message: str | None,
     func_spec: FunctionSpec | None = None,
+    priority: str = "normal",
     **model_kwargs,
 ) -> tuple[OutputType, float, int, int, dict]:
     client = get_ai_client(model_kwargs.get("model"), max_retries=0)
+    create_fn = rate_limited(
+        client.messages.create,
+        model_kwargs.get("model"),
+        (anthropic.RateLimitError,),
+        priority,
+    )
 
     filtered_kwargs: dict = select_values(notnone, model_kwargs)  # type: ignore
     if "max_tokens" not in filtered_kwargs:
@@ -48,7 +56,7 @@ def query(
 
     t0 = time.time()
     message = backoff_create(
-        client.messages.create,
+        create_fn,
         ANTHROPIC_TIMEOUT_EXCEPTIONS,
         messages=messages,
         **filtered_kwargs,
@@ -3,6 +3,7 @@ import logging
 import os
 import time
 
+from .rate_limit import rate_limited
 from .utils import FunctionSpec, OutputType, opt_messages_to_list, backoff_create
 from funcy import notnone, once, select_values
 import httpx
@@ -55,9 +56,16 @@ def query(
     system_message: str | None,
     user_message: str | None,
     func_spec: FunctionSpec | None = None,
+    priority: str = "normal",
     **model_kwargs,
 ) -> tuple[OutputType, float, int, int, dict]:
     client = get_ai_client(model_kwargs.get("model"), max_retries=0)
+    create_fn = rate_limited(
+        client.chat.completions.create,
+        model_kwargs.get("model"),
+        (openai.RateLimitError,),
+        priority,
+    )
     filtered_kwargs: dict = select_values(notnone, model_kwargs)  # type: ignore
 
     messages = opt_messages_to_list(system_message, user_message)
@@ -74,7 +82,7 @@ def query(
 
     t0 = time.time()
     completion = backoff_create(
-        client.chat.completions.create,
+        create_fn,
         OPENAI_TIMEOUT_EXCEPTIONS,
         messages=messages,
         **filtered_kwargs,
@@ -0,0 +1,258 @@
+"""
+Provider-level rate limiting shared by all worker processes.
+
+Each provider (openai, anthropic, openrouter) gets a requests/min and a
+tokens/min token bucket whose state lives in a small file guarded by an
+exclusive file lock, so the parallel experiment workers draw from the same
+budget instead of each hitting the API and backing off independently.
+
+A 429 from the provider empties the request bucket and sets a shared cooldown
+(the server's retry-after if it sent one). Once the cooldown ends, waiting
+workers are let through one refill at a time instead of all at once.
+
+Callers are split into priority classes. Lower classes may only take from the
+bucket while it holds more than a reserved share of its capacity, which leaves
+that headroom for code generation when summaries and reports compete with it.
+
+Configured through environment variables (inherited by worker processes);
+providers without limits are not throttled:
+
+    AI_SCIENTIST_<PROVIDER>_RPM       requests per minute, e.g. AI_SCIENTIST_OPENAI_RPM=500
+    AI_SCIENTIST_<PROVIDER>_TPM       tokens per minute (prompt + completion)
+    AI_SCIENTIST_RATE_LIMIT_DIR       directory for the shared bucket state
+"""
+
+import functools
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: limits are enforced per process only
+    fcntl = None
+
+logger = logging.getLogger("ai-scientist")
+
+# share of bucket capacity a priority class must leave untouched
+PRIORITY_RESERVE = {
+    "high": 0.0,
+    "normal": 0.1,
+    "low": 0.3,
+}
+DEFAULT_COOLDOWN = 10.0
+MAX_WAIT_SLICE = 2.0
+
+
+def provider_for_model(model: str) -> Optional[str]:
+    """Map a model name to the rate-limited provider it is billed against."""
+    if not model or model.startswith("ollama/"):
+        return None
+    if model.startswith("openrouter/"):
+        return "openrouter"
+    if "/" in model and os.environ.get("OPENROUTER_API_KEY"):
+        return "openrouter"
+    if "claude-" in model:
+        return "anthropic"
+    return "openai"
+
+
+def estimate_request_tokens(kwargs: dict) -> int:
+    """Rough prompt + completion token count for a chat request (4 chars/token)."""
+    chars = len(json.dumps(kwargs.get("messages", []), default=str))
+    chars += len(str(kwargs.get("system", "")))
+    completion = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or 0
+    return chars // 4 + int(completion)
+
+
+def _usage_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    # OpenAI: prompt/completion_tokens, Anthropic: input/output_tokens
+    prompt = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", 0)
+    completion = getattr(usage, "completion_tokens", None) or getattr(
+        usage, "output_tokens", 0
+    )
+    return (prompt or 0) + (completion or 0)
+
+
+def _retry_after(exc: Exception) -> float:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", DEFAULT_COOLDOWN))
+    except (TypeError, ValueError):
+        return DEFAULT_COOLDOWN
+
+
+class RateLimiter:
+    """Cross-process token buckets (requests/min, tokens/min) for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        state_dir: Path | str | None = None,
+    ):
+        self.provider = provider
+        self.rpm = rpm
+        self.tpm = tpm
+        state_dir = Path(
+            state_dir or Path(tempfile.gettempdir()) / "ai_scientist_rate_limit"
+        )
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = state_dir / f"{provider}.json"
+        self.lock_path = state_dir / f"{provider}.lock"
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked_state(self):
+        with self._thread_lock, open(self.lock_path, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    state = json.loads(self.state_path.read_text())
+                except (FileNotFoundError, json.JSONDecodeError):
+                    state = {}
+                now = time.time()
+                self._refill(state, now)
+                yield state, now
+                tmp_path = self.state_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(state))
+                os.replace(tmp_path, self.state_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refill(self, state: dict, now: float) -> None:
+        elapsed = max(0.0, now - state.get("updated", now))
+        for name, limit in (("requests", self.rpm), ("tokens", self.tpm)):
+            if limit:
+                level = state.get(name, limit) + elapsed * limit / 60.0
+                state[name] = min(limit, level)
+        state["updated"] = now
+
+    def _wait_time(self, state: dict, now: float, tokens: int, reserve: float) -> float:
+        """Seconds until the request fits, 0 if it can be sent now."""
+        wait = max(0.0, state.get("cooldown_until", 0.0) - now)
+        for name, limit, cost in (
+            ("requests", self.rpm, 1),
+            ("tokens", self.tpm, tokens),
+        ):
+            if not limit:
+                continue
+            # a single oversized request only has to wait for a full bucket
+            needed = min(cost, limit * (1 - reserve)) + reserve * limit
+            deficit = needed - state[name]
+            if deficit > 0:
+                wait = max(wait, deficit * 60.0 / limit)
+        return wait
+
+    def acquire(self, tokens: int = 0, priority: str = "normal") -> float:
+        """Block until the request fits the provider budget; returns seconds waited."""
+        reserve = PRIORITY_RESERVE.get(priority, PRIORITY_RESERVE["normal"])
+        t0 = time.time()
+        while True:
+            with self._locked_state() as (state, now):
+                wait = self._wait_time(state, now, tokens, reserve)
+                if wait <= 0:
+                    if self.rpm:
+                        state["requests"] -= 1
+                    if self.tpm:
+                        state["tokens"] -= min(tokens, self.tpm)
+                    break
+            # jitter so that waiting workers do not wake up in lockstep
+            time.sleep(min(wait, MAX_WAIT_SLICE) * random.uniform(0.8, 1.2))
+        waited = time.time() - t0
+        if waited > 1:
+            logger.info(
+                f"Rate limiter ({self.provider}, {priority}) delayed request by {waited:.1f}s"
+            )
+        return waited
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the real usage of a request is known."""
+        if not self.tpm or actual is None or actual == estimated:
+            return
+        with self._locked_state() as (state, _):
+            state["tokens"] = min(self.tpm, state["tokens"] + estimated - actual)
+
+    def cooldown(self, seconds: float) -> None:
+        """Pause all workers after a provider-side rate-limit error."""
+        with self._locked_state() as (state, now):
+            state["cooldown_until"] = max(state.get("cooldown_until", 0.0), now + seconds)
+            if self.rpm:
+                state["requests"] = 0.0
+        logger.info(f"Rate limit hit for {self.provider}, cooling down {seconds:.0f}s")
+
+    def wrap(
+        self,
+        create_fn: Callable,
+        rate_limit_exceptions: tuple,
+        priority: str = "normal",
+    ) -> Callable:
+        """Throttle every call (including retries) of an API create function."""
+
+        @functools.wraps(create_fn)
+        def limited_create(*args, **kwargs):
+            estimated = estimate_request_tokens(kwargs)
+            self.acquire(estimated, priority)
+            try:
+                response = create_fn(*args, **kwargs)
+            except rate_limit_exceptions as e:
+                self.cooldown(_retry_after(e))
+                raise
+            self.settle(estimated, _usage_tokens(response))
+            return response
+
+        return limited_create
+
+
+def _env_limit(provider: str, kind: str) -> Optional[float]:
+    value = os.environ.get(f"AI_SCIENTIST_{provider.upper()}_{kind}")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        logger.warning(f"Ignoring invalid AI_SCIENTIST_{provider.upper()}_{kind}={value!r}")
+        return None
+
+
+_limiters: dict[tuple, RateLimiter] = {}
+
+
+def get_rate_limiter(model: str) -> Optional[RateLimiter]:
+    """Return the limiter for the provider serving `model`, or None if it is unlimited."""
+    provider = provider_for_model(model)
+    if provider is None:
+        return None
+    rpm, tpm = _env_limit(provider, "RPM"), _env_limit(provider, "TPM")
+    if not rpm and not tpm:
+        return None
+    state_dir = os.environ.get("AI_SCIENTIST_RATE_LIMIT_DIR")
+    key = (provider, rpm, tpm, state_dir)
+    if key not in _limiters:
+        _limiters[key] = RateLimiter(provider, rpm=rpm, tpm=tpm, state_dir=state_dir)
+    return _limiters[key]
+
+
+def rate_limited(
+    create_fn: Callable,
+    model: str,
+    rate_limit_exceptions: tuple,
+    priority: str = "normal",
+) -> Callable:
+    """Wrap create_fn with the provider limiter for `model` (unchanged if unlimited)."""
+    limiter = get_rate_limiter(model)
+    if limiter is None:
+        return create_fn
+    return limiter.wrap(create_fn, rate_limit_exceptions, priority)
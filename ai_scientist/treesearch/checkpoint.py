@@ -0,0 +1,191 @@
+"""
+Append-only checkpoints for AgentManager.
+
+Instead of pickling every journal on every save, the checkpoint directory holds
+- one JSONL log per stage journal, to which only nodes that are new (or whose
+  status changed) since the previous save are appended, and
+- a small state header (stages, history, ledger, ...) that is replaced atomically.
+
+Only nodes that had a field assigned since the previous save are serialized;
+Node.__setattr__ bumps a per-node revision for that. In-place changes to a
+nested value (e.g. node.metric.value) are not seen until the field is
+reassigned. Reopening a checkpoint directory reads the digests of the records
+already logged, so a resumed run does not append its loaded nodes again.
+
+Replaying the logs rebuilds the journals; a torn last line from a crash
+mid-write is skipped, so earlier saves stay usable. Parent links are
+resolved across all journals, since a stage's root nodes descend from the
+best node of the previous stage.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .journal import Journal, Node
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "state.pkl"
+CHECKPOINT_VERSION = 1
+
+
+def _journal_log_name(stage_name: str) -> str:
+    return "journal_" + re.sub(r"[^A-Za-z0-9_.-]", "_", stage_name) + ".jsonl"
+
+
+def _record_digest(record: dict) -> str:
+    """Digest of every field of a node record.
+
+    children is left out: it is rebuilt from parent_id on replay, and a
+    parent should not be rewritten whenever it gains a child.
+    """
+    content = {key: value for key, value in record.items() if key != "children"}
+    return hashlib.sha1(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _node_record(node: Node) -> Tuple[dict, str]:
+    """Serialized node and its digest."""
+    record = node.to_dict()
+    return record, _record_digest(record)
+
+
+def _truncate_torn_tail(log_path: Path) -> None:
+    """Cut off a partial last line left by a crash so new records start on a fresh line."""
+    with open(log_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+class IncrementalCheckpoint:
+    """Writes AgentManager state as per-stage append-only node logs plus a state header."""
+
+    def __init__(self, checkpoint_dir: Path | str):
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        # log name -> {node id -> digest of its last logged record}
+        self._written: Dict[str, Dict[str, str]] = {}
+        # log name -> {node id -> (node, revision) when last found up to date}
+        self._clean: Dict[str, Dict[str, Tuple[weakref.ref, int]]] = {}
+        for log_path in self.checkpoint_dir.glob("journal_*.jsonl"):
+            _truncate_torn_tail(log_path)
+            self._written[log_path.name] = {
+                record["id"]: _record_digest(record)
+                for record in _read_journal_log(log_path)
+            }
+
+    def _pending_records(self, journal: Journal, written: Dict[str, str], clean):
+        for node in journal.nodes:
+            revision = node.__dict__.get("_revision", 0)
+            seen = clean.get(node.id)
+            if seen is not None and seen[0]() is node and seen[1] == revision:
+                continue
+            record, digest = _node_record(node)
+            if written.get(node.id) == digest:
+                clean[node.id] = (weakref.ref(node), revision)
+                continue
+            yield node, record, digest, revision
+
+    def save(self, journals: Dict[str, Journal], state: Dict[str, Any]) -> int:
+        """Append new/changed nodes of every journal, then replace the state header.
+
+        Returns the number of node records written.
+        """
+        num_written = 0
+        for stage_name, journal in journals.items():
+            log_name = _journal_log_name(stage_name)
+            written = self._written.setdefault(log_name, {})
+            clean = self._clean.setdefault(log_name, {})
+            pending = list(self._pending_records(journal, written, clean))
+            if not pending:
+                continue
+            lines = [json.dumps(record) + "\n" for _, record, _, _ in pending]
+            with open(self.checkpoint_dir / log_name, "a") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            for node, _, digest, revision in pending:
+                written[node.id] = digest
+                clean[node.id] = (weakref.ref(node), revision)
+            num_written += len(pending)
+
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "journal_logs": {
+                name: _journal_log_name(name) for name in journals.keys()
+            },
+            **state,
+        }
+        tmp_path = self.checkpoint_dir / (STATE_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(header, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_dir / STATE_FILE)
+        return num_written
+
+
+def _read_journal_log(log_path: Path) -> List[dict]:
+    # first occurrence fixes a node's position, later records carry newer state
+    records: Dict[str, dict] = {}
+    with open(log_path) as f:
+        for line_no, line in enumerate(f, start=1):
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping torn record {line_no} in {log_path}")
+                continue
+            records[data["id"]] = data
+    return list(records.values())
+
+
+def _replay_journal_logs(logs: Dict[str, Path]) -> Dict[str, Journal]:
+    """Rebuild journals from their logs, linking parents across journals."""
+    journals: Dict[str, Journal] = {}
+    parent_ids: List[Tuple[Node, str]] = []
+    nodes_by_id: Dict[str, Node] = {}
+    for stage_name, log_path in logs.items():
+        journal = Journal()
+        for data in _read_journal_log(log_path) if log_path.exists() else []:
+            parent_id = data.get("parent_id")
+            node = Node.from_dict(data)
+            journal.append(node)
+            nodes_by_id.setdefault(node.id, node)
+            if parent_id:
+                parent_ids.append((node, parent_id))
+        journals[stage_name] = journal
+
+    for node, parent_id in parent_ids:
+        parent = nodes_by_id.get(parent_id)
+        if parent is None:
+            logger.warning(f"Parent {parent_id} of node {node.id} not in checkpoint")
+            continue
+        node.parent = parent
+        parent.children.add(node)
+    return journals
+
+
+def load_incremental_checkpoint(
+    checkpoint_dir: Path | str,
+) -> Tuple[Dict[str, Any], Dict[str, Journal]]:
+    """Load the state header and rebuild all journals by replaying their logs."""
+    checkpoint_dir = Path(checkpoint_dir)
+    with open(checkpoint_dir / STATE_FILE, "rb") as f:
+        state = pickle.load(f)
+    journal_logs: Dict[str, str] = state.pop("journal_logs", {})
+    state.pop("version", None)
+
+    journals = _replay_journal_logs(
+        {name: checkpoint_dir / log_name for name, log_name in journal_logs.items()}
+    )
+    return state, journals
+
@@ -4,15 +4,19 @@ Supports:
 - captures stdout and stderr
 - captures exceptions and stack traces
 - limits execution time
+- optionally keeps warm, pre-imported spare processes to hide spawn/import cost
 """
 
+import importlib
 import logging
 import os
 import queue
 import signal
 import sys
+import threading
 import time
 import traceback
+from collections import deque
 from dataclasses import dataclass
 from multiprocessing import Process, Queue
 from pathlib import Path
@@ -86,6 +90,9 @@ class Interpreter:
         format_tb_ipython: bool = False,
         agent_file_name: str = "runfile.py",
         env_vars: dict[str, str] = {},
+        num_spares: int = 0,
+        preload_modules: list[str] = [],
+        warmup_timeout: int = 300,
     ):
         """
         Simulates a standalone Python REPL with an execution time limit.
@@ -96,6 +103,11 @@ class Interpreter:
             format_tb_ipython (bool, optional): Whether to use IPython or default python REPL formatting for exceptions. Defaults to False.
             agent_file_name (str, optional): The name for the agent's code file. Defaults to "runfile.py".
             env_vars (dict[str, str], optional): Environment variables to set in the child process. Defaults to {}.
+            num_spares (int, optional): Number of warm child processes to keep ready, so a session reset
+                swaps in an already started process instead of spawning one. Defaults to 0 (spawn on demand).
+            preload_modules (list[str], optional): Modules imported in each child before it accepts code
+                (e.g. numpy, torch). Defaults to [].
+            warmup_timeout (int, optional): Seconds to wait for a child to finish preloading. Defaults to 300.
         """
         # this really needs to be a path, otherwise causes issues that don't raise exc
         self.working_dir = Path(working_dir).resolve()
@@ -107,6 +119,38 @@ class Interpreter:
         self.agent_file_name = agent_file_name
         self.process: Process = None  # type: ignore
         self.env_vars = env_vars
+        self.num_spares = num_spares
+        self.preload_modules = preload_modules
+        self.warmup_timeout = warmup_timeout
+        # whether the current process has reported state:warm
+        self._warm = False
+        # spare sessions: (process, code_inq, result_outq, event_outq); not tied
+        # to a GPU, the device is sent to the child when the spare is handed out
+        self._spares: deque = deque()
+        # if set, the pid of each session handed out is written here, so the
+        # caller can kill a runaway execution (and its process group)
+        self.session_pid_file: str | None = None
+
+    def _preload(self) -> None:
+        """Import heavy modules once so that executed code finds them in sys.modules."""
+        for module_name in self.preload_modules:
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                logger.warning(f"Failed to preload module {module_name}: {e}")
+
+    @staticmethod
+    def _exit_with_parent() -> None:
+        """Terminate this child if its parent dies, so sessions are not orphaned."""
+        parent_pid = os.getppid()
+
+        def watch():
+            while True:
+                time.sleep(5)
+                if os.getppid() != parent_pid:
+                    os._exit(1)
+
+        threading.Thread(target=watch, daemon=True).start()
 
     def child_proc_setup(self, result_outq: Queue) -> None:
         # disable all warnings (before importing anything)
@@ -123,6 +167,9 @@ class Interpreter:
         # a .py file should be able to import modules from the cwd anyway
         sys.path.append(str(self.working_dir))
 
+        # preload before redirecting output so import noise is not captured
+        self._preload()
+
         # capture stdout and stderr
         # trunk-ignore(mypy/assignment)
         sys.stdout = sys.stderr = RedirectQueue(result_outq)
@@ -130,11 +177,25 @@ class Interpreter:
     def _run_session(
         self, code_inq: Queue, result_outq: Queue, event_outq: Queue
     ) -> None:
+        # own process group: killing it also stops processes the code started;
+        # it no longer gets the terminal's SIGINT, so it exits with its parent
+        os.setpgid(0, 0)
+        self._exit_with_parent()
         self.child_proc_setup(result_outq)
+        event_outq.put(("state:warm",))
 
         global_scope: dict = {}
         while True:
             code = code_inq.get()
+            if isinstance(code, tuple) and code[0] == "env":
+                # device assignment of a handed-out spare; importing torch does
+                # not initialize CUDA, so this still takes effect after preloading
+                for key, value in code[1].items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+                continue
             os.chdir(str(self.working_dir))
             with open(self.agent_file_name, "w") as f:
                 f.write(code)
@@ -160,56 +221,102 @@ class Interpreter:
             # put EOF marker to indicate that we're done
             result_outq.put("<|EOF|>")
 
-    def create_process(self) -> None:
+    def _spawn_session(self) -> tuple:
         # we use three queues to communicate with the child process:
         # - code_inq: send code to child to execute
         # - result_outq: receive stdout/stderr from child
-        # - event_outq: receive events from child (e.g. state:ready, state:finished)
+        # - event_outq: receive events from child (e.g. state:warm, state:ready, state:finished)
         # trunk-ignore(mypy/var-annotated)
-        self.code_inq, self.result_outq, self.event_outq = Queue(), Queue(), Queue()
-        self.process = Process(
+        code_inq, result_outq, event_outq = Queue(), Queue(), Queue()
+        process = Process(
             target=self._run_session,
-            args=(self.code_inq, self.result_outq, self.event_outq),
+            args=(code_inq, result_outq, event_outq),
         )
-        self.process.start()
+        process.start()
+        return process, code_inq, result_outq, event_outq
 
-    def _drain_queues(self):
-        """Quickly drain all in-flight messages to prevent blocking."""
-        while not self.result_outq.empty():
-            try:
-                self.result_outq.get_nowait()
-            except Exception:
-                break
-
-        while not self.event_outq.empty():
-            try:
-                self.event_outq.get_nowait()
-            except Exception:
-                break
+    def _top_up_spares(self) -> None:
+        while len(self._spares) < self.num_spares:
+            self._spares.append(self._spawn_session())
 
-        while not self.code_inq.empty():
-            try:
-                self.code_inq.get_nowait()
-            except Exception:
+    def create_process(self) -> None:
+        session = None
+        while self._spares:
+            spare = self._spares.popleft()
+            if spare[0].is_alive():
+                session = spare
                 break
-
-    def cleanup_session(self):
-        if self.process is None:
+            self._kill_session(spare[0], spare[1:4])
+        if session is None:
+            session = self._spawn_session()
+        (
+            self.process,
+            self.code_inq,
+            self.result_outq,
+            self.event_outq,
+        ) = session
+        # spares may have been started under another GPU assignment of this worker
+        self.code_inq.put(
+            ("env", {"CUDA_VISIBLE_DEVICES": os.environ.get("CUDA_VISIBLE_DEVICES")})
+        )
+        self._warm = False
+        if self.session_pid_file:
+            with open(self.session_pid_file, "w") as f:
+                f.write(str(self.process.pid))
+        self._top_up_spares()
+
+    def _wait_until_warm(self) -> None:
+        """Block until the child has finished setup and preloading."""
+        if self._warm:
             return
+        try:
+            state = self.event_outq.get(timeout=self.warmup_timeout)
+        except queue.Empty:
+            msg = "REPL child process failed to finish warm-up"
+            logger.critical(msg)
+            raise RuntimeError(msg) from None
+        assert state[0] == "state:warm", state
+        self._warm = True
+
+    @staticmethod
+    def _drain_queues(queues):
+        """Quickly drain all in-flight messages to prevent blocking."""
+        for q in queues:
+            while not q.empty():
+                try:
+                    q.get_nowait()
+                except Exception:
+                    break
+
+    def _kill_session(self, process: Process, queues) -> None:
         # give the child process a chance to terminate gracefully
-        self.process.terminate()
-        self._drain_queues()
-        self.process.join(timeout=2)
+        process.terminate()
+        self._drain_queues(queues)
+        process.join(timeout=2)
         # kill the child process if it's still alive
-        if self.process.exitcode is None:
+        if process.exitcode is None:
             logger.warning("Child process failed to terminate gracefully, killing it..")
-            self.process.kill()
-            self._drain_queues()
-            self.process.join(timeout=2)
+            process.kill()
+            self._drain_queues(queues)
+            process.join(timeout=2)
         # don't wait for gc, clean up immediately
-        self.process.close()
+        process.close()
+
+    def cleanup_session(self):
+        if self.process is None:
+            return
+        self._kill_session(
+            self.process, (self.result_outq, self.event_outq, self.code_inq)
+        )
         self.process = None  # type: ignore
 
+    def shutdown(self):
+        """Clean up the current session and all warm spares."""
+        self.cleanup_session()
+        while self._spares:
+            spare = self._spares.popleft()
+            self._kill_session(spare[0], spare[1:4])
+
     def run(self, code: str, reset_session=True) -> ExecutionResult:
         """
         Execute the provided Python command in a separate process and return its output.
@@ -236,6 +343,7 @@ class Interpreter:
 
         assert self.process.is_alive()
 
+        self._wait_until_warm()
         self.code_inq.put(code)
 
         # wait for child to actually start execution (we don't want interrupt child setup)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import heapq
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -13,8 +14,6 @@ from .utils.metric import MetricValue, WorstMetricValue
 from .utils.response import trim_long_string
 from .backend import FunctionSpec, query
 
-from rich import print
-
 import logging
 from pathlib import Path
 
@@ -40,6 +39,10 @@ node_selection_spec = FunctionSpec(
 )
 
 
+# Node attributes that decide which Journal index buckets a node belongs to
+_INDEXED_FIELDS = frozenset({"parent", "is_buggy", "is_buggy_plots", "metric"})
+
+
 @dataclass(eq=False)
 class Node(DataClassJsonMixin):
     """A single node in the solution tree. Contains code, execution results, and evaluation information."""
@@ -128,6 +131,16 @@ class Node(DataClassJsonMixin):
         if self.parent is not None and not isinstance(self.parent, str):
             self.parent.children.add(self)
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # lets incremental checkpoints skip nodes not assigned to since the last save
+        if name not in ("_journals", "_revision"):
+            self.__dict__["_revision"] = self.__dict__.get("_revision", 0) + 1
+        # keep the indexes of every journal holding this node up to date
+        if name in _INDEXED_FIELDS:
+            for journal in self.__dict__.get("_journals", ()):
+                journal._on_node_changed(self)
+
     def __deepcopy__(self, memo):
         # Create a new instance with copied attributes
         cls = self.__class__
@@ -135,8 +148,9 @@ class Node(DataClassJsonMixin):
         memo[id(self)] = result
 
         # Copy all attributes except parent and children to avoid circular references
+        # (journal membership is not copied either)
         for k, v in self.__dict__.items():
-            if k not in ("parent", "children"):
+            if k not in ("parent", "children", "_journals"):
                 setattr(result, k, copy.deepcopy(v, memo))
 
         # Handle parent and children separately
@@ -148,6 +162,8 @@ class Node(DataClassJsonMixin):
     def __getstate__(self):
         """Return state for pickling"""
         state = self.__dict__.copy()
+        # Journal membership is rebuilt by the journal itself when unpickled
+        state.pop("_journals", None)
         # Ensure id is included in the state
         if hasattr(self, "id"):
             state["id"] = self.id
@@ -362,12 +378,137 @@ class InteractiveSession(DataClassJsonMixin):
         return "\n".join(trace).strip()
 
 
+class _BestEntry:
+    """Heap entry ordering nodes best-metric-first, earliest-position on ties."""
+
+    __slots__ = ("node", "metric", "position")
+
+    def __init__(self, node: Node, position: int):
+        self.node = node
+        self.metric = node.metric
+        self.position = position
+
+    def __lt__(self, other: "_BestEntry") -> bool:
+        if self.metric > other.metric:
+            return True
+        if other.metric > self.metric:
+            return False
+        return self.position < other.position
+
+
 @dataclass
 class Journal:
-    """A collection of nodes representing the solution tree."""
+    """A collection of nodes representing the solution tree.
+
+    Lookups by id and the draft/buggy/good views are served from indexes that
+    are maintained in append() and whenever an indexed node attribute changes
+    (see Node.__setattr__), so they do not rescan the node list.
+    """
 
     nodes: list[Node] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self._rebuild_index()
+        # rolling memory summary, keyed by include_code ->
+        # (summary, node id -> _fold_key of the node when it was folded in)
+        self._rolling_summaries: dict[bool, tuple[str, dict[str, tuple]]] = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # indexes are derived data, rebuild them on load
+        for key in list(state):
+            if key.startswith("_idx_"):
+                del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_rolling_summaries", {})
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        self._idx_by_id: dict[str, Node] = {}
+        self._idx_position: dict[str, int] = {}
+        self._idx_drafts: set[str] = set()
+        self._idx_buggy: set[str] = set()
+        self._idx_good: set[str] = set()
+        self._idx_views: dict[str, list[Node]] = {}
+        self._idx_best_heap: list[_BestEntry] = []
+        self._idx_len = 0
+        for node in self.nodes:
+            self._index_node(node)
+
+    def _ensure_index(self) -> None:
+        # nodes appended to the list directly (bypassing append) trigger a rebuild
+        if self._idx_len != len(self.nodes):
+            self._rebuild_index()
+
+    def _index_node(self, node: Node) -> None:
+        position = self._idx_len
+        self._idx_len += 1
+        self._idx_by_id.setdefault(node.id, node)
+        self._idx_position.setdefault(node.id, position)
+        journals = node.__dict__.setdefault("_journals", [])
+        if not any(j is self for j in journals):
+            journals.append(self)
+        self._update_buckets(node)
+
+    def _update_buckets(self, node: Node) -> None:
+        node_id = node.id
+        for bucket, view, member in (
+            (self._idx_drafts, "draft", node.parent is None),
+            (self._idx_buggy, "buggy", bool(node.is_buggy)),
+            (
+                self._idx_good,
+                "good",
+                node.is_buggy is False and node.is_buggy_plots is False,
+            ),
+        ):
+            if member and node_id not in bucket:
+                bucket.add(node_id)
+                self._idx_views.pop(view, None)
+            elif not member and node_id in bucket:
+                bucket.discard(node_id)
+                self._idx_views.pop(view, None)
+        if node_id in self._idx_good and node.metric is not None:
+            heapq.heappush(
+                self._idx_best_heap,
+                _BestEntry(node, self._idx_position[node_id]),
+            )
+
+    def _on_node_changed(self, node: Node) -> None:
+        if self._idx_by_id.get(node.id) is node:
+            self._update_buckets(node)
+
+    def _view(self, name: str) -> list[Node]:
+        self._ensure_index()
+        view = self._idx_views.get(name)
+        if view is None:
+            bucket = {
+                "draft": self._idx_drafts,
+                "buggy": self._idx_buggy,
+                "good": self._idx_good,
+            }[name]
+            view = sorted(
+                (self._idx_by_id[i] for i in bucket),
+                key=lambda n: self._idx_position[n.id],
+            )
+            self._idx_views[name] = view
+        return list(view)
+
+    def _best_good_node_by_metric(self) -> Optional[Node]:
+        """Best good node by metric, same result as max(good_nodes, key=metric)."""
+        self._ensure_index()
+        heap = self._idx_best_heap
+        while heap:
+            top = heap[0]
+            node = top.node
+            # drop stale entries (node no longer good or metric replaced)
+            if node.id in self._idx_good and node.metric is top.metric:
+                return node
+            heapq.heappop(heap)
+        return None
+
     def __getitem__(self, idx: int) -> Node:
         return self.nodes[idx]
 
@@ -377,50 +518,42 @@ class Journal:
 
     def append(self, node: Node) -> None:
         """Append a new node to the journal."""
+        self._ensure_index()
         node.step = len(self.nodes)
         self.nodes.append(node)
+        self._index_node(node)
 
     @property
     def draft_nodes(self) -> list[Node]:
         """Return a list of nodes representing intial coding drafts"""
-        return [n for n in self.nodes if n.parent is None]
+        return self._view("draft")
 
     @property
     def buggy_nodes(self) -> list[Node]:
         """Return a list of nodes that are considered buggy by the agent."""
-        return [n for n in self.nodes if n.is_buggy]
+        return self._view("buggy")
 
     @property
     def good_nodes(self) -> list[Node]:
         """Return a list of nodes that are not considered buggy by the agent."""
-        list_of_nodes = [
-            [
-                n.step,
-                n.parent.step if n.parent else None,
-                n.id,
-                n.is_buggy,
-                n.is_buggy_plots,
-            ]
-            for n in self.nodes
-        ]
-        print(
-            f"[purple]all nodes ID and is_buggy/is_buggy_plots flags: {list_of_nodes}[/purple]"
-        )
-        return [
-            n for n in self.nodes if n.is_buggy is False and n.is_buggy_plots is False
-        ]
+        return self._view("good")
 
     def get_node_by_id(self, node_id: str) -> Optional[Node]:
         """Get a node by its ID."""
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        self._ensure_index()
+        return self._idx_by_id.get(node_id)
 
     def get_metric_history(self) -> list[MetricValue]:
         """Return a list of all metric values in the journal."""
         return [n.metric for n in self.nodes]
 
+    def _max_by_metric(self, nodes: list[Node], only_good: bool) -> Node:
+        if only_good:
+            best = self._best_good_node_by_metric()
+            if best is not None:
+                return best
+        return max(nodes, key=lambda n: n.metric)
+
     def get_best_node(self, only_good=True, use_val_metric_only=False, cfg=None) -> None | Node:
         """Return the best solution found so far."""
         if only_good:
@@ -431,7 +564,7 @@ class Journal:
             nodes = self.nodes
 
         if use_val_metric_only:
-            return max(nodes, key=lambda n: n.metric)
+            return self._max_by_metric(nodes, only_good)
 
         if len(nodes) == 1:
             return nodes[0]
@@ -498,12 +631,12 @@ class Journal:
                 return selected_node
             else:
                 logger.warning("Falling back to metric-based selection")
-                return max(nodes, key=lambda n: n.metric)
+                return self._max_by_metric(nodes, only_good)
 
         except Exception as e:
             logger.error(f"Error in LLM selection process: {e}")
             logger.warning("Falling back to metric-based selection")
-            return max(nodes, key=lambda n: n.metric)
+            return self._max_by_metric(nodes, only_good)
 
     def generate_summary(self, include_code: bool = False, **model_kwargs) -> str:
         """Generate a summary of the research progress using LLM, including both successes and failures."""
@@ -546,11 +679,128 @@ class Journal:
                 "3. Specific recommendations for future experiments based on both successes and failures"
             ),
             model=model_kwargs.get("model", "gpt-4o"),
-            temperature=model_kwargs.get("temp", 0.3)
+            temperature=model_kwargs.get("temp", 0.3),
+            priority="low",
         )
 
         return summary
 
+    @staticmethod
+    def _approx_tokens(text: str) -> int:
+        # ~4 characters per token is close enough for budgeting prompts
+        return len(text) // 4
+
+    @staticmethod
+    def _fold_key(node: Node) -> tuple:
+        # what a node contributes to the rolling summary depends on these
+        return node.is_buggy, node.is_buggy_plots, str(node.metric), node.analysis
+
+    def _summary_entry(self, node: Node, include_code: bool) -> tuple[str, str] | None:
+        """Prompt entry for one node (same fields as generate_summary) and its outcome."""
+        if node.is_buggy is False and node.is_buggy_plots is False:
+            exp_info = f"Design: {node.plan}\n  "
+            exp_info += f"Results: {node.analysis}\n"
+            exp_info += f"Metric: {str(node.metric)}\n"
+            if include_code:
+                exp_info += f"Code: {node.code}\n"
+            return "success", exp_info
+        if node.is_buggy:
+            failure_info = f"Design: {node.plan}\n  "
+            failure_info += f"Error Analysis: {node.analysis}\n"
+            failure_info += f"Error Type: {node.exc_type if hasattr(node, 'exc_type') else 'Unknown'}\n"
+            failure_info += f"Debug Depth: {node.debug_depth}\n"
+            if include_code:
+                failure_info += f"Code: {node.code}\n"
+            return "failure", failure_info
+        return None
+
+    def generate_incremental_summary(
+        self, include_code: bool = False, token_budget: int = 4000, **model_kwargs
+    ) -> str:
+        """Fold new or changed nodes into a cached rolling summary.
+
+        Unlike generate_summary, each prompt only holds the previous summary and
+        the nodes to fold, so its size does not grow with the journal. A node is
+        folded again when its status or metric changed since it was last folded.
+        Nodes are folded in batches of roughly token_budget tokens (single
+        entries are trimmed to half the budget). If there is nothing to fold the
+        cached summary is returned without an LLM call.
+        """
+        if not self.nodes:
+            return "No experiments conducted yet."
+
+        summary, folded = self._rolling_summaries.get(include_code, ("", {}))
+        folded = dict(folded)
+
+        max_entry_chars = token_budget * 2  # ~half the budget at ~4 chars/token
+        summary_words = max(100, token_budget // 4)
+        pending = []
+        for node in self.nodes:
+            key = self._fold_key(node)
+            if folded.get(node.id) == key:
+                continue
+            entry = self._summary_entry(node, include_code)
+            if entry is None:
+                # not finished yet, folded once its status changes
+                folded[node.id] = key
+                continue
+            outcome, text = entry
+            if node.id in folded:
+                text = "Status update of an earlier experiment:\n  " + text
+            pending.append(
+                (node.id, key, outcome, trim_long_string(
+                    text, max_entry_chars, max_entry_chars // 2
+                ))
+            )
+
+        start = 0
+        while start < len(pending):
+            # take as many nodes as fit into the budget (at least one)
+            used = self._approx_tokens(summary)
+            end = start
+            while end < len(pending):
+                entry_tokens = self._approx_tokens(pending[end][3])
+                if end > start and used + entry_tokens > token_budget:
+                    break
+                used += entry_tokens
+                end += 1
+            batch = pending[start:end]
+            start = end
+
+            prompt = {
+                "Introduction": (
+                    "You are an AI researcher maintaining a running summary of experimental progress. "
+                    "Update the previous summary with the new successful and failed experiments "
+                    "to provide insights for future improvements."
+                ),
+                "Previous Summary": summary or "No previous summary.",
+                "New Successful Experiments": "".join(
+                    text for _, _, outcome, text in batch if outcome == "success"
+                ),
+                "New Failed Experiments": "".join(
+                    text for _, _, outcome, text in batch if outcome == "failure"
+                ),
+            }
+            summary = query(
+                system_message=prompt,
+                user_message=(
+                    "Please provide an updated, comprehensive summary of the experimental progress that includes:\n"
+                    "1. Key patterns of success across working experiments\n"
+                    "2. Common failure patterns and pitfalls to avoid\n"
+                    "3. Specific recommendations for future experiments based on both successes and failures\n"
+                    f"Keep the summary under {summary_words} words, condensing older details as needed."
+                ),
+                model=model_kwargs.get("model", "gpt-4o"),
+                temperature=model_kwargs.get("temp", 0.3),
+                priority="low",
+            )
+            for node_id, key, _, _ in batch:
+                folded[node_id] = key
+            self._rolling_summaries[include_code] = (summary, folded)
+
+        self._rolling_summaries[include_code] = (summary, folded)
+        return summary or "No experiments completed yet."
+
     def generate_summary_old(self, include_code: bool = False) -> str:
         summary = []
         for n in self.good_nodes:
@@ -609,7 +859,8 @@ class Journal:
             system_message=summary_prompt,
             user_message="Generate a comprehensive summary of the experimental findings in this stage",
             model=cfg.agent.summary.model if cfg.agent.get("summary", None) else "gpt-4o",
-            temperature=cfg.agent.summary.temp if cfg.agent.get("summary", None) else 0.3
+            temperature=cfg.agent.summary.temp if cfg.agent.get("summary", None) else 0.3,
+            priority="low",
         )
 
         with open(os.path.join(notes_dir, f"{stage_name}_summary.txt"), "w") as f:
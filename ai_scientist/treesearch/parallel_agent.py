@@ -1,26 +1,29 @@
-from concurrent.futures import ProcessPoolExecutor
-from typing import List, Optional, Set, Any, Callable, cast, Dict, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import List, NamedTuple, Optional, Set, Any, Callable, cast, Dict, Tuple
 import random
+import signal
 import subprocess
 import os
+import time
 from queue import Queue
 import logging
 import humanize
 from .backend import FunctionSpec, compile_prompt_to_md, query
 from .interpreter import ExecutionResult
 from .journal import Journal, Node
+from .plot_analysis import PlotGroup, analyze_plot_groups
 from .utils import data_preview
 from .utils.config import Config
 from .utils.metric import MetricValue, WorstMetricValue
 from .utils.response import extract_code, extract_text_up_to_code, wrap_code
 import copy
 import pickle
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from omegaconf import OmegaConf
 
 from rich import print
 from pathlib import Path
-import base64
 import sys
 
 logger = logging.getLogger("ai-scientist")
@@ -28,6 +31,53 @@ logger = logging.getLogger("ai-scientist")
 ExecCallbackType = Callable[[str, bool], ExecutionResult]
 
 
+class _InflightTask(NamedTuple):
+    """A job running in the process pool"""
+
+    process_id: str
+    is_draft: bool
+    start: float
+    # id of the node being re-run, for multi-seed evaluation jobs
+    seed_of: Optional[str] = None
+    # id of the node being expanded (debugged or improved), None for drafts
+    parent_id: Optional[str] = None
+
+
+# seconds a timed-out job gets to return after its session was killed,
+# before its whole worker process is killed instead
+_KILL_GRACE_SECONDS = 15
+
+# pid file of the job running in this pool worker process
+_job_pid_file: Optional[str] = None
+
+
+def _session_pid_file(pid_file: str) -> str:
+    """Where the job's interpreter records the pid of its code-executing session"""
+    return pid_file + ".session"
+
+
+def _run_with_pid_file(pid_file: str, fn: Callable, *args):
+    """Pool job entry point: record the worker's pid so a timed-out job can be killed"""
+    global _job_pid_file
+    with open(pid_file, "w") as f:
+        f.write(str(os.getpid()))
+    _job_pid_file = pid_file
+    try:
+        return fn(*args)
+    finally:
+        _job_pid_file = None
+
+
+@dataclass
+class _SeedRun:
+    """Multi-seed evaluation of one candidate node"""
+
+    node: Node
+    remaining: int
+    seed_nodes: List[Node] = field(default_factory=list)
+    aggregate: bool = True
+
+
 def _safe_pickle_test(obj, name="object"):
     """Test if an object can be pickled"""
     try:
@@ -100,38 +150,6 @@ review_func_spec = FunctionSpec(
     description="Submit a review evaluating the output of the training script.",
 )
 
-vlm_feedback_spec = FunctionSpec(
-    name="analyze_experiment_plots",
-    json_schema={
-        "type": "object",
-        "properties": {
-            "plot_analyses": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "analysis": {
-                            "type": "string",
-                            "description": "Detailed analysis of the plot's results and implications",
-                        },
-                    },
-                    "required": ["analysis"],
-                },
-            },
-            "valid_plots_received": {
-                "type": "boolean",
-                "description": "True if valid plots were received, False otherwise. For example, if the plots are empty or not meaningful, this should be False.",
-            },
-            "vlm_feedback_summary": {
-                "type": "string",
-                "description": "Summarize the feedback from the VLM. If the task involves generative modeling, make sure to focus on the generated samples.",
-            },
-        },
-        "required": ["plot_analyses", "valid_plots_received", "vlm_feedback_summary"],
-    },
-    description="Analyze experimental plots and provide detailed feedback on the results.",
-)
-
 metric_parse_spec = FunctionSpec(
     name="parse_metrics",
     json_schema={
@@ -664,6 +682,7 @@ class MinimalAgent:
                 user_message=None,
                 model=self.cfg.agent.code.model,
                 temperature=self.cfg.agent.code.temp,
+                priority="high",
             )
 
             code = extract_code(completion_text)
@@ -891,22 +910,8 @@ class MinimalAgent:
         )
         return [""]
 
-    def _analyze_plots_with_vlm(self, node: Node) -> None:
-        """Analyze experimental plots using VLM"""
-        if not node.plot_paths:
-            return
-
-        # for debugging
-        print(f"[cyan]Plot paths:[/cyan] {node.plot_paths}")
-
-        def encode_image_to_base64(image_path):
-            with open(image_path, "rb") as image_file:
-                try:
-                    return base64.b64encode(image_file.read()).decode("utf-8")
-                except Exception as e:
-                    print(f"[red]Error encoding image {image_path}: {e}[/red]")
-                    return None
-
+    def _select_plots_for_vlm(self, node: Node) -> List[str]:
+        """Pick the plots of a node to send to the VLM (at most 10)"""
         if not len(node.plot_paths) > 10:
             selected_plots = node.plot_paths
         else:
@@ -978,59 +983,61 @@ class MinimalAgent:
                 )
                 # Fallback to using first 10 plots
                 selected_plots = node.plot_paths[:10]
+        return selected_plots
 
-        print("[cyan]Before encoding images[/cyan]")
-        user_message = [
-            {
-                "type": "text",
-                "text": (
-                    "You are an experienced AI researcher analyzing experimental results. "
-                    "You have been provided with plots from a machine learning experiment. "
-                    f"This experiment is based on the following research idea: {self.task_desc}"
-                    "Please analyze these plots and provide detailed insights about the results. "
-                    "If you don't receive any plots, say 'No plots received'. "
-                    "Never make up plot analysis. "
-                    "Please return the analyzes with strict order of uploaded images, but DO NOT include any word "
-                    "like 'the first plot'."
-                ),
-            }
-        ] + [
-            {
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{encode_image_to_base64(plot_path)}"
-                },
-            }
-            for plot_path in selected_plots
-        ]
+    def _analyze_plots_with_vlm(self, node: Node) -> None:
+        """Analyze experimental plots using VLM"""
+        self._analyze_plots_batch([node])
 
-        response = cast(
-            dict,
-            query(
-                system_message=None,
-                user_message=user_message,
-                func_spec=vlm_feedback_spec,
-                model=self.cfg.agent.vlm_feedback.model,
-                temperature=self.cfg.agent.vlm_feedback.temp,
-            ),
-        )
-        print(
-            f"[cyan]VLM response from {self.cfg.agent.vlm_feedback.model}:[/cyan] {response}"
-        )
-        if response["valid_plots_received"]:
-            node.is_buggy_plots = False
-        else:
-            node.is_buggy_plots = True
+    def _analyze_plots_batch(self, nodes: List[Node]) -> None:
+        """Analyze the plots of several nodes, batching them into shared VLM calls"""
+        nodes = [node for node in nodes if node.plot_paths]
+        if not nodes:
+            return
 
-        for index, analysis in enumerate(response["plot_analyses"]):
-            analysis["plot_path"] = node.plot_paths[index]
+        vlm_cfg = self.cfg.agent.vlm_feedback
+        batch_size = max(1, vlm_cfg.get("batch_nodes", 1))
+        groups = []
+        for node in nodes:
+            # for debugging
+            print(f"[cyan]Plot paths:[/cyan] {node.plot_paths}")
+            groups.append(PlotGroup(node.id, self._select_plots_for_vlm(node)))
+
+        results = {}
+        errors = []
+        for start in range(0, len(groups), batch_size):
+            batch = groups[start : start + batch_size]
+            try:
+                results.update(
+                    analyze_plot_groups(
+                        batch,
+                        self.task_desc,
+                        model=vlm_cfg.model,
+                        temperature=vlm_cfg.temp,
+                        max_image_size=vlm_cfg.get("max_image_size", None),
+                    )
+                )
+            except Exception as e:
+                # a failed batch must not drop the analyses of the other batches
+                logger.error(
+                    f"Error analyzing plots of nodes {[g.key for g in batch]}: {str(e)}"
+                )
+                errors.append(e)
 
-        node.plot_analyses = response["plot_analyses"]
-        node.vlm_feedback_summary = response["vlm_feedback_summary"]
+        for node in nodes:
+            response = results.get(node.id)
+            if response is None:
+                continue
+            print(f"[cyan]VLM response from {vlm_cfg.model}:[/cyan] {response}")
+            node.is_buggy_plots = not response["valid_plots_received"]
+            node.plot_analyses = response["plot_analyses"]
+            node.vlm_feedback_summary = response["vlm_feedback_summary"]
 
-        node.datasets_successfully_tested = (
-            self._determine_datasets_successfully_tested(node)
-        )
+            node.datasets_successfully_tested = (
+                self._determine_datasets_successfully_tested(node)
+            )
+        if errors:
+            raise errors[0]
 
     def _generate_node_summary(self, node: Node) -> dict:
         """Generate a summary of the node's experimental findings"""
@@ -1088,6 +1095,62 @@ class MinimalAgent:
         )
 
 
+def _defer_vlm_analysis(cfg) -> bool:
+    """Whether plot analysis runs batched in the main process instead of per worker"""
+    return cfg.agent.vlm_feedback.get("batch_nodes", 1) > 1
+
+
+# Interpreter kept alive across nodes within one pool worker process
+_worker_interpreter = None
+_worker_interpreter_key = None
+
+
+def _get_worker_interpreter(cfg, workspace: str):
+    """Return the interpreter for a worker process.
+
+    Without exec.warm_pool a fresh Interpreter is created per node. With it,
+    one Interpreter per worker process is cached and reused, and it keeps
+    warm spare processes with the configured modules already imported.
+    """
+    global _worker_interpreter, _worker_interpreter_key
+    from .interpreter import Interpreter
+
+    session_pid_file = _session_pid_file(_job_pid_file) if _job_pid_file else None
+    warm_pool = cfg.exec.get("warm_pool", None)
+    if warm_pool is None or not warm_pool.get("enabled", False):
+        interpreter = Interpreter(
+            working_dir=workspace,
+            timeout=cfg.exec.timeout,
+            format_tb_ipython=cfg.exec.format_tb_ipython,
+            agent_file_name=cfg.exec.agent_file_name,
+        )
+        interpreter.session_pid_file = session_pid_file
+        return interpreter
+
+    key = (
+        workspace,
+        cfg.exec.timeout,
+        cfg.exec.format_tb_ipython,
+        cfg.exec.agent_file_name,
+    )
+    if _worker_interpreter is None or _worker_interpreter_key != key:
+        if _worker_interpreter is not None:
+            _worker_interpreter.shutdown()
+        _worker_interpreter = Interpreter(
+            working_dir=workspace,
+            timeout=cfg.exec.timeout,
+            format_tb_ipython=cfg.exec.format_tb_ipython,
+            agent_file_name=cfg.exec.agent_file_name,
+            num_spares=warm_pool.get("size", 1),
+            preload_modules=list(warm_pool.get("preload", [])),
+        )
+        _worker_interpreter_key = key
+        # start the spares now so they warm up while the LLM drafts code
+        _worker_interpreter._top_up_spares()
+    _worker_interpreter.session_pid_file = session_pid_file
+    return _worker_interpreter
+
+
 class GPUManager:
     """Manages GPU allocation across processes"""
 
@@ -1182,6 +1245,17 @@ class ParallelAgent:
         self.timeout = self.cfg.exec.timeout
         self.executor = ProcessPoolExecutor(max_workers=self.num_workers)
         self._is_shutdown = False
+        # "barrier" waits for every submitted node each step; "continuous"
+        # refills each worker slot as soon as its node finishes
+        self.scheduling = cfg.agent.get("scheduling", "barrier")
+        # in-flight jobs: exploration nodes in continuous mode and seed runs
+        self._inflight: Dict[Future, _InflightTask] = {}
+        # submitted jobs: future -> (process_id, pid file, submit args)
+        self._jobs: Dict[Future, Tuple[str, str, tuple]] = {}
+        self._task_counter = 0
+        # seed jobs waiting for a free worker slot, and runs per candidate id
+        self._seed_queue: deque = deque()
+        self._seed_runs: Dict[str, _SeedRun] = {}
         # Define the metric once at initialization
         self.evaluation_metrics = self._define_global_metrics()
         self._ablation_state = {  # store ablation names
@@ -1230,6 +1304,7 @@ class ParallelAgent:
                 user_message=None,
                 model=self.cfg.agent.code.model,
                 temperature=self.cfg.agent.code.temp,
+                priority="high",
             )
 
             code = extract_code(completion_text)
@@ -1258,76 +1333,113 @@ class ParallelAgent:
             is_seed_agg_node=True,
         )
 
-    def _run_multi_seed_evaluation(self, node: Node) -> List[Node]:
-        """Run multiple seeds of the same node to get statistical metrics.
-        Returns a list of nodes with different random seeds."""
-
-        # Convert node to dict for parallel processing
+    def _seed_node_data(self, node: Node, seed: int) -> dict:
+        """Node dict whose code is prefixed with fixed random seeds"""
         node_data = node.to_dict()
-        node_code = node.code
+        node_data["code"] = (
+            f"# Set random seed\nimport random\nimport numpy as np\nimport torch\n\nseed = {seed}\nrandom.seed(seed)\nnp.random.seed(seed)\ntorch.manual_seed(seed)\nif torch.cuda.is_available():\n    torch.cuda.manual_seed(seed)\n\n"
+            + node.code
+        )
+        return node_data
 
-        # Submit parallel jobs for different seeds
-        seed_nodes = []
-        futures = []
-        for seed in range(self.cfg.agent.multi_seed_eval.num_seeds):
-            gpu_id = None
-            if self.gpu_manager is not None:
-                try:
-                    process_id = f"seed_{seed}_worker"
-                    gpu_id = self.gpu_manager.acquire_gpu(process_id)
-                    logger.info(f"Assigned GPU {gpu_id} to seed {seed}")
-                except RuntimeError as e:
-                    logger.warning(
-                        f"Could not acquire GPU for seed {seed}: {e}. Running on CPU"
-                    )
+    def _submit_seed_job(self, node: Node, seed: int):
+        """Submit one seed re-run of a node to the process pool"""
+        process_id = f"seed_{seed}_{node.id}"
+        gpu_id = None
+        if self.gpu_manager is not None:
+            try:
+                gpu_id = self.gpu_manager.acquire_gpu(process_id)
+                logger.info(f"Assigned GPU {gpu_id} to seed {seed} of node {node.id}")
+            except RuntimeError as e:
+                logger.warning(
+                    f"Could not acquire GPU for seed {seed}: {e}. Running on CPU"
+                )
 
-            # Add seed to node code
-            node_data["code"] = (
-                f"# Set random seed\nimport random\nimport numpy as np\nimport torch\n\nseed = {seed}\nrandom.seed(seed)\nnp.random.seed(seed)\ntorch.manual_seed(seed)\nif torch.cuda.is_available():\n    torch.cuda.manual_seed(seed)\n\n"
-                + node_code
-            )
+        print(f"[yellow]Starting seed {seed} of multi-seed eval for {node.id}[/yellow]")
+        future = self._submit_job(
+            process_id,
+            self._seed_node_data(node, seed),
+            self.task_desc,
+            self.cfg,
+            gpu_id,
+            "",  # memory_summary
+            self.evaluation_metrics,
+            self.stage_name,
+            None,  # new_ablation_idea
+            None,  # new_hyperparam_idea
+            None,  # best_stage1_plot_code
+            None,  # best_stage2_plot_code
+            None,  # best_stage3_plot_code
+            True,  # seed_eval
+        )
+        self._inflight[future] = _InflightTask(
+            process_id, False, time.time(), seed_of=node.id
+        )
 
-            new_ablation_idea = None
-            new_hyperparam_idea = None
-            best_stage1_plot_code = None
-            best_stage2_plot_code = None
-            best_stage3_plot_code = None
-            seed_eval = True
-            memory_summary = ""
-            print("[yellow]Starting multi-seed eval...[/yellow]")
-            futures.append(
-                self.executor.submit(
-                    self._process_node_wrapper,
-                    node_data,
-                    self.task_desc,
-                    self.cfg,
-                    gpu_id,
-                    memory_summary,
-                    self.evaluation_metrics,
-                    self.stage_name,
-                    new_ablation_idea,
-                    new_hyperparam_idea,
-                    best_stage1_plot_code,
-                    best_stage2_plot_code,
-                    best_stage3_plot_code,
-                    seed_eval,
-                )
-            )
+    def _fill_seed_slots(self):
+        """Move queued seed jobs into free worker slots (ahead of exploration)"""
+        while self._seed_queue and len(self._inflight) < self.num_workers:
+            self._submit_seed_job(*self._seed_queue.popleft())
 
-        for future in futures:
-            try:
-                result_data = future.result(timeout=self.timeout)
+    def _queue_seed_evaluation(self, node: Node, aggregate: bool = True):
+        """Queue all seed runs of a candidate node as pool jobs"""
+        if node.id in self._seed_runs:
+            return
+        num_seeds = self.cfg.agent.multi_seed_eval.num_seeds
+        self._seed_runs[node.id] = _SeedRun(node, num_seeds, aggregate=aggregate)
+        self._seed_queue.extend((node, seed) for seed in range(num_seeds))
+
+    def _finish_seed_jobs(self, finished: List[Tuple[str, Optional[dict]]]):
+        """Journal finished seed runs; aggregate candidates whose seeds are all done.
+
+        finished holds (candidate id, result dict or None for a failed run).
+        """
+        result_nodes = []
+        for node_id, result_data in finished:
+            run = self._seed_runs[node_id]
+            run.remaining -= 1
+            if result_data is not None:
                 result_node = Node.from_dict(result_data, self.journal)
                 print(f"Parent node id: {result_node.parent.id}")
-                print(f"Sanity check: actual parent node id: {node.id}")
-                # Add node to journal's list and assign its step number
-                self.journal.append(result_node)
-                seed_nodes.append(self.journal.get_node_by_id(result_node.id))
-                print("Added result node to journal")
-            except Exception as e:
-                logger.error(f"Error in multi-seed evaluation: {str(e)}")
+                print(f"Sanity check: actual parent node id: {node_id}")
+                result_nodes.append(result_node)
+                run.seed_nodes.append(result_node)
+
+        self._analyze_deferred_plots(result_nodes)
+        for result_node in result_nodes:
+            # Add node to journal's list and assign its step number
+            self.journal.append(result_node)
+            print("Added seed result node to journal")
+
+        for node_id in dict.fromkeys(node_id for node_id, _ in finished):
+            run = self._seed_runs[node_id]
+            if run.remaining == 0 and run.aggregate:
+                # start aggregating while other candidates' seeds still run
+                print(f"[yellow]Seeds of {node_id} done, aggregating[/yellow]")
+                self._run_plot_aggregation(run.node, run.seed_nodes)
+
+    def run_multi_seed_evaluation(
+        self, nodes: List[Node], aggregate: bool = True
+    ) -> Dict[str, List[Node]]:
+        """Re-run candidate nodes with different random seeds.
+
+        Seed runs of all candidates are scheduled as pool jobs, interleaved
+        with any exploration nodes still in flight, and each candidate's plot
+        aggregation starts as soon as its own seeds are done.
+        Returns the seed nodes per candidate node id.
+        """
+        for node in nodes:
+            self._queue_seed_evaluation(node, aggregate=aggregate)
+        while any(self._seed_runs[node.id].remaining > 0 for node in nodes):
+            self._step_continuous(refill=False)
+        # exploration nodes submitted before the seeds still belong to this stage
+        self._drain_inflight()
+        return {node.id: self._seed_runs.pop(node.id).seed_nodes for node in nodes}
 
-        return seed_nodes
+    def _run_multi_seed_evaluation(self, node: Node) -> List[Node]:
+        """Run multiple seeds of the same node to get statistical metrics.
+        Returns a list of nodes with different random seeds."""
+        return self.run_multi_seed_evaluation([node], aggregate=False)[node.id]
 
     def _run_plot_aggregation(self, node: Node, seed_nodes: List[Node]) -> Node:
         """Generate an aggregation node for seed evaluation results"""
@@ -1423,7 +1535,6 @@ class ParallelAgent:
         seed_eval=False,
     ):
         """Wrapper function that creates a fresh environment for each process"""
-        from .interpreter import Interpreter
         from .journal import Node, Journal
         from copy import deepcopy
         import os
@@ -1457,13 +1568,9 @@ class ParallelAgent:
         )
 
         # Create interpreter instance for worker process
+        # (reused across nodes when the warm interpreter pool is enabled)
         print("Creating Interpreter")
-        process_interpreter = Interpreter(
-            working_dir=workspace,
-            timeout=cfg.exec.timeout,
-            format_tb_ipython=cfg.exec.format_tb_ipython,
-            agent_file_name=cfg.exec.agent_file_name,
-        )
+        process_interpreter = _get_worker_interpreter(cfg, workspace)
 
         try:
             print(f"stage_name: {stage_name}")
@@ -1769,7 +1876,8 @@ class ParallelAgent:
                         f"Error generating plots for node {child_node.id}: {str(e)}"
                     )
 
-                if child_node.plots:
+                # with batched VLM analysis the main process analyzes the plots
+                if child_node.plots and not _defer_vlm_analysis(cfg):
                     try:
                         worker_agent._analyze_plots_with_vlm(child_node)
                         logger.info(
@@ -1928,9 +2036,13 @@ class ParallelAgent:
             leaves.extend(self._get_leaves(child))
         return leaves
 
-    def _select_parallel_nodes(self) -> List[Optional[Node]]:
+    def _select_parallel_nodes(
+        self, num_nodes: Optional[int] = None
+    ) -> List[Optional[Node]]:
         """Select N nodes to process in parallel,
         balancing between tree exploration and exploitation.
+        N defaults to num_workers; continuous scheduling passes the number of
+        free worker slots instead.
         Note:
         - This function runs in the main process.
         Some design considerations:
@@ -1942,15 +2054,38 @@ class ParallelAgent:
         nodes_to_process = []
         processed_trees = set()
         search_cfg = self.cfg.agent.search
+        if num_nodes is None:
+            num_nodes = self.num_workers
         print(f"[cyan]self.num_workers: {self.num_workers}, [/cyan]")
+        # Drafts still running in continuous mode count towards num_drafts
+        num_pending_drafts = sum(task.is_draft for task in self._inflight.values())
+        # Nodes being expanded by in-flight jobs are not selected again, and
+        # their trees count as processed
+        busy_ids = {
+            task.parent_id
+            for task in self._inflight.values()
+            if task.parent_id is not None
+        }
+        for node_id in busy_ids:
+            tree_root = self.journal.get_node_by_id(node_id)
+            if tree_root is None:
+                continue
+            while tree_root.parent:
+                tree_root = tree_root.parent
+            processed_trees.add(id(tree_root))
 
-        while len(nodes_to_process) < self.num_workers:
+        while len(nodes_to_process) < num_nodes:
             # Initial drafting phase, creating root nodes
             print(
                 f"Checking draft nodes... num of journal.draft_nodes: {len(self.journal.draft_nodes)}, search_cfg.num_drafts: {search_cfg.num_drafts}"
             )
-            if len(self.journal.draft_nodes) < search_cfg.num_drafts:
+            if (
+                len(self.journal.draft_nodes) + num_pending_drafts
+                < search_cfg.num_drafts
+            ):
                 nodes_to_process.append(None)
+                if self.scheduling == "continuous":
+                    num_pending_drafts += 1
                 continue
 
             # Get viable trees
@@ -1984,6 +2119,7 @@ class ParallelAgent:
                             isinstance(n, Node)
                             and n.is_leaf
                             and n.debug_depth <= search_cfg.max_debug_depth
+                            and n.id not in busy_ids
                         )
                     ]
                 except Exception as e:
@@ -2027,16 +2163,19 @@ class ParallelAgent:
                 while tree_root.parent:
                     tree_root = tree_root.parent
 
-                tree_id = id(tree_root)
-                if tree_id not in processed_trees or len(processed_trees) >= len(
-                    viable_trees
+                best_tree_id = id(tree_root)
+                if best_node.id not in busy_ids and (
+                    best_tree_id not in processed_trees
+                    or len(processed_trees) >= len(viable_trees)
                 ):
                     nodes_to_process.append(best_node)
-                    processed_trees.add(tree_id)
+                    processed_trees.add(best_tree_id)
                     continue
 
                 # If we can't use best node (tree already processed), try next best nodes
                 for node in sorted(good_nodes, key=lambda n: n.metric, reverse=True):
+                    if node.id in busy_ids:
+                        continue
                     tree_root = node
                     while tree_root.parent:
                         tree_root = tree_root.parent
@@ -2047,127 +2186,269 @@ class ParallelAgent:
                         nodes_to_process.append(node)
                         processed_trees.add(tree_id)
                         break
+                else:
+                    # every good node is already being expanded
+                    nodes_to_process.append(best_node)
+                    processed_trees.add(best_tree_id)
 
         return nodes_to_process
 
-    def step(self, exec_callback: ExecCallbackType):
-        print("Selecting nodes to process")
-        nodes_to_process = self._select_parallel_nodes()
-        print(f"Selected nodes: {[n.id if n else None for n in nodes_to_process]}")
-
-        # Convert nodes to dicts
-        node_data_list = []
-        for node in nodes_to_process:
-            if node:
-                try:
-                    node_data = node.to_dict()
-                    _safe_pickle_test(node_data, f"node {node.id} data")
-                    node_data_list.append(node_data)
-                except Exception as e:
-                    logger.error(f"Error preparing node {node.id}: {str(e)}")
-                    raise
-            else:
-                node_data_list.append(None)  # None means new draft
+    def _prepare_node_data(self, node: Optional[Node]) -> Optional[dict]:
+        """Convert a selected node to a picklable dict (None means new draft)"""
+        if node is None:
+            return None
+        try:
+            node_data = node.to_dict()
+            _safe_pickle_test(node_data, f"node {node.id} data")
+            return node_data
+        except Exception as e:
+            logger.error(f"Error preparing node {node.id}: {str(e)}")
+            raise
 
-        if self.cfg.agent.get("summary", None) is not None:
-            memory_summary = self.journal.generate_summary(
+    def _generate_memory_summary(self) -> str:
+        summary_cfg = self.cfg.agent.get("summary", None)
+        if summary_cfg is not None and summary_cfg.get("incremental", False):
+            return self.journal.generate_incremental_summary(
+                include_code=False,
+                token_budget=summary_cfg.get("token_budget", 4000),
+                model=summary_cfg.model,
+                temp=summary_cfg.temp,
+            )
+        if summary_cfg is not None:
+            return self.journal.generate_summary(
                 include_code=False, 
                 **{
                     "model": self.cfg.agent.summary.model, 
                     "temp": self.cfg.agent.summary.temp
                 }
             )
+        return self.journal.generate_summary(include_code=False)
+
+    def _submit_node(self, node_data, memory_summary: str, process_id: str):
+        """Acquire a GPU (if any) and submit one node to the process pool"""
+        gpu_id = None
+        if self.gpu_manager is not None:
+            try:
+                gpu_id = self.gpu_manager.acquire_gpu(process_id)
+                logger.info(f"Assigned GPU {gpu_id} to process {process_id}")
+            except RuntimeError as e:
+                logger.warning(f"Could not acquire GPU: {e}. Running on CPU")
+
+        if (
+            self.stage_name
+            and self.stage_name.startswith("2_")
+            and node_data["is_buggy"] is False
+        ):
+            new_hyperparam_idea = self._generate_hyperparam_tuning_idea()
+            self._hyperparam_tuning_state["tried_hyperparams"].add(
+                new_hyperparam_idea.name
+            )
+            new_ablation_idea = None
+        elif (
+            self.stage_name
+            and self.stage_name.startswith("4_")
+            and node_data["is_buggy"] is False
+        ):
+            new_ablation_idea = self._generate_ablation_idea()
+            self._ablation_state["completed_ablations"].add(new_ablation_idea.name)
+            new_hyperparam_idea = None
         else:
-            memory_summary = self.journal.generate_summary(include_code=False)
+            new_ablation_idea = None
+            new_hyperparam_idea = None
 
-        print("Submitting tasks to process pool")
-        futures = []
-        for node_data in node_data_list:
-            gpu_id = None
-            if self.gpu_manager is not None:
-                try:
-                    # Get current process ID for GPU assignment
-                    process_id = f"worker_{len(futures)}"
-                    gpu_id = self.gpu_manager.acquire_gpu(process_id)
-                    logger.info(f"Assigned GPU {gpu_id} to process {process_id}")
-                except RuntimeError as e:
-                    logger.warning(f"Could not acquire GPU: {e}. Running on CPU")
+        best_stage1_plot_code = (
+            self.best_stage1_node.plot_code if self.best_stage1_node else None
+        )
+        best_stage2_plot_code = (
+            self.best_stage2_node.plot_code if self.best_stage2_node else None
+        )
+        best_stage3_plot_code = (
+            self.best_stage3_node.plot_code if self.best_stage3_node else None
+        )
+        seed_eval = False
+        return self._submit_job(
+            process_id,
+            node_data,
+            self.task_desc,
+            self.cfg,
+            gpu_id,
+            memory_summary,
+            self.evaluation_metrics,
+            self.stage_name,
+            new_ablation_idea,
+            new_hyperparam_idea,
+            best_stage1_plot_code,
+            best_stage2_plot_code,
+            best_stage3_plot_code,
+            seed_eval,
+        )
 
-            if (
-                self.stage_name
-                and self.stage_name.startswith("2_")
-                and node_data["is_buggy"] is False
-            ):
-                new_hyperparam_idea = self._generate_hyperparam_tuning_idea()
-                self._hyperparam_tuning_state["tried_hyperparams"].add(
-                    new_hyperparam_idea.name
-                )
-                new_ablation_idea = None
-            elif (
-                self.stage_name
-                and self.stage_name.startswith("4_")
-                and node_data["is_buggy"] is False
-            ):
-                new_ablation_idea = self._generate_ablation_idea()
-                self._ablation_state["completed_ablations"].add(new_ablation_idea.name)
-                new_hyperparam_idea = None
-            else:
-                new_ablation_idea = None
-                new_hyperparam_idea = None
+    def _submit_job(self, process_id: str, *args) -> Future:
+        """Submit a _process_node_wrapper job, remembering how to kill or resubmit it"""
+        pid_dir = os.path.join(self.cfg.workspace_dir, ".worker_pids")
+        os.makedirs(pid_dir, exist_ok=True)
+        pid_file = os.path.join(pid_dir, f"{process_id}.pid")
+        for path in (pid_file, _session_pid_file(pid_file)):
+            if os.path.exists(path):
+                os.remove(path)
+        future = self.executor.submit(
+            _run_with_pid_file, pid_file, self._process_node_wrapper, *args
+        )
+        self._jobs[future] = (process_id, pid_file, args)
+        return future
 
-            best_stage1_plot_code = (
-                self.best_stage1_node.plot_code if self.best_stage1_node else None
-            )
-            best_stage2_plot_code = (
-                self.best_stage2_node.plot_code if self.best_stage2_node else None
-            )
-            best_stage3_plot_code = (
-                self.best_stage3_node.plot_code if self.best_stage3_node else None
-            )
-            seed_eval = False
-            futures.append(
-                self.executor.submit(
-                    self._process_node_wrapper,
-                    node_data,
-                    self.task_desc,
-                    self.cfg,
-                    gpu_id,
-                    memory_summary,
-                    self.evaluation_metrics,
-                    self.stage_name,
-                    new_ablation_idea,
-                    new_hyperparam_idea,
-                    best_stage1_plot_code,
-                    best_stage2_plot_code,
-                    best_stage3_plot_code,
-                    seed_eval,
-                )
+    def _kill_job(self, future: Future):
+        """Stop a timed-out job before its GPU is handed to new work.
+
+        The job's code runs in an interpreter session with its own process
+        group; killing that group makes the job return while its worker and
+        the pool stay alive. Only a job that does not return then (e.g. stuck
+        outside the session) has its worker killed, which breaks the pool.
+        """
+        _, pid_file, _ = self._jobs.pop(future)
+        if future.cancel() or future.done():
+            return
+        try:
+            with open(_session_pid_file(pid_file)) as f:
+                session_pid = int(f.read())
+        except (OSError, ValueError):
+            session_pid = None
+        if session_pid is not None:
+            try:
+                os.killpg(session_pid, signal.SIGKILL)
+            except OSError:
+                try:
+                    os.kill(session_pid, signal.SIGKILL)
+                except OSError as e:
+                    logger.warning(f"Could not kill timed-out session: {e}")
+            done, _ = wait([future], timeout=_KILL_GRACE_SECONDS)
+            if done:
+                logger.info(f"Killed timed-out session {session_pid}")
+                return
+
+        try:
+            with open(pid_file) as f:
+                pid = int(f.read())
+            os.kill(pid, signal.SIGKILL)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not kill timed-out worker: {e}")
+            return
+        process = (self.executor._processes or {}).get(pid)
+        if process is not None:
+            process.join(timeout=10)
+        logger.info(f"Killed timed-out worker process {pid}")
+        self._recycle_executor()
+
+    def _recycle_executor(self):
+        """Replace the broken process pool, resubmitting in-flight jobs without a result"""
+        old_executor = self.executor
+        self.executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        for future, task in list(self._inflight.items()):
+            if future.done() and not future.cancelled() and future.exception() is None:
+                continue  # finished before the pool broke; result is kept
+            process_id, _, args = self._jobs.pop(future)
+            del self._inflight[future]
+            new_future = self._submit_job(process_id, *args)
+            # keeps its start, so the timeout still counts from the first submit
+            self._inflight[new_future] = task
+            logger.info(f"Resubmitted in-flight job {process_id} to the new pool")
+        old_executor.shutdown(wait=False, cancel_futures=True)
+        for process in list((old_executor._processes or {}).values()):
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=1)
+
+    def _add_results_to_journal(self, results: List[dict]) -> List[Node]:
+        """Rebuild worker results as Nodes and append them to the journal"""
+        result_nodes = []
+        for result_data in results:
+            if "metric" in result_data:
+                print(f"metric type: {type(result_data['metric'])}")
+                print(f"metric contents: {result_data['metric']}")
+
+            # Create node and restore relationships using journal.
+            # Journal acts as a database to look up a parent node,
+            # and add the result node as a child.
+            result_node = Node.from_dict(result_data, self.journal)
+            print("[red]Investigating if result node has metric[/red]", flush=True)
+            print(result_node.metric)
+            result_nodes.append(result_node)
+
+        self._analyze_deferred_plots(result_nodes)
+
+        for result_node in result_nodes:
+            # Update hyperparam tuning state if in Stage 2
+            self._update_hyperparam_tuning_state(result_node)
+            # Update ablation state if in Stage 4
+            self._update_ablation_state(result_node)
+
+            # Add node to journal's list and assign its step number
+            self.journal.append(result_node)
+            print("Added result node to journal")
+        return result_nodes
+
+    def _analyze_deferred_plots(self, nodes: List[Node]):
+        """Run the VLM plot analysis that workers skipped, batched across nodes"""
+        if not _defer_vlm_analysis(self.cfg):
+            return
+        pending = [node for node in nodes if node.plot_paths and not node.plot_analyses]
+        if not pending:
+            return
+        vlm_agent = MinimalAgent(
+            task_desc=self.task_desc,
+            cfg=self.cfg,
+            evaluation_metrics=self.evaluation_metrics,
+            stage_name=self.stage_name,
+        )
+        try:
+            vlm_agent._analyze_plots_batch(pending)
+            logger.info(
+                f"Generated batched VLM analysis for nodes {[n.id for n in pending]}"
             )
+        except Exception as e:
+            logger.error(f"Error in batched plot analysis: {str(e)}")
+
+    def _release_gpu(self, process_id: str):
+        """Release GPU for a process if it was using one"""
+        if (
+            self.gpu_manager is not None
+            and process_id in self.gpu_manager.gpu_assignments
+        ):
+            self.gpu_manager.release_gpu(process_id)
+            logger.info(f"Released GPU for process {process_id}")
+
+    def step(self, exec_callback: ExecCallbackType):
+        if self.scheduling == "continuous":
+            self._step_continuous()
+        else:
+            self._step_barrier()
+
+    def _step_barrier(self):
+        """Submit num_workers nodes and wait for all of them before returning."""
+        print("Selecting nodes to process")
+        nodes_to_process = self._select_parallel_nodes()
+        print(f"Selected nodes: {[n.id if n else None for n in nodes_to_process]}")
+
+        # Convert nodes to dicts
+        node_data_list = [self._prepare_node_data(node) for node in nodes_to_process]
+
+        memory_summary = self._generate_memory_summary()
+
+        print("Submitting tasks to process pool")
+        futures = []
+        for node_data in node_data_list:
+            # Get current process ID for GPU assignment
+            process_id = f"worker_{len(futures)}"
+            futures.append(self._submit_node(node_data, memory_summary, process_id))
 
         # Add results to journal
         print("Waiting for results")
+        results = []
+        errors = []
         for i, future in enumerate(futures):
             try:
                 print("About to get result from future")
-                result_data = future.result(timeout=self.timeout)
-                if "metric" in result_data:
-                    print(f"metric type: {type(result_data['metric'])}")
-                    print(f"metric contents: {result_data['metric']}")
-
-                # Create node and restore relationships using journal.
-                # Journal acts as a database to look up a parent node,
-                # and add the result node as a child.
-                result_node = Node.from_dict(result_data, self.journal)
-                print("[red]Investigating if result node has metric[/red]", flush=True)
-                print(result_node.metric)
-                # Update hyperparam tuning state if in Stage 2
-                self._update_hyperparam_tuning_state(result_node)
-                # Update ablation state if in Stage 4
-                self._update_ablation_state(result_node)
-
-                # Add node to journal's list and assign its step number
-                self.journal.append(result_node)
-                print("Added result node to journal")
+                results.append(future.result(timeout=self.timeout))
 
             except TimeoutError:
                 print("Worker process timed out, couldn't get the result")
@@ -2178,16 +2459,132 @@ class ParallelAgent:
                 import traceback
 
                 traceback.print_exc()
-                raise
+                # keep collecting, the other workers' results still get journaled
+                errors.append(e)
             finally:
-                # Release GPU for this process if it was using one
-                process_id = f"worker_{i}"
-                if (
-                    self.gpu_manager is not None
-                    and process_id in self.gpu_manager.gpu_assignments
-                ):
-                    self.gpu_manager.release_gpu(process_id)
-                    logger.info(f"Released GPU for process {process_id}")
+                self._jobs.pop(future, None)
+                self._release_gpu(f"worker_{i}")
+        self._add_results_to_journal(results)
+        if errors:
+            raise errors[0]
+
+    def _step_continuous(self, refill: bool = True):
+        """Barrier-free scheduling.
+
+        Keeps up to num_workers nodes in flight across calls: free slots are
+        topped up with freshly selected nodes, then the call returns as soon as
+        at least one future has finished and its result is in the journal.
+        Slow nodes keep running in the background instead of idling the pool.
+        """
+        self._fill_seed_slots()
+        num_free = self.num_workers - len(self._inflight)
+        if refill and num_free > 0:
+            print(f"Selecting {num_free} nodes for free worker slots")
+            nodes_to_process = self._select_parallel_nodes(num_nodes=num_free)
+            print(
+                f"Selected nodes: {[n.id if n else None for n in nodes_to_process]}"
+            )
+            memory_summary = self._generate_memory_summary()
+            for node in nodes_to_process:
+                node_data = self._prepare_node_data(node)
+                self._task_counter += 1
+                process_id = f"task_{self._task_counter}"
+                future = self._submit_node(node_data, memory_summary, process_id)
+                self._inflight[future] = _InflightTask(
+                    process_id,
+                    node_data is None,
+                    time.time(),
+                    parent_id=node.id if node is not None else None,
+                )
+
+        if not self._inflight:
+            return
+
+        # Wait until the first in-flight future finishes or the oldest one
+        # exceeds its timeout
+        oldest_start = min(task.start for task in self._inflight.values())
+        wait_timeout = max(0.0, oldest_start + self.timeout - time.time())
+        print(f"Waiting for first of {len(self._inflight)} in-flight results")
+        done, _ = wait(
+            list(self._inflight), timeout=wait_timeout, return_when=FIRST_COMPLETED
+        )
+
+        now = time.time()
+        results = []
+        seed_results = []
+        errors = []
+        for future in list(self._inflight):
+            task = self._inflight.get(future)
+            if task is None:
+                continue  # resubmitted after a timed-out worker was killed
+            process_id = task.process_id
+            if future not in done:
+                if now - task.start >= self.timeout:
+                    print("Worker process timed out, couldn't get the result")
+                    logger.error(f"Worker process timed out, couldn't get the result")
+                    del self._inflight[future]
+                    # the GPU is free only once the job no longer runs on it
+                    self._kill_job(future)
+                    self._release_gpu(process_id)
+                    if task.seed_of is not None:
+                        seed_results.append((task.seed_of, None))
+                continue
+
+            del self._inflight[future]
+            self._jobs.pop(future, None)
+            if task.seed_of is not None:
+                try:
+                    seed_results.append((task.seed_of, future.result()))
+                except Exception as e:
+                    logger.error(f"Error in multi-seed evaluation: {str(e)}")
+                    seed_results.append((task.seed_of, None))
+                finally:
+                    self._release_gpu(process_id)
+                continue
+
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Error processing node: {str(e)}")
+                logger.error(f"Error processing node: {str(e)}")
+                import traceback
+
+                traceback.print_exc()
+                errors.append(e)
+            finally:
+                self._release_gpu(process_id)
+        self._add_results_to_journal(results)
+        if seed_results:
+            self._finish_seed_jobs(seed_results)
+        # hand slots freed by this step to waiting seed jobs right away
+        self._fill_seed_slots()
+        if errors:
+            raise errors[0]
+
+    def _collect_finished_inflight(self):
+        """Journal the results of in-flight jobs that already finished (no new work)"""
+        results = []
+        seed_nodes = []
+        for future in [f for f in self._inflight if f.done() and not f.cancelled()]:
+            task = self._inflight.pop(future)
+            self._jobs.pop(future, None)
+            try:
+                result_data = future.result()
+            except Exception as e:
+                logger.error(f"Error in finished in-flight job: {str(e)}")
+                continue
+            if task.seed_of is None:
+                results.append(result_data)
+            else:
+                seed_nodes.append(Node.from_dict(result_data, self.journal))
+        self._add_results_to_journal(results)
+        for seed_node in seed_nodes:
+            self.journal.append(seed_node)
+
+    def _drain_inflight(self):
+        """Wait for all in-flight nodes (continuous mode) and journal their results"""
+        while self._inflight:
+            self._step_continuous(refill=False)
 
     def _update_hyperparam_tuning_state(self, result_node: Node):
         """Update hyperparam tuning tracking state based on execution results."""
@@ -2343,6 +2740,14 @@ class ParallelAgent:
                     for process_id in list(self.gpu_manager.gpu_assignments.keys()):
                         self.gpu_manager.release_gpu(process_id)
 
+                # Journal jobs that finished but were not collected yet, then
+                # abandon nodes and seed runs still in flight
+                self._collect_finished_inflight()
+                self._inflight.clear()
+                self._jobs.clear()
+                self._seed_queue.clear()
+                self._seed_runs.clear()
+
                 # Shutdown executor first
                 self.executor.shutdown(wait=False, cancel_futures=True)
 
@@ -81,6 +81,8 @@ def perform_experiments_bfts(config_path: str):
         cfg=cfg,
         workspace_dir=Path(cfg.workspace_dir),
     )
+    if cfg.resume_checkpoint:
+        manager.load_checkpoint(Path(cfg.resume_checkpoint))
 
     prog = Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -118,7 +120,16 @@ def perform_experiments_bfts(config_path: str):
                         json.dump(summary, f, indent=2)
 
 
-            if cfg.agent.get("summary", None) is not None:
+            summary_cfg = cfg.agent.get("summary", None)
+            if summary_cfg is not None and summary_cfg.get("incremental", False):
+                # shares the cached rolling summary with ParallelAgent.step
+                current_findings = journal.generate_incremental_summary(
+                    include_code=False,
+                    token_budget=summary_cfg.get("token_budget", 4000),
+                    model=summary_cfg.model,
+                    temp=summary_cfg.temp,
+                )
+            elif summary_cfg is not None:
                 current_findings = journal.generate_summary(
                     include_code=False, 
                     **{
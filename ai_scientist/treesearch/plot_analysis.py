@@ -0,0 +1,275 @@
+"""
+VLM analysis of experiment plots.
+
+Plots are encoded once per file content (optionally downscaled, see
+`ai_scientist.vlm.encode_image_to_base64`). A plot that is byte-identical to one
+analyzed before is not uploaded again: its earlier analysis is passed along
+as text instead. A node whose plot set was analyzed before reuses the whole
+result without calling the VLM. Earlier analyses are only reused for the same
+model and research idea. The plots of several nodes can be sent in
+one batched call.
+"""
+
+import copy
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, cast
+
+from ai_scientist.vlm import encode_image_to_base64
+
+from .backend import FunctionSpec, query
+
+logger = logging.getLogger("ai-scientist")
+
+_PLOT_ANALYSIS_PROPERTIES = {
+    "plot_analyses": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "analysis": {
+                    "type": "string",
+                    "description": "Detailed analysis of the plot's results and implications",
+                },
+            },
+            "required": ["analysis"],
+        },
+    },
+    "valid_plots_received": {
+        "type": "boolean",
+        "description": "True if valid plots were received, False otherwise. For example, if the plots are empty or not meaningful, this should be False.",
+    },
+    "vlm_feedback_summary": {
+        "type": "string",
+        "description": "Summarize the feedback from the VLM. If the task involves generative modeling, make sure to focus on the generated samples.",
+    },
+}
+
+vlm_feedback_spec = FunctionSpec(
+    name="analyze_experiment_plots",
+    json_schema={
+        "type": "object",
+        "properties": _PLOT_ANALYSIS_PROPERTIES,
+        "required": ["plot_analyses", "valid_plots_received", "vlm_feedback_summary"],
+    },
+    description="Analyze experimental plots and provide detailed feedback on the results.",
+)
+
+vlm_batch_feedback_spec = FunctionSpec(
+    name="analyze_experiment_plots_batch",
+    json_schema={
+        "type": "object",
+        "properties": {
+            "experiments": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "experiment_index": {
+                            "type": "integer",
+                            "description": "Index of the experiment as given in the input",
+                        },
+                        **_PLOT_ANALYSIS_PROPERTIES,
+                    },
+                    "required": [
+                        "experiment_index",
+                        "plot_analyses",
+                        "valid_plots_received",
+                        "vlm_feedback_summary",
+                    ],
+                },
+            },
+        },
+        "required": ["experiments"],
+    },
+    description="Analyze the plots of several experiments and provide detailed feedback on each experiment's results.",
+)
+
+_CACHE_SIZE = 1024
+# (model, task digest, plot digest) -> analysis text
+_analysis_by_digest: "OrderedDict[tuple, str]" = OrderedDict()
+# (model, task digest, tuple of plot digests) -> full VLM result for a node
+# with exactly these plots
+_result_by_plot_set: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+def _remember(cache: OrderedDict, key, value) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _is_valid_entry(entry) -> bool:
+    """Whether a VLM feedback entry has every field the result is built from."""
+    if not isinstance(entry, dict):
+        return False
+    if "valid_plots_received" not in entry or "vlm_feedback_summary" not in entry:
+        return False
+    analyses = entry.get("plot_analyses", [])
+    return isinstance(analyses, list) and all(
+        isinstance(a, dict) and "analysis" in a for a in analyses
+    )
+
+
+def plot_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError as e:
+        logger.warning(f"Could not read plot {path}: {e}")
+        return None
+
+
+@dataclass
+class PlotGroup:
+    """The plots of one node to analyze."""
+
+    key: str
+    plot_paths: List[str]
+
+
+def _intro_text(task_desc: str, batched: bool) -> str:
+    text = (
+        "You are an experienced AI researcher analyzing experimental results. "
+        "You have been provided with plots from a machine learning experiment. "
+        f"This experiment is based on the following research idea: {task_desc}"
+        "Please analyze these plots and provide detailed insights about the results. "
+        "If you don't receive any plots, say 'No plots received'. "
+        "Never make up plot analysis. "
+        "Please return the analyzes with strict order of uploaded images, but DO NOT include any word "
+        "like 'the first plot'."
+    )
+    if batched:
+        text += (
+            " The plots belong to several independent experiments, each introduced by its "
+            "experiment index. Return one entry per experiment, with an analysis for "
+            "every plot of that experiment in the given order."
+        )
+    return text
+
+
+def analyze_plot_groups(
+    groups: List[PlotGroup],
+    task_desc: str,
+    model: str,
+    temperature: float,
+    max_image_size: Optional[int] = None,
+) -> Dict[str, dict]:
+    """Analyze the plots of one or more nodes, with as few uploads and calls as possible.
+
+    Returns {group key: {"plot_analyses", "valid_plots_received", "vlm_feedback_summary"}},
+    where every plot analysis also carries its "plot_path".
+    """
+    # analyses depend on the model and the research idea in the prompt
+    context = (model, hashlib.sha256(task_desc.encode("utf-8")).hexdigest())
+    results: Dict[str, dict] = {}
+    pending = []
+    for group in groups:
+        plots = [(p, plot_digest(p)) for p in group.plot_paths]
+        plots = [(p, d) for p, d in plots if d is not None]
+        plot_set = context + (tuple(d for _, d in plots),)
+        if plots and plot_set in _result_by_plot_set:
+            logger.info(f"Reusing VLM analysis for identical plots of node {group.key}")
+            result = copy.deepcopy(_result_by_plot_set[plot_set])
+            for analysis, (path, _) in zip(result["plot_analyses"], plots):
+                analysis["plot_path"] = path
+            results[group.key] = result
+        else:
+            pending.append((group, plots))
+
+    if not pending:
+        return results
+
+    batched = len(pending) > 1
+    content = [{"type": "text", "text": _intro_text(task_desc, batched)}]
+    shown: Dict[str, str] = {}  # digest -> where it was shown in this message
+    num_uploaded = 0
+    for index, (group, plots) in enumerate(pending):
+        if batched:
+            content.append({"type": "text", "text": f"Experiment {index}:"})
+        for plot_index, (path, digest) in enumerate(plots):
+            if digest in shown:
+                content.append(
+                    {
+                        "type": "text",
+                        "text": f"(Plot {plot_index}: identical to {shown[digest]} above.)",
+                    }
+                )
+            elif context + (digest,) in _analysis_by_digest:
+                content.append(
+                    {
+                        "type": "text",
+                        "text": (
+                            f"(Plot {plot_index}: identical to a previously analyzed plot. "
+                            f"Earlier analysis: {_analysis_by_digest[context + (digest,)]})"
+                        ),
+                    }
+                )
+            else:
+                content.append(
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{encode_image_to_base64(path, max_image_size)}"
+                        },
+                    }
+                )
+                shown[digest] = (
+                    f"experiment {index}, plot {plot_index}" if batched else f"plot {plot_index}"
+                )
+                num_uploaded += 1
+
+    num_plots = sum(len(plots) for _, plots in pending)
+    logger.info(
+        f"VLM analysis of {num_plots} plots from {len(pending)} nodes "
+        f"({num_uploaded} images uploaded)"
+    )
+    response = cast(
+        dict,
+        query(
+            system_message=None,
+            user_message=content,
+            func_spec=vlm_batch_feedback_spec if batched else vlm_feedback_spec,
+            model=model,
+            temperature=temperature,
+        ),
+    )
+
+    if batched:
+        by_index = {}
+        for entry in response.get("experiments", []):
+            try:
+                by_index[int(entry["experiment_index"])] = entry
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Ignoring malformed batched VLM entry: {entry}")
+    else:
+        by_index = {0: response}
+
+    for index, (group, plots) in enumerate(pending):
+        entry = by_index.get(index)
+        if entry is None:
+            logger.warning(f"VLM response has no analysis for node {group.key}")
+            continue
+        if not _is_valid_entry(entry):
+            logger.warning(f"Ignoring malformed VLM entry for node {group.key}: {entry}")
+            continue
+        analyses = list(entry.get("plot_analyses", []))[: len(plots)]
+        for analysis, (path, digest) in zip(analyses, plots):
+            analysis["plot_path"] = path
+            _remember(_analysis_by_digest, context + (digest,), analysis["analysis"])
+        result = {
+            "plot_analyses": analyses,
+            "valid_plots_received": entry["valid_plots_received"],
+            "vlm_feedback_summary": entry["vlm_feedback_summary"],
+        }
+        if len(analyses) == len(plots):
+            _remember(
+                _result_by_plot_set,
+                context + (tuple(d for _, d in plots),),
+                copy.deepcopy(result),
+            )
+        results[group.key] = result
+    return results
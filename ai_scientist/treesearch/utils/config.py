@@ -41,6 +41,18 @@ class StageConfig:
     max_tokens: Optional[int] = None
 
 
+@dataclass
+class SummaryConfig(StageConfig):
+    incremental: bool = False
+    token_budget: int = 4000
+
+
+@dataclass
+class VlmFeedbackConfig(StageConfig):
+    max_image_size: Optional[int] = None
+    batch_nodes: int = 1
+
+
 @dataclass
 class SearchConfig:
     max_debug_depth: int
@@ -63,21 +75,30 @@ class AgentConfig:
 
     code: StageConfig
     feedback: StageConfig
-    vlm_feedback: StageConfig
+    vlm_feedback: VlmFeedbackConfig
 
     search: SearchConfig
     num_workers: int
     type: str
     multi_seed_eval: dict[str, int]
 
-    summary: Optional[StageConfig] = None
+    summary: Optional["SummaryConfig"] = None
     select_node: Optional[StageConfig] = None
+    scheduling: str = "barrier"
+
+@dataclass
+class WarmPoolConfig:
+    enabled: bool
+    size: int
+    preload: list[str]
+
 
 @dataclass
 class ExecConfig:
     timeout: int
     agent_file_name: str
     format_tb_ipython: bool
+    warm_pool: Optional[WarmPoolConfig] = None
 
 
 @dataclass
@@ -107,6 +128,8 @@ class Config(Hashable):
     agent: AgentConfig
     experiment: ExperimentConfig
     debug: DebugConfig
+    checkpoint_format: str = "pickle"
+    resume_checkpoint: str | None = None
 
 
 def _get_next_logindex(dir: Path) -> int:
@@ -0,0 +1,206 @@
+"""
+Incremental LaTeX builds for the writeup scripts.
+
+`compile_latex_incremental` hashes everything the document is built from
+(.tex/.bib/.bst/.sty/.cls files and figures). For inputs it has already
+built, it copies the cached PDF instead of running LaTeX. Otherwise it runs
+only the passes that are needed:
+
+- bibtex runs only when the citations in the .aux, the bibliography files or
+  the .bbl changed since the last bibtex run;
+- pdflatex re-runs only while the log asks for it, or twice after bibtex.
+
+Built PDFs are kept in `<latex folder>/.latex_build_cache/`, so page
+counting and other post-processing can use the cached PDF for the current
+inputs instead of compiling again.
+"""
+
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+import subprocess
+import traceback
+from typing import Optional
+
+BUILD_CACHE_DIR = ".latex_build_cache"
+MAX_CACHED_PDFS = 8
+INPUT_SUFFIXES = (
+    ".tex", ".bib", ".bst", ".sty", ".cls",
+    ".png", ".pdf", ".jpg", ".jpeg", ".eps",
+)
+BIB_SUFFIXES = (".bib", ".bst")
+RERUN_MARKERS = (
+    "Rerun to get",
+    "Label(s) may have changed",
+    "There were undefined references",
+)
+
+
+def _iter_input_files(cwd: str, main: str, suffixes=INPUT_SUFFIXES):
+    for root, dirs, files in os.walk(cwd):
+        # skip our cache and temporary copies made by the writeup scripts
+        dirs[:] = sorted(
+            d for d in dirs if d != BUILD_CACHE_DIR and not d.startswith("_temp_compile_")
+        )
+        for name in sorted(files):
+            if not name.lower().endswith(suffixes):
+                continue
+            rel_path = osp.relpath(osp.join(root, name), cwd)
+            if rel_path == f"{main}.pdf":  # build output
+                continue
+            yield rel_path
+
+
+def _digest_files(cwd: str, rel_paths) -> str:
+    h = hashlib.sha256()
+    for rel_path in rel_paths:
+        h.update(rel_path.encode("utf-8") + b"\0")
+        with open(osp.join(cwd, rel_path), "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def latex_input_digest(cwd: str, main: str = "template") -> str:
+    """Hash of all files the document is built from."""
+    return _digest_files(cwd, _iter_input_files(cwd, main))
+
+
+def _bib_inputs_digest(cwd: str, main: str) -> Optional[str]:
+    """Hash of what bibtex reads: the citation lines of the .aux plus .bib/.bst files."""
+    aux_path = osp.join(cwd, f"{main}.aux")
+    if not osp.exists(aux_path):
+        return None
+    h = hashlib.sha256()
+    with open(aux_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.startswith(("\\citation", "\\bibdata", "\\bibstyle")):
+                h.update(line.encode("utf-8"))
+    h.update(_digest_files(cwd, _iter_input_files(cwd, main, BIB_SUFFIXES)).encode())
+    return h.hexdigest()
+
+
+def _log_requests_rerun(cwd: str, main: str) -> bool:
+    log_path = osp.join(cwd, f"{main}.log")
+    if not osp.exists(log_path):
+        return True
+    with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+        log = f.read()
+    return any(marker in log for marker in RERUN_MARKERS)
+
+
+def run_latex_command(command, cwd: str, timeout: int = 30) -> bool:
+    """Run one LaTeX tool, printing its output like compile_latex always has."""
+    try:
+        result = subprocess.run(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout,
+        )
+        print("Standard Output:\n", result.stdout)
+        print("Standard Error:\n", result.stderr)
+        return True
+    except subprocess.TimeoutExpired:
+        print(f"EXCEPTION in compile_latex: LaTeX timed out after {timeout} seconds.")
+        print(traceback.format_exc())
+    except subprocess.CalledProcessError:
+        print(f"EXCEPTION in compile_latex: Error running command {' '.join(command)}")
+        print(traceback.format_exc())
+    return False
+
+
+def _load_meta(cache_dir: str) -> dict:
+    try:
+        with open(osp.join(cache_dir, "meta.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_meta(cache_dir: str, meta: dict) -> None:
+    tmp_path = osp.join(cache_dir, "meta.json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, osp.join(cache_dir, "meta.json"))
+
+
+def cached_pdf_path(cwd: str, main: str = "template") -> Optional[str]:
+    """Path of the cached PDF built from the current inputs, if there is one."""
+    path = osp.join(cwd, BUILD_CACHE_DIR, f"{latex_input_digest(cwd, main)}.pdf")
+    return path if osp.exists(path) else None
+
+
+def _store_pdf(cache_dir: str, meta: dict, digest: str, pdf_path: str) -> None:
+    shutil.copyfile(pdf_path, osp.join(cache_dir, f"{digest}.pdf"))
+    builds = [d for d in meta.get("builds", []) if d != digest] + [digest]
+    # keep only the most recent builds
+    for old_digest in builds[:-MAX_CACHED_PDFS]:
+        try:
+            os.remove(osp.join(cache_dir, f"{old_digest}.pdf"))
+        except FileNotFoundError:
+            pass
+    meta["builds"] = builds[-MAX_CACHED_PDFS:]
+
+
+def compile_latex_incremental(
+    cwd: str,
+    pdf_file: str,
+    timeout: int = 30,
+    main: str = "template",
+    max_passes: int = 3,
+) -> bool:
+    """Build `<main>.tex` in cwd into pdf_file, reusing cached builds and skipping
+    bibtex/pdflatex passes that cannot change the output.
+
+    Returns True if a PDF was produced (built or taken from the cache).
+    """
+    cache_dir = osp.join(cwd, BUILD_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    meta = _load_meta(cache_dir)
+    digest = latex_input_digest(cwd, main)
+
+    cached_pdf = osp.join(cache_dir, f"{digest}.pdf")
+    if osp.exists(cached_pdf):
+        print("LaTeX inputs unchanged, using cached PDF")
+        shutil.copyfile(cached_pdf, pdf_file)
+        return True
+
+    print("GENERATING LATEX")
+    pdflatex = ["pdflatex", "-interaction=nonstopmode", f"{main}.tex"]
+    run_latex_command(pdflatex, cwd, timeout)
+    num_passes = 1
+
+    bib_digest = _bib_inputs_digest(cwd, main)
+    bbl_exists = osp.exists(osp.join(cwd, f"{main}.bbl"))
+    if bib_digest is None or bib_digest != meta.get("bib_digest") or not bbl_exists:
+        run_latex_command(["bibtex", main], cwd, timeout)
+        meta["bib_digest"] = bib_digest
+        # the new .bbl needs one pass to be read and one to resolve citations
+        for _ in range(2):
+            run_latex_command(pdflatex, cwd, timeout)
+            num_passes += 1
+    else:
+        print("Bibliography unchanged, skipping bibtex")
+    while num_passes < max_passes and _log_requests_rerun(cwd, main):
+        run_latex_command(pdflatex, cwd, timeout)
+        num_passes += 1
+    print(f"FINISHED GENERATING LATEX ({num_passes} pdflatex passes)")
+
+    built_pdf = osp.join(cwd, f"{main}.pdf")
+    if not osp.exists(built_pdf):
+        print("Failed to rename PDF.")
+        _save_meta(cache_dir, meta)
+        return False
+    _store_pdf(cache_dir, meta, digest, built_pdf)
+    _save_meta(cache_dir, meta)
+    shutil.move(built_pdf, pdf_file)
+    return True
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
@@ -0,0 +1,215 @@
+"""
+Content-addressed on-disk cache for LLM/VLM responses.
+
+Shared by the treesearch backend (`ai_scientist.treesearch.backend.query`),
+`ai_scientist.llm.get_response_from_llm` and `ai_scientist.vlm.get_response_from_vlm`.
+Responses are keyed by a hash of everything that determines the request
+(model, messages, temperature, function spec, ...) and stored in a SQLite file,
+which is safe to share between the experiment worker processes. When the store
+grows beyond its size limit the least recently used entries are evicted.
+
+Configured through environment variables so that worker processes inherit it:
+
+    AI_SCIENTIST_LLM_CACHE          off (default) | deterministic | all
+    AI_SCIENTIST_LLM_CACHE_DIR      cache directory (default: ~/.cache/ai_scientist/llm)
+    AI_SCIENTIST_LLM_CACHE_MAX_MB   size limit in MB (default: 1024)
+
+"deterministic" only caches calls made with temperature 0; "all" also replays
+sampled (temperature > 0) calls, which is meant for re-running or resuming
+experiments with identical prompts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("off", "deterministic", "all")
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ai_scientist" / "llm"
+DEFAULT_MAX_MB = 1024
+
+# returned by get() when a key is not cached (None is a valid response)
+MISS = object()
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with size-based LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Path | str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        mode: str = "deterministic",
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode {mode!r}, expected one of {CACHE_MODES}")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    @staticmethod
+    def make_key(**request: Any) -> str:
+        """Hash a request description (model, messages, temperature, func spec, ...)."""
+        canonical = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def should_cache(self, temperature: Optional[float]) -> bool:
+        if self.mode == "off":
+            return False
+        if self.mode == "deterministic":
+            return temperature is not None and float(temperature) == 0.0
+        return True
+
+    def _connection(self) -> sqlite3.Connection:
+        # connections must not be shared across fork()ed worker processes
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.cache_dir / "responses.sqlite"),
+                timeout=30,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_access)"
+            )
+            conn.commit()
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or MISS."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return MISS
+                conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return MISS
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"LLM response not cacheable: {e}")
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), time.time()),
+                )
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        # drop least recently used entries until we are under the limit
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_settings: Optional[tuple] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide cache configured by the environment, or None if disabled."""
+    global _cache, _cache_settings
+    settings = (
+        os.environ.get("AI_SCIENTIST_LLM_CACHE", "off").lower(),
+        os.environ.get("AI_SCIENTIST_LLM_CACHE_DIR", str(DEFAULT_CACHE_DIR)),
+        os.environ.get("AI_SCIENTIST_LLM_CACHE_MAX_MB", str(DEFAULT_MAX_MB)),
+    )
+    if settings[0] == "off":
+        return None
+    if _cache is None or _cache_settings != settings:
+        mode, cache_dir, max_mb = settings
+        try:
+            _cache = LLMResponseCache(
+                cache_dir=cache_dir,
+                max_bytes=int(float(max_mb) * 1024 * 1024),
+                mode=mode,
+            )
+        except ValueError as e:
+            logger.warning(f"LLM cache disabled: {e}")
+            return None
+        _cache_settings = settings
+    return _cache
+
+
+def configure_llm_cache(
+    mode: str = "deterministic",
+    cache_dir: Optional[Path | str] = None,
+    max_mb: Optional[float] = None,
+) -> None:
+    """Enable/disable the shared cache for this process and its future children."""
+    os.environ["AI_SCIENTIST_LLM_CACHE"] = mode
+    if cache_dir is not None:
+        os.environ["AI_SCIENTIST_LLM_CACHE_DIR"] = str(cache_dir)
+    if max_mb is not None:
+        os.environ["AI_SCIENTIST_LLM_CACHE_MAX_MB"] = str(max_mb)
+
+
+def cache_lookup(temperature: Optional[float], /, **request: Any) -> tuple[Optional[str], Any]:
+    """Look up a request; returns (key, value). key is None when the call must not be cached."""
+    cache = get_llm_cache()
+    if cache is None or not cache.should_cache(temperature):
+        return None, MISS
+    key = cache.make_key(**{"temperature": temperature, **request})
+    return key, cache.get(key)
+
+
+def cache_store(key: Optional[str], value: Any) -> None:
+    """Store a response under a key returned by cache_lookup (no-op for None)."""
+    if key is None:
+        return
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.put(key, value)
@@ -1,4 +1,7 @@
 import base64
+import hashlib
+import io
+from collections import OrderedDict
 from typing import Any
 import re
 import json
@@ -7,6 +10,7 @@ import openai
 import os
 from PIL import Image
 from ai_scientist.utils.token_tracker import track_token_usage
+from ai_scientist.utils.llm_cache import MISS, cache_lookup, cache_store
 
 MAX_NUM_TOKENS = 4096
 
@@ -40,21 +44,42 @@ AVAILABLE_VLMS = [
 ]
 
 
-def encode_image_to_base64(image_path: str) -> str:
-    """Convert an image to base64 string."""
-    with Image.open(image_path) as img:
+# (sha256 of file bytes, max_size) -> base64 JPEG, shared by all VLM callers
+_ENCODED_IMAGE_CACHE: "OrderedDict[tuple[str, int | None], str]" = OrderedDict()
+_ENCODED_IMAGE_CACHE_SIZE = 256
+
+
+def encode_image_to_base64(image_path: str, max_size: int | None = None) -> str:
+    """Convert an image to base64 string.
+
+    If max_size is given, the image is downscaled so that its longer side is at
+    most max_size pixels. Encodings are cached by file content, so the same plot
+    is only decoded and re-encoded once per process.
+    """
+    with open(image_path, "rb") as f:
+        raw = f.read()
+    cache_key = (hashlib.sha256(raw).hexdigest(), max_size)
+    if cache_key in _ENCODED_IMAGE_CACHE:
+        _ENCODED_IMAGE_CACHE.move_to_end(cache_key)
+        return _ENCODED_IMAGE_CACHE[cache_key]
+
+    with Image.open(io.BytesIO(raw)) as img:
         # Convert RGBA to RGB if necessary
-        if img.mode == "RGBA":
+        if img.mode in ("RGBA", "P", "LA"):
             img = img.convert("RGB")
+        if max_size and max(img.size) > max_size:
+            img.thumbnail((max_size, max_size), Image.LANCZOS)
 
         # Save to bytes
-        import io
-
         buffer = io.BytesIO()
         img.save(buffer, format="JPEG")
         image_bytes = buffer.getvalue()
 
-    return base64.b64encode(image_bytes).decode("utf-8")
+    encoded = base64.b64encode(image_bytes).decode("utf-8")
+    _ENCODED_IMAGE_CACHE[cache_key] = encoded
+    if len(_ENCODED_IMAGE_CACHE) > _ENCODED_IMAGE_CACHE_SIZE:
+        _ENCODED_IMAGE_CACHE.popitem(last=False)
+    return encoded
 
 
 @track_token_usage
@@ -136,6 +161,30 @@ def make_vlm_call(client, model, temperature, system_message, prompt):
         raise ValueError(f"Model {model} not supported.")
 
 
+def _cached_vlm_call(client, model, temperature, system_message, new_msg_history):
+    """make_vlm_call through the shared response cache; returns the message content.
+
+    The key includes the base64 image payloads, so regenerated plots miss the cache.
+    """
+    cache_key, content = cache_lookup(
+        temperature,
+        model=model,
+        system_message=system_message,
+        messages=new_msg_history,
+    )
+    if content is MISS:
+        response = make_vlm_call(
+            client,
+            model,
+            temperature,
+            system_message=system_message,
+            prompt=new_msg_history,
+        )
+        content = response.choices[0].message.content
+        cache_store(cache_key, content)
+    return content
+
+
 def prepare_vlm_prompt(msg, image_paths, max_images):
     pass
 
@@ -185,15 +234,9 @@ def get_response_from_vlm(
         # Construct message with all images
         new_msg_history = msg_history + [{"role": "user", "content": content}]
 
-        response = make_vlm_call(
-            client,
-            model,
-            temperature,
-            system_message=system_message,
-            prompt=new_msg_history,
+        content = _cached_vlm_call(
+            client, model, temperature, system_message, new_msg_history
         )
-
-        content = response.choices[0].message.content
         new_msg_history = new_msg_history + [{"role": "assistant", "content": content}]
     elif model.startswith("openrouter/"):
         # Convert single image path to list for consistent handling
@@ -218,15 +261,9 @@ def get_response_from_vlm(
         # Construct message with all images
         new_msg_history = msg_history + [{"role": "user", "content": content}]
 
-        response = make_vlm_call(
-            client,
-            model,
-            temperature,
-            system_message=system_message,
-            prompt=new_msg_history,
+        content = _cached_vlm_call(
+            client, model, temperature, system_message, new_msg_history
         )
-
-        content = response.choices[0].message.content
         new_msg_history = new_msg_history + [{"role": "assistant", "content": content}]
     else:
         raise ValueError(f"Model {model} not supported.")
@@ -0,0 +1,149 @@
+"""
+LLM Concurrency - Bounded parallel fan-out of per-item LLM calls.
+
+Generators that make one LLM call per requirement / story / feature used to
+await them one at a time. LLMExecutor runs such calls concurrently while
+bounding, per model:
+1. The number of calls in flight (semaphore)
+2. The request rate (token-bucket rate limiter)
+
+Results are returned in input order, so callers can assign IDs and merge
+results exactly as the sequential loops did.
+
+Configuration (re_config.yaml):
+
+    performance:
+      llm_concurrency:
+        max_concurrent_calls: 4
+        requests_per_minute: 0        # 0 = no rate limit
+        models:                       # per-model overrides
+          "openai/gpt-4o-mini": {max_concurrent_calls: 8, requests_per_minute: 300}
+
+Generators that use the same model share one executor (per event loop), so
+the limits hold across generators running at the same time. A process-wide
+ceiling (set_call_limit) caps every model's max_concurrent_calls; batch
+workers use it to split a global limit between parallel pipelines.
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_CONCURRENT_CALLS = 4
+
+
+class RateLimiter:
+    """Token-bucket limiter: at most `requests_per_minute`, with bursts up to `burst`."""
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(requests_per_minute // 60)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class LLMExecutor:
+    """Runs LLM calls with bounded concurrency and an optional rate limit."""
+
+    def __init__(self, max_concurrent_calls: int = DEFAULT_MAX_CONCURRENT_CALLS,
+                 requests_per_minute: float = 0):
+        """
+        Args:
+            max_concurrent_calls: Calls allowed in flight at once (1 = sequential)
+            requests_per_minute: Rate limit; 0 disables it
+        """
+        self.max_concurrent_calls = max(1, int(max_concurrent_calls))
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        self._limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+
+    async def run(self, fn: Callable[..., Awaitable[R]], *args, **kwargs) -> R:
+        """Await fn(*args, **kwargs) once a slot (and rate token) is free."""
+        async with self._semaphore:
+            if self._limiter:
+                await self._limiter.acquire()
+            return await fn(*args, **kwargs)
+
+    async def map(self, fn: Callable[[T], Awaitable[R]], items: Iterable[T]) -> List[R]:
+        """
+        fn(item) for every item, concurrently; results in input order.
+
+        The first exception cancels the remaining calls and is re-raised,
+        like the sequential loop it replaces. Callers that want per-item
+        error handling should catch inside fn.
+        """
+        items = list(items)
+        if self.max_concurrent_calls == 1 or len(items) <= 1:
+            return [await self.run(fn, item) for item in items]
+
+        tasks = [asyncio.ensure_future(self.run(fn, item)) for item in items]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+# Process-wide ceiling on max_concurrent_calls (None = no ceiling)
+_call_limit: Optional[int] = None
+
+
+def set_call_limit(limit: Optional[int]):
+    """Cap max_concurrent_calls for every model in this process."""
+    global _call_limit
+    _call_limit = max(1, int(limit)) if limit else None
+
+
+def concurrency_settings(config: Optional[Dict[str, Any]], model: str) -> Dict[str, Any]:
+    """Effective {max_concurrent_calls, requests_per_minute} for a model."""
+    section = ((config or {}).get("performance", {}) or {}).get("llm_concurrency", {}) or {}
+    settings = {
+        "max_concurrent_calls": section.get("max_concurrent_calls", DEFAULT_MAX_CONCURRENT_CALLS),
+        "requests_per_minute": section.get("requests_per_minute", 0),
+    }
+    settings.update((section.get("models", {}) or {}).get(model, {}) or {})
+    if _call_limit is not None:
+        settings["max_concurrent_calls"] = min(settings["max_concurrent_calls"], _call_limit)
+    return settings
+
+
+# event loop → {(model, settings): executor}; semaphores are bound to a loop
+_executors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Any, LLMExecutor]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_llm_executor(config: Optional[Dict[str, Any]], model: str) -> LLMExecutor:
+    """
+    Shared executor for a model on the running event loop.
+
+    Must be called from a coroutine. Generators using the same model and
+    settings get the same executor, so their limits are shared.
+    """
+    settings = concurrency_settings(config, model)
+    key = (model, settings["max_concurrent_calls"], settings["requests_per_minute"])
+    per_loop = _executors.setdefault(asyncio.get_running_loop(), {})
+    executor = per_loop.get(key)
+    if executor is None:
+        executor = per_loop[key] = LLMExecutor(
+            max_concurrent_calls=settings["max_concurrent_calls"],
+            requests_per_minute=settings["requests_per_minute"],
+        )
+    return executor
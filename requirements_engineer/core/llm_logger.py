@@ -10,6 +10,7 @@ Tracks all LLM calls with:
 Writes to JSONL file for analysis.
 """
 
+import contextvars
 import json
 import logging
 import threading
@@ -22,6 +23,12 @@ from functools import wraps
 
 log = logging.getLogger(__name__)
 
+# Pipeline stage the current task is working on. Set per asyncio task by the
+# stage scheduler so calls from concurrently running stages can be told apart.
+current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_current_stage", default=None
+)
+
 
 @dataclass
 class LLMCallLog:
@@ -37,6 +44,7 @@ class LLMCallLog:
     success: bool
     error: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    stage: Optional[str] = None   # pipeline stage tag, see current_stage
 
 
 @dataclass
@@ -254,7 +262,8 @@ class LLMLogger:
             latency_ms=latency_ms,
             success=success,
             error=error,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            stage=current_stage.get(),
         )
 
         # Add to memory
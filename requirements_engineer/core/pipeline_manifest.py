@@ -132,11 +132,23 @@ class PipelineManifest:
 
     # ── Cost tracking helpers ──
 
-    def update_stage_cost(self, cost_usd: float, llm_calls: int):
-        """Update cost/calls on the most recently completed stage."""
-        if self.stages:
-            self.stages[-1].cost_usd = round(cost_usd, 6)
-            self.stages[-1].llm_calls = llm_calls
+    def get_stage(self, name: Optional[str] = None) -> Optional[StageRecord]:
+        """Most recently recorded stage with this name (or any stage if None)."""
+        for record in reversed(self.stages):
+            if name is None or record.name == name:
+                return record
+        return None
+
+    def update_stage_cost(self, cost_usd: float, llm_calls: int, name: Optional[str] = None):
+        """Update cost/calls on the most recently completed stage.
+
+        Stages run by the stage scheduler may finish in any order, so they
+        pass their own ``name`` instead of relying on "most recent".
+        """
+        record = self.get_stage(name)
+        if record is not None:
+            record.cost_usd = round(cost_usd, 6)
+            record.llm_calls = llm_calls
             self._save()
 
     # ── Lifecycle ──
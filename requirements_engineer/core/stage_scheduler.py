@@ -0,0 +1,127 @@
+"""
+Stage Scheduler - Runs pipeline stages as a dependency graph.
+
+Each stage declares the data it consumes (inputs) and produces (outputs),
+using the same names the PipelineManifest records via add_input/add_output.
+A stage depends on the stages that produce its inputs; inputs that already
+exist when the scheduler starts (requirements, user stories, ...) are passed
+as `available`. Stages whose dependencies have finished run concurrently,
+up to `max_parallel` at a time.
+
+    scheduler = StageScheduler(available=["requirements", "user_stories"])
+    scheduler.add("api_spec", run_api_spec, inputs=["requirements"], outputs=["api_endpoints"])
+    scheduler.add("data_dictionary", run_dd, inputs=["requirements"], outputs=["data_dict"])
+    scheduler.add("tech_stack", run_tech, inputs=["api_endpoints", "data_dict"], outputs=["tech_stack"])
+    await scheduler.run()   # api_spec and data_dictionary overlap, then tech_stack
+
+Stages are started in declaration order whenever several are ready, so
+`max_parallel=1` reproduces the sequential pipeline. Each stage runs in its
+own task with `llm_logger.current_stage` set to its name, so LLM calls can
+be attributed to the stage that made them.
+
+Stages pass results through the caller's variables (closures); the scheduler
+only orders them. If a stage raises, the other running stages are cancelled
+and the exception propagates, as it would have in the sequential pipeline.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from .llm_logger import current_stage
+
+
+@dataclass
+class ScheduledStage:
+    """A stage registered with the scheduler."""
+    name: str
+    run: Callable[[], Awaitable[None]]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    depends_on: Set[str] = field(default_factory=set)
+
+
+class StageScheduler:
+    """Runs registered stages concurrently in dependency order."""
+
+    def __init__(self, available: Iterable[str] = (), max_parallel: Optional[int] = None):
+        """
+        Args:
+            available: Data names that exist before any stage runs
+            max_parallel: Stages allowed to run at once (None = unbounded, 1 = sequential)
+        """
+        self.available = set(available)
+        self.max_parallel = max(1, int(max_parallel)) if max_parallel else None
+        self.stages: Dict[str, ScheduledStage] = {}
+        self._producers: Dict[str, str] = {}
+
+    def add(self, name: str, run: Callable[[], Awaitable[None]],
+            inputs: Iterable[str] = (), outputs: Iterable[str] = ()) -> ScheduledStage:
+        """Register a stage; `run` is a coroutine function taking no arguments."""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' registered twice")
+        stage = ScheduledStage(name=name, run=run, inputs=list(inputs), outputs=list(outputs))
+        for output in stage.outputs:
+            if output in self._producers or output in self.available:
+                raise ValueError(f"Output '{output}' of stage '{name}' is already produced elsewhere")
+            self._producers[output] = name
+        self.stages[name] = stage
+        return stage
+
+    def order(self) -> List[str]:
+        """Resolve dependencies; returns a valid sequential order.
+
+        Raises ValueError for inputs nobody produces and for cycles.
+        """
+        for stage in self.stages.values():
+            stage.depends_on = set()
+            for inp in stage.inputs:
+                if inp in self.available:
+                    continue
+                producer = self._producers.get(inp)
+                if producer is None:
+                    raise ValueError(f"Stage '{stage.name}' needs '{inp}', which no stage produces")
+                if producer != stage.name:
+                    stage.depends_on.add(producer)
+
+        done: List[str] = []
+        remaining = list(self.stages)
+        while remaining:
+            ready = [n for n in remaining if self.stages[n].depends_on.issubset(done)]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {', '.join(remaining)}")
+            done.append(ready[0])
+            remaining.remove(ready[0])
+        return done
+
+    async def _run_stage(self, stage: ScheduledStage):
+        current_stage.set(stage.name)
+        await stage.run()
+
+    async def run(self):
+        """Run all stages; returns once every stage has finished."""
+        self.order()
+        pending = list(self.stages)
+        finished: Set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while pending or running:
+                for name in list(pending):
+                    if self.max_parallel and len(running) >= self.max_parallel:
+                        break
+                    if self.stages[name].depends_on.issubset(finished):
+                        pending.remove(name)
+                        # create_task copies the context, so the stage tag is per task
+                        task = asyncio.create_task(self._run_stage(self.stages[name]))
+                        running[task] = name
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    finished.add(running.pop(task))
+                    task.result()  # re-raise the stage's exception
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
@@ -0,0 +1,265 @@
+"""
+Artifact Views — pre-sorted columnar views and filter bitmaps for TraceIndex.
+
+Every artifact gets a row number. For each common sort key the views keep
+the artifact ids in ascending order, per type and overall. Filters are
+Python int bitmaps over the rows. A page request intersects bitmaps and
+walks (or slices) a precomputed order instead of filtering and sorting
+all ids.
+
+Orders are computed once by rebuild() and kept current by
+on_field_change() / on_links_changed() / add() / remove(), each of which
+only repositions the affected ids.
+"""
+
+import bisect
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Sort keys with precomputed orders; others are sorted on demand and cached
+SORT_KEYS = ("id", "title", "priority", "status", "upstream_count", "downstream_count")
+COUNT_KEYS = ("upstream_count", "downstream_count")
+# Fields with value → bitmap maps built up front
+FILTER_FIELDS = ("type", "priority", "status")
+
+
+class ArtifactViews:
+    """Sorted id orders and filter bitmaps over TraceIndex artifacts."""
+
+    def __init__(
+        self,
+        artifacts: Dict[str, dict],
+        link_counts: Callable[[str], Tuple[int, int]],
+    ):
+        """
+        Args:
+            artifacts:   TraceIndex's id → record dict (shared, not copied).
+            link_counts: id → (upstream_count, downstream_count).
+        """
+        self._artifacts = artifacts
+        self._link_counts = link_counts
+        self.rebuild()
+
+    # ── Build ────────────────────────────────────────────────────────
+
+    def rebuild(self):
+        self._row: Dict[str, int] = {}
+        self._row_ids: List[Optional[str]] = []
+        self._alive = 0
+        # (artifact type or None, sort key) → ids ascending by (value, id)
+        self._orders: Dict[Tuple[Optional[str], str], List[str]] = {}
+        # field → lowercase value → bitmap
+        self._bitmaps: Dict[str, Dict[str, int]] = {}
+        # id → {count key: value}, so counts can be compared before/after
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+        for aid in self._artifacts:
+            self._assign_row(aid)
+        for fld in FILTER_FIELDS:
+            self._build_bitmap(fld)
+        types = {art.get("type", "") for art in self._artifacts.values()}
+        for key in SORT_KEYS:
+            self._build_order(None, key)
+            for art_type in types:
+                self._build_order(art_type, key)
+
+    def _assign_row(self, aid: str):
+        row = len(self._row_ids)
+        self._row[aid] = row
+        self._row_ids.append(aid)
+        self._alive |= 1 << row
+        up, down = self._link_counts(aid)
+        self._counts[aid] = {"upstream_count": up, "downstream_count": down}
+
+    def _build_bitmap(self, fld: str) -> Dict[str, int]:
+        values: Dict[str, int] = defaultdict(int)
+        for aid, row in self._row.items():
+            values[self._field_text(aid, fld)] |= 1 << row
+        self._bitmaps[fld] = dict(values)
+        return self._bitmaps[fld]
+
+    def _build_order(self, art_type: Optional[str], key: str) -> List[str]:
+        ids = [
+            aid for aid in self._row
+            if art_type is None or self._artifacts[aid].get("type", "") == art_type
+        ]
+        ids.sort(key=lambda aid: self._order_key(aid, key))
+        self._orders[(art_type, key)] = ids
+        return ids
+
+    # ── Values ───────────────────────────────────────────────────────
+
+    def _field_text(self, aid: str, fld: str) -> str:
+        return str(self._artifacts.get(aid, {}).get(fld, "")).lower()
+
+    def _sort_value(self, aid: str, key: str):
+        if key in COUNT_KEYS:
+            return self._counts[aid][key]
+        return self._field_text(aid, key)
+
+    def _order_key(self, aid: str, key: str):
+        return (self._sort_value(aid, key), aid)
+
+    # ── Masks ────────────────────────────────────────────────────────
+
+    @property
+    def all_mask(self) -> int:
+        return self._alive
+
+    def type_mask(self, art_type: str) -> int:
+        return self._bitmaps["type"].get(art_type.lower(), 0)
+
+    def filter_mask(self, fld: str, value: str) -> int:
+        """Rows whose field contains value (case-insensitive substring)."""
+        values = self._bitmaps.get(fld)
+        if values is None:
+            values = self._build_bitmap(fld)
+        needle = value.lower()
+        mask = 0
+        for text, bits in values.items():
+            if needle in text:
+                mask |= bits
+        return mask & self._alive
+
+    def ids_mask(self, ids: Iterable[str]) -> int:
+        mask = 0
+        for aid in ids:
+            row = self._row.get(aid)
+            if row is not None:
+                mask |= 1 << row
+        return mask
+
+    # ── Paging ───────────────────────────────────────────────────────
+
+    def order(self, key: str, art_type: Optional[str] = None) -> List[str]:
+        ids = self._orders.get((art_type, key))
+        if ids is None:
+            ids = self._build_order(art_type, key)
+        return ids
+
+    def page(
+        self,
+        key: str,
+        reverse: bool,
+        start: int,
+        size: int,
+        art_type: Optional[str] = None,
+        mask: Optional[int] = None,
+    ) -> List[str]:
+        """Ids of one page. mask=None means every artifact of art_type."""
+        ids = self.order(key, art_type)
+        if mask is None:
+            if reverse:
+                end = len(ids) - start
+                return ids[max(0, end - size):max(0, end)][::-1]
+            return ids[start:start + size]
+
+        # byte view of the mask: O(1) bit tests instead of shifting a big int
+        bits = mask.to_bytes((len(self._row_ids) + 7) // 8 or 1, "little")
+        result: List[str] = []
+        skipped = 0
+        row = self._row
+        for aid in (reversed(ids) if reverse else ids):
+            r = row[aid]
+            if not (bits[r >> 3] >> (r & 7)) & 1:
+                continue
+            if skipped < start:
+                skipped += 1
+                continue
+            result.append(aid)
+            if len(result) >= size:
+                break
+        return result
+
+    # ── Maintenance ──────────────────────────────────────────────────
+
+    def _reposition(self, aid: str, key: str, old_value, types: Iterable[Optional[str]]):
+        """Move aid within the orders for key after its value changed."""
+        for art_type in types:
+            ids = self._orders.get((art_type, key))
+            if ids is None:
+                continue
+            pos = bisect.bisect_left(
+                ids, (old_value, aid),
+                key=lambda i: (old_value, i) if i == aid else self._order_key(i, key),
+            )
+            if pos < len(ids) and ids[pos] == aid:
+                del ids[pos]
+            bisect.insort(ids, aid, key=lambda i: self._order_key(i, key))
+
+    def on_field_change(self, aid: str, fld: str, old_value: Any = None):
+        """Update orders and bitmaps after artifact[fld] was changed."""
+        row = self._row.get(aid)
+        if row is None:
+            return
+        old_text = str(old_value if old_value is not None else "").lower()
+        if fld in self._bitmaps:
+            values = self._bitmaps[fld]
+            if old_text in values:
+                values[old_text] &= ~(1 << row)
+                if not values[old_text]:
+                    del values[old_text]
+            new_text = self._field_text(aid, fld)
+            values[new_text] = values.get(new_text, 0) | (1 << row)
+        art_type = self._artifacts[aid].get("type", "")
+        if fld == "type":
+            # moves between per-type orders
+            for key in list({k for _, k in self._orders}):
+                old_ids = self._orders.get((old_value, key))
+                if old_ids is not None and aid in old_ids:
+                    old_ids.remove(aid)
+                new_ids = self._orders.get((art_type, key))
+                if new_ids is not None:
+                    bisect.insort(new_ids, aid, key=lambda i: self._order_key(i, key))
+        if any(k == fld for _, k in self._orders):
+            # per-type orders were already rebuilt above when the type changed
+            types = (None,) if fld == "type" else (None, art_type)
+            self._reposition(aid, fld, old_text, types)
+
+    def on_links_changed(self, aids: Iterable[str]):
+        """Refresh upstream/downstream counts (and their orders) for aids."""
+        for aid in aids:
+            if aid not in self._row:
+                continue
+            art_type = self._artifacts[aid].get("type", "")
+            up, down = self._link_counts(aid)
+            for key, value in (("upstream_count", up), ("downstream_count", down)):
+                old = self._counts[aid][key]
+                if old == value:
+                    continue
+                self._counts[aid][key] = value
+                self._reposition(aid, key, old, (None, art_type))
+
+    def add(self, aid: str):
+        """Index a new artifact (or refresh an existing one)."""
+        if aid in self._row:
+            self.remove(aid)
+        self._assign_row(aid)
+        row = self._row[aid]
+        for fld, values in self._bitmaps.items():
+            text = self._field_text(aid, fld)
+            values[text] = values.get(text, 0) | (1 << row)
+        art_type = self._artifacts[aid].get("type", "")
+        for (order_type, key), ids in self._orders.items():
+            if order_type is None or order_type == art_type:
+                bisect.insort(ids, aid, key=lambda i, k=key: self._order_key(i, k))
+
+    def remove(self, aid: str):
+        """Drop an artifact. Call before it is removed from the artifacts dict."""
+        row = self._row.pop(aid, None)
+        if row is None:
+            return
+        bit = 1 << row
+        self._alive &= ~bit
+        self._row_ids[row] = None
+        for values in self._bitmaps.values():
+            for text in [t for t, bits in values.items() if bits & bit]:
+                values[text] &= ~bit
+                if not values[text]:
+                    del values[text]
+        for ids in self._orders.values():
+            try:
+                ids.remove(aid)
+            except ValueError:
+                pass
+        self._counts.pop(aid, None)
@@ -0,0 +1,235 @@
+"""
+Batch Runner — runs queued enterprise pipelines in parallel worker processes.
+
+Each project runs `run_enterprise_mode` in its own spawned process, so
+pipelines never share module-level state (the LLMLogger singleton, shared
+LLM executors, generator caches). A fresh process per project also means
+the per-process LLM cost totals are per project.
+
+Workers report back over a multiprocessing queue:
+- every event the pipeline emits, re-emitted on the dashboard's emitter
+  with project_index / project_total / project_name added
+- a final "done" (output dir, cost) or "error" message
+
+Limits across the whole batch:
+- max_workers: projects running at once
+- max_llm_calls: concurrent LLM calls across all workers; each worker gets
+  an equal share as its per-model ceiling (llm_concurrency.set_call_limit)
+- cost_budget_usd: once the projects' reported costs add up to the budget,
+  running workers are terminated and queued projects are not started.
+  Terminated projects keep their checkpoints and can be resumed.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import queue as queue_module
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .event_emitter import DashboardEventEmitter, EventType
+
+# How long the collector waits for a worker message before checking for
+# workers that exited without reporting (crashed / killed)
+_POLL_SECONDS = 0.5
+# Wait per message when collecting what exited workers left in the queue
+_DRAIN_SECONDS = 0.05
+
+
+def _run_project(project_path: str, config_path: str, index: int, messages, call_limit: Optional[int]):
+    """Worker process entry point: run one project, report events and result."""
+    from requirements_engineer.core import llm_concurrency
+    from requirements_engineer.core.llm_logger import get_llm_logger
+    from requirements_engineer.run_re_system import run_enterprise_mode
+
+    llm_concurrency.set_call_limit(call_limit)
+
+    def _forward(event):
+        # JSON round-trip: event data may hold objects that do not pickle
+        data = json.loads(json.dumps(event.data, default=str))
+        messages.put(("event", index, event.type.value, data))
+
+    emitter = DashboardEventEmitter()
+    emitter.max_history = 0
+    emitter.add_callback(_forward)
+
+    try:
+        output_dir = asyncio.run(run_enterprise_mode(
+            project_path=project_path,
+            config_path=config_path,
+            emitter=emitter,
+        ))
+        cost = get_llm_logger().get_summary().get("total_cost_usd", 0.0)
+        messages.put(("done", index, str(output_dir) if output_dir else None, cost))
+    except BaseException as e:
+        traceback.print_exc()
+        messages.put(("error", index, f"{type(e).__name__}: {e}", None))
+
+
+class BatchRunner:
+    """Runs a queue of projects with bounded process parallelism."""
+
+    def __init__(self, emitter: DashboardEventEmitter, max_workers: int = 2,
+                 max_llm_calls: Optional[int] = None, cost_budget_usd: Optional[float] = None,
+                 worker: Callable = _run_project):
+        """
+        Args:
+            emitter: Dashboard emitter that worker events are re-emitted on
+            max_workers: Projects running at once
+            max_llm_calls: Concurrent LLM calls across all workers (None = per-worker config)
+            cost_budget_usd: Stop the batch once reported cost reaches this (None / 0 = no budget)
+            worker: Process entry point with _run_project's signature (module-level, picklable)
+        """
+        self.emitter = emitter
+        self.max_workers = max(1, int(max_workers))
+        self.max_llm_calls = max_llm_calls
+        self.cost_budget_usd = cost_budget_usd or None
+        self.worker = worker
+        self._ctx = multiprocessing.get_context("spawn")
+        self._costs: Dict[int, float] = {}
+        self._stop_reason: Optional[str] = None
+        self._stop_status = "cancelled"
+
+    @property
+    def worker_call_limit(self) -> Optional[int]:
+        """Per-worker LLM call ceiling derived from the global limit."""
+        if not self.max_llm_calls:
+            return None
+        return max(1, int(self.max_llm_calls) // self.max_workers)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(self._costs.values())
+
+    def stop(self, reason: str = "Cancelled by user", status: str = "cancelled"):
+        """Stop starting new projects; run() terminates the running ones."""
+        self._stop_reason = reason
+        self._stop_status = status
+
+    async def run(self, projects: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Run every {"project_path", "config_path"} item.
+
+        Returns one result per project, in queue order, with status
+        complete | error | cancelled | budget_exceeded | skipped.
+        """
+        total = len(projects)
+        names = [Path(p["project_path"]).stem for p in projects]
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        messages = self._ctx.Queue()
+        pending = list(range(total))
+        running: Dict[int, Any] = {}
+        started: List[Any] = []
+        loop = asyncio.get_running_loop()
+
+        def _get_message():
+            try:
+                return messages.get(timeout=_POLL_SECONDS)
+            except queue_module.Empty:
+                return None
+
+        def _drain_messages():
+            drained = []
+            while True:
+                try:
+                    drained.append(messages.get(timeout=_DRAIN_SECONDS))
+                except queue_module.Empty:
+                    return drained
+
+        def _finish(index: int, status: str, **extra):
+            results[index] = {"project": names[index], "status": status, **extra}
+            running.pop(index, None)
+
+        async def _handle(message):
+            kind, index = message[0], message[1]
+            if kind == "event":
+                event_type, data = message[2], message[3]
+                if event_type == EventType.PIPELINE_PROGRESS.value:
+                    # cumulative cost of the worker's pipeline so far
+                    self._costs[index] = data.get("cost_usd", 0.0)
+                await self._emit_project(EventType(event_type), index, total, names, data)
+            elif kind == "done":
+                output_dir, cost = message[2], message[3]
+                self._costs[index] = cost or self._costs.get(index, 0.0)
+                _finish(index, "complete", output_dir=output_dir, cost_usd=round(self._costs[index], 4))
+            elif kind == "error":
+                print(f"[PIPELINE ERROR] {names[index]}: {message[2]}")
+                _finish(index, "error", error=message[2])
+                await self._emit_error(index, total, names, message[2], bool(pending or running))
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.max_workers and not self._stop_reason:
+                    index = pending.pop(0)
+                    process = self._ctx.Process(
+                        target=self.worker,
+                        args=(projects[index]["project_path"], projects[index]["config_path"],
+                              index, messages, self.worker_call_limit),
+                        name=f"re-batch-{index + 1}",
+                        daemon=True,
+                    )
+                    process.start()
+                    started.append(process)
+                    running[index] = process
+                    await self._emit_project(EventType.PIPELINE_PROGRESS, index, total, names, {
+                        "step": 0, "total": 15,
+                        "description": f"Starting {names[index]}...",
+                        "percent": 0, "cost_usd": 0, "total_tokens": 0,
+                    })
+
+                if self._stop_reason and running:
+                    for index in list(running):
+                        running[index].terminate()
+                        _finish(index, self._stop_status, error=self._stop_reason)
+                if self._stop_reason and not running:
+                    break
+
+                message = await loop.run_in_executor(None, _get_message)
+                if message is not None:
+                    await _handle(message)
+                else:
+                    # A worker can exit right after queueing its last message:
+                    # note the exited workers, then handle everything they sent
+                    # before treating the ones still unfinished as crashed
+                    exited = [index for index, process in running.items() if not process.is_alive()]
+                    if exited:
+                        for message in await loop.run_in_executor(None, _drain_messages):
+                            await _handle(message)
+                    for index in exited:
+                        if index in running:
+                            error = f"Worker exited with code {running[index].exitcode}"
+                            _finish(index, "error", error=error)
+                            await self._emit_error(index, total, names, error, bool(pending or running))
+
+                if (self.cost_budget_usd and not self._stop_reason
+                        and self.total_cost >= self.cost_budget_usd):
+                    self.stop(f"Cost budget ${self.cost_budget_usd:.2f} reached (${self.total_cost:.2f})",
+                              status="budget_exceeded")
+                    print(f"[BATCH] {self._stop_reason}")
+                    await self.emitter.emit(EventType.PIPELINE_ERROR, {
+                        "error": self._stop_reason, "project_total": total, "continues": False,
+                    })
+        finally:
+            for process in running.values():
+                process.terminate()
+            for process in started:
+                process.join(timeout=5)
+
+        for index in pending:
+            _finish(index, "skipped", error=self._stop_reason)
+        return [r or {"project": names[i], "status": "cancelled"} for i, r in enumerate(results)]
+
+    async def _emit_project(self, event_type: EventType, index: int, total: int,
+                            names: List[str], data: Dict[str, Any]):
+        await self.emitter.emit(event_type, {
+            **data,
+            "project_index": index + 1, "project_total": total, "project_name": names[index],
+        })
+
+    async def _emit_error(self, index: int, total: int, names: List[str], error: str, continues: bool):
+        await self.emitter.emit(EventType.PIPELINE_ERROR, {
+            "error": f"{names[index]}: {error}",
+            "project_index": index + 1, "project_total": total,
+            "continues": continues,
+        })
@@ -0,0 +1,157 @@
+"""
+Link Matching — lookup structures for TraceIndex cross-link heuristics.
+
+The cross-linking strategies ask questions like "which API paths occur in
+this test's text", "which entity names occur in this diagram" or "which
+story title contains (or is contained in) this task name". Answering them
+with nested loops is quadratic in artifact count. The structures here answer
+them in roughly linear time:
+
+- AhoCorasick: all patterns occurring in a text, in one pass over the text.
+- SubstringIndex: all strings containing a query, via a trigram index.
+- RelatedStrings: both directions at once ("q in s or s in q").
+- IdFinder: TraceIndex._find_id with indexed substring fallbacks.
+
+Results are pattern/string indices, so callers can keep the iteration
+order (and hence the edge order) of the original loops.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        # empty patterns occur in every text
+        self._always: List[int] = []
+        for idx, pattern in enumerate(patterns):
+            if not pattern:
+                self._always.append(idx)
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(idx)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Indices of the patterns occurring in text."""
+        found = set(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class SubstringIndex:
+    """Indices of strings containing a query (trigram candidates, then verify)."""
+
+    def __init__(self, strings: Sequence[str]):
+        self._strings = list(strings)
+        self._grams: Dict[str, Set[int]] = defaultdict(set)
+        for idx, text in enumerate(self._strings):
+            for gram in _trigrams(text):
+                self._grams[gram].add(idx)
+
+    def containing(self, query: str) -> Set[int]:
+        if len(query) < 3:
+            return {i for i, s in enumerate(self._strings) if query in s}
+        candidates: Optional[Set[int]] = None
+        for gram in _trigrams(query):
+            bucket = self._grams.get(gram)
+            if not bucket:
+                return set()
+            candidates = set(bucket) if candidates is None else candidates & bucket
+            if not candidates:
+                return set()
+        return {i for i in candidates or () if query in self._strings[i]}
+
+
+class RelatedStrings:
+    """Strings s with `query in s or s in query`."""
+
+    def __init__(self, strings: Sequence[str]):
+        self._contained = AhoCorasick(strings)
+        self._containing = SubstringIndex(strings)
+
+    def related(self, query: str) -> Set[int]:
+        return self._contained.find_all(query) | self._containing.containing(query)
+
+    def first(self, query: str) -> Optional[int]:
+        """Lowest index related to query (what a first-match loop would find)."""
+        hits = self.related(query)
+        return min(hits) if hits else None
+
+
+class IdFinder:
+    """Resolve a (possibly partial) artifact reference to an indexed id.
+
+    Same answers as the linear scan it replaces: exact id, "node-" prefixed
+    id, the first id of the type (in by_type order) containing the reference,
+    and for entities the first id containing the part after the first "-".
+    """
+
+    def __init__(self, artifacts: Dict[str, dict], by_type: Dict[str, List[str]]):
+        self._artifacts = artifacts
+        self._by_type = by_type
+        self._indexes: Dict[str, SubstringIndex] = {}
+        self._cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def _first_containing(self, art_type: str, needle: str) -> Optional[str]:
+        index = self._indexes.get(art_type)
+        ids = self._by_type.get(art_type, [])
+        if index is None:
+            index = self._indexes[art_type] = SubstringIndex([a.upper() for a in ids])
+        hits = index.containing(needle.upper())
+        return ids[min(hits)] if hits else None
+
+    def find(self, art_type: str, partial: str) -> Optional[str]:
+        if not partial:
+            return None
+        if partial in self._artifacts:
+            return partial
+        if f"node-{partial}" in self._artifacts:
+            return f"node-{partial}"
+        key = (art_type, partial)
+        if key in self._cache:
+            return self._cache[key]
+        found = self._first_containing(art_type, partial)
+        if found is None and art_type == "entity" and "-" in partial:
+            found = self._first_containing("entity", partial.split("-", 1)[1])
+        self._cache[key] = found
+        return found
@@ -0,0 +1,198 @@
+"""
+Project Listing — cached per-project summaries for /api/projects.
+
+Summarizing a project means reading journal.json, parsing user_stories.md
+and globbing diagrams/tests. The summary only changes when one of a few
+paths changes, so each summary is stored with a stamp of their mtimes
+(the project folder, journal.json, user_stories.md, diagrams/, testing/).
+A listing then costs a handful of stat calls per project; only projects
+whose stamp changed are summarized again.
+
+Summaries are kept in memory and persisted to `<output_dir>/.project_listing.json`
+so a restarted server starts warm.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .markdown_parser import (
+    parse_user_stories_md,
+    extract_project_name,
+    extract_timestamp,
+)
+
+LISTING_CACHE_FILE = ".project_listing.json"
+LISTING_CACHE_VERSION = 1
+
+# Paths (relative to the project folder) whose mtimes make up the stamp.
+# Directory mtimes change when entries are added or removed.
+_STAMP_PATHS = (
+    ".",
+    "journal.json",
+    "user_stories/user_stories.md",
+    "diagrams",
+    "testing",
+)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def project_stamp(project_dir: Path) -> List[Optional[int]]:
+    """mtimes of the paths a project summary depends on (None = missing)."""
+    return [_mtime(os.path.join(project_dir, rel)) for rel in _STAMP_PATHS]
+
+
+def _count_glob(directory: Path, suffix: str) -> int:
+    try:
+        return sum(
+            1 for entry in os.scandir(directory)
+            if entry.name.endswith(suffix) and entry.is_file()
+        )
+    except OSError:
+        return 0
+
+
+def summarize_project(project_dir: Path) -> Optional[dict]:
+    """Summary shown on the landing page, or None for an empty project."""
+    has_journal = (project_dir / "journal.json").exists()
+    has_user_stories = (project_dir / "user_stories" / "user_stories.md").exists()
+    diagram_count = _count_glob(project_dir / "diagrams", ".mmd")
+    test_count = _count_glob(project_dir / "testing", ".feature")
+    has_diagrams = diagram_count > 0
+    has_tests = test_count > 0
+
+    # Skip empty projects
+    if not (has_journal or has_user_stories or has_diagrams):
+        return None
+
+    node_count = 0
+    epic_count = 0
+    us_count = 0
+
+    if has_journal:
+        try:
+            with open(project_dir / "journal.json", encoding="utf-8") as f:
+                journal = json.load(f)
+            node_count = len(journal.get("nodes", {}))
+        except (json.JSONDecodeError, IOError):
+            pass
+
+    if has_user_stories:
+        try:
+            epics, stories = parse_user_stories_md(project_dir / "user_stories" / "user_stories.md")
+            epic_count = len(epics)
+            us_count = len(stories)
+        except Exception:
+            pass
+
+    return {
+        "id": project_dir.name,
+        "name": extract_project_name(project_dir),
+        "path": str(project_dir),
+        "format": "journal" if has_journal else "folder",
+        "has_journal": has_journal,
+        "has_user_stories": has_user_stories,
+        "has_diagrams": has_diagrams,
+        "has_tests": has_tests,
+        "node_count": node_count,
+        "epic_count": epic_count,
+        "us_count": us_count,
+        "diagram_count": diagram_count,
+        "test_count": test_count,
+        "created": extract_timestamp(project_dir.name),
+    }
+
+
+class ProjectListing:
+    """
+    Incrementally maintained list of project summaries under output_dir.
+
+    list_projects() is blocking (stat calls, plus parsing for changed
+    projects); the server runs it in a worker thread. Calls are serialized,
+    so concurrent requests share one scan's work.
+    """
+
+    def __init__(self, output_dir: Path, persist: bool = True):
+        self.output_dir = Path(output_dir)
+        self.persist = persist
+        self._lock = threading.Lock()
+        # project folder name → {"stamp": [...], "summary": dict or None}
+        self._entries: Optional[Dict[str, dict]] = None
+
+    @property
+    def cache_path(self) -> Path:
+        return self.output_dir / LISTING_CACHE_FILE
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if not self.persist:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == LISTING_CACHE_VERSION:
+                return data.get("projects", {})
+        except (json.JSONDecodeError, IOError, AttributeError):
+            pass
+        return {}
+
+    def _save_cache(self):
+        if not self.persist:
+            return
+        tmp_path = self.cache_path.with_name(f"{LISTING_CACHE_FILE}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": LISTING_CACHE_VERSION, "projects": self._entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"  [WARN] Could not write project listing cache: {e}")
+
+    def list_projects(self) -> List[dict]:
+        """Summaries of all non-empty projects, newest folder name first."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load_cache()
+            if not self.output_dir.exists():
+                return []
+
+            names = sorted(
+                (entry.name for entry in os.scandir(self.output_dir)
+                 if entry.is_dir() and not entry.name.startswith(".")),
+                reverse=True,
+            )
+            changed = False
+            projects = []
+            for name in names:
+                project_dir = self.output_dir / name
+                stamp = project_stamp(project_dir)
+                entry = self._entries.get(name)
+                if entry is None or entry.get("stamp") != stamp:
+                    entry = {"stamp": stamp, "summary": summarize_project(project_dir)}
+                    self._entries[name] = entry
+                    changed = True
+                if entry["summary"] is not None:
+                    projects.append(entry["summary"])
+
+            gone = set(self._entries) - set(names)
+            for name in gone:
+                del self._entries[name]
+            if changed or gone:
+                self._save_cache()
+            return projects
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forget one project's summary (or all), e.g. after the pipeline wrote it."""
+        with self._lock:
+            if self._entries is None:
+                return
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
@@ -0,0 +1,208 @@
+"""
+Project Snapshot — on-disk cache of a loaded project for fast reopen.
+
+After a project is loaded, the project dict returned by the load endpoint and
+the built TraceIndex (including its LinkGraph) are pickled into
+`<project>/.dashboard_snapshot`. The file starts with a small JSON header
+holding the snapshot version and a fingerprint of the project files (path,
+size, mtime) and of the loader code, followed by an HMAC-SHA256 over header
+and payload. A later open memory-maps the file, checks the header and the
+HMAC and unpickles the payload only if both match.
+
+The HMAC key is a per-user secret kept outside the project directory (see
+`snapshot_key_path`), so a snapshot that was not written by this user's
+dashboard - e.g. one shipped inside an imported project - is never
+unpickled. A stale, foreign or unreadable snapshot is ignored and rewritten.
+"""
+
+import hashlib
+import hmac
+import json
+import mmap
+import os
+import pickle
+import secrets
+import struct
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FILE = ".dashboard_snapshot"
+_MAGIC = b"REDSNAP\0"
+_HEADER_LEN = struct.Struct("<Q")
+_MAC_LEN = hashlib.sha256().digest_size
+_KEY_LEN = 32
+
+# Packages of every module the project loader (server, markdown parser,
+# TraceIndex and the pickled classes) uses; a code change invalidates snapshots
+_CODE_DIRS = (
+    Path(__file__).parent,
+    Path(__file__).parent.parent / "propagation",
+)
+_code_digest: Optional[str] = None
+
+
+def code_digest() -> str:
+    global _code_digest
+    if _code_digest is None:
+        h = hashlib.sha256()
+        for code_dir in _CODE_DIRS:
+            for path in sorted(code_dir.glob("*.py")):
+                h.update(f"{code_dir.name}/{path.name}\0".encode())
+                try:
+                    h.update(path.read_bytes())
+                except OSError:
+                    pass
+        _code_digest = h.hexdigest()
+    return _code_digest
+
+
+def snapshot_key_path() -> Path:
+    """Per-user file holding the snapshot HMAC key ($XDG_CACHE_HOME or ~/.cache)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "requirements_engineer" / "snapshot.key"
+
+
+def _snapshot_key(create: bool) -> Optional[bytes]:
+    """The HMAC key, created (owner-only) on first save; None if unavailable."""
+    path = snapshot_key_path()
+    try:
+        key = path.read_bytes()
+        if len(key) == _KEY_LEN:
+            return key
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"  [WARN] Cannot read snapshot key {path}: {e}")
+        return None
+    if not create:
+        return None
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        key = secrets.token_bytes(_KEY_LEN)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        os.replace(tmp_path, path)
+        return key
+    except OSError as e:
+        print(f"  [WARN] Cannot create snapshot key {path}: {e}")
+        return None
+
+
+def project_fingerprint(project_dir: Path) -> str:
+    """Hash of (relative path, size, mtime) of every non-hidden project file."""
+    entries = []
+    stack = [Path(project_dir)]
+    while stack:
+        current = stack.pop()
+        try:
+            scan = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in scan:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.is_file():
+                st = entry.stat()
+                rel = os.path.relpath(entry.path, project_dir)
+                entries.append(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}")
+    h = hashlib.sha256()
+    for line in sorted(entries):
+        h.update(line.encode("utf-8", "surrogateescape") + b"\n")
+    return h.hexdigest()
+
+
+def _header(fingerprint: str) -> dict:
+    return {"version": SNAPSHOT_VERSION, "code": code_digest(), "files": fingerprint}
+
+
+def load_snapshot(project_dir: Path, fingerprint: Optional[str] = None) -> Optional[Any]:
+    """
+    Return the snapshot payload if it matches the current project files.
+
+    Args:
+        project_dir:  Project output directory.
+        fingerprint:  project_fingerprint(project_dir), if already computed.
+    """
+    path = Path(project_dir) / SNAPSHOT_FILE
+    if not path.exists():
+        return None
+    key = _snapshot_key(create=False)
+    if key is None:
+        return None
+    fingerprint = fingerprint or project_fingerprint(project_dir)
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(_MAGIC)] != _MAGIC:
+                return None
+            offset = len(_MAGIC)
+            (header_len,) = _HEADER_LEN.unpack_from(mm, offset)
+            offset += _HEADER_LEN.size
+            header_bytes = mm[offset:offset + header_len]
+            if json.loads(header_bytes) != _header(fingerprint):
+                return None
+            offset += header_len
+            mac = mm[offset:offset + _MAC_LEN]
+            offset += _MAC_LEN
+            with memoryview(mm)[offset:] as payload:
+                expected = hmac.new(key, header_bytes, hashlib.sha256)
+                expected.update(payload)
+                if not hmac.compare_digest(mac, expected.digest()):
+                    print(f"  [WARN] Ignoring project snapshot with invalid signature: {path}")
+                    return None
+                return pickle.loads(payload)
+    except Exception as e:
+        print(f"  [WARN] Ignoring unreadable project snapshot: {e}")
+        return None
+
+
+def save_snapshot(project_dir: Path, payload: Any, fingerprint: str) -> bool:
+    """
+    Write payload as the snapshot for the project files in `fingerprint`.
+
+    Pass the fingerprint taken *before* the files were read, so edits made
+    while loading invalidate the snapshot instead of being masked by it.
+    """
+    key = _snapshot_key(create=True)
+    if key is None:
+        return False
+    path = Path(project_dir) / SNAPSHOT_FILE
+    tmp_path = path.with_name(f"{SNAPSHOT_FILE}.{os.getpid()}.tmp")
+    try:
+        header = json.dumps(_header(fingerprint)).encode("utf-8")
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        mac = hmac.new(key, header, hashlib.sha256)
+        mac.update(data)
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            f.write(mac.digest())
+            f.write(data)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"  [WARN] Could not write project snapshot: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def load_project_snapshot(project_dir: Path, fingerprint: str) -> Optional[Tuple[dict, Any]]:
+    """(project dict, TraceIndex or None) from a valid snapshot, else None."""
+    payload = load_snapshot(project_dir, fingerprint)
+    if not isinstance(payload, dict) or "project" not in payload:
+        return None
+    return payload["project"], payload.get("trace_index")
+
+
+def save_project_snapshot(project_dir: Path, fingerprint: str, project: dict, trace_index=None) -> bool:
+    return save_snapshot(
+        project_dir, {"project": project, "trace_index": trace_index}, fingerprint
+    )
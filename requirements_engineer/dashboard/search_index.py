@@ -0,0 +1,239 @@
+"""
+Search Index — tokenized inverted index for the Trace Explorer search box.
+
+Artifacts are indexed by title and description. A query token matches
+index terms exactly, by prefix (so typing "auth" finds "authentication")
+and by infix ("db" finds "mongodb"), via a trigram index over the vocabulary
+for tokens of 3+ characters and a vocabulary scan for shorter ones. Ranking
+is BM25, with title matches weighted above description matches and exact
+term matches above prefix/infix expansions. Only ranking caps the number of
+terms a token expands to; filtering with match() considers all of them.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Field and match-kind weights
+TITLE_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+EXACT_WEIGHT = 1.0
+EXPANDED_WEIGHT = 0.5
+# Max vocabulary terms a single query token may expand to when ranking
+MAX_EXPANSIONS = 64
+
+FIELDS = ("title", "body")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of text."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _trigrams(term: str) -> Set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over artifact title/description with BM25 ranking."""
+
+    def __init__(self):
+        # field → term → {doc_id: term frequency}
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {
+            f: defaultdict(dict) for f in FIELDS
+        }
+        # field → doc_id → token count
+        self._doc_len: Dict[str, Dict[str, int]] = {f: {} for f in FIELDS}
+        self._total_len: Dict[str, int] = {f: 0 for f in FIELDS}
+        # doc_id → set of terms (all fields), for removal
+        self._doc_terms: Dict[str, Set[str]] = {}
+        # term → number of fields/docs referencing it (vocabulary refcount)
+        self._term_refs: Dict[str, int] = defaultdict(int)
+        # sorted vocabulary for prefix lookups, trigram → terms for infix
+        self._vocab: List[str] = []
+        self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    # ── Maintenance ──────────────────────────────────────────────────
+
+    def clear(self):
+        self.__init__()
+
+    def build(self, docs: Iterable[Tuple[str, str, str]]):
+        """Rebuild from (doc_id, title, description) triples."""
+        self.clear()
+        for doc_id, title, body in docs:
+            self._add(doc_id, title, body, keep_vocab_sorted=False)
+        self._vocab.sort()
+
+    def add(self, doc_id: str, title: str, body: str):
+        """Index (or re-index) a single document."""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        self._add(doc_id, title, body, keep_vocab_sorted=True)
+
+    def _add(self, doc_id: str, title: str, body: str, keep_vocab_sorted: bool):
+        terms: Set[str] = set()
+        for fld, text in (("title", title), ("body", body)):
+            tokens = tokenize(text)
+            self._doc_len[fld][doc_id] = len(tokens)
+            self._total_len[fld] += len(tokens)
+            tf: Dict[str, int] = defaultdict(int)
+            for tok in tokens:
+                tf[tok] += 1
+            for term, count in tf.items():
+                self._postings[fld][term][doc_id] = count
+                terms.add(term)
+        self._doc_terms[doc_id] = terms
+        for term in terms:
+            self._term_refs[term] += 1
+            if self._term_refs[term] == 1:
+                self._add_vocab_term(term, keep_vocab_sorted)
+
+    def remove(self, doc_id: str):
+        """Drop a document from the index (no-op if unknown)."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for fld in FIELDS:
+            self._total_len[fld] -= self._doc_len[fld].pop(doc_id, 0)
+            for term in terms:
+                posting = self._postings[fld].get(term)
+                if posting is not None and posting.pop(doc_id, None) is not None:
+                    if not posting:
+                        del self._postings[fld][term]
+        for term in terms:
+            self._term_refs[term] -= 1
+            if self._term_refs[term] <= 0:
+                del self._term_refs[term]
+                self._remove_vocab_term(term)
+
+    def _add_vocab_term(self, term: str, keep_sorted: bool):
+        if keep_sorted:
+            bisect.insort(self._vocab, term)
+        else:
+            self._vocab.append(term)
+        for gram in _trigrams(term):
+            self._trigram_terms[gram].add(term)
+
+    def _remove_vocab_term(self, term: str):
+        pos = bisect.bisect_left(self._vocab, term)
+        if pos < len(self._vocab) and self._vocab[pos] == term:
+            del self._vocab[pos]
+        for gram in _trigrams(term):
+            bucket = self._trigram_terms.get(gram)
+            if bucket is not None:
+                bucket.discard(term)
+                if not bucket:
+                    del self._trigram_terms[gram]
+
+    # ── Lookup ───────────────────────────────────────────────────────
+
+    def _expand(self, token: str, limit: Optional[int] = MAX_EXPANSIONS) -> Dict[str, float]:
+        """Vocabulary terms matching a query token → match weight.
+
+        At most `limit` terms are returned (None: all matching terms).
+        """
+        if limit is None:
+            limit = math.inf
+        matches: Dict[str, float] = {}
+        if token in self._term_refs:
+            matches[token] = EXACT_WEIGHT
+        # prefix matches via the sorted vocabulary
+        pos = bisect.bisect_left(self._vocab, token)
+        while pos < len(self._vocab) and len(matches) < limit:
+            term = self._vocab[pos]
+            if not term.startswith(token):
+                break
+            matches.setdefault(term, EXPANDED_WEIGHT)
+            pos += 1
+        if len(matches) >= limit:
+            return matches
+        # infix matches via trigram intersection; tokens too short for a
+        # trigram scan the vocabulary instead
+        if len(token) >= 3:
+            candidates: Optional[Set[str]] = None
+            for gram in _trigrams(token):
+                bucket = self._trigram_terms.get(gram, set())
+                candidates = set(bucket) if candidates is None else candidates & bucket
+                if not candidates:
+                    break
+            candidates = sorted(candidates or ())
+        else:
+            candidates = self._vocab
+        for term in candidates:
+            if len(matches) >= limit:
+                break
+            if token in term:
+                matches.setdefault(term, EXPANDED_WEIGHT)
+        return matches
+
+    def _bm25(self, fld: str, term: str, scores: Dict[str, float], weight: float):
+        posting = self._postings[fld].get(term)
+        if not posting:
+            return
+        n_docs = len(self._doc_terms)
+        idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+        avg_len = (self._total_len[fld] / n_docs) or 1.0
+        doc_len = self._doc_len[fld]
+        for doc_id, tf in posting.items():
+            norm = tf + K1 * (1 - B + B * doc_len.get(doc_id, 0) / avg_len)
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * tf * (K1 + 1) / norm
+
+    def score(self, query: str, limit: Optional[int] = MAX_EXPANSIONS) -> Dict[str, float]:
+        """doc_id → relevance for documents matching every query token.
+
+        Each token expands to at most `limit` vocabulary terms (None: all).
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+        total: Optional[Dict[str, float]] = None
+        for token in dict.fromkeys(tokens):
+            token_scores: Dict[str, float] = {}
+            for term, match_weight in self._expand(token, limit).items():
+                self._bm25("title", term, token_scores, match_weight * TITLE_WEIGHT)
+                self._bm25("body", term, token_scores, match_weight * BODY_WEIGHT)
+            if total is None:
+                total = token_scores
+            else:
+                total = {d: s + token_scores[d] for d, s in total.items() if d in token_scores}
+            if not total:
+                return {}
+        return total or {}
+
+    def match(self, query: str) -> Set[str]:
+        """IDs of documents matching every query token (no expansion cap)."""
+        tokens = tokenize(query)
+        if not tokens:
+            return set()
+        result: Optional[Set[str]] = None
+        for token in dict.fromkeys(tokens):
+            docs: Set[str] = set()
+            for term in self._expand(token, limit=None):
+                for fld in FIELDS:
+                    docs.update(self._postings[fld].get(term, ()))
+            result = docs if result is None else result & docs
+            if not result:
+                return set()
+        return result or set()
+
+    def top(self, query: str, limit: int, keep=None) -> List[Tuple[str, float]]:
+        """Best `limit` (doc_id, score) pairs, optionally filtered by keep(doc_id)."""
+        scored = self.score(query).items()
+        if keep is not None:
+            scored = [(d, s) for d, s in scored if keep(d)]
+        return heapq.nlargest(limit, scored, key=lambda x: (x[1], x[0]))
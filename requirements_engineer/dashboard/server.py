@@ -13,6 +13,7 @@ import os
 import re
 import subprocess
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import webbrowser
@@ -48,7 +49,14 @@ from .markdown_parser import (
     parse_test_factories_json,
     parse_architecture_json,
     extract_project_name,
-    extract_timestamp
+)
+from .project_listing import ProjectListing
+from .write_queue import WriteQueue
+from .batch_runner import BatchRunner
+from .project_snapshot import (
+    load_project_snapshot,
+    project_fingerprint,
+    save_project_snapshot,
 )
 
 # Import propagation module
@@ -118,6 +126,8 @@ class DashboardServer:
         self.auto_linker: Optional['AutoLinker'] = None
         self._current_project_path: Optional[Path] = None
         self._current_project_id: Optional[str] = None
+        # Incremented per project load; only the latest load becomes current
+        self._project_load_seq = 0
 
         # KiloAgent Cascade Edit state
         self._cascade_results: Dict[str, Any] = {}
@@ -127,6 +137,18 @@ class DashboardServer:
 
         # Trace Explorer index (built on project load)
         self._trace_index: Optional['TraceIndex'] = None
+        # Serializes incremental re-indexing of changed project files
+        self._file_change_lock = asyncio.Lock()
+
+        # Bounded pool for blocking file I/O and parsing in request handlers
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard-io")
+        # Coalesced write-back of Trace Explorer edits
+        self._write_queue = WriteQueue(max_workers=2)
+
+        # Project summaries for the landing page (refreshed by mtime)
+        self._project_listing = ProjectListing(
+            Path(__file__).parent.parent.parent / "enterprise_output"
+        )
 
         # Pipeline execution state
         self._pipeline_task: Optional[asyncio.Task] = None
@@ -136,6 +158,7 @@ class DashboardServer:
             "project_index": 0, "project_total": 1, "project_name": ""
         }
         self._pipeline_queue: list = []  # list of {"project_path": ..., "config_path": ...}
+        self._batch_cfg: Dict[str, Any] = {}  # performance.batch of the running batch
 
     async def start(self):
         """Start the dashboard server."""
@@ -218,6 +241,9 @@ class DashboardServer:
         """Stop the dashboard server."""
         if self.runner:
             await self.runner.cleanup()
+        # Let queued write-backs finish before the process exits
+        await asyncio.get_running_loop().run_in_executor(None, self._write_queue.shutdown)
+        self._io_pool.shutdown(wait=False)
 
     async def _handle_index(self, request: web.Request) -> web.Response:
         """Serve the main dashboard HTML."""
@@ -821,72 +847,10 @@ WICHTIG:
 
     async def _handle_list_projects(self, request: web.Request) -> web.Response:
         """List all projects from enterprise_output folder (both formats)."""
-        projects = []
-        output_dir = Path(__file__).parent.parent.parent / "enterprise_output"
-
-        if output_dir.exists():
-            for project_dir in sorted(output_dir.iterdir(), reverse=True):
-                if not project_dir.is_dir():
-                    continue
-
-                # Check for content indicators
-                has_journal = (project_dir / "journal.json").exists()
-                has_user_stories = (project_dir / "user_stories" / "user_stories.md").exists()
-                diagrams_dir = project_dir / "diagrams"
-                has_diagrams = diagrams_dir.exists() and any(diagrams_dir.glob("*.mmd"))
-                testing_dir = project_dir / "testing"
-                has_tests = testing_dir.exists() and any(testing_dir.glob("*.feature"))
-
-                # Skip empty projects
-                if not (has_journal or has_user_stories or has_diagrams):
-                    continue
-
-                # Count items based on format
-                node_count = 0
-                epic_count = 0
-                us_count = 0
-                diagram_count = 0
-                test_count = 0
-
-                if has_journal:
-                    try:
-                        with open(project_dir / "journal.json", encoding="utf-8") as f:
-                            journal = json.load(f)
-                        node_count = len(journal.get("nodes", {}))
-                    except (json.JSONDecodeError, IOError):
-                        pass
-
-                if has_user_stories:
-                    try:
-                        epics, stories = parse_user_stories_md(project_dir / "user_stories" / "user_stories.md")
-                        epic_count = len(epics)
-                        us_count = len(stories)
-                    except Exception:
-                        pass
-
-                if has_diagrams:
-                    diagram_count = len(list(diagrams_dir.glob("*.mmd")))
-
-                if has_tests:
-                    test_count = len(list(testing_dir.glob("*.feature")))
-
-                projects.append({
-                    "id": project_dir.name,
-                    "name": extract_project_name(project_dir),
-                    "path": str(project_dir),
-                    "format": "journal" if has_journal else "folder",
-                    "has_journal": has_journal,
-                    "has_user_stories": has_user_stories,
-                    "has_diagrams": has_diagrams,
-                    "has_tests": has_tests,
-                    "node_count": node_count,
-                    "epic_count": epic_count,
-                    "us_count": us_count,
-                    "diagram_count": diagram_count,
-                    "test_count": test_count,
-                    "created": extract_timestamp(project_dir.name)
-                })
-
+        # Cached per-project summaries; the stat/parse work runs off the event loop
+        projects = await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, self._project_listing.list_projects
+        )
         return web.json_response({"projects": projects})
 
     async def _handle_load_project(self, request: web.Request) -> web.Response:
@@ -898,42 +862,69 @@ WICHTIG:
         if not project_dir.exists():
             return web.json_response({"error": "Project not found"}, status=404)
 
-        # Track the currently loaded project for auto-linker
-        self._current_project_path = project_dir
-        self._current_project_id = project_id
-        print(f"[SERVER] Loaded project: {project_id}")
+        self._project_load_seq += 1
+        load_seq = self._project_load_seq
 
         try:
-            journal_path = project_dir / "journal.json"
-
-            # Always load folder-based data first (epics, user_stories, tests, etc.)
-            result = self._load_folder_format(project_dir)
-
-            # If journal.json exists, merge its nodes with the folder data
-            if journal_path.exists():
-                with open(journal_path, encoding="utf-8") as f:
-                    journal = json.load(f)
-                # Merge journal nodes into result
-                if "nodes" in journal:
-                    result["nodes"] = journal.get("nodes", {})
-                if "project_name" in journal:
-                    result["project_name"] = journal["project_name"]
-                result["format"] = "hybrid"  # Indicates both sources were used
-                print(f"  [INFO] Merged journal.json with folder data for {project_id}")
-
-            # Build Trace Explorer index from loaded project data
+            # Reading/parsing the project and building the index run off the event loop
+            result, trace_index = await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self._load_project_data, project_dir
+            )
+        except (json.JSONDecodeError, IOError) as e:
+            return web.json_response({"error": str(e)}, status=500)
+
+        # Switch project and index together, without an await in between, and
+        # only for the most recent load so a slower earlier one cannot pair
+        # its index with another project's path
+        if load_seq == self._project_load_seq:
+            # Track the currently loaded project for auto-linker
+            self._current_project_path = project_dir
+            self._current_project_id = project_id
             if HAS_TRACE_INDEX:
-                try:
-                    self._trace_index = TraceIndex()
-                    self._trace_index.build(project_dir, result)
-                except Exception as e:
-                    print(f"  [WARN] TraceIndex build failed: {e}")
-                    self._trace_index = None
+                self._trace_index = trace_index
+            print(f"[SERVER] Loaded project: {project_id}")
+        return web.json_response(result)
 
-            return web.json_response(result)
+    def _load_project_data(self, project_dir: Path):
+        """Blocking part of a project load: (project dict, TraceIndex or None)."""
+        project_id = project_dir.name
+
+        # Reopening an unchanged project: reuse the on-disk snapshot
+        fingerprint = project_fingerprint(project_dir)
+        snapshot = load_project_snapshot(project_dir, fingerprint)
+        if snapshot is not None:
+            print(f"  [INFO] Loaded {project_id} from snapshot")
+            return snapshot
+
+        journal_path = project_dir / "journal.json"
+
+        # Always load folder-based data first (epics, user_stories, tests, etc.)
+        result = self._load_folder_format(project_dir)
+
+        # If journal.json exists, merge its nodes with the folder data
+        if journal_path.exists():
+            with open(journal_path, encoding="utf-8") as f:
+                journal = json.load(f)
+            # Merge journal nodes into result
+            if "nodes" in journal:
+                result["nodes"] = journal.get("nodes", {})
+            if "project_name" in journal:
+                result["project_name"] = journal["project_name"]
+            result["format"] = "hybrid"  # Indicates both sources were used
+            print(f"  [INFO] Merged journal.json with folder data for {project_id}")
+
+        # Build Trace Explorer index from loaded project data
+        trace_index = None
+        if HAS_TRACE_INDEX:
+            try:
+                trace_index = TraceIndex()
+                trace_index.build(project_dir, result)
+            except Exception as e:
+                print(f"  [WARN] TraceIndex build failed: {e}")
+                trace_index = None
 
-        except (json.JSONDecodeError, IOError) as e:
-            return web.json_response({"error": str(e)}, status=500)
+        save_project_snapshot(project_dir, fingerprint, result, trace_index)
+        return result, trace_index
 
     def _load_folder_format(self, project_dir: Path) -> dict:
         """Load project data from folder-based format."""
@@ -2024,11 +2015,17 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
                 {"error": "OPENROUTER_API_KEY not set"}, status=400
             )
 
-        self._start_batch_pipeline([{"project_path": project_path, "config_path": config_path}])
+        self._start_batch_pipeline([{"project_path": project_path, "config_path": config_path}],
+                                   self._get_batch_config(config_path))
         return web.json_response({"status": "started", "projects": 1})
 
     async def _handle_pipeline_batch(self, request: web.Request) -> web.Response:
-        """Start the enterprise pipeline for multiple projects sequentially."""
+        """Start the enterprise pipeline for multiple projects.
+
+        Projects run in parallel worker processes according to
+        performance.batch in the config; the body may override
+        max_parallel and cost_budget_usd.
+        """
         if self._pipeline_task and not self._pipeline_task.done():
             return web.json_response(
                 {"error": "Pipeline already running"}, status=409
@@ -2057,19 +2054,42 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
                 {"error": f"Files not found: {', '.join(missing)}"}, status=400
             )
 
+        batch_cfg = self._get_batch_config(config_path)
+        if data.get("max_parallel"):
+            batch_cfg["max_parallel_projects"] = data["max_parallel"]
+        if data.get("cost_budget_usd") is not None:
+            batch_cfg["cost_budget_usd"] = data["cost_budget_usd"]
+
         queue = [{"project_path": p, "config_path": config_path} for p in projects]
-        self._start_batch_pipeline(queue)
-        return web.json_response({"status": "started", "projects": len(queue)})
+        self._start_batch_pipeline(queue, batch_cfg)
+        return web.json_response({
+            "status": "started", "projects": len(queue),
+            "max_parallel": min(int(batch_cfg.get("max_parallel_projects", 1)), len(queue)),
+        })
 
-    def _start_batch_pipeline(self, queue: list):
+    def _get_batch_config(self, config_path: str) -> Dict[str, Any]:
+        """Load performance.batch settings from the pipeline config."""
+        try:
+            import yaml
+            with open(config_path, encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            batch_cfg = (config.get("performance", {}) or {}).get("batch", {}) or {}
+            return dict(batch_cfg)
+        except Exception as e:
+            print(f"[SERVER] Could not load batch config: {e}")
+        return {}
+
+    def _start_batch_pipeline(self, queue: list, batch_cfg: Optional[Dict[str, Any]] = None):
         """Initialize status and launch the batch runner task."""
         self._pipeline_queue = list(queue)
+        self._batch_cfg = batch_cfg or {}
         first_name = Path(queue[0]["project_path"]).stem
         self._pipeline_status = {
             "running": True, "step": 0, "total": 15,
             "description": "Starting...", "error": None, "output_dir": None,
             "project_index": 1, "project_total": len(queue),
-            "project_name": first_name
+            "project_name": first_name,
+            "projects": {},  # project_index → {name, step, description, cost_usd}
         }
 
         # Register progress tracker (idempotent — old callback replaced)
@@ -2080,6 +2100,13 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
             if event.type == EventType.PIPELINE_PROGRESS:
                 self._pipeline_status["step"] = event.data.get("step", 0)
                 self._pipeline_status["description"] = event.data.get("description", "")
+                if "project_index" in event.data:
+                    self._pipeline_status["projects"][str(event.data["project_index"])] = {
+                        "name": event.data.get("project_name", ""),
+                        "step": event.data.get("step", 0),
+                        "description": event.data.get("description", ""),
+                        "cost_usd": event.data.get("cost_usd", 0),
+                    }
             elif event.type == EventType.PIPELINE_COMPLETE:
                 # Will be handled per-project in the batch loop
                 pass
@@ -2092,60 +2119,31 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
         self._pipeline_task = asyncio.create_task(self._run_batch_pipeline())
 
     async def _run_batch_pipeline(self):
-        """Run all queued projects sequentially."""
+        """Run all queued projects in worker processes, within the batch limits."""
         import sys
+        # spawned workers inherit sys.path and import requirements_engineer from it
         sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-        from requirements_engineer.run_re_system import run_enterprise_mode
 
         total_projects = len(self._pipeline_queue)
-        results = []
-
-        for idx, item in enumerate(self._pipeline_queue):
-            project_path = item["project_path"]
-            config_path = item["config_path"]
-            project_name = Path(project_path).stem
-
-            # Update status for this project
-            self._pipeline_status.update({
-                "running": True, "step": 0, "error": None,
-                "project_index": idx + 1, "project_total": total_projects,
-                "project_name": project_name
-            })
-
-            # Emit a batch progress event so the UI knows which project
-            await self.emitter.emit(EventType.PIPELINE_PROGRESS, {
-                "step": 0, "total": 15,
-                "description": f"Starting {project_name}...",
-                "percent": 0, "cost_usd": 0, "total_tokens": 0,
-                "project_index": idx + 1, "project_total": total_projects,
-                "project_name": project_name
-            })
 
-            try:
-                output_dir = await run_enterprise_mode(
-                    project_path=project_path,
-                    config_path=config_path,
-                    emitter=self.emitter,
-                )
-                results.append({
-                    "project": project_name, "status": "complete",
-                    "output_dir": str(output_dir) if output_dir else None
-                })
-            except asyncio.CancelledError:
-                results.append({"project": project_name, "status": "cancelled"})
-                break
-            except Exception as e:
-                import traceback
-                error_msg = f"{type(e).__name__}: {e}"
-                print(f"[PIPELINE ERROR] {project_name}: {error_msg}")
-                traceback.print_exc()
-                results.append({"project": project_name, "status": "error", "error": error_msg})
-                # Continue to next project — don't abort the batch
-                await self.emitter.emit(EventType.PIPELINE_ERROR, {
-                    "error": f"{project_name}: {error_msg}",
-                    "project_index": idx + 1, "project_total": total_projects,
-                    "continues": idx + 1 < total_projects
-                })
+        # a single worker still enforces the cost budget and the LLM call limit
+        max_parallel = int(self._batch_cfg.get("max_parallel_projects", 1) or 1)
+        runner = BatchRunner(
+            self.emitter,
+            max_workers=max(1, min(max_parallel, total_projects)),
+            max_llm_calls=self._batch_cfg.get("max_concurrent_llm_calls"),
+            cost_budget_usd=self._batch_cfg.get("cost_budget_usd"),
+        )
+        self._pipeline_status["description"] = f"Running {total_projects} projects, {runner.max_workers} at a time"
+        try:
+            results = await runner.run(self._pipeline_queue)
+        except asyncio.CancelledError:
+            results = [{"project": Path(item["project_path"]).stem, "status": "cancelled"}
+                       for item in self._pipeline_queue]
+        self._pipeline_queue = []
+        for idx, result in enumerate(results):
+            entry = self._pipeline_status["projects"].setdefault(str(idx + 1), {"name": result["project"]})
+            entry["status"] = result["status"]
 
         # All done
         self._pipeline_status["running"] = False
@@ -2153,6 +2151,15 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
         self._pipeline_status["description"] = "All projects complete"
         self._pipeline_queue = []
 
+        # The pipeline wrote these project folders; their cached listing
+        # summaries may predate writes within the same mtime tick
+        written = [r.get("output_dir") for r in results]
+        if written and all(written):
+            for output_dir in written:
+                self._project_listing.invalidate(Path(output_dir).name)
+        else:
+            self._project_listing.invalidate()
+
         completed = [r for r in results if r["status"] == "complete"]
         failed = [r for r in results if r["status"] == "error"]
 
@@ -2205,9 +2212,12 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
         if not manifest_path.exists():
             return web.json_response({"error": "pipeline_manifest.json not found"}, status=404)
 
-        try:
+        def _read_manifest():
             with open(manifest_path, "r", encoding="utf-8") as f:
-                data = _json.load(f)
+                return _json.load(f)
+
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(self._io_pool, _read_manifest)
             return web.json_response(data)
         except Exception as e:
             return web.json_response({"error": str(e)}, status=500)
@@ -2336,7 +2346,22 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
         if not field:
             return web.json_response({"error": "Missing 'field'"}, status=400)
 
-        result = self._trace_index.update_artifact(artifact_id, field, value)
+        trace_index = self._trace_index
+        result = trace_index.edit_artifact(artifact_id, field, value)
+        if "error" not in result:
+            # Queued write-back: edits to the same file share one atomic rewrite
+            target = trace_index.write_back_target(artifact_id, field, value)
+            if target is None:
+                result["success"] = False
+            else:
+                path, fmt, edit = target
+                try:
+                    result["success"] = await asyncio.wrap_future(
+                        self._write_queue.submit(path, edit, fmt)
+                    )
+                except Exception as e:
+                    print(f"[TraceIndex] Write-back failed for {artifact_id}: {e}")
+                    result["success"] = False
 
         # Emit trace edit event via WebSocket
         await self.emitter.emit_raw("trace_edit", {
@@ -3529,6 +3554,7 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
             event_callback=emit_event
         )
         await self.propagation_engine.initialize()
+        self.propagation_engine.add_file_change_listener(self._on_project_file_change)
 
         # Initialize auto linker
         self.auto_linker = AutoLinker(
@@ -3540,6 +3566,35 @@ Bitte fuehre die angeforderte Aenderung durch und gib den aktualisierten Inhalt
 
         print(f"[SERVER] Propagation initialized for: {project_path}")
 
+    async def _on_project_file_change(self, event_type: str, file_path: str):
+        """Re-index only the changed file in the Trace Explorer index.
+
+        The file is parsed in the I/O pool; the index is updated on the loop,
+        one change at a time, so handlers never see a half-applied change.
+        """
+        index = self._trace_index
+        if index is None or index.project_dir is None:
+            return
+        try:
+            Path(file_path).resolve().relative_to(index.project_dir.resolve())
+        except ValueError:
+            return  # change belongs to another project
+        async with self._file_change_lock:
+            if self._trace_index is not index:
+                return  # another project was loaded meanwhile
+            try:
+                pending = index.link_graph.prepare_reload(file_path)
+                if pending is None:
+                    return
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io_pool, index.link_graph.parse_reload, pending
+                )
+                if self._trace_index is not index:
+                    return
+                index.apply_file_change(event_type, file_path, parsed=pending)
+            except Exception as e:
+                print(f"  [WARN] TraceIndex incremental update failed: {e}")
+
     async def _start_file_watching(self):
         """Start file watching for the current project."""
         if self.propagation_engine:
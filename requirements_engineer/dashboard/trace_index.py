@@ -6,6 +6,7 @@ chains, impact analysis, and full-text search.  Built once when a project
 loads; updated incrementally on edits.
 """
 
+import bisect
 import json
 import math
 import re
@@ -14,6 +15,11 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..propagation.link_graph import LinkGraph
+from ..propagation.models import Edge
+from .artifact_views import ArtifactViews
+from .link_matching import AhoCorasick, IdFinder, RelatedStrings
+from .search_index import SearchIndex, tokenize
+from .write_queue import FileEdit, apply_edits
 
 
 # ── Artifact type display order ──────────────────────────────────────
@@ -62,6 +68,34 @@ DOWNSTREAM_EDGES = {
 }
 
 
+# Screen content_types → UI component types shown for them (cross-link 1/1b)
+CONTENT_TO_COMP = {
+    "dashboard": {"card", "chart"},
+    "kpis": {"card", "chart"},
+    "real-time-dashboard": {"card", "chart", "table"},
+    "form": {"input", "button", "select"},
+    "forms": {"input", "button", "select"},
+    "list": {"table"},
+    "table": {"table"},
+    "filters": {"input", "select", "button"},
+    "search": {"input"},
+    "status": {"badge"},
+    "status-overview": {"badge", "card"},
+    "alerts": {"badge", "modal"},
+    "configuration": {"input", "select", "button"},
+    "security": {"input", "button"},
+    "detail-view": {"card", "table"},
+    "rules-engine": {"table", "input"},
+    "charts": {"chart"},
+    "logs": {"table"},
+    "queue": {"table", "badge"},
+    "quick-actions": {"button"},
+    "modal": {"modal"},
+    "navigation": {"navigation"},
+    "progress": {"progress"},
+}
+
+
 class TraceIndex:
     """Pre-computed artifact index for fast sort/filter/paginate/trace."""
 
@@ -73,8 +107,17 @@ class TraceIndex:
         self._artifacts: Dict[str, dict] = {}
         # type → [ids]  (sorted by id)
         self._by_type: Dict[str, List[str]] = defaultdict(list)
-        # Full-text search index: id → lowercase searchable text
-        self._search_idx: Dict[str, str] = {}
+        # Tokenized inverted index (prefix/infix matching, BM25 ranking)
+        self._search = SearchIndex()
+        # Pre-sorted id orders and filter bitmaps for query()
+        self._views = ArtifactViews(self._artifacts, self._link_counts)
+
+    def _link_counts(self, aid: str) -> Tuple[int, int]:
+        """(upstream, downstream) edge counts of an artifact."""
+        return (
+            len(self.link_graph._reverse_adjacency.get(aid, set())),
+            len(self.link_graph._adjacency.get(aid, set())),
+        )
 
     # ── Build ────────────────────────────────────────────────────────
 
@@ -89,7 +132,6 @@ class TraceIndex:
         self.project_dir = Path(project_dir)
         self._artifacts.clear()
         self._by_type.clear()
-        self._search_idx.clear()
 
         # 1) Let LinkGraph build its node/edge graph from disk
         self.link_graph.build_from_project(self.project_dir)
@@ -109,9 +151,13 @@ class TraceIndex:
             self._build_cross_links(project_data)
 
         # 4) Build search index
-        for aid, art in self._artifacts.items():
-            text = f"{art.get('title', '')} {art.get('description', '')}"
-            self._search_idx[aid] = text.lower()
+        self._search.build(
+            (aid, str(art.get("title", "")), str(art.get("description", "")))
+            for aid, art in self._artifacts.items()
+        )
+
+        # 5) Sorted views and filter bitmaps for paginated queries
+        self._views.rebuild()
 
         print(f"[TraceIndex] Indexed {len(self._artifacts)} artifacts, "
               f"{len(self.link_graph.edges)} edges")
@@ -149,27 +195,33 @@ class TraceIndex:
         for nid, data in self.link_graph.nodes.items():
             if nid in self._artifacts:
                 continue
-            # Skip "node-" prefixed duplicates when base ID exists
-            if nid.startswith("node-") and nid[5:] in self.link_graph.nodes:
+            rec = self._record_from_node(nid, data)
+            if rec is None:
                 continue
-            art_type = data.get("type", "unknown")
-            # Normalise type names
-            if art_type == "user_story":
-                art_type = "user-story"
-            elif art_type == "functional" or art_type == "non_functional":
-                art_type = "requirement"
-
-            rec = {
-                "id": nid,
-                "type": art_type,
-                "title": data.get("title", nid),
-                "description": data.get("description", ""),
-                "priority": data.get("priority", ""),
-                "status": data.get("validation_status", data.get("status", "")),
-                "file_path": data.get("file", ""),
-            }
             self._artifacts[nid] = rec
-            self._by_type[art_type].append(nid)
+            self._by_type[rec["type"]].append(nid)
+
+    def _record_from_node(self, nid: str, data: dict) -> Optional[dict]:
+        """Flat index record for a LinkGraph node (None for skipped duplicates)."""
+        # Skip "node-" prefixed duplicates when base ID exists
+        if nid.startswith("node-") and nid[5:] in self.link_graph.nodes:
+            return None
+        art_type = data.get("type", "unknown")
+        # Normalise type names
+        if art_type == "user_story":
+            art_type = "user-story"
+        elif art_type == "functional" or art_type == "non_functional":
+            art_type = "requirement"
+
+        return {
+            "id": nid,
+            "type": art_type,
+            "title": data.get("title", nid),
+            "description": data.get("description", ""),
+            "priority": data.get("priority", ""),
+            "status": data.get("validation_status", data.get("status", "")),
+            "file_path": data.get("file", ""),
+        }
 
     def _index_extra_from_project_data(self, pd: dict):
         """Pick up artifacts from project_data that LinkGraph may miss."""
@@ -454,54 +506,53 @@ class TraceIndex:
             return True
 
         # Helper: find artifact id by partial match within a type
-        def _find_id(art_type: str, partial: str) -> Optional[str]:
-            if not partial:
-                return None
-            # Exact match first
-            if partial in self._artifacts:
-                return partial
-            # Try with "node-" prefix (LinkGraph convention)
-            if f"node-{partial}" in self._artifacts:
-                return f"node-{partial}"
-            partial_upper = partial.upper()
-            for aid in self._by_type.get(art_type, []):
-                if partial_upper in aid.upper():
-                    return aid
-            # For entities: strip common prefixes like "ENTITY-"
-            if art_type == "entity" and "-" in partial:
-                suffix = partial.split("-", 1)[1]
-                for aid in self._by_type.get("entity", []):
-                    if suffix.upper() in aid.upper():
-                        return aid
-            return None
+        # (exact, "node-" prefixed, then indexed substring match)
+        _find_id = IdFinder(self._artifacts, self._by_type).find
+
+        # Components by component_type, in list order
+        comps_by_type: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        for ci, comp in enumerate(components):
+            ctype = (comp.get("component_type") or "").lower()
+            comps_by_type[ctype].append((ci, comp.get("id", "")))
+
+        def _components_for(content_types) -> List[str]:
+            matching = set()
+            for ct in content_types:
+                matching.update(CONTENT_TO_COMP.get(ct, set()))
+            hits = [hit for ctype in matching for hit in comps_by_type.get(ctype, [])]
+            return [cid for _, cid in sorted(hits)]
+
+        # Entity name (and singular) → id, for path segment matching
+        entity_map: Dict[str, str] = {}
+        for ent in entities:
+            name = (ent.get("name") or ent.get("id", "")).lower()
+            if name:
+                eid = ent.get("id") or ent.get("name", "")
+                entity_map[name] = eid
+                if name.endswith("s"):
+                    entity_map[name[:-1]] = eid
+
+        # Persona role/name found in story.persona → (persona, story) pairs
+        persona_patterns: List[str] = []
+        pattern_persona: List[int] = []
+        for pi, persona in enumerate(personas):
+            for text in ((persona.get("role") or "").lower(),
+                         (persona.get("name") or "").lower()):
+                if text:
+                    persona_patterns.append(text)
+                    pattern_persona.append(pi)
+        persona_matcher = AhoCorasick(persona_patterns)
+        persona_story_pairs: List[Tuple[int, int]] = []
+        for si, story in enumerate(user_stories):
+            sp = (story.get("persona") or "").lower()
+            if sp:
+                persona_story_pairs.extend(
+                    {(pattern_persona[i], si) for i in persona_matcher.find_all(sp)}
+                )
+        persona_story_pairs.sort()
 
         # ── 1. Screen → Component (via content_types matching) ──────
         if screens and components:
-            CONTENT_TO_COMP = {
-                "dashboard": {"card", "chart"},
-                "kpis": {"card", "chart"},
-                "real-time-dashboard": {"card", "chart", "table"},
-                "form": {"input", "button", "select"},
-                "forms": {"input", "button", "select"},
-                "list": {"table"},
-                "table": {"table"},
-                "filters": {"input", "select", "button"},
-                "search": {"input"},
-                "status": {"badge"},
-                "status-overview": {"badge", "card"},
-                "alerts": {"badge", "modal"},
-                "configuration": {"input", "select", "button"},
-                "security": {"input", "button"},
-                "detail-view": {"card", "table"},
-                "rules-engine": {"table", "input"},
-                "charts": {"chart"},
-                "logs": {"table"},
-                "queue": {"table", "badge"},
-                "quick-actions": {"button"},
-                "modal": {"modal"},
-                "navigation": {"navigation"},
-                "progress": {"progress"},
-            }
             for scr in screens:
                 sid = scr.get("id", "")
                 if not sid:
@@ -512,17 +563,8 @@ class TraceIndex:
                     if comp_id:
                         _link(sid, comp_id, "screen_component")
                 # Method 2: content_types → component_type matching
-                content_types = scr.get("content_types") or []
-                if content_types:
-                    matching = set()
-                    for ct in content_types:
-                        matching.update(CONTENT_TO_COMP.get(ct, set()))
-                    if matching:
-                        for comp in components:
-                            cid = comp.get("id", "")
-                            ctype = (comp.get("component_type") or "").lower()
-                            if ctype in matching:
-                                _link(sid, cid, "screen_component")
+                for cid in _components_for(scr.get("content_types") or []):
+                    _link(sid, cid, "screen_component")
 
         # ── 1b. IA-Screen children + content_types from LinkGraph ────
         # LinkGraph loads IA screens with children and content_types
@@ -535,17 +577,8 @@ class TraceIndex:
                 for child_id in (data.get("children") or []):
                     _link(nid, child_id, "screen_child")
                 # content_types → component matching
-                content_types = data.get("content_types") or []
-                if content_types:
-                    matching = set()
-                    for ct in content_types:
-                        matching.update(CONTENT_TO_COMP.get(ct, set()))
-                    if matching:
-                        for comp in components:
-                            cid = comp.get("id", "")
-                            ctype = (comp.get("component_type") or "").lower()
-                            if ctype in matching:
-                                _link(nid, cid, "screen_component")
+                for cid in _components_for(data.get("content_types") or []):
+                    _link(nid, cid, "screen_component")
 
         # ── 2. Component → Screen (via parent_screen_ids) ───────────
         if components:
@@ -585,14 +618,6 @@ class TraceIndex:
 
         # ── 5. Entity → API (via path segment matching) ─────────────
         if entities and api_endpoints:
-            entity_map = {}
-            for ent in entities:
-                name = (ent.get("name") or ent.get("id", "")).lower()
-                if name:
-                    eid = ent.get("id") or ent.get("name", "")
-                    entity_map[name] = eid
-                    if name.endswith("s"):
-                        entity_map[name[:-1]] = eid
             for ep in api_endpoints:
                 path = ep.get("path", "")
                 ep_id = ep.get("id", "")
@@ -607,14 +632,6 @@ class TraceIndex:
 
         # ── 6. Screen → Entity (via data_requirements path) ────────
         if screens and entities:
-            entity_map = {}
-            for ent in entities:
-                name = (ent.get("name") or ent.get("id", "")).lower()
-                if name:
-                    eid = ent.get("id") or ent.get("name", "")
-                    entity_map[name] = eid
-                    if name.endswith("s"):
-                        entity_map[name[:-1]] = eid
             for scr in screens:
                 sid = scr.get("id", "")
                 for api_ref in (scr.get("data_requirements") or []):
@@ -648,21 +665,9 @@ class TraceIndex:
                         _link(ep_id, sid, "api_screen")
 
         # ── 8. Persona → User Story (via role matching) ─────────────
-        if personas and user_stories:
-            for persona in personas:
-                pid = persona.get("id", "")
-                prole = (persona.get("role") or "").lower()
-                pname = (persona.get("name") or "").lower()
-                if not prole and not pname:
-                    continue
-                for story in user_stories:
-                    sp = (story.get("persona") or "").lower()
-                    usid = story.get("id", "")
-                    if sp and (
-                        (prole and prole in sp)
-                        or (pname and pname in sp)
-                    ):
-                        _link(pid, usid, "persona_story")
+        for pi, si in persona_story_pairs:
+            _link(personas[pi].get("id", ""), user_stories[si].get("id", ""),
+                  "persona_story")
 
         # ── 9. Test → API (via API path in content) ─────────────────
         if test_cases and api_endpoints:
@@ -671,6 +676,7 @@ class TraceIndex:
                 p = (ep.get("path") or "").lower()
                 if p:
                     api_paths.append((p, ep.get("id", "")))
+            path_matcher = AhoCorasick(p for p, _ in api_paths)
             for tc in test_cases:
                 tid = tc.get("id", "")
                 content = (
@@ -680,19 +686,18 @@ class TraceIndex:
                 ).lower()
                 if not content:
                     continue
-                for path, ep_id in api_paths:
-                    if path in content:
-                        _link(tid, ep_id, "test_api")
+                for i in sorted(path_matcher.find_all(content)):
+                    _link(tid, api_paths[i][1], "test_api")
 
         # ── 10. Diagram → Entity (via mermaid code) ─────────────────
         if entities:
-            entity_names = set()
             ename_to_id = {}
             for ent in entities:
                 name = (ent.get("name") or ent.get("id", "")).lower()
                 if name and len(name) > 2:
-                    entity_names.add(name)
                     ename_to_id[name] = ent.get("id") or ent.get("name", "")
+            entity_names = list(ename_to_id)
+            name_matcher = AhoCorasick(entity_names)
             # Check diagrams from project_data
             for diag in diagrams:
                 did = diag.get("id", "")
@@ -703,10 +708,8 @@ class TraceIndex:
                     continue
                 # Try both raw ID and prefixed version
                 actual_id = did if did in self._artifacts else f"diagram_{did}"
-                for ename in entity_names:
-                    if ename in code:
-                        ent_id = ename_to_id[ename]
-                        _link(actual_id, ent_id, "diagram_entity")
+                for i in sorted(name_matcher.find_all(code)):
+                    _link(actual_id, ename_to_id[entity_names[i]], "diagram_entity")
             # Also check LinkGraph diagram nodes (have mermaid_code in node data)
             for nid, ndata in self.link_graph.nodes.items():
                 if ndata.get("type") != "diagram":
@@ -714,10 +717,8 @@ class TraceIndex:
                 code = (ndata.get("mermaid_code") or ndata.get("code", "")).lower()
                 if not code:
                     continue
-                for ename in entity_names:
-                    if ename in code:
-                        ent_id = ename_to_id[ename]
-                        _link(nid, ent_id, "diagram_entity")
+                for i in sorted(name_matcher.find_all(code)):
+                    _link(nid, ename_to_id[entity_names[i]], "diagram_entity")
 
         # ── 11. Task → Feature/Entity/API (via parent fields) ───────
         if isinstance(tasks_dict, dict):
@@ -775,6 +776,8 @@ class TraceIndex:
                 sid = story.get("id", "")
                 if stitle and sid:
                     story_title_map[_norm(stitle)] = sid
+            story_titles = list(story_title_map)
+            title_matcher = RelatedStrings(story_titles)
 
             for feat_id, task_list in tasks_dict.items():
                 if not isinstance(task_list, list):
@@ -797,10 +800,9 @@ class TraceIndex:
                                 _link(matched_sid, tid, "story_task")
                                 break
                             # Partial match: story title contains task name or vice versa
-                            for stitle_norm, sid in story_title_map.items():
-                                if norm_name in stitle_norm or stitle_norm in norm_name:
-                                    _link(sid, tid, "story_task")
-                                    break
+                            first = title_matcher.first(norm_name)
+                            if first is not None:
+                                _link(story_title_map[story_titles[first]], tid, "story_task")
                             break
 
         # ── 12. Epic → Requirement + Epic → Story (from epic data) ──
@@ -843,15 +845,10 @@ class TraceIndex:
                 sus = scr.get("parent_user_story", "")
                 if sus:
                     story_to_screens[sus].append(scr.get("id", ""))
-            for persona in personas:
-                pid = persona.get("id", "")
-                prole = (persona.get("role") or "").lower()
-                pname = (persona.get("name") or "").lower()
-                for story in user_stories:
-                    sp = (story.get("persona") or "").lower()
-                    if sp and ((prole and prole in sp) or (pname and pname in sp)):
-                        for scr_id in story_to_screens.get(story.get("id", ""), []):
-                            _link(pid, scr_id, "persona_screen")
+            for pi, si in persona_story_pairs:
+                pid = personas[pi].get("id", "")
+                for scr_id in story_to_screens.get(user_stories[si].get("id", ""), []):
+                    _link(pid, scr_id, "persona_screen")
 
         # ── 15. Component → API (via parent screen data_reqs) ───────
         if components and screens and api_endpoints:
@@ -897,6 +894,13 @@ class TraceIndex:
                     persona_name_map[pname] = pid
                 if prole:
                     persona_name_map[prole] = pid
+            persona_keys = list(persona_name_map)
+            persona_key_matcher = RelatedStrings(persona_keys)
+            screen_names = [
+                (scr.get("name") or scr.get("title", "")).lower().replace(" ", "")
+                for scr in screens
+            ]
+            screen_matcher = RelatedStrings(screen_names)
 
             for flow in user_flows:
                 fid = flow.get("id", "")
@@ -904,21 +908,18 @@ class TraceIndex:
                 for step in (flow.get("steps") or []):
                     screen_name = step.get("screen", "")
                     if screen_name:
-                        for scr in screens:
-                            sname = (scr.get("name") or scr.get("title", "")).lower().replace(" ", "")
-                            if screen_name.lower().replace(" ", "") in sname or sname in screen_name.lower().replace(" ", ""):
-                                _link(fid, scr.get("id", ""), "flow_screen")
-                                break
+                        first = screen_matcher.first(screen_name.lower().replace(" ", ""))
+                        if first is not None:
+                            _link(fid, screens[first].get("id", ""), "flow_screen")
                 # Flow → persona via actor or persona field
                 flow_actor = (flow.get("actor") or flow.get("persona") or "").lower()
                 if flow_actor:
                     matched_pid = persona_name_map.get(flow_actor)
                     if not matched_pid:
                         # Partial match
-                        for key, pid in persona_name_map.items():
-                            if flow_actor in key or key in flow_actor:
-                                matched_pid = pid
-                                break
+                        first = persona_key_matcher.first(flow_actor)
+                        if first is not None:
+                            matched_pid = persona_name_map[persona_keys[first]]
                     if matched_pid:
                         _link(matched_pid, fid, "flow_persona")
                 # Flow → explicit linked IDs
@@ -969,44 +970,40 @@ class TraceIndex:
 
         Returns dict with keys: items, total, page, page_size, total_pages.
         """
-        # 1) Collect candidate IDs
-        if artifact_type and artifact_type in self._by_type:
-            ids = list(self._by_type[artifact_type])
-        elif artifact_type:
-            ids = []
-        else:
-            ids = list(self._artifacts.keys())
+        # 1) Candidate bitmap (None = every artifact of the type)
+        if artifact_type and artifact_type not in self._by_type:
+            return {"items": [], "total": 0, "page": 1,
+                    "page_size": page_size, "total_pages": 1}
+        art_type = artifact_type or None
+        views = self._views
+        mask: Optional[int] = None
 
         # 2) Full-text search filter
         if search:
-            q = search.lower()
-            ids = [i for i in ids if q in self._search_idx.get(i, "")]
+            mask = views.ids_mask(self._search.match(search))
 
         # 3) Field filters
         if filters:
             for fld, val in filters.items():
-                val_lower = val.lower()
-                ids = [
-                    i for i in ids
-                    if val_lower in str(self._artifacts.get(i, {}).get(fld, "")).lower()
-                ]
-
-        total = len(ids)
-
-        # 4) Sort
-        reverse = sort_dir == "desc"
-        ids.sort(
-            key=lambda i: str(self._artifacts.get(i, {}).get(sort_by, "")).lower(),
-            reverse=reverse,
-        )
+                fmask = views.filter_mask(fld, val)
+                mask = fmask if mask is None else mask & fmask
+
+        if mask is None:
+            total = len(views.order(sort_by, art_type))
+        else:
+            if art_type:
+                mask &= views.type_mask(art_type)
+            total = mask.bit_count()
 
-        # 5) Paginate
+        # 4) Paginate over the pre-sorted order
         total_pages = max(1, math.ceil(total / page_size))
         page = max(1, min(page, total_pages))
         start = (page - 1) * page_size
-        page_ids = ids[start : start + page_size]
+        page_ids = views.page(
+            sort_by, sort_dir == "desc", start, page_size, art_type, mask
+        )
 
-        # 6) Build summary items (light — no full data)
+        # 5) Build summary items (light — no full data)
         items = []
         for aid in page_ids:
             art = self._artifacts.get(aid, {})
@@ -1239,26 +1236,142 @@ class TraceIndex:
     def search(
         self, query_text: str, types: Optional[List[str]] = None, limit: int = 50
     ) -> List[dict]:
-        """Full-text search across title + description."""
-        q = query_text.lower()
+        """Full-text search across title + description.
+
+        Every query word must match (exactly, as a prefix or inside a word);
+        results are ranked by BM25 with title hits above description hits.
+        """
+        def keep(aid: str) -> bool:
+            return not types or self._artifacts.get(aid, {}).get("type", "") in types
+
+        if tokenize(query_text):
+            hits = self._search.top(query_text, limit, keep=keep)
+        else:
+            # Empty query matches everything
+            hits = [(aid, 0.0) for aid in self._artifacts if keep(aid)][:limit]
+
         results = []
-        for aid, text in self._search_idx.items():
-            if q not in text:
-                continue
+        for aid, score in hits:
             art = self._artifacts.get(aid, {})
-            if types and art.get("type", "") not in types:
-                continue
-            # Simple relevance: title match > description match
-            score = 2 if q in art.get("title", "").lower() else 1
             results.append({
                 "id": aid,
                 "type": art.get("type", ""),
                 "title": art.get("title", ""),
                 "description": art.get("description", "")[:200],
-                "score": score,
+                "score": round(score, 4),
             })
         results.sort(key=lambda x: (-x["score"], x["title"]))
-        return results[:limit]
+        return results
+
+    # ── Incremental updates ──────────────────────────────────────────
+
+    def _index_artifact(self, rec: dict):
+        aid = rec["id"]
+        self._artifacts[aid] = rec
+        bisect.insort(self._by_type[rec.get("type", "")], aid)
+        self._search.add(aid, str(rec.get("title", "")), str(rec.get("description", "")))
+        self._views.add(aid)
+
+    def _unindex_artifact(self, aid: str):
+        rec = self._artifacts.get(aid)
+        if rec is None:
+            return
+        self._views.remove(aid)
+        self._search.remove(aid)
+        ids = self._by_type.get(rec.get("type", ""), [])
+        pos = bisect.bisect_left(ids, aid)
+        if pos < len(ids) and ids[pos] == aid:
+            del ids[pos]
+        del self._artifacts[aid]
+
+    def add_artifact(self, rec: dict):
+        """Add an artifact record, or replace the one with the same id."""
+        self._unindex_artifact(rec["id"])
+        self._index_artifact(rec)
+
+    def remove_artifact(self, artifact_id: str):
+        """
+        Drop an artifact and the derived links (cross-links, manifest) touching
+        it. Links read from project files stay, as they would on a full build.
+        """
+        if artifact_id not in self._artifacts:
+            return
+        self._unindex_artifact(artifact_id)
+        lg = self.link_graph
+        neighbours = set(lg._adjacency.get(artifact_id, set())) | set(
+            lg._reverse_adjacency.get(artifact_id, set())
+        )
+        for other in neighbours:
+            for src, dst in ((artifact_id, other), (other, artifact_id)):
+                if dst not in lg._adjacency.get(src, set()):
+                    continue
+                edge_type = lg._edge_types.get((src, dst), "")
+                if Edge(src, dst, edge_type) in lg._edge_sources:
+                    continue
+                self.remove_edge(src, dst)
+        self._views.on_links_changed(neighbours)
+
+    def add_edge(self, source: str, target: str, edge_type: str):
+        """Add a link between two artifacts."""
+        self.link_graph._add_edge(source, target, edge_type)
+        self._views.on_links_changed((source, target))
+
+    def remove_edge(self, source: str, target: str):
+        """Remove the link source → target, whichever way it was added."""
+        lg = self.link_graph
+        edge_type = lg._edge_types.get((source, target))
+        if edge_type is None:
+            return
+        if Edge(source, target, edge_type) in lg._edge_set:
+            lg.remove_edges([Edge(source, target, edge_type)])
+        else:  # adjacency-only links (link_manifest.json)
+            lg._edge_types.pop((source, target), None)
+            lg._adjacency.get(source, set()).discard(target)
+            lg._reverse_adjacency.get(target, set()).discard(source)
+        self._views.on_links_changed((source, target))
+
+    def apply_file_change(self, event_type: str, file_path: str,
+                          parsed: Optional[Dict[str, Any]] = None) -> dict:
+        """
+        Re-index the artifacts and links that came from one changed file.
+
+        Handles the files LinkGraph can reload on its own (journal.json,
+        user_stories.md, task_list.json, diagrams/*.mmd). Other files need a
+        full build().
+
+        parsed: the file's link_graph.prepare_reload() snapshot, already run
+        through parse_reload() (e.g. in a worker thread); re-read if omitted.
+
+        Returns {handled, updated_ids, removed_ids}.
+        """
+        if parsed is not None:
+            delta = self.link_graph.apply_reload(parsed)
+        else:
+            delta = self.link_graph.reload_file(file_path)
+        if delta is None:
+            return {"handled": False, "updated_ids": [], "removed_ids": []}
+
+        removed = []
+        for nid in delta["removed_nodes"]:
+            if nid in self._artifacts:
+                self.remove_artifact(nid)
+                removed.append(nid)
+        updated = []
+        for nid in delta["changed_nodes"]:
+            rec = self._record_from_node(nid, self.link_graph.nodes[nid])
+            if rec is not None:
+                self.add_artifact(rec)
+                updated.append(nid)
+
+        touched = set()
+        for edge in delta["added_edges"] + delta["removed_edges"]:
+            touched.update((edge.source, edge.target))
+        self._views.on_links_changed(touched)
+
+        print(f"[TraceIndex] {event_type} {Path(file_path).name}: "
+              f"{len(updated)} updated, {len(removed)} removed, "
+              f"{len(delta['added_edges'])}+/{len(delta['removed_edges'])}- edges")
+        return {"handled": True, "updated_ids": updated, "removed_ids": removed}
 
     # ── Update (edit + write-back) ───────────────────────────────────
 
@@ -1266,6 +1379,18 @@ class TraceIndex:
         """
         Update an artifact field in-memory and write back to source file.
 
+        Returns {success, impacted_ids}.
+        """
+        result = self.edit_artifact(artifact_id, field, value)
+        if "error" in result:
+            return result
+        result["success"] = self._write_back(artifact_id, field, value)
+        return result
+
+    def edit_artifact(self, artifact_id: str, field: str, value: Any) -> dict:
+        """
+        Update an artifact field in-memory only (see write_back_target()).
+
         Returns {success, impacted_ids}.
         """
         art = self._artifacts.get(artifact_id)
@@ -1273,7 +1398,9 @@ class TraceIndex:
             return {"success": False, "error": "Artifact not found", "impacted_ids": []}
 
         # Update in-memory
+        old_value = art.get(field)
         art[field] = value
+        self._views.on_field_change(artifact_id, field, old_value)
 
         # Update LinkGraph node
         lg_node = self.link_graph.get_node(artifact_id)
@@ -1281,118 +1408,114 @@ class TraceIndex:
             lg_node[field] = value
 
         # Update search index
-        text = f"{art.get('title', '')} {art.get('description', '')}"
-        self._search_idx[artifact_id] = text.lower()
-
-        # Write back to disk
-        success = self._write_back(artifact_id, field, value)
+        self._search.add(
+            artifact_id, str(art.get("title", "")), str(art.get("description", ""))
+        )
 
         # Compute impacted IDs
         impacted = self.link_graph.get_linked_nodes(artifact_id, depth=2)
 
         return {
-            "success": success,
+            "success": True,
             "impacted_ids": impacted,
         }
 
     def _write_back(self, artifact_id: str, field: str, value: Any) -> bool:
         """Write the updated field back to its source file on disk."""
-        if not self.project_dir:
+        target = self.write_back_target(artifact_id, field, value)
+        if target is None:
             return False
-
-        art = self._artifacts.get(artifact_id, {})
-        art_type = art.get("type", "")
-
         try:
-            if art_type == "requirement":
-                return self._write_back_requirement(artifact_id, field, value)
-            elif art_type == "user-story":
-                return self._write_back_user_story(artifact_id, field, value)
-            elif art_type == "task":
-                return self._write_back_task(artifact_id, field, value)
-            elif art_type == "diagram":
-                return self._write_back_diagram(artifact_id, field, value)
-            # Other types: best-effort via LinkGraph node data
-            return False
+            return apply_edits(target[0], target[1], [target[2]])[0]
         except Exception as e:
             print(f"[TraceIndex] Write-back failed for {artifact_id}: {e}")
             return False
 
-    def _write_back_requirement(self, aid: str, field: str, value: Any) -> bool:
-        """Update requirement in journal.json."""
-        journal_path = self.project_dir / "journal.json"
-        if not journal_path.exists():
-            return False
+    def write_back_target(
+        self, artifact_id: str, field: str, value: Any
+    ) -> Optional[Tuple[Path, str, FileEdit]]:
+        """
+        (source file, format, edit) that writes the field back to disk.
 
-        with open(journal_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        The edit is applied to the parsed file (see write_queue.apply_edits),
+        so several edits of one file can share a single read and rewrite.
+        None if the artifact type has no write-back.
+        """
+        if not self.project_dir:
+            return None
 
-        nodes = data.get("nodes", {})
-        # Try both the artifact id and node-prefixed variant
-        node_key = None
-        for key in [aid, f"node-{aid}"]:
-            if key in nodes:
-                node_key = key
-                break
+        art = self._artifacts.get(artifact_id, {})
+        art_type = art.get("type", "")
 
-        if node_key is None:
-            return False
+        if art_type == "requirement":
+            return self._write_back_requirement(artifact_id, field, value)
+        elif art_type == "user-story":
+            return self._write_back_user_story(artifact_id, field, value)
+        elif art_type == "task":
+            return self._write_back_task(artifact_id, field, value)
+        elif art_type == "diagram":
+            return self._write_back_diagram(artifact_id, field, value)
+        # Other types: best-effort via LinkGraph node data
+        return None
+
+    def _write_back_requirement(self, aid: str, field: str, value: Any):
+        """Update requirement in journal.json."""
+        journal_path = self.project_dir / "journal.json"
+        if not journal_path.exists():
+            return None
 
-        nodes[node_key][field] = value
+        def edit(data):
+            nodes = data.get("nodes", {})
+            # Try both the artifact id and node-prefixed variant
+            for key in [aid, f"node-{aid}"]:
+                if key in nodes:
+                    nodes[key][field] = value
+                    return data
+            return None
 
-        with open(journal_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        return True
+        return journal_path, "json", edit
 
-    def _write_back_user_story(self, aid: str, field: str, value: Any) -> bool:
+    def _write_back_user_story(self, aid: str, field: str, value: Any):
         """Update user story in user_stories.json."""
         us_path = self.project_dir / "user_stories.json"
         if not us_path.exists():
-            return False
-
-        with open(us_path, "r", encoding="utf-8") as f:
-            stories = json.load(f)
+            return None
 
-        if not isinstance(stories, list):
-            stories = stories.get("user_stories", [])
+        def edit(data):
+            stories = data if isinstance(data, list) else data.get("user_stories", [])
+            for story in stories:
+                if story.get("id") == aid:
+                    story[field] = value
+                    return data
+            return None
 
-        for story in stories:
-            if story.get("id") == aid:
-                story[field] = value
-                with open(us_path, "w", encoding="utf-8") as f:
-                    json.dump(stories, f, indent=2, ensure_ascii=False)
-                return True
-        return False
+        return us_path, "json", edit
 
-    def _write_back_task(self, aid: str, field: str, value: Any) -> bool:
+    def _write_back_task(self, aid: str, field: str, value: Any):
         """Update task in tasks/task_list.json."""
         tasks_path = self.project_dir / "tasks" / "task_list.json"
         if not tasks_path.exists():
-            return False
+            return None
 
-        with open(tasks_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        def edit(data):
+            features = data.get("features", {})
+            for feat_tasks in features.values():
+                for task in feat_tasks:
+                    if task.get("id") == aid:
+                        task[field] = value
+                        return data
+            return None
 
-        features = data.get("features", {})
-        for feat_tasks in features.values():
-            for task in feat_tasks:
-                if task.get("id") == aid:
-                    task[field] = value
-                    with open(tasks_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    return True
-        return False
-
-    def _write_back_diagram(self, aid: str, field: str, value: Any) -> bool:
+        return tasks_path, "json", edit
+
+    def _write_back_diagram(self, aid: str, field: str, value: Any):
         """Update diagram .mmd file."""
         if field != "content":
-            return False
+            return None
         lg_node = self.link_graph.get_node(aid)
         if not lg_node:
-            return False
+            return None
         file_path = lg_node.get("file", "")
         if not file_path:
-            return False
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(value)
-        return True
+            return None
+        return Path(file_path), "text", lambda _old: value
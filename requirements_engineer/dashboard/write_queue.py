@@ -0,0 +1,134 @@
+"""
+Write Queue — coalesced, atomic write-back of dashboard edits.
+
+Trace Explorer edits change one field of one artifact, but the artifact
+lives in a shared document (journal.json, task_list.json, ...). Writing
+each edit separately means re-reading and rewriting the whole file per
+field. The queue instead collects edits per file and applies every edit
+that is pending when a worker picks the file up: one read, all edits, one
+atomic rewrite (temp file + os.replace).
+
+Work runs on a small bounded thread pool. Edits to the same file are
+applied in submission order and never concurrently; edits arriving while a
+file is being written are batched into its next write.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# edit(document) -> new document (may be the same, mutated object),
+# or None if the edit does not apply to this document
+FileEdit = Callable[[Any], Optional[Any]]
+
+FORMATS = ("json", "text")
+
+
+def _read(path: Path, fmt: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        if fmt == "json":
+            return json.load(f)
+        return f.read()
+
+
+def _write_atomic(path: Path, fmt: str, doc: Any):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if fmt == "json":
+                json.dump(doc, f, indent=2, ensure_ascii=False)
+            else:
+                f.write(doc)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def apply_edits(path: Path, fmt: str, edits: List[FileEdit]) -> List[bool]:
+    """
+    Apply edits to one file with a single read and a single write.
+
+    Returns one flag per edit (False = edit did not apply). Text files that
+    do not exist yet start out empty.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown file format: {fmt}")
+    path = Path(path)
+    if path.exists():
+        doc = _read(path, fmt)
+    elif fmt == "text":
+        doc = ""
+    else:
+        return [False] * len(edits)
+
+    results = []
+    for edit in edits:
+        try:
+            new_doc = edit(doc)
+        except Exception as e:
+            print(f"  [WARN] Edit of {path.name} failed: {e}")
+            new_doc = None
+        if new_doc is None:
+            results.append(False)
+        else:
+            doc = new_doc
+            results.append(True)
+    if any(results):
+        _write_atomic(path, fmt, doc)
+    return results
+
+
+class WriteQueue:
+    """Per-file coalescing write-back on a bounded thread pool."""
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="write-queue")
+        self._lock = threading.Lock()
+        # path → (format, [(edit, future)]) waiting for the next write
+        self._pending: Dict[Path, Tuple[str, List[Tuple[FileEdit, Future]]]] = {}
+        # paths with a flush scheduled or running
+        self._active: set = set()
+
+    def submit(self, path: Path, edit: FileEdit, fmt: str = "json") -> Future:
+        """Queue an edit; the future resolves to whether it applied."""
+        path = Path(path)
+        future: Future = Future()
+        with self._lock:
+            entry = self._pending.get(path)
+            if entry is None:
+                entry = self._pending[path] = (fmt, [])
+            elif entry[0] != fmt:
+                future.set_exception(ValueError(f"{path} queued as {entry[0]}, not {fmt}"))
+                return future
+            entry[1].append((edit, future))
+            if path not in self._active:
+                self._active.add(path)
+                self._pool.submit(self._flush, path)
+        return future
+
+    def _flush(self, path: Path):
+        while True:
+            with self._lock:
+                entry = self._pending.pop(path, None)
+                if entry is None:
+                    self._active.discard(path)
+                    return
+            fmt, batch = entry
+            try:
+                results = apply_edits(path, fmt, [edit for edit, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), ok in zip(batch, results):
+                future.set_result(ok)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
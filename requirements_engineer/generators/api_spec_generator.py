@@ -31,6 +31,7 @@ from requirements_engineer.core.token_manager import (
 # Import LLM logger
 import time
 from requirements_engineer.core.llm_logger import get_llm_logger, log_llm_call
+from requirements_engineer.core.llm_concurrency import get_llm_executor
 
 
 @dataclass_json
@@ -379,6 +380,11 @@ Return ONLY valid JSON, no other text."""
         Returns:
             List of APIEndpoint instances
         """
+        data = await self._request_endpoints(requirement, constraints)
+        return self._build_endpoints(requirement, data)
+
+    async def _request_endpoints(self, requirement, constraints: List[str] = None) -> Dict[str, Any]:
+        """LLM call for derive_endpoints(); returns the parsed JSON."""
         constraints_text = "\n".join(f"- {c}" for c in (constraints or [])) or "None specified"
 
         prompt = self.ENDPOINT_PROMPT.format(
@@ -390,8 +396,10 @@ Return ONLY valid JSON, no other text."""
         )
 
         response = await self._call_llm(prompt)
-        data = self._extract_json(response)
+        return self._extract_json(response)
 
+    def _build_endpoints(self, requirement, data: Dict[str, Any]) -> List[APIEndpoint]:
+        """Create (and register) APIEndpoints from a parsed LLM response."""
         endpoints = []
         for ep_data in data.get("endpoints", []):
             # Parse parameters
@@ -487,14 +495,18 @@ Return ONLY valid JSON, no other text."""
         batch_info = chunker.get_batch_info(functional_reqs)
         print(f"  Processing {batch_info['total_requirements']} functional requirements in {batch_info['num_batches']} batch(es)")
 
-        # Process each batch
+        # Process each batch: LLM calls run concurrently, results are merged in order
+        executor = get_llm_executor(self.config, self.model_name)
         batch_num = 0
         for batch in chunker.chunk_requirements(functional_reqs, template_tokens):
             batch_num += 1
             print(f"  [Batch {batch_num}/{batch_info['num_batches']}] Processing {len(batch)} requirements...")
 
-            for req in batch:
-                await self.derive_endpoints(req, constraints)
+            responses = await executor.map(
+                lambda req: self._request_endpoints(req, constraints), batch
+            )
+            for req, data in zip(batch, responses):
+                self._build_endpoints(req, data)
                 print(f"    Derived endpoints for {req.requirement_id}: {req.title}")
 
         # Deduplicate endpoints: merge same method+path, combine requirement refs
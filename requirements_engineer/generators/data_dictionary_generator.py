@@ -33,6 +33,7 @@ from requirements_engineer.core.token_manager import (
 # Import LLM logger
 import time
 from requirements_engineer.core.llm_logger import get_llm_logger, log_llm_call
+from requirements_engineer.core.llm_concurrency import get_llm_executor
 
 
 @dataclass_json
@@ -642,27 +643,29 @@ Return ONLY valid JSON."""
         # Track seen entity names (case-insensitive) to prevent duplicates like User/user
         seen_entity_keys = set()
 
-        # Process each batch using fixed batch size
-        batch_num = 0
+        # Build one prompt per fixed-size batch
+        prompts = []
         for i in range(0, len(requirements), max_requirements_per_batch):
             batch = requirements[i:i + max_requirements_per_batch]
-            batch_num += 1
-            print(f"  [Batch {batch_num}/{num_batches}] Processing {len(batch)} requirements...")
-
-            # Build requirements summary for this batch
             req_summary = ""
             for req in batch:
                 req_summary += f"- {req.requirement_id}: {req.title}\n"
                 req_summary += f"  {req.description}\n"
-
-            prompt = self.ENTITY_PROMPT.format(
+            prompts.append((len(batch), self.ENTITY_PROMPT.format(
                 requirements=req_summary,
                 domain=domain or "Software System"
-            )
+            )))
+
+        # Batches are analyzed concurrently; merging below stays in batch order
+        async def analyze(item):
+            batch_num, (batch_size, prompt) = item
+            print(f"  [Batch {batch_num}/{num_batches}] Analyzing {batch_size} requirements for domain entities...")
+            return self._extract_json(await self._call_llm(prompt))
+
+        executor = get_llm_executor(self.config, self.model_name)
+        responses = await executor.map(analyze, enumerate(prompts, 1))
 
-            print(f"    Analyzing batch for domain entities...")
-            response = await self._call_llm(prompt)
-            data = self._extract_json(response)
+        for batch_num, data in enumerate(responses, 1):
             all_batch_results.append(data)
 
             # Parse entities from this batch
@@ -14,6 +14,7 @@ from openai import AsyncOpenAI
 
 # Import LLM logger
 from requirements_engineer.core.llm_logger import get_llm_logger, log_llm_call
+from requirements_engineer.core.llm_concurrency import get_llm_executor
 
 
 @dataclass_json
@@ -183,7 +184,21 @@ Antworte NUR mit dem JSON-Objekt."""
         requirements: List[Any] = None
     ) -> List[Task]:
         """Generate tasks for a single feature."""
+        data = await self._request_tasks(
+            feature_name, feature_description, user_stories, requirements
+        )
+        if data is None:
+            return []
+        return self._build_tasks(feature_id, data)
 
+    async def _request_tasks(
+        self,
+        feature_name: str,
+        feature_description: str,
+        user_stories: List[Any] = None,
+        requirements: List[Any] = None
+    ) -> Optional[Dict[str, Any]]:
+        """LLM call for generate_tasks_for_feature(); parsed JSON or None on failure."""
         # Build user stories text
         us_lines = []
         if user_stories:
@@ -239,7 +254,18 @@ Antworte NUR mit dem JSON-Objekt."""
             elif "```" in content:
                 content = content.split("```")[1].split("```")[0].strip()
 
-            data = json.loads(content)
+            return json.loads(content)
+
+        except json.JSONDecodeError as e:
+            print(f"    [WARN] Could not parse tasks JSON: {e}")
+            return None
+        except Exception as e:
+            print(f"    [ERROR] Task generation failed: {e}")
+            return None
+
+    def _build_tasks(self, feature_id: str, data: Dict[str, Any]) -> List[Task]:
+        """Create Tasks (with sequential TASK-xxx IDs) from a parsed LLM response."""
+        try:
             tasks = []
 
             for task_data in data.get("tasks", []):
@@ -265,9 +291,6 @@ Antworte NUR mit dem JSON-Objekt."""
 
             return tasks
 
-        except json.JSONDecodeError as e:
-            print(f"    [WARN] Could not parse tasks JSON: {e}")
-            return []
         except Exception as e:
             print(f"    [ERROR] Task generation failed: {e}")
             return []
@@ -297,6 +320,7 @@ Antworte NUR mit dem JSON-Objekt."""
 
         print(f"  Generating tasks for {len(features)} features...")
 
+        feature_infos = []
         for i, feature in enumerate(features, 1):
             # Extract feature info
             if hasattr(feature, 'id'):
@@ -312,22 +336,25 @@ Antworte NUR mit dem JSON-Objekt."""
                 feature_name = str(feature)
                 feature_desc = ''
 
-            print(f"    [{i}/{len(features)}] {feature_name}...")
-
             # Get related user stories
             related_us = us_by_feature.get(feature_id, user_stories[:3] if user_stories else [])
+            feature_infos.append((i, feature_id, feature_name, feature_desc, related_us))
 
-            tasks = await self.generate_tasks_for_feature(
-                feature_id=feature_id,
-                feature_name=feature_name,
-                feature_description=feature_desc,
-                user_stories=related_us,
-                requirements=requirements
+        async def request(info):
+            i, feature_id, feature_name, feature_desc, related_us = info
+            print(f"    [{i}/{len(features)}] {feature_name}...")
+            return await self._request_tasks(
+                feature_name, feature_desc, related_us, requirements
             )
 
+        # LLM calls run concurrently; TASK IDs are assigned in feature order below
+        responses = await get_llm_executor(self.config, self.model).map(request, feature_infos)
+
+        for (i, feature_id, feature_name, _, _), data in zip(feature_infos, responses):
+            tasks = self._build_tasks(feature_id, data) if data is not None else []
             if tasks:
                 breakdown.features[feature_id] = tasks
-                print(f"      Generated {len(tasks)} tasks")
+                print(f"      {feature_name}: generated {len(tasks)} tasks")
 
         # Add infrastructure tasks from entities (DB migrations)
         if entities:
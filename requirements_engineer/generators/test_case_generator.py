@@ -26,6 +26,7 @@ except ImportError:
 # Import LLM logger
 import time
 from requirements_engineer.core.llm_logger import get_llm_logger, log_llm_call
+from requirements_engineer.core.llm_concurrency import get_llm_executor
 
 # Import local types if available
 try:
@@ -613,6 +614,11 @@ Return ONLY valid JSON, no other text."""
         Returns:
             List of TestCase instances
         """
+        data = await self._request_test_cases(user_story)
+        return self._build_test_cases(user_story, data)
+
+    async def _request_test_cases(self, user_story: UserStory) -> Dict[str, Any]:
+        """LLM call for generate_test_cases(); returns the parsed JSON."""
         # Format acceptance criteria
         ac_text = ""
         for i, ac in enumerate(user_story.acceptance_criteria, 1):
@@ -628,8 +634,10 @@ Return ONLY valid JSON, no other text."""
         )
 
         response = await self._call_llm(prompt)
-        data = self._extract_json(response)
+        return self._extract_json(response)
 
+    def _build_test_cases(self, user_story: UserStory, data: Dict[str, Any]) -> List[TestCase]:
+        """Create (and register) TestCases from a parsed LLM response."""
         test_cases = []
         for tc_data in data.get("test_cases", []):
             steps = []
@@ -661,61 +669,79 @@ Return ONLY valid JSON, no other text."""
 
     async def generate_all_gherkin(self, user_stories: List[UserStory]) -> List[GherkinFeature]:
         """Generate Gherkin features for all user stories with error handling."""
-        features = []
         total = len(user_stories)
-        for i, story in enumerate(user_stories, 1):
+
+        async def generate(item) -> GherkinFeature:
+            i, story = item
             try:
                 print(f"  [{i}/{total}] Generating Gherkin for {story.id}: {story.title}...")
                 feature = await self.generate_gherkin(story)
-                features.append(feature)
                 print(f"    [OK] Generated {len(feature.scenarios)} scenarios")
+                return feature
             except Exception as e:
                 print(f"    [FAIL] Failed to generate Gherkin for {story.id}: {e}")
                 # Create minimal feature on failure
-                features.append(GherkinFeature(
+                return GherkinFeature(
                     name=story.title,
                     description=f"As a {story.persona}, I want to {story.action}, so that {story.benefit}",
                     parent_user_story_id=story.id,
                     parent_requirement_id=story.parent_requirement_id
-                ))
+                )
+
+        executor = get_llm_executor(self.config, self.model_name)
+        features = await executor.map(generate, enumerate(user_stories, 1))
+        # Concurrent calls register features in completion order; restore story order
+        for story in user_stories:
+            if story.id in self.features:
+                self.features[story.id] = self.features.pop(story.id)
         return features
 
     async def generate_all_test_cases(self, user_stories: List[UserStory]) -> List[TestCase]:
         """Generate test cases for all user stories with error handling."""
-        all_cases = []
         total = len(user_stories)
-        for i, story in enumerate(user_stories, 1):
+
+        async def request(item) -> Optional[Dict[str, Any]]:
+            i, story = item
             try:
                 print(f"  [{i}/{total}] Generating test cases for {story.id}...")
-                cases = await self.generate_test_cases(story)
-                all_cases.extend(cases)
-                print(f"    [OK] Generated {len(cases)} test cases")
+                return await self._request_test_cases(story)
             except Exception as e:
                 print(f"    [WARN] First attempt failed for {story.id}: {e}, retrying...")
                 try:
-                    cases = await self.generate_test_cases(story)
-                    all_cases.extend(cases)
-                    print(f"    [OK] Retry succeeded: {len(cases)} test cases")
+                    return await self._request_test_cases(story)
                 except Exception as e2:
                     print(f"    [FAIL] Retry also failed for {story.id}: {e2}")
-                    # Create stub with acceptance criteria as test steps
-                    tc_id = self._generate_tc_id()
-                    steps = []
-                    if story.acceptance_criteria:
-                        for ac in story.acceptance_criteria:
-                            steps.append(TestStep(
-                                step_type="When",
-                                description=f"Given {ac.given}, When {ac.when}",
-                                expected_result=f"Then {ac.then}"
-                            ))
-                    all_cases.append(TestCase(
-                        id=tc_id,
-                        title=f"Test {story.title}",
-                        description=f"Verify: {story.action}",
-                        steps=steps,
-                        parent_user_story_id=story.id,
-                        parent_requirement_id=story.parent_requirement_id
+                    return None
+
+        # LLM calls run concurrently; TC IDs are assigned in story order below
+        executor = get_llm_executor(self.config, self.model_name)
+        responses = await executor.map(request, enumerate(user_stories, 1))
+
+        all_cases = []
+        for story, data in zip(user_stories, responses):
+            if data is not None:
+                cases = self._build_test_cases(story, data)
+                all_cases.extend(cases)
+                print(f"    [OK] Generated {len(cases)} test cases for {story.id}")
+                continue
+            # Create stub with acceptance criteria as test steps
+            tc_id = self._generate_tc_id()
+            steps = []
+            if story.acceptance_criteria:
+                for ac in story.acceptance_criteria:
+                    steps.append(TestStep(
+                        step_type="When",
+                        description=f"Given {ac.given}, When {ac.when}",
+                        expected_result=f"Then {ac.then}"
                     ))
+            all_cases.append(TestCase(
+                id=tc_id,
+                title=f"Test {story.title}",
+                description=f"Verify: {story.action}",
+                steps=steps,
+                parent_user_story_id=story.id,
+                parent_requirement_id=story.parent_requirement_id
+            ))
         return all_cases
 
     def get_coverage_matrix(self) -> Dict[str, Any]:
@@ -31,6 +31,9 @@ from requirements_engineer.core.token_manager import (
     TokenBudget, TokenEstimator, RequirementChunker
 )
 
+# Import bounded-concurrency executor for per-requirement LLM calls
+from requirements_engineer.core.llm_concurrency import get_llm_executor
+
 # Import LLM logger for cost tracking
 try:
     from requirements_engineer.core.llm_logger import log_llm_call
@@ -436,6 +439,15 @@ Return ONLY valid JSON, no other text."""
         self._us_counter += 1
         return f"US-{str(self._us_counter).zfill(3)}"
 
+    def _restore_story_order(self, stories: List[UserStory]) -> None:
+        """Re-insert stories into self.user_stories in list (ID) order.
+
+        Concurrently generated stories are stored in completion order.
+        """
+        for story in stories:
+            if story.id in self.user_stories:
+                self.user_stories[story.id] = self.user_stories.pop(story.id)
+
     def _generate_epic_id(self) -> str:
         """Generate a new Epic ID."""
         self._epic_counter += 1
@@ -553,7 +565,8 @@ Return ONLY valid JSON, no other text."""
     async def generate_user_story(
         self,
         requirement,
-        stakeholders: List[Dict[str, Any]] = None
+        stakeholders: List[Dict[str, Any]] = None,
+        us_id: Optional[str] = None
     ) -> UserStory:
         """
         Generate a User Story from a RequirementNode.
@@ -564,6 +577,7 @@ Return ONLY valid JSON, no other text."""
         Args:
             requirement: RequirementNode instance
             stakeholders: List of stakeholder definitions
+            us_id: Pre-assigned story ID (default: next ID once generated)
 
         Returns:
             UserStory instance (new or existing if duplicate)
@@ -649,7 +663,7 @@ Return ONLY valid JSON, no other text."""
                 then=ac_data.get("then", "")
             ))
 
-        us_id = self._generate_us_id()
+        us_id = us_id or self._generate_us_id()
 
         # Determine complexity
         is_complex = self._is_complex_requirement(requirement)
@@ -826,13 +840,27 @@ Keep each sub-task focused and testable. Return ONLY valid JSON."""
 
         stories = []
         batch_num = 0
+        executor = get_llm_executor(self.config, self.model_name)
 
         for batch in chunker.chunk_requirements(functional_reqs, template_tokens):
             batch_num += 1
             print(f"  [Batch {batch_num}/{batch_info['num_batches']}] Processing {len(batch)} requirements...")
 
-            for req in batch:
-                story = await self.generate_user_story(req, stakeholders)
+            if self.supermemory and self.enable_deduplication:
+                # Dedup checks must see the stories generated before them
+                batch_stories = []
+                for req in batch:
+                    batch_stories.append(await self.generate_user_story(req, stakeholders))
+            else:
+                # Reserve IDs in requirement order, then generate concurrently
+                us_ids = [self._generate_us_id() for _ in batch]
+                batch_stories = await executor.map(
+                    lambda item: self.generate_user_story(item[0], stakeholders, us_id=item[1]),
+                    zip(batch, us_ids)
+                )
+                self._restore_story_order(batch_stories)
+
+            for story in batch_stories:
                 stories.append(story)
                 print(f"    Generated {story.id}: {story.title}")
 
@@ -842,7 +870,8 @@ Keep each sub-task focused and testable. Return ONLY valid JSON."""
     async def generate_nfr_story(
         self,
         requirement,
-        stakeholders: List[Dict[str, Any]] = None
+        stakeholders: List[Dict[str, Any]] = None,
+        us_id: Optional[str] = None
     ) -> UserStory:
         """
         Generate a verification story for a Non-Functional Requirement.
@@ -903,7 +932,7 @@ Return ONLY valid JSON."""
                 then=f"the result meets target: {vc.get('target', 'defined threshold')}"
             ))
 
-        us_id = self._generate_us_id()
+        us_id = us_id or self._generate_us_id()
         user_story = UserStory(
             id=us_id,
             title=f"Verify: {requirement.title}",
@@ -943,10 +972,14 @@ Return ONLY valid JSON."""
 
         print(f"  Generating verification stories for {len(nfr_reqs)} NFR requirements...")
 
-        stories = []
-        for req in nfr_reqs:
-            story = await self.generate_nfr_story(req, stakeholders)
-            stories.append(story)
+        # Reserve IDs in requirement order, then generate concurrently
+        us_ids = [self._generate_us_id() for _ in nfr_reqs]
+        stories = await get_llm_executor(self.config, self.model_name).map(
+            lambda item: self.generate_nfr_story(item[0], stakeholders, us_id=item[1]),
+            zip(nfr_reqs, us_ids)
+        )
+        self._restore_story_order(stories)
+        for story in stories:
             print(f"    Generated {story.id}: {story.title}")
 
         print(f"  Total NFR stories generated: {len(stories)}")
@@ -0,0 +1,227 @@
+"""Embedding Store — persistent, append-only vector cache shared across runs.
+
+SemanticMatcher used to keep its text-hash → vector cache in a dict that
+died with the process, so every refinement run re-embedded the whole
+artifact bundle. The store keeps those vectors on disk, one directory per
+embedding model:
+
+    <root>/<model>/meta.json     {"version", "model", "dim"}
+    <root>/<model>/vectors.f32   float32 matrix, row-major, (N, dim)
+    <root>/<model>/keys.txt      text hash of row i on line i
+
+Reads go through a read-only np.memmap of vectors.f32, so opening a store
+with many thousand vectors costs one read of keys.txt. Writes append new
+rows and keys under a file lock; other processes (parallel batch workers,
+other projects) pick up the appended rows on their next lookup.
+
+Rows are written before their keys, so a key always has its vector. Rows
+left without a key and partial key lines left by an interrupted write are
+truncated by the next writer.
+"""
+
+import json
+import logging
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer use only
+    fcntl = None
+
+STORE_VERSION = 1
+_ROW_DTYPE = "float32"
+
+
+def _model_dir_name(model: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model).strip("_") or "default"
+
+
+class EmbeddingStore:
+    """Persistent text-hash → vector store for one embedding model.
+
+    Usage:
+        store = EmbeddingStore("~/.cache/requirements_engineer/embeddings", "text-embedding-3-small")
+        found = store.get_many(["<md5>", ...])     # {key: np.ndarray}
+        store.put_many(["<md5>"], [[0.1, ...]])
+    """
+
+    def __init__(self, root_dir, model: str):
+        if not HAS_NUMPY:
+            raise RuntimeError("EmbeddingStore requires numpy")
+        self.model = model
+        self.dir = Path(os.path.expanduser(str(root_dir))) / _model_dir_name(model)
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}  # key → row
+        self._n_rows = 0  # lines in keys.txt read so far (= rows with a key)
+        self._keys_offset = 0  # bytes of keys.txt already read
+        self._matrix: Any = None  # np.memmap over the first _n_rows rows
+        self._incompatible = False  # store written by another version: leave it alone
+        self._load_meta()
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.dir / "vectors.f32"
+
+    @property
+    def keys_path(self) -> Path:
+        return self.dir / "keys.txt"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.dir / "meta.json"
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        self._refresh()
+        return key in self._rows
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Vectors for the keys that are stored (missing keys are left out)."""
+        self._refresh()
+        rows = [(key, self._rows[key]) for key in keys if key in self._rows]
+        if not rows:
+            return {}
+        matrix = self._mapped()
+        return {key: np.array(matrix[row]) for key, row in rows}
+
+    # ------------------------------------------------------------------
+    # Append
+    # ------------------------------------------------------------------
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> int:
+        """Append vectors for keys not stored yet. Returns rows written."""
+        if len(keys) != len(vectors):
+            raise ValueError(f"{len(keys)} keys but {len(vectors)} vectors")
+        if not keys:
+            return 0
+
+        matrix = np.asarray(vectors, dtype=_ROW_DTYPE)
+        if matrix.ndim != 2:
+            raise ValueError("vectors must be a 2-D sequence")
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            self._load_meta()
+            self._refresh()
+            if self._incompatible:
+                return 0
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self._write_meta()
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Store for {self.model} holds {self.dim}-d vectors, got {matrix.shape[1]}-d"
+                )
+
+            new_rows: List[int] = []
+            new_keys: List[str] = []
+            seen = set(self._rows)
+            for i, key in enumerate(keys):
+                if key not in seen:
+                    seen.add(key)
+                    new_rows.append(i)
+                    new_keys.append(key)
+            if not new_keys:
+                return 0
+
+            row_bytes = self.dim * np.dtype(_ROW_DTYPE).itemsize
+            with open(self.vectors_path, "ab") as f:
+                # Drop rows of an interrupted write that never got their keys
+                if f.tell() != self._n_rows * row_bytes:
+                    f.truncate(self._n_rows * row_bytes)
+                    f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(matrix[new_rows]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.keys_path, "ab") as f:
+                # Drop a partial key line left by an interrupted write
+                if f.tell() != self._keys_offset:
+                    f.truncate(self._keys_offset)
+                    f.seek(0, os.SEEK_END)
+                f.write("".join(f"{key}\n" for key in new_keys).encode("utf-8"))
+
+            self._refresh()
+        return len(new_keys)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _load_meta(self):
+        if self.dim is not None or not self.meta_path.exists():
+            return
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Unreadable embedding store metadata %s: %s", self.meta_path, e)
+            return
+        if meta.get("version") != STORE_VERSION or meta.get("model") != self.model:
+            if not self._incompatible:
+                logger.warning("Ignoring embedding store %s (version/model mismatch)", self.dir)
+            self._incompatible = True
+            return
+        self.dim = int(meta["dim"])
+
+    def _write_meta(self):
+        tmp_path = self.meta_path.with_name(f"meta.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STORE_VERSION, "model": self.model, "dim": self.dim}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _refresh(self):
+        """Pick up keys appended since the last read (by us or other processes)."""
+        if self.dim is None:
+            self._load_meta()
+            if self.dim is None:
+                return
+        try:
+            with open(self.keys_path, "rb") as f:
+                f.seek(self._keys_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # only complete lines
+        if not end:
+            return
+        for line in data[:end].decode("utf-8").splitlines():
+            self._rows.setdefault(line, self._n_rows)
+            self._n_rows += 1
+        self._keys_offset += end
+
+    def _mapped(self):
+        n = self._n_rows
+        if self._matrix is None or self._matrix.shape[0] != n:
+            self._matrix = np.memmap(self.vectors_path, dtype=_ROW_DTYPE, mode="r", shape=(n, self.dim))
+        return self._matrix
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.dir / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,76 @@
+"""Local Embeddings — offline embedding backend for SemanticMatcher.
+
+HashingEmbedder maps text to a fixed-size vector by feature hashing of word
+unigrams and bigrams (signed, sublinear term frequency, L2-normalized). It
+needs no network, no model download and no fitted vocabulary, and the same
+text always gets the same vector, so its vectors can be stored in the
+EmbeddingStore like any other model's.
+
+It captures lexical overlap only; paraphrases with no shared words score
+low. Use it for offline runs and tests, or as a fallback when no embeddings
+API key is configured.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import List
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+DEFAULT_LOCAL_DIM = 512
+BIGRAM_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would", "shall",
+    "should", "may", "might", "must", "can", "could", "and", "but", "or",
+    "for", "of", "to", "in", "on", "at", "by", "with", "from", "as", "into",
+    "that", "this", "it", "its", "so", "i", "want",
+})
+
+
+def _bucket(feature: str, dim: int):
+    digest = hashlib.md5(feature.encode("utf-8")).digest()
+    value = int.from_bytes(digest[:8], "little")
+    return value % dim, (1.0 if value >> 63 else -1.0)
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embeddings via the hashing trick."""
+
+    def __init__(self, dim: int = DEFAULT_LOCAL_DIM):
+        self.dim = max(8, int(dim))
+        # Store / cache key: vectors differ per dimension and feature scheme
+        self.model = f"local-hashing-v1-{self.dim}"
+
+    @property
+    def available(self) -> bool:
+        return HAS_NUMPY
+
+    def embed_one(self, text: str) -> List[float]:
+        tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+        features = Counter(tokens)
+        for first, second in zip(tokens, tokens[1:]):
+            features[f"{first} {second}"] += BIGRAM_WEIGHT
+
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in features.items():
+            index, sign = _bucket(feature, self.dim)
+            weight = 1.0 + math.log(count) if count >= 1 else count  # sublinear tf
+            vec[index] += sign * weight
+        norm = float(np.linalg.norm(vec))
+        if norm > 0:
+            vec /= norm
+        return vec.tolist()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts; same interface as the API-backed embedding path."""
+        return [self.embed_one(text) for text in texts]
@@ -1,8 +1,19 @@
 """Semantic Matcher — in-memory vector index for artifact matching.
 
-Uses OpenAI text-embedding-3-small via REST API with numpy cosine similarity.
+Uses OpenAI text-embedding-3-small via REST API with numpy cosine similarity,
+or a local embedding backend (memory/local_embeddings.py) for offline use.
 Falls back gracefully when no API key is available.
 
+With `store_dir` set, embeddings are also kept in a persistent EmbeddingStore
+(memory/embedding_store.py) keyed by model, so texts embedded by earlier
+runs or other projects are not sent to the API again.
+
+Queries can be batched with find_similar_batch(): all query texts are
+embedded together and scored with one matrix product per chunk of queries.
+Indexes with at least `ann_min_items` items are additionally clustered into
+an inverted-file (IVF) index, so each query only scores the items in its
+`ann_nprobe` nearest clusters instead of the whole index.
+
 Pattern adapted from external/arch_team/backend/core/embeddings.py.
 """
 
@@ -11,6 +22,8 @@ import logging
 import os
 from typing import Any, Dict, List, Optional, Tuple
 
+from .embedding_store import EmbeddingStore
+
 logger = logging.getLogger(__name__)
 
 # Optional deps — graceful degradation
@@ -33,6 +46,96 @@ DEFAULT_BATCH_SIZE = 64
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 0.5  # seconds
 
+# Upper bound on query x item scores held in memory at once (~16 MB float32)
+MAX_SCORE_ELEMENTS = 4_000_000
+# Index size from which queries go through the IVF index (0 = always exact)
+DEFAULT_ANN_MIN_ITEMS = 20_000
+DEFAULT_ANN_NPROBE = 10
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+
+def _chunk_rows(n_cols: int) -> int:
+    """Rows per chunk so that a (rows, n_cols) score matrix stays bounded."""
+    return max(1, MAX_SCORE_ELEMENTS // max(1, n_cols))
+
+
+def _top_k(scores: Any, k: int) -> Tuple[Any, Any]:
+    """Per-row top-k of a 2-D score matrix: (indices, scores), best first."""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        idx = np.argpartition(scores, -k, axis=1)[:, -k:]
+    else:
+        idx = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    top = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+def _nearest(vectors: Any, centroids: Any) -> Any:
+    """Index of the most similar centroid for every row, chunked."""
+    assign = np.empty(len(vectors), dtype=np.int64)
+    step = _chunk_rows(len(centroids))
+    for start in range(0, len(vectors), step):
+        assign[start:start + step] = np.argmax(vectors[start:start + step] @ centroids.T, axis=1)
+    return assign
+
+
+class _IVFIndex:
+    """Inverted-file index over unit vectors (spherical k-means lists).
+
+    A query scores the centroids, then only the items of its `nprobe`
+    best lists. Approximate: a true neighbour assigned to an unprobed
+    list is missed, so results can differ slightly from an exact scan.
+    """
+
+    def __init__(self, vectors: Any, n_lists: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        n_lists = max(1, min(n_lists, n))
+        sample = vectors[rng.choice(n, min(n, n_lists * KMEANS_SAMPLE_PER_LIST), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assign = _nearest(sample, centroids)
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=n_lists)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            sums = np.zeros_like(centroids)
+            filled = counts > 0
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.where(norms == 0, 1, norms), centroids)
+
+        assign = _nearest(vectors, centroids)
+        self.centroids = centroids.astype(np.float32)
+        self.order = np.argsort(assign, kind="stable")  # item indices grouped by list
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def search(self, vectors: Any, queries: Any, k: int, nprobe: int) -> List[Tuple[Any, Any]]:
+        """(indices, scores) of the top-k items per query row, best first."""
+        results = []
+        nprobe = min(nprobe, self.n_lists)
+        step = _chunk_rows(self.n_lists)
+        for start in range(0, len(queries), step):
+            chunk = queries[start:start + step]
+            probes, _ = _top_k(chunk @ self.centroids.T, nprobe)
+            for q, lists in zip(chunk, probes):
+                candidates = np.concatenate([
+                    self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists
+                ])
+                if not len(candidates):
+                    results.append((candidates, np.empty(0, dtype=np.float32)))
+                    continue
+                scores = vectors[candidates] @ q
+                idx, top = _top_k(scores[None, :], k)
+                results.append((candidates[idx[0]], top[0]))
+        return results
+
 
 class SemanticMatcher:
     """In-memory semantic matching using OpenAI embeddings + numpy cosine similarity.
@@ -50,28 +153,58 @@ class SemanticMatcher:
         api_key: Optional[str] = None,
         model: str = DEFAULT_MODEL,
         batch_size: int = DEFAULT_BATCH_SIZE,
+        backend: Any = None,
+        store_dir: Optional[str] = None,
+        ann_min_items: int = DEFAULT_ANN_MIN_ITEMS,
+        ann_nprobe: int = DEFAULT_ANN_NPROBE,
     ):
+        """
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY)
+            model: OpenAI embeddings model
+            batch_size: Texts per embeddings request
+            backend: Local embedding backend (e.g. HashingEmbedder) used
+                instead of the API; must provide `model` and async `embed(texts)`
+            store_dir: Root of the persistent embedding store (None = memory only)
+            ann_min_items: Index size from which an IVF index is built (0 = exact only)
+            ann_nprobe: IVF lists scored per query (higher = better recall, slower)
+        """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
-        self.model = model
+        self.backend = backend
+        self.model = backend.model if backend is not None else model
         self.batch_size = max(1, batch_size)
+        self.ann_min_items = ann_min_items
+        self.ann_nprobe = max(1, ann_nprobe)
 
         # Embedding cache: text_hash -> vector
-        self._cache: Dict[str, List[float]] = {}
+        self._cache: Dict[str, Any] = {}
+
+        # Persistent cache shared across runs (optional)
+        self.store: Optional[EmbeddingStore] = None
+        if store_dir and HAS_NUMPY:
+            try:
+                self.store = EmbeddingStore(store_dir, self.model)
+            except OSError as e:
+                logger.warning("Embedding store unavailable (%s); using in-memory cache only", e)
 
         # In-memory index
         self._index_ids: List[str] = []
         self._index_texts: List[str] = []
         self._index_vectors: Any = None  # np.ndarray (N, dim) or None
+        self._ann: Optional[_IVFIndex] = None
         self._index_built = False
 
         # Stats
         self.embed_calls = 0
         self.embed_tokens_approx = 0
         self.cache_hits = 0
+        self.store_hits = 0
 
     @property
     def available(self) -> bool:
         """Check if semantic matching is available."""
+        if self.backend is not None:
+            return bool(HAS_NUMPY and getattr(self.backend, "available", True))
         return bool(self.api_key and HAS_NUMPY and HAS_HTTPX)
 
     @property
@@ -84,11 +217,12 @@ class SemanticMatcher:
     # ------------------------------------------------------------------
 
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Embed texts via OpenAI REST API.
+        """Embed texts via OpenAI REST API (or the local backend).
 
         Features:
         - Batched requests (default 64 per batch)
-        - In-memory caching by text hash
+        - In-memory caching by text hash, backed by the persistent store
+        - Each distinct text embedded once per call
         - Retry with exponential backoff
         """
         if not texts:
@@ -96,29 +230,43 @@ class SemanticMatcher:
         if not self.available:
             raise RuntimeError("SemanticMatcher not available (missing API key or deps)")
 
-        results: List[Optional[List[float]]] = [None] * len(texts)
-        uncached_indices: List[int] = []
-
-        # Check cache first
-        for i, text in enumerate(texts):
-            key = self._cache_key(text)
+        keys = [self._cache_key(text) for text in texts]
+        missing: Dict[str, str] = {}  # key -> text, first occurrence
+        for key, text in zip(keys, texts):
             if key in self._cache:
-                results[i] = self._cache[key]
                 self.cache_hits += 1
             else:
-                uncached_indices.append(i)
+                missing.setdefault(key, text)
 
-        # Batch embed uncached texts
-        if uncached_indices:
-            uncached_texts = [texts[i] for i in uncached_indices]
-            vectors = await self._embed_via_api(uncached_texts)
+        # Vectors embedded by earlier runs / other projects
+        if missing and self.store is not None:
+            try:
+                stored = self.store.get_many(list(missing))
+            except (OSError, ValueError) as e:
+                logger.warning("Embedding store read failed: %s", e)
+                stored = {}
+            self._cache.update(stored)
+            self.store_hits += len(stored)
+            for key in stored:
+                del missing[key]
+
+        # Batch embed the rest
+        if missing:
+            new_keys = list(missing)
+            new_texts = [missing[key] for key in new_keys]
+            if self.backend is not None:
+                vectors = await self.backend.embed(new_texts)
+            else:
+                vectors = await self._embed_via_api(new_texts)
+            self._cache.update(zip(new_keys, vectors))
 
-            for idx, vec in zip(uncached_indices, vectors):
-                key = self._cache_key(texts[idx])
-                self._cache[key] = vec
-                results[idx] = vec
+            if self.store is not None:
+                try:
+                    self.store.put_many(new_keys, vectors)
+                except (OSError, ValueError) as e:
+                    logger.warning("Embedding store write failed: %s", e)
 
-        return results  # type: ignore[return-value]
+        return [self._cache[key] for key in keys]
 
     async def _embed_via_api(self, texts: List[str]) -> List[List[float]]:
         """Call OpenAI embeddings API with batching and retry."""
@@ -211,10 +359,15 @@ class SemanticMatcher:
         norms = np.where(norms == 0, 1, norms)  # avoid division by zero
         self._index_vectors = self._index_vectors / norms
 
+        self._ann = None
+        if self.ann_min_items and len(ids) >= self.ann_min_items:
+            self._ann = _IVFIndex(self._index_vectors, n_lists=int(np.sqrt(len(ids))))
+
         self._index_built = True
         logger.info(
-            "Semantic index built: %d items, %d embed calls, ~%d tokens",
-            len(ids), self.embed_calls, self.embed_tokens_approx
+            "Semantic index built: %d items%s, %d embed calls, ~%d tokens",
+            len(ids), f" ({self._ann.n_lists} IVF lists)" if self._ann else "",
+            self.embed_calls, self.embed_tokens_approx
         )
         return len(ids)
 
@@ -225,35 +378,51 @@ class SemanticMatcher:
 
         Returns [(id, cosine_score), ...] sorted by descending score.
         """
-        if not self._index_built or self._index_vectors is None:
-            return []
-
-        query_vec = await self.embed_batch([query])
-        if not query_vec or not query_vec[0]:
-            return []
-
-        q = np.array(query_vec[0], dtype=np.float32)
-        norm = np.linalg.norm(q)
-        if norm > 0:
-            q = q / norm
-
-        # Cosine similarity = dot product of normalized vectors
-        scores = self._index_vectors @ q  # (N,)
-
-        # Get top-K indices
-        if top_k >= len(scores):
-            top_indices = np.argsort(scores)[::-1]
+        results = await self.find_similar_batch([query], top_k=top_k, threshold=threshold)
+        return results[0] if results else []
+
+    async def find_similar_batch(
+        self, queries: List[str], top_k: int = 5, threshold: float = 0.0
+    ) -> List[List[Tuple[str, float]]]:
+        """find_similar() for many queries at once.
+
+        All queries are embedded in one embed_batch() call; scores are
+        computed as (queries x index) matrix products, chunked so that at
+        most MAX_SCORE_ELEMENTS scores are held at once. Returns one result
+        list per query, in query order.
+        """
+        results: List[List[Tuple[str, float]]] = [[] for _ in queries]
+        if not self._index_built or self._index_vectors is None or top_k <= 0:
+            return results
+
+        positions = [i for i, query in enumerate(queries) if query]
+        if not positions:
+            return results
+        query_vecs = await self.embed_batch([queries[i] for i in positions])
+        keep = [(i, vec) for i, vec in zip(positions, query_vecs) if len(vec)]
+        if not keep:
+            return results
+
+        q = np.array([vec for _, vec in keep], dtype=np.float32)
+        norms = np.linalg.norm(q, axis=1, keepdims=True)
+        q = q / np.where(norms == 0, 1, norms)
+
+        if self._ann is not None:
+            hits = self._ann.search(self._index_vectors, q, top_k, self.ann_nprobe)
         else:
-            top_indices = np.argpartition(scores, -top_k)[-top_k:]
-            top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
-
-        results = []
-        for idx in top_indices:
-            score = float(scores[idx])
-            if score >= threshold:
-                results.append((self._index_ids[idx], score))
-
-        return results[:top_k]
+            # Cosine similarity = dot product of normalized vectors
+            hits = []
+            step = _chunk_rows(len(self._index_vectors))
+            for start in range(0, len(q), step):
+                idx, top = _top_k(q[start:start + step] @ self._index_vectors.T, top_k)
+                hits.extend(zip(idx, top))
+
+        for (pos, _), (idx, top) in zip(keep, hits):
+            results[pos] = [
+                (self._index_ids[i], float(score))
+                for i, score in zip(idx, top) if score >= threshold
+            ]
+        return results
 
     async def find_best_match(
         self, query: str, threshold: float = 0.5
@@ -280,15 +449,20 @@ class SemanticMatcher:
         self._index_ids.clear()
         self._index_texts.clear()
         self._index_vectors = None
+        self._ann = None
         self._index_built = False
 
     def stats(self) -> Dict[str, Any]:
         """Return usage statistics."""
         return {
             "available": self.available,
+            "model": self.model,
             "index_size": len(self._index_ids),
+            "ann_lists": self._ann.n_lists if self._ann is not None else 0,
             "cache_size": len(self._cache),
             "cache_hits": self.cache_hits,
+            "store_size": len(self.store) if self.store is not None else 0,
+            "store_hits": self.store_hits,
             "embed_calls": self.embed_calls,
             "embed_tokens_approx": self.embed_tokens_approx,
             "cost_usd": self.cost_usd,
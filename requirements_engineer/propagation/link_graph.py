@@ -7,6 +7,7 @@ Builds from project files and supports queries for linked nodes and orphan detec
 import json
 import re
 from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Any, Tuple
 
@@ -24,17 +25,73 @@ class LinkGraph:
         """Initialize an empty link graph."""
         self.nodes: Dict[str, dict] = {}  # node_id -> node data
         self.edges: List[Edge] = []
+        self._edge_set: Set[Edge] = set()  # Membership check for self.edges
         self._adjacency: Dict[str, Set[str]] = defaultdict(set)  # For fast lookup
         self._reverse_adjacency: Dict[str, Set[str]] = defaultdict(set)  # Incoming edges
         self._edge_types: Dict[Tuple[str, str], str] = {}  # (source, target) -> edge_type
 
+        # Which project file produced a node/edge (see reload_file)
+        self.project_path: Optional[Path] = None
+        self._node_sources: Dict[str, str] = {}  # node_id -> relative file path
+        self._edge_sources: Dict[Edge, str] = {}  # edge -> relative file path
+        self._current_source: Optional[str] = None
+
+    # ── Pickling ───────────────────────────────────────────────────
+    # Edge objects are slow to unpickle, so snapshots store edges as tuples
+    # and rebuild edges/_edge_set/_edge_sources on first access.
+
+    _PACKED_ATTRS = ("edges", "_edge_set", "_edge_sources")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._PACKED_ATTRS:
+            state.pop(name, None)
+        if "_packed_edges" not in state:
+            sources = self._edge_sources
+            state["_packed_edges"] = [
+                (e.source, e.target, e.edge_type, e.bidirectional, sources.get(e))
+                for e in self.edges
+            ]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def __getattr__(self, name):
+        # only reached for missing attributes: unpack edges of a loaded snapshot
+        if name in self._PACKED_ATTRS and "_packed_edges" in self.__dict__:
+            self._unpack_edges()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def _unpack_edges(self):
+        packed = self.__dict__.pop("_packed_edges")
+        edges = []
+        sources = {}
+        for source, target, edge_type, bidirectional, origin in packed:
+            edge = Edge(source=source, target=target, edge_type=edge_type,
+                        bidirectional=bidirectional)
+            edges.append(edge)
+            if origin:
+                sources[edge] = origin
+        self.edges = edges
+        self._edge_set = set(edges)
+        self._edge_sources = sources
+
     def clear(self):
         """Clear all nodes and edges."""
+        self.__dict__.pop("_packed_edges", None)
+        self.__dict__.setdefault("edges", [])
+        self.__dict__.setdefault("_edge_set", set())
+        self.__dict__.setdefault("_edge_sources", {})
         self.nodes.clear()
         self.edges.clear()
+        self._edge_set.clear()
         self._adjacency.clear()
         self._reverse_adjacency.clear()
         self._edge_types.clear()
+        self._node_sources.clear()
+        self._edge_sources.clear()
 
     def build_from_project(self, project_path: Path):
         """
@@ -45,21 +102,16 @@ class LinkGraph:
         """
         self.clear()
         project_path = Path(project_path)
+        self.project_path = project_path
 
         # 1. Load journal.json -> RequirementNodes
-        journal_path = project_path / "journal.json"
-        if journal_path.exists():
-            self._load_journal(journal_path)
-
         # 2. Load user_stories.md -> Epics, UserStories
-        user_stories_path = project_path / "user_stories" / "user_stories.md"
-        if user_stories_path.exists():
-            self._load_user_stories(user_stories_path)
-
         # 3. Load task_list.json -> Tasks with dependencies
-        tasks_path = project_path / "tasks" / "task_list.json"
-        if tasks_path.exists():
-            self._load_tasks(tasks_path)
+        for rel_path, loader in self.FILE_LOADERS.items():
+            file_path = project_path / rel_path
+            if file_path.exists():
+                with self._tracking_source(rel_path):
+                    getattr(self, loader)(file_path)
 
         # 4. Load diagrams
         diagrams_path = project_path / "diagrams"
@@ -72,6 +124,153 @@ class LinkGraph:
         # 6. Load discovered links (auto-linked by user approval)
         self._load_discovered_links(project_path)
 
+    # Per-file loaders that reload_file() can re-run on their own
+    FILE_LOADERS = {
+        "journal.json": "_load_journal",
+        "user_stories/user_stories.md": "_load_user_stories",
+        "tasks/task_list.json": "_load_tasks",
+    }
+
+    @contextmanager
+    def _tracking_source(self, rel_path: str):
+        """Attribute nodes written and edges added in this block to rel_path."""
+        before = {nid: id(data) for nid, data in self.nodes.items()}
+        self._current_source = rel_path
+        try:
+            yield
+        finally:
+            self._current_source = None
+            for nid, data in self.nodes.items():
+                if before.get(nid) != id(data):
+                    self._node_sources[nid] = rel_path
+
+    def _source_key(self, file_path) -> Optional[str]:
+        """Relative path of a file reload_file() can handle, else None."""
+        if self.project_path is None:
+            return None
+        try:
+            rel = Path(file_path).resolve().relative_to(self.project_path.resolve())
+        except ValueError:
+            return None
+        rel_path = rel.as_posix()
+        if rel_path in self.FILE_LOADERS:
+            return rel_path
+        if rel.parent.as_posix() == "diagrams" and rel.suffix == ".mmd":
+            return rel_path
+        return None
+
+    def reload_file(self, file_path) -> Optional[Dict[str, Any]]:
+        """
+        Re-read one project file and replace the nodes and edges it produced.
+
+        Handles journal.json, user_stories.md, task_list.json and diagrams;
+        a missing file removes everything it contributed.
+
+        Returns:
+            {"removed_nodes", "changed_nodes", "added_edges", "removed_edges"},
+            or None if the file is not one build_from_project() loads on its own
+            (the caller should rebuild instead).
+        """
+        pending = self.prepare_reload(file_path)
+        if pending is None:
+            return None
+        self.parse_reload(pending)
+        return self.apply_reload(pending)
+
+    # reload_file() in three steps, so the parse can run off the thread
+    # that owns the graph: prepare and apply change or snapshot the graph,
+    # parse_reload only reads the snapshot
+
+    def prepare_reload(self, file_path) -> Optional[Dict[str, Any]]:
+        """Snapshot what parsing file_path depends on; None if reload_file() can't handle it."""
+        rel_path = self._source_key(file_path)
+        if rel_path is None:
+            return None
+        old_nodes = {nid for nid, src in self._node_sources.items() if src == rel_path}
+        # the scratch graph sees every node except this file's own
+        base = {nid: data for nid, data in self.nodes.items() if nid not in old_nodes}
+        return {"rel_path": rel_path, "base": base}
+
+    def parse_reload(self, pending: Dict[str, Any]):
+        """Parse the file of a prepare_reload() snapshot into a scratch graph."""
+        rel_path, base = pending["rel_path"], pending["base"]
+        abs_path = self.project_path / rel_path
+        scratch = LinkGraph()
+        scratch.project_path = self.project_path
+        scratch.nodes = dict(base)
+        if abs_path.exists():
+            if rel_path in self.FILE_LOADERS:
+                getattr(scratch, self.FILE_LOADERS[rel_path])(abs_path)
+            else:
+                scratch._load_diagram_file(abs_path)
+        pending["new_nodes"] = {
+            nid: data for nid, data in scratch.nodes.items()
+            if base.get(nid) is not data
+        }
+        pending["new_edges"] = list(scratch.edges)
+
+    def apply_reload(self, pending: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the file's nodes and edges with the parsed ones; returns the reload_file() delta."""
+        rel_path, new_nodes = pending["rel_path"], pending["new_nodes"]
+        old_nodes = {nid for nid, src in self._node_sources.items() if src == rel_path}
+        old_edges = {e for e, src in self._edge_sources.items() if src == rel_path}
+        new_edges = set(pending["new_edges"])
+
+        removed_nodes = sorted(old_nodes - set(new_nodes))
+        changed_nodes = sorted(
+            nid for nid, data in new_nodes.items() if self.nodes.get(nid) != data
+        )
+        for nid in removed_nodes:
+            self.nodes.pop(nid, None)
+            self._node_sources.pop(nid, None)
+        for nid, data in new_nodes.items():
+            self.nodes[nid] = data
+            self._node_sources[nid] = rel_path
+
+        removed_edges = old_edges - new_edges
+        self.remove_edges(removed_edges)
+        added_edges = []
+        self._current_source = rel_path
+        try:
+            for edge in pending["new_edges"]:
+                if edge not in old_edges:
+                    self._add_edge(edge.source, edge.target, edge.edge_type)
+                    added_edges.append(edge)
+        finally:
+            self._current_source = None
+
+        return {
+            "removed_nodes": removed_nodes,
+            "changed_nodes": changed_nodes,
+            "added_edges": added_edges,
+            "removed_edges": sorted(removed_edges, key=lambda e: (e.source, e.target, e.edge_type)),
+        }
+
+    def remove_edges(self, edges):
+        """Remove the given edges (and their adjacency entries) in one pass."""
+        doomed = set(edges) & self._edge_set
+        if not doomed:
+            return
+        self.edges = [e for e in self.edges if e not in doomed]
+        self._edge_set -= doomed
+        # pairs that still have an edge of another type keep their adjacency
+        remaining: Dict[Tuple[str, str], str] = {}
+        pairs = {(e.source, e.target) for e in doomed}
+        for e in self.edges:
+            if (e.source, e.target) in pairs:
+                remaining[(e.source, e.target)] = e.edge_type
+        for e in doomed:
+            self._edge_sources.pop(e, None)
+            pair = (e.source, e.target)
+            if pair in remaining:
+                self._edge_types[pair] = remaining[pair]
+                continue
+            if self._edge_types.get(pair) not in (None, e.edge_type):
+                continue  # also linked by a non-Edge source (e.g. link manifest)
+            self._edge_types.pop(pair, None)
+            self._adjacency.get(e.source, set()).discard(e.target)
+            self._reverse_adjacency.get(e.target, set()).discard(e.source)
+
     def _load_journal(self, journal_path: Path):
         """Load RequirementNodes from journal.json."""
         try:
@@ -237,32 +436,48 @@ class LinkGraph:
     def _load_diagrams(self, diagrams_path: Path):
         """Load diagram files and link them to nodes."""
         for diagram_file in diagrams_path.glob("*.mmd"):
-            # Extract node ID from filename (e.g., REQ-001_flowchart.mmd)
-            stem = diagram_file.stem
-            parts = stem.split("_")
-            if parts:
-                node_id = parts[0]
-                diagram_type = parts[1] if len(parts) > 1 else "diagram"
-
-                diagram_id = f"diagram_{stem}"
-                self.nodes[diagram_id] = {
-                    "id": diagram_id,
-                    "title": f"{node_id} {diagram_type}",
-                    "type": "diagram",
-                    "file": str(diagram_file)
-                }
-
-                # Link diagram to its parent node
-                if node_id in self.nodes:
-                    self._add_edge(diagram_id, node_id, "diagram_of")
+            rel_path = f"diagrams/{diagram_file.name}"
+            self._current_source = rel_path
+            try:
+                diagram_id = self._load_diagram_file(diagram_file)
+            finally:
+                self._current_source = None
+            if diagram_id:
+                self._node_sources[diagram_id] = rel_path
+
+    def _load_diagram_file(self, diagram_file: Path) -> Optional[str]:
+        """Load one diagram file and link it to its node; returns the diagram id."""
+        # Extract node ID from filename (e.g., REQ-001_flowchart.mmd)
+        stem = diagram_file.stem
+        parts = stem.split("_")
+        if not parts:
+            return None
+        node_id = parts[0]
+        diagram_type = parts[1] if len(parts) > 1 else "diagram"
+
+        diagram_id = f"diagram_{stem}"
+        self.nodes[diagram_id] = {
+            "id": diagram_id,
+            "title": f"{node_id} {diagram_type}",
+            "type": "diagram",
+            "file": str(diagram_file)
+        }
+
+        # Link diagram to its parent node
+        if node_id in self.nodes:
+            self._add_edge(diagram_id, node_id, "diagram_of")
+        return diagram_id
 
     def _add_edge(self, source: str, target: str, edge_type: str):
         """Add an edge to the graph."""
         edge = Edge(source=source, target=target, edge_type=edge_type)
 
         # Avoid duplicates
-        if edge not in self.edges:
+        if edge not in self._edge_set:
+            self._edge_set.add(edge)
             self.edges.append(edge)
+            if self._current_source:
+                self._edge_sources[edge] = self._current_source
             self._adjacency[source].add(target)
             self._reverse_adjacency[target].add(source)
             self._edge_types[(source, target)] = edge_type
@@ -380,6 +595,10 @@ class LinkGraph:
         if new_links:
             # Remove existing edges from this node
             self.edges = [e for e in self.edges if e.source != node_id]
+            self._edge_set = set(self.edges)
+            self._edge_sources = {
+                e: src for e, src in self._edge_sources.items() if e.source != node_id
+            }
             if node_id in self._adjacency:
                 for target in self._adjacency[node_id]:
                     self._edge_types.pop((node_id, target), None)
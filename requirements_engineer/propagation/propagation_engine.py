@@ -69,6 +69,14 @@ class PropagationEngine:
         self._is_processing = False
         self._processing_lock = asyncio.Lock()
 
+        # Called with (event_type, file_path) for every change, e.g. to keep
+        # the dashboard's TraceIndex in sync
+        self._file_change_listeners: List[Callable[[str, str], Any]] = []
+
+    def add_file_change_listener(self, listener: Callable[[str, str], Any]):
+        """Register a (sync or async) callback for raw file change events."""
+        self._file_change_listeners.append(listener)
+
     async def initialize(self):
         """
         Initialize the engine: build link graph, cache files, start watcher.
@@ -130,6 +138,15 @@ class PropagationEngine:
             event_type: Type of change (modified, created, deleted)
             file_path: Path to the changed file
         """
+        for listener in self._file_change_listeners:
+            try:
+                if asyncio.iscoroutinefunction(listener):
+                    await listener(event_type, file_path)
+                else:
+                    listener(event_type, file_path)
+            except Exception as e:
+                print(f"[PropagationEngine] File change listener error: {e}")
+
         async with self._processing_lock:
             if self._is_processing:
                 return
@@ -178,8 +195,9 @@ class PropagationEngine:
         """
         suggestions = []
 
-        # Rebuild link graph to include any new nodes
-        self.link_graph.build_from_project(self.project_path)
+        # Update the link graph: re-read only the changed file if possible
+        if self.link_graph.reload_file(change.file_path) is None:
+            self.link_graph.build_from_project(self.project_path)
 
         for node_id in change.affected_node_ids:
             # Find linked nodes
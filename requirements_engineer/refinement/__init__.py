@@ -19,7 +19,7 @@ Usage:
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 
 # ---------------------------------------------------------------------------
@@ -101,6 +101,20 @@ class ArtifactBundle:
     task_by_id: Dict[str, Any] = field(default_factory=dict)
     endpoint_by_key: Dict[str, Any] = field(default_factory=dict)
 
+    # Items modified in place since the last completeness check:
+    # collection name (e.g. "requirements") -> id() of the items.
+    # Added and removed items need no marking; the checker sees those itself.
+    touched: Dict[str, Set[int]] = field(default_factory=dict)
+
+    def touch(self, collection: str, *items: Any):
+        """Mark items of a collection as modified for incremental re-checks."""
+        self.touched.setdefault(collection, set()).update(id(item) for item in items)
+
+    def take_touched(self) -> Dict[str, Set[int]]:
+        """Return and reset the items modified since the last call."""
+        touched, self.touched = self.touched, {}
+        return touched
+
     @property
     def loaded_count(self) -> int:
         return sum(1 for r in self.file_results if r.status == LoadStatus.LOADED)
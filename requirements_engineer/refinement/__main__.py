@@ -5,6 +5,7 @@ Usage:
     python -m requirements_engineer.refinement <output_dir>
     python -m requirements_engineer.refinement <output_dir> --dry-run
     python -m requirements_engineer.refinement <output_dir> --max-iterations 3 --target-score 0.90
+    python -m requirements_engineer.refinement <output_dir> --restore-iteration 2
 """
 
 import argparse
@@ -19,6 +20,7 @@ try:
 except ImportError:
     pass
 
+from .backup_store import BackupStore
 from .refinement_loop import RefinementLoop
 
 
@@ -54,6 +56,14 @@ def main():
         "--config", default=None,
         help="Path to re_config.yaml for threshold overrides",
     )
+    parser.add_argument(
+        "--restore-iteration", type=int, default=None, metavar="N",
+        help="Restore the files backed up before iteration N and exit",
+    )
+    parser.add_argument(
+        "--gc-backups", type=int, default=None, metavar="KEEP",
+        help="Keep the newest KEEP iteration backups, delete the rest and exit",
+    )
 
     args = parser.parse_args()
 
@@ -62,6 +72,21 @@ def main():
         print(f"Error: Output directory does not exist: {output_dir}")
         sys.exit(1)
 
+    if args.restore_iteration is not None or args.gc_backups is not None:
+        store = BackupStore(output_dir)
+        if args.restore_iteration is not None:
+            if args.restore_iteration not in store.iterations():
+                print(f"Error: No backup for iteration {args.restore_iteration} "
+                      f"(available: {store.iterations() or 'none'})")
+                sys.exit(1)
+            restored = store.restore(args.restore_iteration)
+            print(f"Restored {len(restored)} files from iteration {args.restore_iteration}")
+        if args.gc_backups is not None:
+            removed = store.gc(keep_iterations=args.gc_backups)
+            print(f"Removed {removed['manifests_removed']} iteration backups, "
+                  f"{removed['blobs_removed']} blobs ({removed['bytes_freed']} bytes)")
+        return
+
     # Build config from args
     config = {
         "max_iterations": args.max_iterations,
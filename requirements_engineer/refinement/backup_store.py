@@ -0,0 +1,236 @@
+"""
+Backup Store — content-addressed, deduplicated backups of refinement iterations.
+
+Before each iteration the refinement loop snapshots the files its fixes may
+rewrite. Instead of copying every file into a per-iteration folder, file
+contents are stored once under their SHA-256 and each iteration only writes
+a small manifest:
+
+    <output_dir>/.backups/refinement/
+        objects/ab/cdef0123...        file content, named by its sha256
+        iterations/iter_0003.json     {"iteration", "created_at", "files": {path: {sha256, size, mtime_ns}}}
+
+Unchanged files cost nothing but a manifest entry: when a file's size and
+mtime match the previous manifest its hash is reused without reading it,
+and content that is already stored is not written again.
+
+    store = BackupStore(output_dir)
+    store.snapshot(3, ["tasks/task_list.json", "journal.json"])
+    store.restore(3)                       # put iteration 3's files back
+    store.gc(keep_iterations=5)            # drop older manifests + unreferenced blobs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+_MANIFEST_RE = re.compile(r"^iter_(\d+)\.json$")
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BackupStore:
+    """Content-addressed backup store for one output directory."""
+
+    def __init__(self, output_dir: Path, root: Optional[Path] = None):
+        """
+        Args:
+            output_dir: Pipeline output directory whose files are backed up
+            root: Store location (default: <output_dir>/.backups/refinement)
+        """
+        self.output_dir = Path(output_dir)
+        self.root = Path(root) if root else self.output_dir / ".backups" / "refinement"
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "iterations"
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    def snapshot(self, iteration: int, rel_paths: Iterable[str]) -> Dict[str, Any]:
+        """Back up the given files (relative to output_dir) as `iteration`.
+
+        Missing files are skipped. Returns the manifest, with a "stats"
+        entry counting files, newly stored blobs and bytes written.
+        """
+        previous = self._latest_manifest(before=iteration)
+        prev_files = previous.get("files", {}) if previous else {}
+
+        files: Dict[str, Dict[str, Any]] = {}
+        new_blobs = 0
+        bytes_written = 0
+        for rel_path in rel_paths:
+            src = self.output_dir / rel_path
+            try:
+                stat = src.stat()
+            except FileNotFoundError:
+                continue
+
+            prev = prev_files.get(rel_path)
+            if prev and prev["size"] == stat.st_size and prev.get("mtime_ns") == stat.st_mtime_ns:
+                sha = prev["sha256"]
+            else:
+                sha = _hash_file(src)
+
+            blob = self._blob_path(sha)
+            if not blob.exists():
+                self._write_blob(src, blob)
+                new_blobs += 1
+                bytes_written += stat.st_size
+
+            files[rel_path] = {"sha256": sha, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        manifest = {
+            "iteration": iteration,
+            "created_at": datetime.now().isoformat(),
+            "files": files,
+        }
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        self._write_json(self._manifest_path(iteration), manifest)
+
+        manifest["stats"] = {"files": len(files), "new_blobs": new_blobs, "bytes_written": bytes_written}
+        return manifest
+
+    # ------------------------------------------------------------------
+    # Lookup / restore
+    # ------------------------------------------------------------------
+
+    def iterations(self) -> List[int]:
+        """Iterations that have a manifest, ascending."""
+        if not self.manifests_dir.exists():
+            return []
+        found = []
+        for path in self.manifests_dir.iterdir():
+            match = _MANIFEST_RE.match(path.name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def load_manifest(self, iteration: int) -> Dict[str, Any]:
+        """Manifest of an iteration; raises FileNotFoundError if there is none."""
+        with open(self._manifest_path(iteration), encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore(self, iteration: int, paths: Optional[Iterable[str]] = None,
+                target_dir: Optional[Path] = None) -> List[str]:
+        """Write an iteration's files back (to output_dir, or target_dir).
+
+        Args:
+            iteration: Iteration to restore
+            paths: Only these relative paths (default: every file in the manifest)
+            target_dir: Restore into another directory instead of output_dir
+
+        Returns the restored relative paths. Raises ValueError if a stored
+        blob no longer matches its hash.
+        """
+        files = self.load_manifest(iteration)["files"]
+        wanted = list(files) if paths is None else [p for p in paths if p in files]
+        target_dir = Path(target_dir) if target_dir else self.output_dir
+
+        restored = []
+        for rel_path in wanted:
+            sha = files[rel_path]["sha256"]
+            dst = target_dir / rel_path
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dst.with_name(f".{dst.name}.restore.tmp")
+            shutil.copyfile(self._blob_path(sha), tmp)
+            if _hash_file(tmp) != sha:
+                tmp.unlink()
+                raise ValueError(f"Backup blob for {rel_path} (iteration {iteration}) is corrupt")
+            os.replace(tmp, dst)
+            restored.append(rel_path)
+        return restored
+
+    # ------------------------------------------------------------------
+    # Garbage collection
+    # ------------------------------------------------------------------
+
+    def gc(self, keep_iterations: Optional[int] = None) -> Dict[str, int]:
+        """Delete old manifests and every blob no manifest references.
+
+        Args:
+            keep_iterations: Keep only the newest N manifests (None = keep all,
+                only remove unreferenced blobs)
+        """
+        manifests_removed = 0
+        iterations = self.iterations()
+        if keep_iterations is not None and len(iterations) > keep_iterations:
+            for iteration in iterations[:len(iterations) - max(0, keep_iterations)]:
+                self._manifest_path(iteration).unlink()
+                manifests_removed += 1
+
+        referenced = set()
+        for iteration in self.iterations():
+            referenced.update(entry["sha256"] for entry in self.load_manifest(iteration)["files"].values())
+
+        blobs_removed = 0
+        bytes_freed = 0
+        if self.objects_dir.exists():
+            for blob in self.objects_dir.glob("*/*"):
+                sha = blob.parent.name + blob.name
+                if sha in referenced or blob.name.endswith(".tmp"):
+                    continue
+                bytes_freed += blob.stat().st_size
+                blob.unlink()
+                blobs_removed += 1
+            for subdir in self.objects_dir.iterdir():
+                if subdir.is_dir() and not any(subdir.iterdir()):
+                    subdir.rmdir()
+
+        return {"manifests_removed": manifests_removed, "blobs_removed": blobs_removed,
+                "bytes_freed": bytes_freed}
+
+    def size_bytes(self) -> int:
+        """Total size of stored blobs."""
+        if not self.objects_dir.exists():
+            return 0
+        return sum(blob.stat().st_size for blob in self.objects_dir.glob("*/*"))
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.objects_dir / sha[:2] / sha[2:]
+
+    def _manifest_path(self, iteration: int) -> Path:
+        return self.manifests_dir / f"iter_{iteration:04d}.json"
+
+    def _latest_manifest(self, before: int) -> Optional[Dict[str, Any]]:
+        earlier = [i for i in self.iterations() if i < before]
+        if not earlier:
+            return None
+        try:
+            return self.load_manifest(earlier[-1])
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Unreadable backup manifest for iteration %d: %s", earlier[-1], e)
+            return None
+
+    @staticmethod
+    def _write_blob(src: Path, blob: Path):
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, blob)
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]):
+        tmp = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
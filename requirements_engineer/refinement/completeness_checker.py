@@ -3,12 +3,20 @@ Completeness Checker — 12 cross-artifact rules for evaluating RE output qualit
 
 Each rule computes a metric, compares against a configurable threshold,
 produces a score 0.0–1.0, and emits Gap objects for items below threshold.
+
+The checker keeps per-rule state between checks: keywords and link ids
+derived from each artifact, link counts, and for keyword-overlap rules a
+matching artifact per covered item. check_all(bundle, incremental=True)
+updates that state only for artifacts that were added, removed, or marked
+with bundle.touch() since the previous check; without `incremental` the
+state is rebuilt from scratch. Both produce the same report.
 """
 
 import logging
 import re
+from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from . import (
     ArtifactBundle,
@@ -56,6 +64,173 @@ def _extract_keywords(text: str) -> Set[str]:
     return words - _STOPWORDS
 
 
+_MISSING = object()
+
+
+class _Derived:
+    """Per-item derived values of one collection (keywords, link ids, ...).
+
+    Values are keyed by id(item) and recomputed only for items that are
+    new or touched; sync() reports what changed.
+    """
+
+    def __init__(self, compute: Callable[[Any], Any]):
+        self.compute = compute
+        self._values: Dict[int, Tuple[Any, Any]] = {}  # id(item) -> (item, value)
+
+    def sync(self, items: Iterable[Any], touched: Set[int]) -> Dict[int, Tuple[Any, Any]]:
+        """Update values; returns {item_id: (old, new)} for added, changed and
+        removed items (_MISSING stands for "no value")."""
+        delta: Dict[int, Tuple[Any, Any]] = {}
+        current: Dict[int, Tuple[Any, Any]] = {}
+        for item in items:
+            key = id(item)
+            if key in current:
+                continue
+            cached = self._values.get(key)
+            if cached is not None and cached[0] is item and key not in touched:
+                current[key] = cached
+                continue
+            value = self.compute(item)
+            old = cached[1] if cached is not None else _MISSING
+            if old is _MISSING or old != value or cached[0] is not item:
+                delta[key] = (old, value)
+            current[key] = (item, value)
+        for key in self._values.keys() - current.keys():
+            delta[key] = (self._values[key][1], _MISSING)
+        self._values = current
+        return delta
+
+    def value(self, item: Any) -> Any:
+        return self._values[id(item)][1]
+
+    def items(self) -> List[Tuple[int, Any]]:
+        return [(key, value) for key, (_, value) in self._values.items()]
+
+
+class _LinkIndex:
+    """Counts of link keys over a collection, e.g. requirement ids referenced by stories."""
+
+    def __init__(self, links: Callable[[Any], Iterable[str]]):
+        self.derived = _Derived(lambda item: frozenset(k for k in links(item) if k))
+        self.counts: Counter = Counter()
+
+    def sync(self, items: Iterable[Any], touched: Set[int]) -> "_LinkIndex":
+        for old, new in self.derived.sync(items, touched).values():
+            if old is not _MISSING:
+                self.counts.subtract(old)
+            if new is not _MISSING:
+                self.counts.update(new)
+        return self
+
+    def __contains__(self, key: str) -> bool:
+        return self.counts.get(key, 0) > 0
+
+    def distinct(self) -> int:
+        return sum(1 for count in self.counts.values() if count > 0)
+
+
+class _Coverage:
+    """Incremental "target matches at least one source" relation.
+
+    Keeps one matching source (witness) per covered target. After a delta
+    only these targets are re-tested: new or touched targets, and targets
+    whose witness changed or was removed, against all sources; uncovered
+    targets against the new or touched sources only.
+    """
+
+    def __init__(self, target_value: Callable[[Any], Any], source_value: Callable[[Any], Any],
+                 matches: Callable[[Any, Any], bool]):
+        self.targets = _Derived(target_value)
+        self.sources = _Derived(source_value)
+        self.matches = matches
+        self._witness: Dict[int, Optional[int]] = {}  # target id -> source id (None = uncovered)
+
+    def sync(self, targets: Iterable[Any], target_touched: Set[int],
+             sources: Iterable[Any], source_touched: Set[int]) -> "_Coverage":
+        source_delta = self.sources.sync(sources, source_touched)
+        target_delta = self.targets.sync(targets, target_touched)
+        all_sources = self.sources.items()
+        new_sources = [(key, value) for key, value in all_sources if key in source_delta]
+
+        witness: Dict[int, Optional[int]] = {}
+        for key, value in self.targets.items():
+            previous = self._witness.get(key, _MISSING)
+            if key in target_delta or previous is _MISSING or previous in source_delta:
+                witness[key] = self._find(value, all_sources)
+            elif previous is None and new_sources:
+                witness[key] = self._find(value, new_sources)
+            else:
+                witness[key] = previous
+        self._witness = witness
+        return self
+
+    def _find(self, value: Any, sources: List[Tuple[int, Any]]) -> Optional[int]:
+        for key, source in sources:
+            if self.matches(value, source):
+                return key
+        return None
+
+    def covered(self, item: Any) -> bool:
+        return self._witness.get(id(item)) is not None
+
+
+def _keyword_overlap(minimum: int) -> Callable[[Set[str], Set[str]], bool]:
+    return lambda a, b: len(a & b) >= minimum
+
+
+def _story_links(story: Any) -> List[str]:
+    return [getattr(story, "parent_requirement_id", "")] + list(
+        getattr(story, "linked_requirement_ids", [])
+    )
+
+
+def _screen_story_links(screen: Any) -> List[str]:
+    return [getattr(screen, "parent_user_story", "")] + list(
+        getattr(screen, "linked_user_stories", [])
+    )
+
+
+def _composition_story_links(comp: Any) -> List[str]:
+    # Key varies: "linked_user_stories" or "user_stories"
+    if isinstance(comp, dict):
+        return list(comp.get("linked_user_stories", comp.get("user_stories", [])))
+    return list(getattr(comp, "linked_user_stories", getattr(comp, "user_stories", [])))
+
+
+def _screen_component_names(screen: Any) -> List[str]:
+    names = []
+    for comp in getattr(screen, "components", []):
+        names.append(getattr(comp, "name", "") if hasattr(comp, "name") else (
+            comp.get("name", "") if isinstance(comp, dict) else str(comp)
+        ))
+    return names
+
+
+def _entity_name(entity: Any) -> str:
+    return entity.name if hasattr(entity, "name") else entity.get("name", "")
+
+
+# Lifecycle entities (those likely needing state machines)
+_LIFECYCLE_KEYWORDS = frozenset({
+    "status", "state", "phase", "stage", "step", "order", "request",
+    "session", "message", "chat", "call", "payment", "subscription",
+    "registration", "notification", "task", "job", "workflow",
+})
+
+
+def _is_lifecycle_entity(entity: Any) -> bool:
+    """Entity has a status/state field or a lifecycle name."""
+    if _entity_name(entity).lower() in _LIFECYCLE_KEYWORDS:
+        return True
+    fields = entity.get("fields", []) if isinstance(entity, dict) else getattr(entity, "fields", [])
+    for f in fields:
+        fname = f.name if hasattr(f, "name") else (f.get("name", "") if isinstance(f, dict) else "")
+        if fname.lower() in ("status", "state", "phase"):
+            return True
+    return False
+
+
 class CompletenessChecker:
     """Runs 12 completeness rules against an ArtifactBundle."""
 
@@ -65,14 +240,52 @@ class CompletenessChecker:
         self.weights = {**DEFAULT_WEIGHTS, **(config.get("weights", {}))}
         self.disabled_rules: Set[str] = set(config.get("disabled_rules", []))
         self._gap_counter = 0
+        # Per-rule derived state, reused by incremental checks
+        self._state: Dict[str, Any] = {}
+        self._state_bundle: Optional[ArtifactBundle] = None
+        self._touched: Dict[str, Set[int]] = {}
 
     def _next_gap_id(self) -> str:
         self._gap_counter += 1
         return f"GAP-{self._gap_counter:03d}"
 
-    def check_all(self, bundle: ArtifactBundle) -> CompletenessReport:
-        """Run all enabled rules and produce a CompletenessReport."""
+    def _links(self, name: str, collection: str, items: Iterable[Any],
+               links: Callable[[Any], Iterable[str]]) -> _LinkIndex:
+        index = self._state.get(name)
+        if index is None:
+            index = self._state[name] = _LinkIndex(links)
+        return index.sync(items, self._touched.get(collection, set()))
+
+    def _coverage(self, name: str, targets: Iterable[Any], target_collection: str,
+                  sources: Iterable[Any], source_collection: str,
+                  target_value: Callable[[Any], Any], source_value: Callable[[Any], Any],
+                  matches: Callable[[Any, Any], bool]) -> _Coverage:
+        coverage = self._state.get(name)
+        if coverage is None:
+            coverage = self._state[name] = _Coverage(target_value, source_value, matches)
+        return coverage.sync(targets, self._touched.get(target_collection, set()),
+                             sources, self._touched.get(source_collection, set()))
+
+    def _derived(self, name: str, collection: str, items: Iterable[Any],
+                 compute: Callable[[Any], Any]) -> _Derived:
+        derived = self._state.get(name)
+        if derived is None:
+            derived = self._state[name] = _Derived(compute)
+        derived.sync(items, self._touched.get(collection, set()))
+        return derived
+
+    def check_all(self, bundle: ArtifactBundle, incremental: bool = False) -> CompletenessReport:
+        """Run all enabled rules and produce a CompletenessReport.
+
+        With incremental=True the per-rule state of the previous check of
+        the same bundle is updated for added, removed and touched artifacts
+        only; otherwise it is rebuilt from scratch (full re-check).
+        """
         self._gap_counter = 0
+        self._touched = bundle.take_touched()
+        if not incremental or self._state_bundle is not bundle:
+            self._state = {}
+            self._state_bundle = bundle
         rules = [
             self._check_req_to_story,
             self._check_story_to_test,
@@ -117,6 +330,9 @@ class CompletenessChecker:
     def _check_req_to_story(self, bundle: ArtifactBundle) -> RuleResult:
         rule_id = "req_to_story"
         threshold = self.thresholds[rule_id]
+        # Requirement IDs that have stories
+        reqs_with_stories = self._links("req_to_story.links", "user_stories",
+                                        bundle.user_stories, _story_links)
 
         func_reqs = [
             r for r in bundle.requirements
@@ -127,15 +343,6 @@ class CompletenessChecker:
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Build set of requirement IDs that have stories
-        reqs_with_stories: Set[str] = set()
-        for story in bundle.user_stories:
-            parent = getattr(story, "parent_requirement_id", "")
-            if parent:
-                reqs_with_stories.add(parent)
-            for linked in getattr(story, "linked_requirement_ids", []):
-                reqs_with_stories.add(linked)
-
         gaps = []
         for req in func_reqs:
             rid = getattr(req, "requirement_id", "") or getattr(req, "id", "")
@@ -170,18 +377,16 @@ class CompletenessChecker:
     def _check_story_to_test(self, bundle: ArtifactBundle) -> RuleResult:
         rule_id = "story_to_test"
         threshold = self.thresholds[rule_id]
+        stories_with_tests = self._links(
+            "story_to_test.links", "test_cases", bundle.test_cases,
+            lambda tc: [getattr(tc, "parent_user_story_id", "")],
+        )
 
         if not bundle.user_stories:
             return RuleResult(rule_id=rule_id, rule_name="Story -> Test",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        stories_with_tests: Set[str] = set()
-        for tc in bundle.test_cases:
-            parent = getattr(tc, "parent_user_story_id", "")
-            if parent:
-                stories_with_tests.add(parent)
-
         gaps = []
         for story in bundle.user_stories:
             sid = getattr(story, "id", "")
@@ -215,36 +420,21 @@ class CompletenessChecker:
     def _check_story_to_screen(self, bundle: ArtifactBundle) -> RuleResult:
         rule_id = "story_to_screen"
         threshold = self.thresholds[rule_id]
+        # Stories linked from screens and from compositions
+        screen_links = self._links("story_to_screen.screens", "screens",
+                                   bundle.screens, _screen_story_links)
+        composition_links = self._links("story_to_screen.compositions", "screen_compositions",
+                                        bundle.screen_compositions, _composition_story_links)
 
         if not bundle.user_stories:
             return RuleResult(rule_id=rule_id, rule_name="Story -> Screen",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Build mapping of stories that have screens
-        stories_with_screens: Set[str] = set()
-        for screen in bundle.screens:
-            parent_us = getattr(screen, "parent_user_story", "")
-            if parent_us:
-                stories_with_screens.add(parent_us)
-            for linked in getattr(screen, "linked_user_stories", []):
-                stories_with_screens.add(linked)
-
-        # Also check compositions (key varies: "linked_user_stories" or "user_stories")
-        for comp in bundle.screen_compositions:
-            if isinstance(comp, dict):
-                for sid in comp.get("linked_user_stories", comp.get("user_stories", [])):
-                    stories_with_screens.add(sid)
-            else:
-                linked = getattr(comp, "linked_user_stories",
-                                 getattr(comp, "user_stories", []))
-                for sid in linked:
-                    stories_with_screens.add(sid)
-
         gaps = []
         for story in bundle.user_stories:
             sid = getattr(story, "id", "")
-            if sid and sid not in stories_with_screens:
+            if sid and sid not in screen_links and sid not in composition_links:
                 gaps.append(Gap(
                     gap_id=self._next_gap_id(),
                     rule_id=rule_id,
@@ -316,29 +506,24 @@ class CompletenessChecker:
         threshold = self.thresholds[rule_id]
 
         entities = list(bundle.entities.values()) if bundle.entities else []
+        # Entity keywords matched against requirement keywords
+        coverage = self._coverage(
+            "entity_to_req.coverage", entities, "entities", bundle.requirements, "requirements",
+            lambda entity: _extract_keywords(_entity_name(entity)),
+            lambda req: _extract_keywords(
+                f"{getattr(req, 'title', '')} {getattr(req, 'description', '')}"
+            ),
+            _keyword_overlap(1),
+        )
         if not entities:
             return RuleResult(rule_id=rule_id, rule_name="Entity -> Requirement",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Build entity keywords and match against requirements
-        req_keyword_map: Dict[str, Set[str]] = {}
-        for req in bundle.requirements:
-            rid = getattr(req, "requirement_id", "") or getattr(req, "id", "")
-            title = getattr(req, "title", "")
-            desc = getattr(req, "description", "")
-            req_keyword_map[rid] = _extract_keywords(f"{title} {desc}")
-
         gaps = []
         for entity in entities:
-            name = entity.name if hasattr(entity, "name") else entity.get("name", "")
-            entity_kw = _extract_keywords(name)
-            linked = False
-            for _rid, req_kw in req_keyword_map.items():
-                if len(entity_kw & req_kw) >= 1:
-                    linked = True
-                    break
-            if not linked:
+            name = _entity_name(entity)
+            if not coverage.covered(entity):
                 gaps.append(Gap(
                     gap_id=self._next_gap_id(),
                     rule_id=rule_id,
@@ -369,47 +554,24 @@ class CompletenessChecker:
         threshold = self.thresholds[rule_id]
 
         entities = list(bundle.entities.values()) if bundle.entities else []
+        lifecycle = self._derived("state_machine_density.lifecycle", "entities",
+                                  entities, _is_lifecycle_entity)
+        sm_entities = self._links(
+            "state_machine_density.links", "state_machines", bundle.state_machines,
+            lambda sm: [(getattr(sm, "entity", "") or "").lower()],
+        )
         if not entities:
             return RuleResult(rule_id=rule_id, rule_name="State Machine Density",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Identify lifecycle entities (those likely needing state machines)
-        lifecycle_keywords = {
-            "status", "state", "phase", "stage", "step", "order", "request",
-            "session", "message", "chat", "call", "payment", "subscription",
-            "registration", "notification", "task", "job", "workflow",
-        }
-
-        lifecycle_entities = []
-        for entity in entities:
-            name = entity.name if hasattr(entity, "name") else entity.get("name", "")
-            fields = getattr(entity, "fields", [])
-            if isinstance(entity, dict):
-                fields = entity.get("fields", [])
-
-            # Check if entity has status/state field or lifecycle name
-            has_lifecycle = name.lower() in lifecycle_keywords
-            for f in fields:
-                fname = f.name if hasattr(f, "name") else (f.get("name", "") if isinstance(f, dict) else "")
-                if fname.lower() in ("status", "state", "phase"):
-                    has_lifecycle = True
-                    break
-            if has_lifecycle:
-                lifecycle_entities.append(name)
+        lifecycle_entities = [_entity_name(e) for e in entities if lifecycle.value(e)]
 
         if not lifecycle_entities:
             return RuleResult(rule_id=rule_id, rule_name="State Machine Density",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Check which lifecycle entities have state machines
-        sm_entities = set()
-        for sm in bundle.state_machines:
-            ent_name = getattr(sm, "entity", "")
-            if ent_name:
-                sm_entities.add(ent_name.lower())
-
         gaps = []
         for name in lifecycle_entities:
             if name.lower() not in sm_entities:
@@ -526,29 +688,23 @@ class CompletenessChecker:
     def _check_component_count(self, bundle: ArtifactBundle) -> RuleResult:
         rule_id = "component_count"
         threshold = self.thresholds[rule_id]
+        # Unique components from screens
+        components = self._links("component_count.names", "screens",
+                                 bundle.screens, _screen_component_names)
 
         if not bundle.screens:
             return RuleResult(rule_id=rule_id, rule_name="Component Count",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Count unique components from screens and compositions
-        components: Set[str] = set()
-        for screen in bundle.screens:
-            for comp in getattr(screen, "components", []):
-                cname = getattr(comp, "name", "") if hasattr(comp, "name") else (
-                    comp.get("name", "") if isinstance(comp, dict) else str(comp)
-                )
-                if cname:
-                    components.add(cname)
-
+        n_components = components.distinct()
         target = len(bundle.screens) * 1.5
         if target <= 0:
             return RuleResult(rule_id=rule_id, rule_name="Component Count",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        ratio = len(components) / target
+        ratio = n_components / target
 
         gaps = []
         if ratio < threshold:
@@ -556,7 +712,7 @@ class CompletenessChecker:
                 gap_id=self._next_gap_id(),
                 rule_id=rule_id,
                 severity=GapSeverity.MEDIUM,
-                title=f"Only {len(components)} components for {len(bundle.screens)} screens",
+                title=f"Only {n_components} components for {len(bundle.screens)} screens",
                 description=f"Expected ~{int(target)} components (1.5× screens)",
                 affected_ids=[],
                 current_value=ratio,
@@ -581,33 +737,28 @@ class CompletenessChecker:
     def _check_flow_coverage(self, bundle: ArtifactBundle) -> RuleResult:
         rule_id = "flow_coverage"
         threshold = self.thresholds[rule_id]
+        # Match flows to epics via keyword overlap
+        coverage = self._coverage(
+            "flow_coverage.coverage", bundle.epics, "epics", bundle.user_flows, "user_flows",
+            lambda epic: _extract_keywords(
+                f"{getattr(epic, 'title', '')} {getattr(epic, 'description', '')}"
+            ),
+            lambda flow: _extract_keywords(
+                f"{getattr(flow, 'name', '') or getattr(flow, 'title', '')} "
+                f"{getattr(flow, 'description', '')}"
+            ),
+            _keyword_overlap(2),
+        )
 
         if not bundle.epics:
             return RuleResult(rule_id=rule_id, rule_name="Flow Coverage",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Match flows to epics via keyword overlap
-        flow_keywords: List[Set[str]] = []
-        for flow in bundle.user_flows:
-            name = getattr(flow, "name", "") or getattr(flow, "title", "")
-            desc = getattr(flow, "description", "")
-            flow_keywords.append(_extract_keywords(f"{name} {desc}"))
-
         gaps = []
         for epic in bundle.epics:
             eid = getattr(epic, "id", "")
-            title = getattr(epic, "title", "")
-            desc = getattr(epic, "description", "")
-            epic_kw = _extract_keywords(f"{title} {desc}")
-
-            has_flow = False
-            for fkw in flow_keywords:
-                if len(epic_kw & fkw) >= 2:
-                    has_flow = True
-                    break
-
-            if not has_flow:
+            if not coverage.covered(epic):
                 gaps.append(Gap(
                     gap_id=self._next_gap_id(),
                     rule_id=rule_id,
@@ -696,33 +847,28 @@ class CompletenessChecker:
     def _check_test_api_linkage(self, bundle: ArtifactBundle) -> RuleResult:
         rule_id = "test_api_linkage"
         threshold = self.thresholds[rule_id]
+        # Endpoint keywords matched against test case titles/descriptions
+        coverage = self._coverage(
+            "test_api_linkage.coverage", bundle.api_endpoints, "api_endpoints",
+            bundle.test_cases, "test_cases",
+            lambda ep: _extract_keywords(f"{getattr(ep, 'path', '')} {getattr(ep, 'summary', '')}"),
+            lambda tc: _extract_keywords(
+                f"{getattr(tc, 'title', '') or getattr(tc, 'name', '')} "
+                f"{getattr(tc, 'description', '')}"
+            ),
+            _keyword_overlap(2),
+        )
 
         if not bundle.api_endpoints:
             return RuleResult(rule_id=rule_id, rule_name="Test <-> API Linkage",
                               current_value=1.0, target_value=threshold,
                               score=1.0, weight=self.weights[rule_id], passed=True)
 
-        # Extract keywords from test case titles/descriptions
-        test_keywords: List[Set[str]] = []
-        for tc in bundle.test_cases:
-            title = getattr(tc, "title", "") or getattr(tc, "name", "")
-            desc = getattr(tc, "description", "")
-            test_keywords.append(_extract_keywords(f"{title} {desc}"))
-
         gaps = []
         for ep in bundle.api_endpoints:
             path = getattr(ep, "path", "")
             method = getattr(ep, "method", "")
-            summary = getattr(ep, "summary", "")
-            ep_kw = _extract_keywords(f"{path} {summary}")
-
-            has_test = False
-            for tkw in test_keywords:
-                if len(ep_kw & tkw) >= 2:
-                    has_test = True
-                    break
-
-            if not has_test:
+            if not coverage.covered(ep):
                 gaps.append(Gap(
                     gap_id=self._next_gap_id(),
                     rule_id=rule_id,
@@ -8,15 +8,27 @@ Three tiers of fixes:
   1. Auto-link (programmatic, no LLM) — keyword overlap matching
   2. LLM-extend — direct LLM calls for entity linking, acceptance criteria
   3. Generator — re-invoke existing pipeline generators with focused inputs
+
+Fixes that need the LLM run concurrently where they do not conflict: gaps
+touching the same artifact (or generators writing what another one reads)
+are split into consecutive waves, everything within a wave runs at once.
+Same-type link gaps share one multi-item prompt (fix_batch_size items).
+All calls go through one LLMExecutor (max_parallel_fixes in flight) and
+reserve their share of max_llm_calls / max_cost_usd before they start, so
+concurrent fixes never overshoot the budget.
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from requirements_engineer.core.llm_concurrency import get_llm_executor
 
 from . import ArtifactBundle, Gap, GapFixStrategy
 
@@ -38,11 +50,40 @@ except ImportError:
 
 # Optional: Semantic matcher for RAG
 try:
-    from requirements_engineer.memory.semantic_matcher import SemanticMatcher
+    from requirements_engineer.memory.semantic_matcher import (
+        DEFAULT_ANN_MIN_ITEMS, DEFAULT_ANN_NPROBE, SemanticMatcher,
+    )
     HAS_SEMANTIC = True
 except ImportError:
     HAS_SEMANTIC = False
 
+# Matches kept per prefetched semantic query (fixers ask for at most 3)
+SEMANTIC_PREFETCH_TOP_K = 3
+
+# Parallel fix application defaults (refinement.max_parallel_fixes / fix_batch_size)
+DEFAULT_MAX_PARALLEL_FIXES = 4
+DEFAULT_FIX_BATCH_SIZE = 10
+
+# Bundle collections each generator handler reads / writes. Two handlers
+# conflict (and run one after the other) when one writes what the other
+# reads or writes.
+_GENERATOR_READS = {
+    "test_case": {"user_stories"},
+    "user_story": {"requirements"},
+    "task": {"requirements", "user_stories", "epics"},
+    "state_machine": {"requirements", "user_stories", "entities"},
+    "screen": {"user_stories"},
+    "user_flow": {"user_stories", "epics", "personas"},
+}
+_GENERATOR_WRITES = {
+    "test_case": {"test_cases"},
+    "user_story": {"user_stories", "epics"},
+    "task": {"tasks"},
+    "state_machine": {"state_machines"},
+    "screen": {"screens"},
+    "user_flow": {"user_flows"},
+}
+
 # Stopwords for keyword overlap matching (reused from completeness_checker)
 _STOPWORDS = frozenset({
     "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
@@ -166,6 +207,48 @@ def _estimate_cost(model: str, approx_tokens: int = 4000) -> float:
     return 0.001  # default fallback
 
 
+class LLMBudgetExceeded(RuntimeError):
+    """Raised instead of making an LLM call that max_llm_calls / max_cost_usd do not allow."""
+
+
+def _conflict_waves(items: List[Any], conflicts: Callable[[Any, Any], bool]) -> List[List[Any]]:
+    """Split items into waves whose members can run concurrently.
+
+    Each item goes one wave after the latest earlier item it conflicts with,
+    so conflicting fixes keep their original order.
+    """
+    waves: List[List[Any]] = []
+    placed: List[Tuple[Any, int]] = []
+    for item in items:
+        wave = 1 + max((w for other, w in placed if conflicts(other, item)), default=-1)
+        placed.append((item, wave))
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(item)
+    return waves
+
+
+def _gaps_overlap(a: Gap, b: Gap) -> bool:
+    return not set(a.affected_ids).isdisjoint(b.affected_ids)
+
+
+def _generators_conflict(a: str, b: str) -> bool:
+    reads_a, writes_a = _GENERATOR_READS.get(a, set()), _GENERATOR_WRITES.get(a, set())
+    reads_b, writes_b = _GENERATOR_READS.get(b, set()), _GENERATOR_WRITES.get(b, set())
+    return bool(writes_a & (reads_b | writes_b) or writes_b & reads_a)
+
+
+# Backlink gap rule -> (bundle lookup, touched collection, log label, semantic query fields)
+_BACKLINK_RULES = {
+    "api_to_req": ("endpoint_by_key", "api_endpoints", "API", ("path", "summary")),
+    "task_backlinks": ("task_by_id", "tasks", "task", ("title", "description")),
+}
+
+
+def _batches(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
 class GeneratorInvoker:
     """Applies fixes to an ArtifactBundle by re-invoking generators or programmatic fixes."""
 
@@ -175,6 +258,14 @@ class GeneratorInvoker:
         self.cost_usd = 0.0
         self.fix_log: List[str] = []
 
+        # Budget (None = unlimited) and parallel fix application
+        self.max_llm_calls = self.config.get("max_llm_calls")
+        self.max_cost_usd = self.config.get("max_cost_usd")
+        self.max_parallel_fixes = max(1, int(self.config.get("max_parallel_fixes", DEFAULT_MAX_PARALLEL_FIXES)))
+        self.fix_batch_size = max(1, int(self.config.get("fix_batch_size", DEFAULT_FIX_BATCH_SIZE)))
+        self._reserved_calls = 0  # calls in flight, charged when they complete
+        self._reserved_cost = 0.0
+
         # LLM settings
         self.model_name = self.config.get("model", "google/gemini-3-flash-preview")
         self.generator_model = self.config.get("generator_model", self.model_name)
@@ -190,6 +281,8 @@ class GeneratorInvoker:
         self._matcher_checked = False
         self._index_built = False
         self.similarity_threshold = self.config.get("similarity_threshold", 0.55)
+        # query text -> top matches (threshold 0), filled by _prefetch_semantic_matches
+        self._semantic_hits: Dict[str, List[Tuple[str, float]]] = {}
 
     # ------------------------------------------------------------------
     # LLM infrastructure
@@ -224,12 +317,25 @@ class GeneratorInvoker:
         if not HAS_SEMANTIC:
             logger.info("Semantic matcher not available (import failed).")
             return False
+        rag_cfg = self.config.get("rag", {}) or {}
+        # openai | local | auto (local when no OpenAI key is set)
+        backend_name = rag_cfg.get("embedding_backend", "openai")
+        store_dir = rag_cfg.get("embedding_store")
+        ann_kwargs = {
+            "ann_min_items": rag_cfg.get("ann_min_items", DEFAULT_ANN_MIN_ITEMS),
+            "ann_nprobe": rag_cfg.get("ann_nprobe", DEFAULT_ANN_NPROBE),
+        }
         openai_key = self.config.get("openai_api_key") or os.environ.get("OPENAI_API_KEY")
+        if backend_name == "local" or (backend_name == "auto" and not openai_key):
+            from requirements_engineer.memory.local_embeddings import HashingEmbedder
+            backend = HashingEmbedder(dim=rag_cfg.get("local_dim", 512))
+            self._matcher = SemanticMatcher(backend=backend, store_dir=store_dir, **ann_kwargs)
+            return self._matcher.available
         if not openai_key:
             logger.info("Semantic matching disabled (no OPENAI_API_KEY).")
             return False
-        model = self.config.get("embeddings_model", "text-embedding-3-small")
-        self._matcher = SemanticMatcher(api_key=openai_key, model=model)
+        model = rag_cfg.get("embeddings_model") or self.config.get("embeddings_model", "text-embedding-3-small")
+        self._matcher = SemanticMatcher(api_key=openai_key, model=model, store_dir=store_dir, **ann_kwargs)
         return self._matcher.available
 
     async def build_artifact_index(self, bundle: ArtifactBundle) -> bool:
@@ -267,11 +373,118 @@ class GeneratorInvoker:
         try:
             count = await self._matcher.build_index(items)
             self._index_built = count > 0
+            self._semantic_hits.clear()
             return self._index_built
         except Exception as e:
             logger.warning("Failed to build semantic index: %s", e)
             return False
 
+    async def _prefetch_semantic_matches(self, queries: List[str]):
+        """Resolve many semantic queries with one batched matcher call.
+
+        Gap fixers ask the matcher one query at a time; prefetching the
+        queries of all gaps up front replaces those per-gap embedding
+        round trips and index scans with a single find_similar_batch().
+        """
+        if not (self._index_built and self._matcher and self._matcher.available):
+            return
+        pending = list(dict.fromkeys(q for q in queries if q and q not in self._semantic_hits))
+        if not pending:
+            return
+        try:
+            results = await self._matcher.find_similar_batch(pending, top_k=SEMANTIC_PREFETCH_TOP_K)
+        except Exception as e:
+            logger.warning("Batched semantic matching failed, using per-gap queries: %s", e)
+            return
+        self._semantic_hits.update(zip(pending, results))
+
+    async def _find_similar(
+        self, query: str, top_k: int = 3, threshold: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """matcher.find_similar(), answered from prefetched results when possible."""
+        hits = self._semantic_hits.get(query)
+        if hits is not None and top_k <= SEMANTIC_PREFETCH_TOP_K:
+            return [(item_id, score) for item_id, score in hits if score >= threshold][:top_k]
+        return await self._matcher.find_similar(query, top_k=top_k, threshold=threshold)
+
+    def budget_exhausted(self, next_cost: float = 0.0) -> bool:
+        """True when max_llm_calls / max_cost_usd leave no room for another call.
+
+        Calls still in flight count against the budget, so concurrent fixes
+        cannot overshoot it.
+        """
+        if self.max_llm_calls is not None and self.llm_calls + self._reserved_calls >= self.max_llm_calls:
+            return True
+        if (self.max_cost_usd is not None
+                and self.cost_usd + self._reserved_cost + next_cost > self.max_cost_usd):
+            return True
+        return False
+
+    @contextmanager
+    def _llm_budget(self, model: str, approx_tokens: int = 4000):
+        """Reserve budget for one LLM call made inside the block.
+
+        Raises LLMBudgetExceeded when the call does not fit. The call is
+        charged to llm_calls / cost_usd when the block completes.
+        """
+        cost = _estimate_cost(model, approx_tokens)
+        if self.budget_exhausted(cost):
+            raise LLMBudgetExceeded(
+                f"LLM budget exhausted ({self.llm_calls} calls, ~${self.cost_usd:.3f})"
+            )
+        self._reserved_calls += 1
+        self._reserved_cost += cost
+        try:
+            yield
+            self.llm_calls += 1
+            self.cost_usd += cost
+        finally:
+            self._reserved_calls -= 1
+            self._reserved_cost -= cost
+
+    def _llm_executor(self, model: str):
+        """Shared executor bounding this invoker's LLM calls to max_parallel_fixes."""
+        config = {"performance": {"llm_concurrency": {"max_concurrent_calls": self.max_parallel_fixes}}}
+        return get_llm_executor(config, model)
+
+    async def _run_concurrently(
+        self, items: List[Any], fix: Callable[[Any], Awaitable[Any]]
+    ) -> List[Any]:
+        """Await fix(item) for all items at once; results in input order.
+
+        A fix that raises yields its exception instead of cancelling the others.
+        """
+        results = await asyncio.gather(*(fix(item) for item in items), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        return results
+
+    async def _fan_out(
+        self, items: List[Any], call: Callable[[Any], Awaitable[Any]],
+        what: str, approx_tokens: int = 4000,
+    ) -> List[Tuple[Any, Any]]:
+        """Run one generator call per item concurrently, each within the budget.
+
+        Returns (item, result) pairs of the successful calls, in input order.
+        Items the budget no longer covers are skipped; failures are logged.
+        """
+        async def run(item):
+            try:
+                with self._llm_budget(self.generator_model, approx_tokens):
+                    return True, await call(item)
+            except LLMBudgetExceeded:
+                return False, None
+            except Exception as e:
+                logger.warning("%s failed for %s: %s", what, getattr(item, "id", item), e)
+                return False, None
+
+        results = await self._llm_executor(self.generator_model).map(run, items)
+        skipped = len(items) - sum(ok for ok, _ in results)
+        if skipped and self.budget_exhausted():
+            self.fix_log.append(f"[SKIP] LLM budget exhausted: {what} incomplete")
+        return [(item, result) for item, (ok, result) in zip(items, results) if ok]
+
     async def _call_llm(
         self,
         prompt: str,
@@ -282,22 +495,20 @@ class GeneratorInvoker:
         if not await self._ensure_client():
             return ""
 
-        start_time = time.time()
-        response = await self._client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=self.temperature,
-            max_tokens=max_tokens or self.max_tokens,
-        )
-        latency_ms = int((time.time() - start_time) * 1000)
-        response_text = response.choices[0].message.content.strip()
-
-        # Track budget
-        self.llm_calls += 1
-        self.cost_usd += _estimate_cost(self.model_name)
+        with self._llm_budget(self.model_name):
+            start_time = time.time()
+            response = await self._llm_executor(self.model_name).run(
+                self._client.chat.completions.create,
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=self.temperature,
+                max_tokens=max_tokens or self.max_tokens,
+            )
+            latency_ms = int((time.time() - start_time) * 1000)
+            response_text = response.choices[0].message.content.strip()
 
         # Log if available
         if HAS_LOGGER:
@@ -399,23 +610,44 @@ class GeneratorInvoker:
         if task_ratio_gaps:
             fixed += self._fix_task_ratio_stubs(task_ratio_gaps, bundle)
 
+        await self._prefetch_semantic_matches(
+            self._auto_link_queries(other_gaps[:max_fixes], bundle)
+        )
+
+        backlink_gaps = []
         for gap in other_gaps[:max_fixes]:
             if gap.rule_id in ("state_machine_density", "task_ratio"):
                 continue  # Already handled above
             elif gap.rule_id == "story_to_test":
                 if self._fix_story_without_test(gap, bundle):
                     fixed += 1
-            elif gap.rule_id == "api_to_req":
-                if await self._fix_api_to_req_link(gap, bundle):
-                    fixed += 1
-            elif gap.rule_id == "task_backlinks":
-                if await self._fix_task_backlink(gap, bundle):
-                    fixed += 1
+            elif gap.rule_id in _BACKLINK_RULES:
+                backlink_gaps.append(gap)  # Linked together below
             elif gap.rule_id == "quality_gates":
                 # Quality gates are informational — no programmatic fix
                 pass
+        if backlink_gaps:
+            fixed += await self._fix_backlinks(backlink_gaps, bundle)
         return fixed
 
+    @staticmethod
+    def _auto_link_queries(gaps: List[Gap], bundle: ArtifactBundle) -> List[str]:
+        """Semantic query texts the api_to_req / task_backlinks fixers will ask for."""
+        queries = []
+        for gap in gaps:
+            for item_id in gap.affected_ids:
+                if gap.rule_id == "api_to_req":
+                    item = bundle.endpoint_by_key.get(item_id)
+                    fields = ("path", "summary")
+                elif gap.rule_id == "task_backlinks":
+                    item = bundle.task_by_id.get(item_id)
+                    fields = ("title", "description")
+                else:
+                    break
+                if item:
+                    queries.append(" ".join(getattr(item, f, "") for f in fields).strip())
+        return queries
+
     def _fix_story_without_test(self, gap: Gap, bundle: ArtifactBundle) -> bool:
         """Create a stub test case for a story without one."""
         for sid in gap.affected_ids:
@@ -445,43 +677,95 @@ class GeneratorInvoker:
 
     async def _fix_api_to_req_link(self, gap: Gap, bundle: ArtifactBundle) -> bool:
         """Link API endpoint to requirement — semantic → LLM → keyword → best-effort."""
-        for ep_key in gap.affected_ids:
-            ep = bundle.endpoint_by_key.get(ep_key)
-            if not ep:
-                continue
-            path = getattr(ep, "path", "")
-            summary = getattr(ep, "summary", "")
-            query = f"{path} {summary}".strip()
+        return await self._fix_backlinks([gap], bundle) > 0
 
-            # Try semantic matching first
-            if self._index_built and self._matcher and self._matcher.available:
-                try:
-                    matches = await self._matcher.find_similar(
-                        query, top_k=3, threshold=self.similarity_threshold
+    async def _fix_backlinks(self, gaps: List[Gap], bundle: ArtifactBundle) -> int:
+        """Link API endpoints / tasks to requirements — semantic → LLM → keyword → best-effort.
+
+        Items without a semantic match go to the LLM fix_batch_size per prompt;
+        gaps touching the same item land in different waves, the prompts of
+        a wave run concurrently. Items the LLM leaves unlinked fall back to
+        keyword matching. Returns count of gaps fixed.
+        """
+        fixed = 0
+        pending: List[Tuple[Gap, str, Any]] = []
+        for gap in gaps:
+            target = self._backlink_target(gap, bundle)
+            if target is None:
+                continue
+            key, item = target
+            if await self._link_semantic(gap.rule_id, key, item, bundle):
+                fixed += 1
+            else:
+                pending.append((gap, key, item))
+
+        use_llm = bool(pending) and await self._ensure_client()
+        for wave in _conflict_waves(pending, lambda a, b: _gaps_overlap(a[0], b[0])):
+            linked: Set[str] = set()
+            if use_llm:
+                batches = [
+                    (rule_id, batch)
+                    for rule_id in _BACKLINK_RULES
+                    for batch in _batches(
+                        [(key, item) for gap, key, item in wave if gap.rule_id == rule_id],
+                        self.fix_batch_size,
                     )
-                    for req_id, score in matches:
-                        if req_id in bundle.req_by_id:
-                            ep.parent_requirement_id = req_id
-                            self.fix_log.append(
-                                f"[SEMANTIC] Linked API {ep_key} -> {req_id} "
-                                f"(cosine={score:.3f})"
-                            )
-                            return True
-                except Exception as e:
-                    logger.warning("Semantic API-to-req matching failed: %s", e)
+                ]
+                results = await self._run_concurrently(
+                    batches, lambda batch: self._link_batch_llm(batch[0], batch[1], bundle)
+                )
+                for (rule_id, _), result in zip(batches, results):
+                    if isinstance(result, Exception):
+                        logger.warning(
+                            "LLM %s-to-req linking failed, falling back to keywords: %s",
+                            _BACKLINK_RULES[rule_id][2], result,
+                        )
+                    else:
+                        linked |= result
 
-            # Try LLM fallback (if API key available)
-            if await self._ensure_client():
-                try:
-                    if await self._fix_api_to_req_link_llm(ep_key, ep, bundle):
-                        return True
-                except Exception as e:
-                    logger.warning("LLM API-to-req linking failed, falling back to keywords: %s", e)
+            for gap, key, item in wave:
+                if key in linked or self._link_keywords(gap.rule_id, key, item, bundle):
+                    fixed += 1
+        return fixed
 
-            # Fallback: keyword overlap + best-effort
-            return self._fix_api_to_req_link_keywords(ep_key, ep, bundle)
+    @staticmethod
+    def _backlink_target(gap: Gap, bundle: ArtifactBundle) -> Optional[Tuple[str, Any]]:
+        """First affected endpoint / task of a backlink gap that exists in the bundle."""
+        lookup = getattr(bundle, _BACKLINK_RULES[gap.rule_id][0])
+        for key in gap.affected_ids:
+            item = lookup.get(key)
+            if item:
+                return key, item
+        return None
+
+    async def _link_semantic(self, rule_id: str, key: str, item: Any, bundle: ArtifactBundle) -> bool:
+        """Link an endpoint / task to its best semantic requirement match, if any."""
+        if not (self._index_built and self._matcher and self._matcher.available):
+            return False
+        _, collection, label, fields = _BACKLINK_RULES[rule_id]
+        query = " ".join(getattr(item, f, "") for f in fields).strip()
+        try:
+            matches = await self._find_similar(
+                query, top_k=3, threshold=self.similarity_threshold
+            )
+            for req_id, score in matches:
+                if req_id in bundle.req_by_id:
+                    item.parent_requirement_id = req_id
+                    bundle.touch(collection, item)
+                    self.fix_log.append(
+                        f"[SEMANTIC] Linked {label} {key} -> {req_id} "
+                        f"(cosine={score:.3f})"
+                    )
+                    return True
+        except Exception as e:
+            logger.warning("Semantic %s-to-req matching failed: %s", label, e)
         return False
 
+    def _link_keywords(self, rule_id: str, key: str, item: Any, bundle: ArtifactBundle) -> bool:
+        if rule_id == "api_to_req":
+            return self._fix_api_to_req_link_keywords(key, item, bundle)
+        return self._fix_task_backlink_keywords(key, item, bundle)
+
     def _fix_api_to_req_link_keywords(
         self, ep_key: str, ep: Any, bundle: ArtifactBundle
     ) -> bool:
@@ -504,6 +788,7 @@ class GeneratorInvoker:
         if best_req and best_score >= 1:
             rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
             ep.parent_requirement_id = rid
+            bundle.touch("api_endpoints", ep)
             self.fix_log.append(
                 f"Linked API {ep_key} -> {rid} (keyword overlap={best_score})"
             )
@@ -512,6 +797,7 @@ class GeneratorInvoker:
         if best_req:
             rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
             ep.parent_requirement_id = rid
+            bundle.touch("api_endpoints", ep)
             self.fix_log.append(
                 f"[BEST-EFFORT] Linked API {ep_key} -> {rid} (overlap={best_score})"
             )
@@ -521,6 +807,7 @@ class GeneratorInvoker:
             req = bundle.requirements[0]
             rid = getattr(req, "requirement_id", "") or getattr(req, "id", "")
             ep.parent_requirement_id = rid
+            bundle.touch("api_endpoints", ep)
             self.fix_log.append(f"[FALLBACK] Linked API {ep_key} -> {rid}")
             return True
         return False
@@ -529,32 +816,84 @@ class GeneratorInvoker:
         self, ep_key: str, ep: Any, bundle: ArtifactBundle
     ) -> bool:
         """LLM-based API-to-requirement linking."""
-        path = getattr(ep, "path", "")
-        summary = getattr(ep, "summary", "")
-        method = getattr(ep, "method", "")
-        endpoints_text = f"- {method} {path}"
-        if summary:
-            endpoints_text += f" ({summary})"
+        return ep_key in await self._link_batch_llm("api_to_req", [(ep_key, ep)], bundle)
 
-        requirements_text = self._format_requirements(bundle.requirements)
-        prompt = API_LINK_PROMPT.format(
-            endpoints_text=endpoints_text,
-            requirements_text=requirements_text,
-        )
+    async def _link_batch_llm(
+        self, rule_id: str, items: List[Tuple[str, Any]], bundle: ArtifactBundle
+    ) -> Set[str]:
+        """Link several API endpoints or tasks with one LLM prompt. Returns keys linked."""
+        lines = []
+        if rule_id == "api_to_req":
+            for ep_key, ep in items:
+                summary = getattr(ep, "summary", "")
+                line = f"- {getattr(ep, 'method', '')} {getattr(ep, 'path', '')}"
+                if summary:
+                    line += f" ({summary})"
+                lines.append(line)
+            prompt = API_LINK_PROMPT.format(
+                endpoints_text="\n".join(lines),
+                requirements_text=self._format_requirements(bundle.requirements),
+            )
+        else:
+            for tid, task in items:
+                task_type = getattr(task, "task_type", "")
+                desc = getattr(task, "description", "")
+                line = f"- {tid}: {getattr(task, 'title', '')}"
+                if task_type:
+                    line += f" (type: {task_type})"
+                if desc:
+                    line += f"\n  {desc[:200]}"
+                lines.append(line)
+            prompt = TASK_LINK_PROMPT.format(
+                tasks_text="\n".join(lines),
+                requirements_text=self._format_requirements(bundle.requirements),
+            )
 
         response = await self._call_llm(prompt, max_tokens=2000)
         data = self._extract_json(response)
 
+        _, collection, label, _ = _BACKLINK_RULES[rule_id]
+        linked: Set[str] = set()
         for link in data.get("links", []):
             req_id = link.get("requirement_id", "")
             reason = link.get("reason", "")
-            if req_id and req_id in bundle.req_by_id:
-                ep.parent_requirement_id = req_id
-                self.fix_log.append(
-                    f"[LLM] Linked API {ep_key} -> {req_id} ({reason})"
-                )
-                return True
-        return False
+            if not (req_id and req_id in bundle.req_by_id):
+                continue
+            target = self._linked_item(rule_id, link, items, linked)
+            if target is None:
+                continue
+            key, item = target
+            item.parent_requirement_id = req_id
+            bundle.touch(collection, item)
+            self.fix_log.append(
+                f"[LLM] Linked {label} {key} -> {req_id} ({reason})"
+            )
+            linked.add(key)
+        return linked
+
+    @staticmethod
+    def _linked_item(
+        rule_id: str, link: Dict[str, Any], items: List[Tuple[str, Any]], linked: Set[str]
+    ) -> Optional[Tuple[str, Any]]:
+        """The not yet linked item an LLM link entry refers to."""
+        candidates = [(key, item) for key, item in items if key not in linked]
+        if len(items) == 1:
+            return candidates[0] if candidates else None
+        if rule_id == "api_to_req":
+            ref = str(link.get("endpoint", "")).strip()
+            ref_path = ref.split()[-1] if ref else ""
+            for key, item in candidates:
+                if key.lower() == ref.lower():
+                    return key, item
+            for key, item in candidates:
+                if ref_path and getattr(item, "path", "") == ref_path:
+                    return key, item
+            return None
+        ref = str(link.get("task_id", "")).strip()
+        for key, item in candidates:
+            if key == ref:
+                return key, item
+        return None
 
     def _fix_stories_to_screens_batch(
         self, gaps: List[Gap], bundle: ArtifactBundle
@@ -607,6 +946,7 @@ class GeneratorInvoker:
                 screen_id = getattr(best_screen, "id", "")
                 if not getattr(best_screen, "parent_user_story", ""):
                     best_screen.parent_user_story = sid
+                    bundle.touch("screens", best_screen)
                     self.fix_log.append(
                         f"Linked story {sid} -> screen {screen_id} "
                         f"(keyword overlap={best_overlap})"
@@ -898,108 +1238,58 @@ class GeneratorInvoker:
 
     async def _fix_task_backlink(self, gap: Gap, bundle: ArtifactBundle) -> bool:
         """Link task to requirement — semantic → LLM → keyword → best-effort."""
-        for tid in gap.affected_ids:
-            task = bundle.task_by_id.get(tid)
-            if not task:
-                continue
-            title = getattr(task, "title", "")
-            desc = getattr(task, "description", "")
-            query = f"{title} {desc}".strip()
-
-            # Try semantic matching first
-            if self._index_built and self._matcher and self._matcher.available:
-                try:
-                    matches = await self._matcher.find_similar(
-                        query, top_k=3, threshold=self.similarity_threshold
-                    )
-                    for req_id, score in matches:
-                        if req_id in bundle.req_by_id:
-                            task.parent_requirement_id = req_id
-                            self.fix_log.append(
-                                f"[SEMANTIC] Linked task {tid} -> {req_id} "
-                                f"(cosine={score:.3f})"
-                            )
-                            return True
-                except Exception as e:
-                    logger.warning("Semantic task-to-req matching failed: %s", e)
-
-            # Try LLM fallback (if API key available)
-            if await self._ensure_client():
-                try:
-                    if await self._fix_task_backlink_llm(tid, task, bundle):
-                        return True
-                except Exception as e:
-                    logger.warning("LLM task-to-req linking failed, falling back to keywords: %s", e)
+        return await self._fix_backlinks([gap], bundle) > 0
 
-            # Fallback: keyword overlap
-            task_kw = _extract_keywords(query)
-            best_req = None
-            best_score = 0
-            for req in bundle.requirements:
-                req_title = getattr(req, "title", "")
-                req_desc = getattr(req, "description", "")
-                req_kw = _extract_keywords(f"{req_title} {req_desc}")
-                overlap = len(task_kw & req_kw)
-                if overlap > best_score:
-                    best_score = overlap
-                    best_req = req
+    def _fix_task_backlink_keywords(
+        self, tid: str, task: Any, bundle: ArtifactBundle
+    ) -> bool:
+        """Keyword-matching fallback for task-to-requirement linking."""
+        title = getattr(task, "title", "")
+        desc = getattr(task, "description", "")
+        task_kw = _extract_keywords(f"{title} {desc}")
+        best_req = None
+        best_score = 0
+        for req in bundle.requirements:
+            req_title = getattr(req, "title", "")
+            req_desc = getattr(req, "description", "")
+            req_kw = _extract_keywords(f"{req_title} {req_desc}")
+            overlap = len(task_kw & req_kw)
+            if overlap > best_score:
+                best_score = overlap
+                best_req = req
 
-            if best_req and best_score >= 1:
-                rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
-                task.parent_requirement_id = rid
-                self.fix_log.append(
-                    f"Linked task {tid} -> {rid} (keyword overlap={best_score})"
-                )
-                return True
-            # Best-effort: link to closest match even with overlap=0
-            if best_req:
-                rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
-                task.parent_requirement_id = rid
-                self.fix_log.append(
-                    f"[BEST-EFFORT] Linked task {tid} -> {rid} (overlap={best_score})"
-                )
-                return True
-            # Absolute fallback: first requirement
-            if bundle.requirements:
-                req = bundle.requirements[0]
-                rid = getattr(req, "requirement_id", "") or getattr(req, "id", "")
-                task.parent_requirement_id = rid
-                self.fix_log.append(f"[FALLBACK] Linked task {tid} -> {rid}")
-                return True
+        if best_req and best_score >= 1:
+            rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
+            task.parent_requirement_id = rid
+            bundle.touch("tasks", task)
+            self.fix_log.append(
+                f"Linked task {tid} -> {rid} (keyword overlap={best_score})"
+            )
+            return True
+        # Best-effort: link to closest match even with overlap=0
+        if best_req:
+            rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
+            task.parent_requirement_id = rid
+            bundle.touch("tasks", task)
+            self.fix_log.append(
+                f"[BEST-EFFORT] Linked task {tid} -> {rid} (overlap={best_score})"
+            )
+            return True
+        # Absolute fallback: first requirement
+        if bundle.requirements:
+            req = bundle.requirements[0]
+            rid = getattr(req, "requirement_id", "") or getattr(req, "id", "")
+            task.parent_requirement_id = rid
+            bundle.touch("tasks", task)
+            self.fix_log.append(f"[FALLBACK] Linked task {tid} -> {rid}")
+            return True
         return False
 
     async def _fix_task_backlink_llm(
         self, tid: str, task: Any, bundle: ArtifactBundle
     ) -> bool:
         """LLM-based task-to-requirement linking."""
-        title = getattr(task, "title", "")
-        desc = getattr(task, "description", "")
-        task_type = getattr(task, "task_type", "")
-        tasks_text = f"- {tid}: {title}"
-        if task_type:
-            tasks_text += f" (type: {task_type})"
-        if desc:
-            tasks_text += f"\n  {desc[:200]}"
-
-        requirements_text = self._format_requirements(bundle.requirements)
-        prompt = TASK_LINK_PROMPT.format(
-            tasks_text=tasks_text,
-            requirements_text=requirements_text,
-        )
-
-        response = await self._call_llm(prompt, max_tokens=2000)
-        data = self._extract_json(response)
-
-        for link in data.get("links", []):
-            req_id = link.get("requirement_id", "")
-            reason = link.get("reason", "")
-            if req_id and req_id in bundle.req_by_id:
-                task.parent_requirement_id = req_id
-                self.fix_log.append(
-                    f"[LLM] Linked task {tid} -> {req_id} ({reason})"
-                )
-                return True
-        return False
+        return tid in await self._link_batch_llm("task_backlinks", [(tid, task)], bundle)
 
     # ------------------------------------------------------------------
     # LLM-assisted fixes
@@ -1008,11 +1298,40 @@ class GeneratorInvoker:
     async def apply_llm_fixes(
         self, gaps: List[Gap], bundle: ArtifactBundle, max_fixes: int = 10
     ) -> int:
-        """Apply LLM-assisted fixes (entity linking, acceptance criteria). Returns count fixed."""
+        """Apply LLM-assisted fixes (entity linking, acceptance criteria). Returns count fixed.
+
+        Entity gaps are linked fix_batch_size per prompt, the prompts of a
+        wave concurrently (see _conflict_waves).
+        """
+        entity_gaps = [gap for gap in gaps[:max_fixes] if gap.rule_id == "entity_to_req"]
+        if not entity_gaps or not bundle.requirements:
+            return 0
+        await self._prefetch_semantic_matches([
+            entity_name for gap in entity_gaps for entity_name in gap.affected_ids
+        ])
+
         fixed = 0
-        for gap in gaps[:max_fixes]:
-            if gap.rule_id == "entity_to_req":
-                if await self._fix_entity_to_req(gap, bundle):
+        use_llm = await self._ensure_client()
+        for wave in _conflict_waves(entity_gaps, _gaps_overlap):
+            batches = _batches(wave, self.fix_batch_size) if use_llm else []
+            results = await self._run_concurrently(
+                batches,
+                lambda batch: self._link_entities_llm(
+                    [name for gap in batch for name in gap.affected_ids], bundle
+                ),
+            )
+            fallback = [] if use_llm else list(wave)
+            for batch, result in zip(batches, results):
+                if isinstance(result, Exception):
+                    logger.warning("LLM entity linking failed, falling back to keywords: %s", result)
+                    fallback.extend(batch)
+                    continue
+                linked = {name.lower() for name in result}
+                fixed += sum(
+                    1 for gap in batch if any(name.lower() in linked for name in gap.affected_ids)
+                )
+            for gap in fallback:
+                if await self._fix_entity_to_req_keywords(gap, bundle):
                     fixed += 1
         return fixed
 
@@ -1033,10 +1352,14 @@ class GeneratorInvoker:
 
     async def _fix_entity_to_req_llm(self, gap: Gap, bundle: ArtifactBundle) -> bool:
         """LLM-based entity-to-requirement linking with optional RAG context."""
+        return bool(await self._link_entities_llm(gap.affected_ids, bundle))
+
+    async def _link_entities_llm(self, entity_names: List[str], bundle: ArtifactBundle) -> Set[str]:
+        """Link several entities with one LLM prompt. Returns entity names linked."""
         # Build entity descriptions
         entities_text = ""
         rag_context = ""
-        for entity_name in gap.affected_ids:
+        for entity_name in entity_names:
             entity = bundle.entities.get(entity_name)
             if entity:
                 fields = getattr(entity, "fields", [])
@@ -1052,7 +1375,7 @@ class GeneratorInvoker:
             # RAG: find semantically similar requirements for this entity
             if self._index_built and self._matcher and self._matcher.available:
                 try:
-                    similar = await self._matcher.find_similar(entity_name, top_k=3)
+                    similar = await self._find_similar(entity_name, top_k=3)
                     if similar:
                         rag_context += f"\n### Semantic matches for '{entity_name}':\n"
                         for req_id, score in similar:
@@ -1077,7 +1400,7 @@ class GeneratorInvoker:
         response = await self._call_llm(prompt, max_tokens=2000)
         data = self._extract_json(response)
 
-        linked = False
+        linked: Set[str] = set()
         for link in data.get("links", []):
             entity_name = link.get("entity", "")
             req_id = link.get("requirement_id", "")
@@ -1085,21 +1408,22 @@ class GeneratorInvoker:
             if entity_name and req_id and req_id in bundle.req_by_id:
                 # Mutate requirement description so keyword checker sees the link
                 req = bundle.req_by_id[req_id]
-                self._tag_entity_on_req(req, entity_name)
+                self._tag_entity_on_req(req, entity_name, bundle)
                 self.fix_log.append(
                     f"[LLM] Linked entity '{entity_name}' -> {req_id} ({reason})"
                 )
-                linked = True
+                linked.add(entity_name)
 
         return linked
 
     @staticmethod
-    def _tag_entity_on_req(req: Any, entity_name: str):
+    def _tag_entity_on_req(req: Any, entity_name: str, bundle: ArtifactBundle):
         """Append entity name to requirement description so keyword checker sees the link."""
         desc = getattr(req, "description", "") or ""
         tag = f" [Entity: {entity_name}]"
         if tag not in desc:
             req.description = desc + tag
+            bundle.touch("requirements", req)
 
     async def _fix_entity_to_req_keywords(self, gap: Gap, bundle: ArtifactBundle) -> bool:
         """Semantic then keyword-matching fallback for entity linking."""
@@ -1107,13 +1431,13 @@ class GeneratorInvoker:
             # Try semantic matching (no LLM, just embeddings)
             if self._index_built and self._matcher and self._matcher.available:
                 try:
-                    match = await self._matcher.find_best_match(
-                        entity_name, threshold=self.similarity_threshold
+                    matches = await self._find_similar(
+                        entity_name, top_k=1, threshold=self.similarity_threshold
                     )
-                    if match:
-                        req_id, score = match
+                    if matches:
+                        req_id, score = matches[0]
                         if req_id in bundle.req_by_id:
-                            self._tag_entity_on_req(bundle.req_by_id[req_id], entity_name)
+                            self._tag_entity_on_req(bundle.req_by_id[req_id], entity_name, bundle)
                             self.fix_log.append(
                                 f"[SEMANTIC] Linked entity '{entity_name}' -> {req_id} "
                                 f"(cosine={score:.3f})"
@@ -1138,7 +1462,7 @@ class GeneratorInvoker:
 
             if best_req and best_score >= 1:
                 rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
-                self._tag_entity_on_req(best_req, entity_name)
+                self._tag_entity_on_req(best_req, entity_name, bundle)
                 self.fix_log.append(
                     f"Linked entity '{entity_name}' -> {rid} (keyword overlap={best_score})"
                 )
@@ -1146,7 +1470,7 @@ class GeneratorInvoker:
             # Best-effort: link to closest match even with overlap=0
             if best_req:
                 rid = getattr(best_req, "requirement_id", "") or getattr(best_req, "id", "")
-                self._tag_entity_on_req(best_req, entity_name)
+                self._tag_entity_on_req(best_req, entity_name, bundle)
                 self.fix_log.append(
                     f"[BEST-EFFORT] Linked entity '{entity_name}' -> {rid} "
                     f"(overlap={best_score})"
@@ -1156,7 +1480,7 @@ class GeneratorInvoker:
             if bundle.requirements:
                 req = bundle.requirements[0]
                 rid = getattr(req, "requirement_id", "") or getattr(req, "id", "")
-                self._tag_entity_on_req(req, entity_name)
+                self._tag_entity_on_req(req, entity_name, bundle)
                 self.fix_log.append(
                     f"[FALLBACK] Linked entity '{entity_name}' -> {rid}"
                 )
@@ -1187,18 +1511,28 @@ class GeneratorInvoker:
             if gap.generator_name:
                 by_generator.setdefault(gap.generator_name, []).append(gap)
 
+        # Only successful generator runs count against max_calls; generators
+        # touching disjoint collections run concurrently. Each wave is taken
+        # from the next max_calls - calls generators in order, so the same
+        # generators run as in a sequential loop.
+        pending = list(by_generator.items())
         fixed = 0
         calls = 0
-        for gen_name, gen_gaps in by_generator.items():
-            if calls >= max_calls:
-                break
-            try:
-                count = await self._invoke_generator(gen_name, gen_gaps, bundle)
-                fixed += count
-                calls += 1
-            except Exception as e:
-                logger.warning("Generator '%s' failed: %s", gen_name, e)
-                self.fix_log.append(f"[ERROR] Generator {gen_name} failed: {e}")
+        while pending and calls < max_calls:
+            wave = _conflict_waves(
+                pending[:max_calls - calls], lambda a, b: _generators_conflict(a[0], b[0])
+            )[0]
+            pending = [group for group in pending if all(group is not m for m in wave)]
+            results = await self._run_concurrently(
+                wave, lambda group: self._invoke_generator(group[0], group[1], bundle)
+            )
+            for (gen_name, _), result in zip(wave, results):
+                if isinstance(result, Exception):
+                    logger.warning("Generator '%s' failed: %s", gen_name, result)
+                    self.fix_log.append(f"[ERROR] Generator {gen_name} failed: {result}")
+                else:
+                    fixed += result
+                    calls += 1
 
         return fixed
 
@@ -1246,27 +1580,26 @@ class GeneratorInvoker:
         await gen.initialize()
 
         fixed = 0
-        affected_ids = set()
-        for gap in gaps:
-            affected_ids.update(gap.affected_ids)
+        # ordered, so the stories (and TC- IDs) do not depend on set order
+        affected_ids = dict.fromkeys(sid for gap in gaps for sid in gap.affected_ids)
 
-        for sid in list(affected_ids)[:10]:  # Limit per invocation
-            story = bundle.story_by_id.get(sid)
-            if not story:
-                continue
-            try:
-                new_tcs = await gen.generate_test_cases(story)
-                for tc in new_tcs:
-                    bundle.test_cases.append(tc)
-                    bundle.test_by_id[tc.id] = tc
-                self.llm_calls += 1
-                self.cost_usd += _estimate_cost(self.generator_model)
-                self.fix_log.append(
-                    f"[GENERATOR] Generated {len(new_tcs)} test cases for {sid}"
-                )
-                fixed += 1
-            except Exception as e:
-                logger.warning("Test case generation failed for %s: %s", sid, e)
+        stories = [
+            bundle.story_by_id[sid]
+            for sid in list(affected_ids)[:10]  # Limit per invocation
+            if sid in bundle.story_by_id
+        ]
+        # Only the LLM calls run concurrently; test cases (and their TC- IDs)
+        # are built afterwards in story order
+        responses = await self._fan_out(stories, gen._request_test_cases, "Test case generation")
+        for story, data in responses:
+            new_tcs = gen._build_test_cases(story, data)
+            for tc in new_tcs:
+                bundle.test_cases.append(tc)
+                bundle.test_by_id[tc.id] = tc
+            self.fix_log.append(
+                f"[GENERATOR] Generated {len(new_tcs)} test cases for {story.id}"
+            )
+            fixed += 1
 
         return fixed
 
@@ -1298,7 +1631,8 @@ class GeneratorInvoker:
         await gen.initialize()
 
         try:
-            new_stories, new_epics = await gen.generate_user_stories(affected_reqs[:15])
+            with self._llm_budget(self.generator_model, 6000):
+                new_stories, new_epics = await gen.generate_user_stories(affected_reqs[:15])
             for story in new_stories:
                 bundle.user_stories.append(story)
                 sid = getattr(story, "id", "")
@@ -1310,8 +1644,6 @@ class GeneratorInvoker:
                 if eid:
                     bundle.epic_by_id[eid] = epic
 
-            self.llm_calls += 1
-            self.cost_usd += _estimate_cost(self.generator_model, 6000)
             self.fix_log.append(
                 f"[GENERATOR] Generated {len(new_stories)} stories + "
                 f"{len(new_epics)} epics for {len(affected_reqs)} requirements"
@@ -1338,12 +1670,8 @@ class GeneratorInvoker:
         )
         # TaskGenerator has no initialize() — ready after __init__
 
-        # Generate tasks for all epics (not just first 5)
-        fixed = 0
-        for epic in bundle.epics:
+        async def generate(epic):
             eid = getattr(epic, "id", "")
-            title = getattr(epic, "title", "")
-            desc = getattr(epic, "description", "")
             # Find stories for this epic
             epic_stories = [
                 s for s in bundle.user_stories
@@ -1355,33 +1683,35 @@ class GeneratorInvoker:
                 for rid in [getattr(s, "parent_requirement_id", "")]
                 if rid in bundle.req_by_id
             ]
+            return await gen._request_tasks(
+                feature_name=getattr(epic, "title", ""),
+                feature_description=getattr(epic, "description", ""),
+                user_stories=epic_stories[:10],
+                requirements=epic_reqs[:10],
+            )
 
-            try:
-                new_tasks = await gen.generate_tasks_for_feature(
-                    feature_id=eid,
-                    feature_name=title,
-                    feature_description=desc,
-                    user_stories=epic_stories[:10],
-                    requirements=epic_reqs[:10],
-                )
-                for task in new_tasks:
-                    tid = getattr(task, "id", "")
-                    if tid:
-                        bundle.task_by_id[tid] = task
-                # Also add to task_breakdown.features so to_dict() includes them
-                if bundle.task_breakdown:
-                    if eid not in bundle.task_breakdown.features:
-                        bundle.task_breakdown.features[eid] = []
-                    bundle.task_breakdown.features[eid].extend(new_tasks)
-                    bundle.task_breakdown.total_tasks += len(new_tasks)
-                self.llm_calls += 1
-                self.cost_usd += _estimate_cost(self.generator_model)
-                self.fix_log.append(
-                    f"[GENERATOR] Generated {len(new_tasks)} tasks for epic {eid}"
-                )
-                fixed += len(new_tasks)
-            except Exception as e:
-                logger.warning("Task generation failed for epic %s: %s", eid, e)
+        # Generate tasks for all epics (not just first 5). Only the LLM calls
+        # run concurrently; tasks (and their TASK- IDs) are built in epic order
+        fixed = 0
+        for epic, data in await self._fan_out(list(bundle.epics), generate, "Task generation"):
+            if data is None:
+                continue
+            eid = getattr(epic, "id", "")
+            new_tasks = gen._build_tasks(eid, data)
+            for task in new_tasks:
+                tid = getattr(task, "id", "")
+                if tid:
+                    bundle.task_by_id[tid] = task
+            # Also add to task_breakdown.features so to_dict() includes them
+            if bundle.task_breakdown:
+                if eid not in bundle.task_breakdown.features:
+                    bundle.task_breakdown.features[eid] = []
+                bundle.task_breakdown.features[eid].extend(new_tasks)
+                bundle.task_breakdown.total_tasks += len(new_tasks)
+            self.fix_log.append(
+                f"[GENERATOR] Generated {len(new_tasks)} tasks for epic {eid}"
+            )
+            fixed += len(new_tasks)
 
         return fixed
 
@@ -1415,15 +1745,14 @@ class GeneratorInvoker:
         await gen.initialize()
 
         try:
-            new_sms = await gen.generate_state_machines(
-                requirements=bundle.requirements[:30],
-                user_stories=bundle.user_stories[:30],
-                entities=entities_list,
-            )
+            with self._llm_budget(self.generator_model, 6000):
+                new_sms = await gen.generate_state_machines(
+                    requirements=bundle.requirements[:30],
+                    user_stories=bundle.user_stories[:30],
+                    entities=entities_list,
+                )
             for sm in new_sms:
                 bundle.state_machines.append(sm)
-            self.llm_calls += 1
-            self.cost_usd += _estimate_cost(self.generator_model, 6000)
             self.fix_log.append(
                 f"[GENERATOR] Generated {len(new_sms)} state machines"
             )
@@ -1467,30 +1796,26 @@ class GeneratorInvoker:
             config=self.config,
         )
 
+        async def generate(story):
+            return await gen.generate_screen(
+                project_name="Refinement",
+                user_story=story,
+                ia_node=None,
+                components=[],
+            )
+
         fixed = 0
-        for story in uncovered[:15]:
-            sid = getattr(story, "id", "")
-            title = getattr(story, "title", "")
-            try:
-                screen = await gen.generate_screen(
-                    project_name="Refinement",
-                    user_story=story,
-                    ia_node=None,
-                    components=[],
+        for story, screen in await self._fan_out(uncovered[:15], generate, "Screen generation"):
+            if screen:
+                sid = getattr(story, "id", "")
+                screen.parent_user_story = sid
+                bundle.screens.append(screen)
+                screen_id = getattr(screen, "id", "")
+                bundle.screen_by_id[screen_id] = screen
+                self.fix_log.append(
+                    f"[GENERATOR] Generated screen {screen_id} for story {sid}"
                 )
-                if screen:
-                    screen.parent_user_story = sid
-                    bundle.screens.append(screen)
-                    screen_id = getattr(screen, "id", "")
-                    bundle.screen_by_id[screen_id] = screen
-                    self.llm_calls += 1
-                    self.cost_usd += _estimate_cost(self.generator_model)
-                    self.fix_log.append(
-                        f"[GENERATOR] Generated screen {screen_id} for story {sid}"
-                    )
-                    fixed += 1
-            except Exception as e:
-                logger.warning("Screen generation failed for %s: %s", sid, e)
+                fixed += 1
 
         return fixed
 
@@ -1519,7 +1844,7 @@ class GeneratorInvoker:
             config=self.config,
         )
 
-        fixed = 0
+        epics = []
         for eid in list(affected_eids)[:7]:
             epic = bundle.epic_by_id.get(eid)
             if not epic:
@@ -1529,27 +1854,26 @@ class GeneratorInvoker:
                 s for s in bundle.user_stories
                 if getattr(s, "parent_epic_id", "") == eid
             ]
-            if not epic_stories:
-                continue
-            # Pick first story + first persona
-            story = epic_stories[0]
-            persona = bundle.personas[0] if bundle.personas else None
-            try:
-                flow = await gen.generate_user_flow(
-                    project_name="Refinement",
-                    persona=persona,
-                    user_story=story,
+            if epic_stories:
+                epics.append((epic, epic_stories[0]))
+
+        async def generate(item):
+            # First story of the epic + first persona
+            _, story = item
+            return await gen.generate_user_flow(
+                project_name="Refinement",
+                persona=bundle.personas[0] if bundle.personas else None,
+                user_story=story,
+            )
+
+        fixed = 0
+        for (epic, _), flow in await self._fan_out(epics, generate, "User flow generation"):
+            if flow:
+                bundle.user_flows.append(flow)
+                self.fix_log.append(
+                    f"[GENERATOR] Generated user flow {flow.id} for epic {getattr(epic, 'id', '')}"
                 )
-                if flow:
-                    bundle.user_flows.append(flow)
-                    self.llm_calls += 1
-                    self.cost_usd += _estimate_cost(self.generator_model)
-                    self.fix_log.append(
-                        f"[GENERATOR] Generated user flow {flow.id} for epic {eid}"
-                    )
-                    fixed += 1
-            except Exception as e:
-                logger.warning("User flow generation failed for epic %s: %s", eid, e)
+                fixed += 1
 
         return fixed
 
@@ -6,13 +6,13 @@ check convergence, stop on target reached or stagnation.
 """
 
 import logging
-import shutil
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from . import CompletenessReport, RefinementResult
 from .artifact_loader import ArtifactLoader
+from .backup_store import BackupStore
 from .completeness_checker import CompletenessChecker
 from .gap_classifier import classify_gaps
 from .generator_invoker import GeneratorInvoker
@@ -20,6 +20,28 @@ from .refinement_report import generate_dry_run_report, generate_report
 
 logger = logging.getLogger(__name__)
 
+# Files that fixes and save_artifacts() may rewrite
+BACKUP_FILES = [
+    "testing/test_documentation.md",
+    "tasks/task_list.json",
+    "_checkpoints/stage_5.json",
+    "_checkpoints/stage_8.json",
+    "_checkpoints/stage_9.json",
+    "state_machines/state_machines.json",
+    "ux_design/ux_spec.json",
+    "ux_design/user_flows.json",
+    "journal.json",
+]
+
+
+def _report_signature(report: CompletenessReport):
+    """Scores and gaps of a report, for comparing two checks of one bundle."""
+    return [
+        (rr.rule_id, rr.current_value, rr.score, rr.passed,
+         [(gap.title, tuple(gap.affected_ids)) for gap in rr.gaps])
+        for rr in report.rule_results
+    ]
+
 
 class RefinementLoop:
     """Main refinement loop orchestrator."""
@@ -36,6 +58,10 @@ class RefinementLoop:
         self.max_llm_fixes = self.config.get("max_llm_fixes_per_iteration", 30)
         self.max_gen_calls = self.config.get("max_generator_calls_per_iteration", 10)
         self.backup_originals = self.config.get("backup_originals", True)
+        self.backup_keep_iterations = self.config.get("backup_keep_iterations") or None
+        # Re-check only what the fixes changed; verify runs a full check alongside
+        self.incremental_check = self.config.get("incremental_check", True)
+        self.verify_incremental_check = self.config.get("verify_incremental_check", False)
 
     async def run(self, output_dir: str | Path) -> RefinementResult:
         """Run the full refinement loop on an output directory."""
@@ -75,7 +101,9 @@ class RefinementLoop:
             return result
 
         # Step 3: Refinement loop
-        invoker = GeneratorInvoker(self.config)
+        invoker = GeneratorInvoker({
+            **self.config, "max_llm_calls": self.max_llm_calls, "max_cost_usd": self.max_cost_usd,
+        })
         current_report = before_report
         consecutive_stagnant = 0
 
@@ -112,14 +140,14 @@ class RefinementLoop:
             print(f"   Auto-link fixes: {fixed_auto}")
 
             fixed_llm = 0
-            if classified.llm_extend and invoker.llm_calls < self.max_llm_calls:
+            if classified.llm_extend and not invoker.budget_exhausted():
                 fixed_llm = await invoker.apply_llm_fixes(
                     classified.llm_extend, bundle, max_fixes=self.max_llm_fixes
                 )
                 print(f"   LLM fixes: {fixed_llm}")
 
             fixed_gen = 0
-            if classified.generator and invoker.llm_calls < self.max_llm_calls:
+            if classified.generator and not invoker.budget_exhausted():
                 fixed_gen = await invoker.apply_generator_fixes(
                     classified.generator, bundle, max_calls=self.max_gen_calls
                 )
@@ -146,7 +174,9 @@ class RefinementLoop:
             bundle.task_by_id.clear()
             loader._build_indices(bundle)
 
-            new_report = checker.check_all(bundle)
+            new_report = checker.check_all(bundle, incremental=self.incremental_check)
+            if self.incremental_check and self.verify_incremental_check:
+                new_report = self._verify_report(new_report, bundle)
             delta = new_report.overall_score - current_report.overall_score
             print(f"   Score: {current_report.overall_score:.1%} -> {new_report.overall_score:.1%} (delta {delta:+.1%})")
 
@@ -168,8 +198,8 @@ class RefinementLoop:
                 consecutive_stagnant = 0
 
             # Budget check
-            if invoker.llm_calls >= self.max_llm_calls:
-                print(f"   LLM call budget exhausted ({self.max_llm_calls}).")
+            if invoker.budget_exhausted():
+                print(f"   LLM budget exhausted ({self.max_llm_calls} calls / ${self.max_cost_usd:.2f}).")
                 current_report = new_report
                 break
 
@@ -233,24 +263,30 @@ class RefinementLoop:
 
         return report
 
+    def _verify_report(self, report: CompletenessReport, bundle) -> CompletenessReport:
+        """Compare an incremental report with a full re-check; returns the full one."""
+        full_report = CompletenessChecker(self.config).check_all(bundle)
+        if _report_signature(report) != _report_signature(full_report):
+            logger.warning(
+                "Incremental completeness check diverged from full re-check "
+                "(%.4f vs %.4f); using the full result",
+                report.overall_score, full_report.overall_score,
+            )
+        return full_report
+
     def _backup(self, output_dir: Path, iteration: int):
-        """Backup modified files before an iteration."""
-        backup_dir = output_dir / ".backups" / f"iter_{iteration}"
-        backup_dir.mkdir(parents=True, exist_ok=True)
-
-        # Backup files that might be modified
-        files_to_backup = [
-            "testing/test_documentation.md",
-            "tasks/task_list.json",
-            "_checkpoints/stage_5.json",
-            "_checkpoints/stage_8.json",
-        ]
-        for rel_path in files_to_backup:
-            src = output_dir / rel_path
-            if src.exists():
-                dst = backup_dir / rel_path
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
+        """Backup files that might be modified before an iteration.
+
+        Unchanged content is deduplicated by the BackupStore; restore with
+        `python -m requirements_engineer.refinement <dir> --restore-iteration N`.
+        """
+        store = BackupStore(output_dir)
+        manifest = store.snapshot(iteration, BACKUP_FILES)
+        stats = manifest["stats"]
+        logger.info("Backup iteration %d: %d files, %d new blobs (%d bytes)",
+                    iteration, stats["files"], stats["new_blobs"], stats["bytes_written"])
+        if self.backup_keep_iterations:
+            store.gc(keep_iterations=self.backup_keep_iterations)
 
     def _save_report(
         self,
@@ -27,6 +27,7 @@ import asyncio
 import json
 import os
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -51,6 +52,7 @@ from requirements_engineer.core.re_metrics import MetricsManager
 from requirements_engineer.core.llm_logger import get_llm_logger, LLMLogger
 from requirements_engineer.core.re_agent_manager import REAgentManager
 from requirements_engineer.core.pipeline_manifest import PipelineManifest
+from requirements_engineer.core.stage_scheduler import StageScheduler
 from requirements_engineer.work_breakdown.feature_breakdown import FeatureBreakdown
 from requirements_engineer.work_breakdown.service_breakdown import ServiceBreakdown
 from requirements_engineer.work_breakdown.application_breakdown import ApplicationBreakdown
@@ -233,6 +235,24 @@ def create_output_directory(project_name: str, base_dir: str = "requirements_out
 # Checkpoint helpers for pipeline resume
 # ---------------------------------------------------------------------------
 
+def _write_json_atomic(path: Path, data, **dump_kwargs):
+    """Write JSON via a temp file + os.replace, so a killed process never
+    leaves a truncated file behind (batch workers are terminated on stop)."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
 def _save_checkpoint(output_dir: Path, stage, data: dict):
     """Save checkpoint data after a completed stage.
 
@@ -241,8 +261,8 @@ def _save_checkpoint(output_dir: Path, stage, data: dict):
     """
     cp_dir = output_dir / "_checkpoints"
     cp_dir.mkdir(exist_ok=True)
-    with open(cp_dir / f"stage_{stage}.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    _write_json_atomic(cp_dir / f"stage_{stage}.json", data,
+                       ensure_ascii=False, indent=2, default=str)
     # Save cumulative LLM usage alongside stage data
     _save_llm_usage_snapshot(output_dir)
 
@@ -260,8 +280,7 @@ def _save_llm_usage_snapshot(output_dir: Path):
         merged = summary
     cp_dir = output_dir / "_checkpoints"
     cp_dir.mkdir(exist_ok=True)
-    with open(cp_dir / "llm_usage.json", "w", encoding="utf-8") as f:
-        json.dump(merged, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(cp_dir / "llm_usage.json", merged, ensure_ascii=False, indent=2)
 
 
 def _load_llm_usage_snapshot(output_dir: Path) -> dict:
@@ -370,8 +389,12 @@ _STAGE_VALIDATIONS = {
 }
 
 
-def _validate_stage_output(stage_key, context: dict, manifest=None) -> bool:
-    """Warn if a stage produced empty output. Returns True if valid."""
+def _validate_stage_output(stage_key, context: dict, manifest=None, stage_name=None) -> bool:
+    """Warn if a stage produced empty output. Returns True if valid.
+
+    The warning is attached to the manifest stage named ``stage_name``, or to
+    the most recent stage when not given.
+    """
     entry = _STAGE_VALIDATIONS.get(stage_key)
     if entry is None:
         return True
@@ -379,8 +402,8 @@ def _validate_stage_output(stage_key, context: dict, manifest=None) -> bool:
     if check_fn(context):
         return True
     print(f"   [VALIDATION WARN] Stage {stage_key} ({label}) produced empty '{var_name}'")
-    if manifest and manifest.stages:
-        last = manifest.stages[-1]
+    last = manifest.get_stage(stage_name) if manifest else None
+    if last is not None:
         if last.quality_gate is None:
             last.quality_gate = {}
         last.quality_gate["output_validation"] = "empty"
@@ -2138,477 +2161,518 @@ async def run_enterprise_mode(
 
     _validate_stage_output(5, {"user_stories": user_stories}, manifest)
 
-    # Generate API Specification
+    # ── Steps 5-8: Stages scheduled by data dependency ────────
+    # API spec, realtime spec, data dictionary and test cases only need the
+    # requirements / user stories, so they run concurrently; tech stack waits
+    # for API spec + data dictionary, architecture for tech stack
+    # (core/stage_scheduler.py). Each stage resumes from its own checkpoint.
     api_spec_yaml = ""
     api_endpoints = []  # Track API endpoints for metrics
-    if last_completed >= 5:
-        cp = _load_checkpoint(output_dir, 5)
-        from requirements_engineer.generators.api_spec_generator import APIEndpoint
-        api_endpoints = [APIEndpoint.from_dict(ep) for ep in cp["api_endpoints"]]
-        api_spec_yaml = cp.get("api_spec_yaml", "")
-        # Re-save output files from checkpoint data
-        if api_spec_yaml:
-            (output_dir / "api").mkdir(parents=True, exist_ok=True)
-            with open(output_dir / "api" / "openapi_spec.yaml", "w", encoding="utf-8") as f:
-                f.write(api_spec_yaml)
-        api_md = cp.get("api_md", "")
-        if api_md:
-            with open(output_dir / "api" / "api_documentation.md", "w", encoding="utf-8") as f:
-                f.write(api_md)
-        manifest.skip_stage(5, "api_spec", "Resumed from checkpoint")
-        print(f"\n[5/20] [RESUMED] Loaded {len(api_endpoints)} API endpoints")
-    elif with_api_spec and not dry_run:
-        _snap = _llm_snapshot()
-        with manifest.stage(5, "api_spec", "Generating API Specification") as stg:
-            stg.add_input("requirements", "data", count=len(requirements), description="Requirements for API derivation")
-            stg.add_input("tech_constraints", "data", description="Technical constraints")
+    realtime_spec_yaml = ""
+    data_dict = None  # Track data dictionary for metrics
+    tech_stack = None
+    arch_spec = None
+    test_cases = []
+    test_generator = None
 
-            print("\n[5/20] Generating API Specification...")
-            await _emit_progress(5, "Generating API Specification...")
-            if emitter:
-                await emitter.pass_started("specification", 3)
-                await emitter.log_info("Generating API Specification...")
+    def _update_scheduled_stage_cost(name: str):
+        """Set a scheduled stage's cost from the LLM calls tagged with its name."""
+        calls = [c for c in llm_logger.calls if c.stage == name]
+        manifest.update_stage_cost(
+            cost_usd=sum(c.cost_usd for c in calls),
+            llm_calls=len(calls),
+            name=name,
+        )
 
-            api_generator = APISpecGenerator(
-                model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
-                base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1"),
-                api_title=f"{project_name} API",
-                api_version="1.0.0"
-            )
-            await api_generator.initialize()
+    # Generate API Specification
+    async def _stage_api_spec():
+        nonlocal api_spec_yaml, api_endpoints
+        if _has_checkpoint(output_dir, 5):
+            cp = _load_checkpoint(output_dir, 5)
+            from requirements_engineer.generators.api_spec_generator import APIEndpoint
+            api_endpoints = [APIEndpoint.from_dict(ep) for ep in cp["api_endpoints"]]
+            api_spec_yaml = cp.get("api_spec_yaml", "")
+            # Re-save output files from checkpoint data
+            if api_spec_yaml:
+                (output_dir / "api").mkdir(parents=True, exist_ok=True)
+                with open(output_dir / "api" / "openapi_spec.yaml", "w", encoding="utf-8") as f:
+                    f.write(api_spec_yaml)
+            api_md = cp.get("api_md", "")
+            if api_md:
+                with open(output_dir / "api" / "api_documentation.md", "w", encoding="utf-8") as f:
+                    f.write(api_md)
+            manifest.skip_stage(5, "api_spec", "Resumed from checkpoint")
+            print(f"\n[5/20] [RESUMED] Loaded {len(api_endpoints)} API endpoints")
+        elif with_api_spec and not dry_run:
+            with manifest.stage(5, "api_spec", "Generating API Specification") as stg:
+                stg.add_input("requirements", "data", count=len(requirements), description="Requirements for API derivation")
+                stg.add_input("tech_constraints", "data", description="Technical constraints")
+
+                print("\n[5/20] Generating API Specification...")
+                await _emit_progress(5, "Generating API Specification...")
+                if emitter:
+                    await emitter.pass_started("specification", 3)
+                    await emitter.log_info("Generating API Specification...")
 
-            tech_constraints = constraints.get("technical", [])
-            api_spec_yaml = await api_generator.generate_openapi_spec(requirements, tech_constraints)
+                api_generator = APISpecGenerator(
+                    model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
+                    base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1"),
+                    api_title=f"{project_name} API",
+                    api_version="1.0.0"
+                )
+                await api_generator.initialize()
 
-            with open(output_dir / "api" / "openapi_spec.yaml", "w", encoding="utf-8") as f:
-                f.write(api_spec_yaml)
+                tech_constraints = constraints.get("technical", [])
+                api_spec_yaml = await api_generator.generate_openapi_spec(requirements, tech_constraints)
 
-            api_md = api_generator.to_markdown()
-            with open(output_dir / "api" / "api_documentation.md", "w", encoding="utf-8") as f:
-                f.write(api_md)
+                with open(output_dir / "api" / "openapi_spec.yaml", "w", encoding="utf-8") as f:
+                    f.write(api_spec_yaml)
 
-            # Emit API endpoints to dashboard
-            if emitter:
-                for endpoint in api_generator.endpoints:
-                    await emitter.api_spec_generated(
-                        endpoint.path,
-                        endpoint.method.upper(),
-                        endpoint.path
-                    )
+                api_md = api_generator.to_markdown()
+                with open(output_dir / "api" / "api_documentation.md", "w", encoding="utf-8") as f:
+                    f.write(api_md)
 
-            api_endpoints = list(api_generator.endpoints)
-            print(f"   Generated {len(api_endpoints)} API endpoints")
+                # Emit API endpoints to dashboard
+                if emitter:
+                    for endpoint in api_generator.endpoints:
+                        await emitter.api_spec_generated(
+                            endpoint.path,
+                            endpoint.method.upper(),
+                            endpoint.path
+                        )
 
-            stg.add_output("openapi_spec.yaml", "file", path="api/openapi_spec.yaml", description="OpenAPI 3.0 specification")
-            stg.add_output("api_documentation.md", "file", path="api/api_documentation.md", description="API documentation")
-            stg.add_output("endpoints", "data", count=len(api_endpoints), description="API endpoints")
-        _update_stage_cost(_snap)
-        if api_endpoints:
-            _save_checkpoint(output_dir, 5, {
-                "api_endpoints": [ep.to_dict() for ep in api_endpoints],
-                "api_spec_yaml": api_spec_yaml,
-                "api_md": api_md,
-            })
-    elif dry_run:
-        manifest.skip_stage(5, "api_spec", "Generating API Specification", reason="dry_run")
-        print("\n[5/20] [DRY RUN] Skipping API Specification")
-    else:
-        manifest.skip_stage(5, "api_spec", "Generating API Specification", reason="disabled")
-        print("\n[5/20] Skipping API Specification (disabled)")
+                api_endpoints = list(api_generator.endpoints)
+                print(f"   Generated {len(api_endpoints)} API endpoints")
+
+                stg.add_output("openapi_spec.yaml", "file", path="api/openapi_spec.yaml", description="OpenAPI 3.0 specification")
+                stg.add_output("api_documentation.md", "file", path="api/api_documentation.md", description="API documentation")
+                stg.add_output("endpoints", "data", count=len(api_endpoints), description="API endpoints")
+            _update_scheduled_stage_cost("api_spec")
+            if api_endpoints:
+                _save_checkpoint(output_dir, 5, {
+                    "api_endpoints": [ep.to_dict() for ep in api_endpoints],
+                    "api_spec_yaml": api_spec_yaml,
+                    "api_md": api_md,
+                })
+        elif dry_run:
+            manifest.skip_stage(5, "api_spec", "Generating API Specification", reason="dry_run")
+            print("\n[5/20] [DRY RUN] Skipping API Specification")
+        else:
+            manifest.skip_stage(5, "api_spec", "Generating API Specification", reason="disabled")
+            print("\n[5/20] Skipping API Specification (disabled)")
 
-    _validate_stage_output("11a", {"api_endpoints": api_endpoints}, manifest)
+        _validate_stage_output("11a", {"api_endpoints": api_endpoints}, manifest, "api_spec")
 
-    # Generate Realtime/WebSocket Spec (AsyncAPI) - runs after API spec
-    realtime_spec_yaml = ""
-    rt_config = config.get("generators", {}).get("realtime_spec", {})
-    if rt_config.get("enabled", True) and with_api_spec and not dry_run:
-        _snap = _llm_snapshot()
-        with manifest.stage("5b", "realtime_spec", "Generating Realtime Spec (AsyncAPI)") as stg:
-            stg.add_input("requirements", "data", count=len(requirements), description="Requirements for realtime detection")
-            stg.add_input("config", "config", description="Realtime spec configuration")
+    # Generate Realtime/WebSocket Spec (AsyncAPI) - needs only requirements
+    async def _stage_realtime_spec():
+        nonlocal realtime_spec_yaml
+        rt_config = config.get("generators", {}).get("realtime_spec", {})
+        if rt_config.get("enabled", True) and with_api_spec and not dry_run:
+            with manifest.stage("5b", "realtime_spec", "Generating Realtime Spec (AsyncAPI)") as stg:
+                stg.add_input("requirements", "data", count=len(requirements), description="Requirements for realtime detection")
+                stg.add_input("config", "config", description="Realtime spec configuration")
 
-            try:
-                RealtimeSpecGenerator = imports["RealtimeSpecGenerator"]
-                print("\n  [5b] Generating Realtime Spec (AsyncAPI)...")
-                rt_generator = RealtimeSpecGenerator(
-                    model_name=rt_config.get("model", config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini")),
-                    base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1"),
-                    config=config,
-                )
-                await rt_generator.initialize()
-                realtime_spec_yaml = await rt_generator.generate_asyncapi_spec(
-                    requirements,
-                    title=f"{project_name} Realtime API",
-                )
-                if realtime_spec_yaml:
-                    rt_dir = output_dir / "api"
-                    rt_dir.mkdir(parents=True, exist_ok=True)
-                    with open(rt_dir / "asyncapi_spec.yaml", "w", encoding="utf-8") as f:
-                        f.write(realtime_spec_yaml)
-                    rt_md = rt_generator.to_markdown(realtime_spec_yaml)
-                    if rt_md:
-                        with open(rt_dir / "realtime_documentation.md", "w", encoding="utf-8") as f:
-                            f.write(rt_md)
-                    print(f"   Generated AsyncAPI spec with WebSocket channels")
-                    stg.add_output("asyncapi_spec.yaml", "file", path="api/asyncapi_spec.yaml", description="AsyncAPI 2.6 specification")
-                else:
-                    print("   No real-time requirements found, skipping AsyncAPI")
-            except Exception as e:
-                print(f"   [WARN] Realtime spec generation failed: {e}")
-        _update_stage_cost(_snap)
-    else:
-        manifest.skip_stage("5b", "realtime_spec", "Generating Realtime Spec (AsyncAPI)",
-                            reason="disabled or dry_run" if dry_run else "realtime spec disabled")
+                try:
+                    RealtimeSpecGenerator = imports["RealtimeSpecGenerator"]
+                    print("\n  [5b] Generating Realtime Spec (AsyncAPI)...")
+                    rt_generator = RealtimeSpecGenerator(
+                        model_name=rt_config.get("model", config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini")),
+                        base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1"),
+                        config=config,
+                    )
+                    await rt_generator.initialize()
+                    realtime_spec_yaml = await rt_generator.generate_asyncapi_spec(
+                        requirements,
+                        title=f"{project_name} Realtime API",
+                    )
+                    if realtime_spec_yaml:
+                        rt_dir = output_dir / "api"
+                        rt_dir.mkdir(parents=True, exist_ok=True)
+                        with open(rt_dir / "asyncapi_spec.yaml", "w", encoding="utf-8") as f:
+                            f.write(realtime_spec_yaml)
+                        rt_md = rt_generator.to_markdown(realtime_spec_yaml)
+                        if rt_md:
+                            with open(rt_dir / "realtime_documentation.md", "w", encoding="utf-8") as f:
+                                f.write(rt_md)
+                        print(f"   Generated AsyncAPI spec with WebSocket channels")
+                        stg.add_output("asyncapi_spec.yaml", "file", path="api/asyncapi_spec.yaml", description="AsyncAPI 2.6 specification")
+                    else:
+                        print("   No real-time requirements found, skipping AsyncAPI")
+                except Exception as e:
+                    print(f"   [WARN] Realtime spec generation failed: {e}")
+            _update_scheduled_stage_cost("realtime_spec")
+        else:
+            manifest.skip_stage("5b", "realtime_spec", "Generating Realtime Spec (AsyncAPI)",
+                                reason="disabled or dry_run" if dry_run else "realtime spec disabled")
 
     # Generate Data Dictionary
-    data_dict = None  # Track data dictionary for metrics
-    if last_completed >= 6:
-        cp = _load_checkpoint(output_dir, 6)
-        from requirements_engineer.generators.data_dictionary_generator import DataDictionary, Entity, Relationship, GlossaryTerm
-        data_dict = DataDictionary(title=project_name)
-        entities = [Entity.from_dict(e) for e in cp.get("entities", [])]
-        data_dict.entities = {e.name: e for e in entities}
-        data_dict.relationships = [Relationship.from_dict(r) for r in cp.get("relationships", [])]
-        glossary = [GlossaryTerm.from_dict(g) for g in cp.get("glossary", [])]
-        data_dict.glossary = {g.term: g for g in glossary}
-        # Re-save data dictionary files from checkpoint
-        dd_md = data_dict.to_markdown()
-        with open(output_dir / "data" / "data_dictionary.md", "w", encoding="utf-8") as f:
-            f.write(dd_md)
-        er_diagram = data_dict.to_er_diagram()
-        with open(output_dir / "data" / "er_diagram.mmd", "w", encoding="utf-8") as f:
-            f.write(er_diagram)
-        schema_sql = data_dict.to_sql()
-        with open(output_dir / "data" / "schema.sql", "w", encoding="utf-8") as f:
-            f.write(schema_sql)
-        manifest.skip_stage(6, "data_dictionary", "Resumed from checkpoint")
-        print(f"\n[6/20] [RESUMED] Loaded {len(data_dict.entities)} entities, {len(data_dict.relationships)} relationships")
-    elif with_data_dict and not dry_run:
-        _snap = _llm_snapshot()
-        with manifest.stage(6, "data_dictionary", "Generating Data Dictionary") as stg:
-            stg.add_input("requirements", "data", count=len(requirements), description="Requirements for entity extraction")
-            stg.add_input("domain", "data", description=f"Domain: {domain}")
-
-            print("\n[6/20] Generating Data Dictionary...")
-            await _emit_progress(6, "Generating Data Dictionary...")
-            dd_generator = DataDictionaryGenerator(
-                model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
-                base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1")
-            )
-            await dd_generator.initialize()
-
-            data_dict = await dd_generator.generate_dictionary(
-                requirements,
-                domain=domain,
-                title=f"{project_name} Data Dictionary"
-            )
-
+    async def _stage_data_dictionary():
+        nonlocal data_dict
+        if _has_checkpoint(output_dir, 6):
+            cp = _load_checkpoint(output_dir, 6)
+            from requirements_engineer.generators.data_dictionary_generator import DataDictionary, Entity, Relationship, GlossaryTerm
+            data_dict = DataDictionary(title=project_name)
+            entities = [Entity.from_dict(e) for e in cp.get("entities", [])]
+            data_dict.entities = {e.name: e for e in entities}
+            data_dict.relationships = [Relationship.from_dict(r) for r in cp.get("relationships", [])]
+            glossary = [GlossaryTerm.from_dict(g) for g in cp.get("glossary", [])]
+            data_dict.glossary = {g.term: g for g in glossary}
+            # Re-save data dictionary files from checkpoint
             dd_md = data_dict.to_markdown()
             with open(output_dir / "data" / "data_dictionary.md", "w", encoding="utf-8") as f:
                 f.write(dd_md)
-
             er_diagram = data_dict.to_er_diagram()
             with open(output_dir / "data" / "er_diagram.mmd", "w", encoding="utf-8") as f:
                 f.write(er_diagram)
-
             schema_sql = data_dict.to_sql()
             with open(output_dir / "data" / "schema.sql", "w", encoding="utf-8") as f:
                 f.write(schema_sql)
+            manifest.skip_stage(6, "data_dictionary", "Resumed from checkpoint")
+            print(f"\n[6/20] [RESUMED] Loaded {len(data_dict.entities)} entities, {len(data_dict.relationships)} relationships")
+        elif with_data_dict and not dry_run:
+            with manifest.stage(6, "data_dictionary", "Generating Data Dictionary") as stg:
+                stg.add_input("requirements", "data", count=len(requirements), description="Requirements for entity extraction")
+                stg.add_input("domain", "data", description=f"Domain: {domain}")
 
-            print(f"   Generated dictionary with {len(data_dict.entities)} entities")
-
-            # Emit to Matrix Dashboard
-            if matrix_bridge:
-                await matrix_bridge.emit_data_dictionary(data_dict)
-
-            stg.add_output("data_dictionary.md", "file", path="data/data_dictionary.md", description="Data dictionary")
-            stg.add_output("er_diagram.mmd", "file", path="data/er_diagram.mmd", description="ER diagram (Mermaid)")
-            stg.add_output("entities", "data", count=len(data_dict.entities), description="Data entities")
-        _update_stage_cost(_snap)
-        if data_dict and hasattr(data_dict, 'entities'):
-            def _serialize(obj):
-                """Serialize dataclass, dataclass_json, dict, or any object."""
-                if isinstance(obj, dict):
-                    return obj
-                if hasattr(obj, 'to_dict'):
-                    return obj.to_dict()
-                if hasattr(obj, '__dict__'):
-                    return vars(obj)
-                return str(obj)
-
-            ents = data_dict.entities
-            rels = getattr(data_dict, 'relationships', [])
-            gloss = getattr(data_dict, 'glossary', {})
-            _save_checkpoint(output_dir, 6, {
-                "entities": [_serialize(e) for e in (ents.values() if isinstance(ents, dict) else ents)],
-                "relationships": [_serialize(r) for r in (rels.values() if isinstance(rels, dict) else rels)],
-                "glossary": [_serialize(g) for g in (gloss.values() if isinstance(gloss, dict) else gloss)],
-            })
-    elif dry_run:
-        manifest.skip_stage(6, "data_dictionary", "Generating Data Dictionary", reason="dry_run")
-        print("\n[6/20] [DRY RUN] Skipping Data Dictionary")
-    else:
-        manifest.skip_stage(6, "data_dictionary", "Generating Data Dictionary", reason="disabled")
-        print("\n[6/20] Skipping Data Dictionary (disabled)")
-
-    _validate_stage_output("12a", {"data_dict": data_dict}, manifest)
-
-    # Generate Tech Stack
-    tech_stack = None
-    if last_completed >= 7:
-        cp = _load_checkpoint(output_dir, 7)
-        from requirements_engineer.generators.tech_stack_generator import TechStack, save_tech_stack
-        tech_stack = TechStack.from_dict(cp["tech_stack"]) if cp.get("tech_stack") else None
-        if tech_stack:
-            save_tech_stack(tech_stack, output_dir)
-        manifest.skip_stage(7, "tech_stack", "Resumed from checkpoint")
-        print(f"\n[7/20] [RESUMED] Loaded tech stack")
-    elif not dry_run:
-        _snap = _llm_snapshot()
-        try:
-            with manifest.stage(7, "tech_stack", "Generating Tech Stack Recommendations") as stg:
-                stg.add_input("requirements", "data", count=len(requirements), description="Requirements")
-                stg.add_input("constraints", "data", description="Project constraints")
-                stg.add_input("api_endpoints", "data", count=len(api_endpoints), description="API endpoints")
-                stg.add_input("entities", "data", count=len(data_dict.entities) if data_dict else 0, description="Data entities")
-
-                print("\n[7/20] Generating Tech Stack Recommendations...")
-                await _emit_progress(7, "Generating Tech Stack Recommendations...")
-                llm_config = config.get("kilo_agent", {})
-                tech_generator = TechStackGenerator(
-                    model=llm_config.get("model", "openai/gpt-4o-mini"),
-                    base_url=llm_config.get("base_url", "https://openrouter.ai/api/v1"),
-                    api_key=os.environ.get("OPENROUTER_API_KEY")
+                print("\n[6/20] Generating Data Dictionary...")
+                await _emit_progress(6, "Generating Data Dictionary...")
+                dd_generator = DataDictionaryGenerator(
+                    model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
+                    base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1")
                 )
+                await dd_generator.initialize()
 
-                tech_stack = await tech_generator.generate_tech_stack(
-                    project_name=project_name,
+                data_dict = await dd_generator.generate_dictionary(
+                    requirements,
                     domain=domain,
-                    requirements=requirements,
-                    constraints=constraints,
-                    api_endpoints=api_endpoints if api_endpoints else None,
-                    entities=data_dict.entities if data_dict else None
+                    title=f"{project_name} Data Dictionary"
                 )
 
-                save_tech_stack(tech_stack, output_dir)
-                print(f"   Generated tech stack with {tech_stack.backend_framework} / {tech_stack.frontend_framework}")
+                dd_md = data_dict.to_markdown()
+                with open(output_dir / "data" / "data_dictionary.md", "w", encoding="utf-8") as f:
+                    f.write(dd_md)
+
+                er_diagram = data_dict.to_er_diagram()
+                with open(output_dir / "data" / "er_diagram.mmd", "w", encoding="utf-8") as f:
+                    f.write(er_diagram)
+
+                schema_sql = data_dict.to_sql()
+                with open(output_dir / "data" / "schema.sql", "w", encoding="utf-8") as f:
+                    f.write(schema_sql)
+
+                print(f"   Generated dictionary with {len(data_dict.entities)} entities")
 
                 # Emit to Matrix Dashboard
                 if matrix_bridge:
-                    await matrix_bridge.emit_tech_stack(tech_stack)
-
-                stg.add_output("tech_stack.md", "file", path="tech_stack/tech_stack.md", description="Tech stack recommendations")
-                stg.add_output("tech_stack.json", "file", path="tech_stack/tech_stack.json", description="Tech stack data")
-            _update_stage_cost(_snap)
-        except Exception as e:
-            print(f"   [ERROR] Stage 7 (Tech Stack) failed: {e}")
-            _update_stage_cost(_snap)
-        if tech_stack:
-            _save_checkpoint(output_dir, 7, {
-                "tech_stack": tech_stack.to_dict() if hasattr(tech_stack, 'to_dict') else {},
-            })
-    elif dry_run:
-        manifest.skip_stage(7, "tech_stack", "Generating Tech Stack Recommendations", reason="dry_run")
-        print("\n[7/20] [DRY RUN] Skipping Tech Stack generation")
+                    await matrix_bridge.emit_data_dictionary(data_dict)
+
+                stg.add_output("data_dictionary.md", "file", path="data/data_dictionary.md", description="Data dictionary")
+                stg.add_output("er_diagram.mmd", "file", path="data/er_diagram.mmd", description="ER diagram (Mermaid)")
+                stg.add_output("entities", "data", count=len(data_dict.entities), description="Data entities")
+            _update_scheduled_stage_cost("data_dictionary")
+            if data_dict and hasattr(data_dict, 'entities'):
+                def _serialize(obj):
+                    """Serialize dataclass, dataclass_json, dict, or any object."""
+                    if isinstance(obj, dict):
+                        return obj
+                    if hasattr(obj, 'to_dict'):
+                        return obj.to_dict()
+                    if hasattr(obj, '__dict__'):
+                        return vars(obj)
+                    return str(obj)
+
+                ents = data_dict.entities
+                rels = getattr(data_dict, 'relationships', [])
+                gloss = getattr(data_dict, 'glossary', {})
+                _save_checkpoint(output_dir, 6, {
+                    "entities": [_serialize(e) for e in (ents.values() if isinstance(ents, dict) else ents)],
+                    "relationships": [_serialize(r) for r in (rels.values() if isinstance(rels, dict) else rels)],
+                    "glossary": [_serialize(g) for g in (gloss.values() if isinstance(gloss, dict) else gloss)],
+                })
+        elif dry_run:
+            manifest.skip_stage(6, "data_dictionary", "Generating Data Dictionary", reason="dry_run")
+            print("\n[6/20] [DRY RUN] Skipping Data Dictionary")
+        else:
+            manifest.skip_stage(6, "data_dictionary", "Generating Data Dictionary", reason="disabled")
+            print("\n[6/20] Skipping Data Dictionary (disabled)")
 
-    # ── Step 7.5: Architecture Design ─────────────────────────
-    arch_spec = None
-    arch_cfg = config.get("generators", {}).get("architecture", {})
-    if _has_checkpoint(output_dir, "7.5"):
-        cp = _load_checkpoint(output_dir, "7.5")
-        arch_spec = ArchitectureSpec.from_dict(cp["arch_spec"]) if cp.get("arch_spec") else None
-        if arch_spec:
-            save_architecture(arch_spec, output_dir)
-        manifest.skip_stage("7.5", "architecture", "Resumed from checkpoint")
-        print("\n[7.5/20] [CHECKPOINT] Loaded Architecture from checkpoint")
-    elif not dry_run and arch_cfg.get("enabled", True) and requirements and tech_stack:
-        _snap = _llm_snapshot()
-        try:
-            with manifest.stage("7.5", "architecture", "Generating Architecture Design") as stg:
-                stg.add_input("requirements", "data", count=len(requirements), description="Requirements")
-                stg.add_input("tech_stack", "data", description="Tech stack recommendations")
-                stg.add_input("api_endpoints", "data", count=len(api_endpoints), description="API endpoints")
-                stg.add_input("entities", "data", count=len(data_dict.entities) if data_dict else 0, description="Data entities")
+        _validate_stage_output("12a", {"data_dict": data_dict}, manifest, "data_dictionary")
 
-                print("\n[7.5/20] Generating Architecture Design (C4 diagrams)...")
-                await _emit_progress("7.5", "Generating Architecture Design...")
-                llm_config = config.get("kilo_agent", {})
-                arch_generator = ArchitectureGenerator(
-                    model=arch_cfg.get("model", llm_config.get("model", "openai/gpt-4o-mini")),
-                    base_url=llm_config.get("base_url", "https://openrouter.ai/api/v1"),
-                    api_key=os.environ.get("OPENROUTER_API_KEY"),
-                    config=arch_cfg,
-                )
-                arch_spec = await arch_generator.generate_architecture(
-                    requirements=requirements,
-                    tech_stack_dict=tech_stack.to_dict() if hasattr(tech_stack, 'to_dict') else {},
-                    api_endpoint_count=len(api_endpoints),
-                    entity_count=len(data_dict.entities) if data_dict else 0,
-                    project_name=project_name,
-                    domain=domain,
-                )
-                if arch_spec:
-                    save_architecture(arch_spec, output_dir)
-                    print(f"   Saved {len(arch_spec.services)} services, 4 C4/deployment diagrams")
-                    stg.add_output("architecture_overview.md", "file", path="architecture/architecture_overview.md", description="Architecture overview")
-                    stg.add_output("c4_context.mmd", "file", path="architecture/c4_context.mmd", description="C4 Context diagram")
-                    stg.add_output("c4_container.mmd", "file", path="architecture/c4_container.mmd", description="C4 Container diagram")
-                    stg.add_output("deployment.mmd", "file", path="architecture/deployment.mmd", description="Deployment diagram")
-                    stg.add_output("data_flow.mmd", "file", path="architecture/data_flow.mmd", description="Data flow diagram")
-                    _save_checkpoint(output_dir, "7.5", {"arch_spec": arch_spec.to_dict()})
-            _update_stage_cost(_snap)
-        except Exception as e:
-            print(f"   [ERROR] Stage 7.5 (Architecture) failed: {e}")
-            _update_stage_cost(_snap)
-    elif dry_run and arch_cfg.get("enabled", True):
-        manifest.skip_stage("7.5", "architecture", "Generating Architecture Design", reason="dry_run")
-        print("\n[7.5/20] [DRY RUN] Skipping Architecture Design")
-    else:
-        manifest.skip_stage("7.5", "architecture", "Generating Architecture Design", reason="disabled or missing inputs")
+    # Generate Tech Stack
+    async def _stage_tech_stack():
+        nonlocal tech_stack
+        if _has_checkpoint(output_dir, 7):
+            cp = _load_checkpoint(output_dir, 7)
+            from requirements_engineer.generators.tech_stack_generator import TechStack
+            tech_stack = TechStack.from_dict(cp["tech_stack"]) if cp.get("tech_stack") else None
+            if tech_stack:
+                save_tech_stack(tech_stack, output_dir)
+            manifest.skip_stage(7, "tech_stack", "Resumed from checkpoint")
+            print(f"\n[7/20] [RESUMED] Loaded tech stack")
+        elif not dry_run:
+            try:
+                with manifest.stage(7, "tech_stack", "Generating Tech Stack Recommendations") as stg:
+                    stg.add_input("requirements", "data", count=len(requirements), description="Requirements")
+                    stg.add_input("constraints", "data", description="Project constraints")
+                    stg.add_input("api_endpoints", "data", count=len(api_endpoints), description="API endpoints")
+                    stg.add_input("entities", "data", count=len(data_dict.entities) if data_dict else 0, description="Data entities")
+
+                    print("\n[7/20] Generating Tech Stack Recommendations...")
+                    await _emit_progress(7, "Generating Tech Stack Recommendations...")
+                    llm_config = config.get("kilo_agent", {})
+                    tech_generator = TechStackGenerator(
+                        model=llm_config.get("model", "openai/gpt-4o-mini"),
+                        base_url=llm_config.get("base_url", "https://openrouter.ai/api/v1"),
+                        api_key=os.environ.get("OPENROUTER_API_KEY")
+                    )
 
-    # Generate Gherkin Test Cases
-    test_cases = []
-    if last_completed >= 8:
-        cp = _load_checkpoint(output_dir, 8)
-        from requirements_engineer.generators.test_case_generator import TestCase, GherkinFeature, TestCaseGenerator
-        test_cases = [TestCase.from_dict(tc) for tc in cp["test_cases"]]
-        # Re-save test files from checkpoint
-        test_gen_temp = TestCaseGenerator.__new__(TestCaseGenerator)
-        test_gen_temp.test_cases = {tc.id: tc for tc in test_cases}
-        test_gen_temp.features = {sid: GherkinFeature.from_dict(f) for sid, f in cp.get("features", {}).items()}
-        test_gen_temp.config = config
-        # Save feature files
-        for story_id, feature in test_gen_temp.features.items():
-            filename = f"{story_id.replace('-', '_').lower()}.feature"
-            with open(output_dir / "testing" / filename, "w", encoding="utf-8") as f:
-                f.write(feature.to_gherkin())
-        # Save test documentation
-        test_md = test_gen_temp.to_markdown()
-        with open(output_dir / "testing" / "test_documentation.md", "w", encoding="utf-8") as f:
-            f.write(test_md)
-        # Re-save step definition stubs
-        step_defs = test_gen_temp.to_step_definitions()
-        steps_dir = output_dir / "testing" / "step_defs"
-        steps_dir.mkdir(parents=True, exist_ok=True)
-        for filename, content in step_defs.items():
-            with open(steps_dir / filename, "w", encoding="utf-8") as f:
-                f.write(content)
-        manifest.skip_stage(8, "test_cases", "Resumed from checkpoint")
-        print(f"\n[8/20] [RESUMED] Loaded {len(test_cases)} test cases, {len(test_gen_temp.features)} features")
-    elif with_gherkin and user_stories and not dry_run:
-        _snap = _llm_snapshot()
-        with manifest.stage(8, "test_cases", "Generating Gherkin Test Cases") as stg:
-            stg.add_input("user_stories", "data", count=len(user_stories), description="User stories for test derivation")
+                    tech_stack = await tech_generator.generate_tech_stack(
+                        project_name=project_name,
+                        domain=domain,
+                        requirements=requirements,
+                        constraints=constraints,
+                        api_endpoints=api_endpoints if api_endpoints else None,
+                        entities=data_dict.entities if data_dict else None
+                    )
 
-            print("\n[8/20] Generating Gherkin Test Cases...")
-            await _emit_progress(8, "Generating Gherkin Test Cases...")
-            if emitter:
-                await emitter.pass_started("testing", 4)
-                await emitter.log_info("Generating Gherkin Test Cases...")
+                    save_tech_stack(tech_stack, output_dir)
+                    print(f"   Generated tech stack with {tech_stack.backend_framework} / {tech_stack.frontend_framework}")
 
-            test_generator = TestCaseGenerator(
-                model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
-                base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1")
-            )
-            await test_generator.initialize()
+                    # Emit to Matrix Dashboard
+                    if matrix_bridge:
+                        await matrix_bridge.emit_tech_stack(tech_stack)
 
-            features = await test_generator.generate_all_gherkin(user_stories)
-            test_cases = await test_generator.generate_all_test_cases(user_stories)
+                    stg.add_output("tech_stack.md", "file", path="tech_stack/tech_stack.md", description="Tech stack recommendations")
+                    stg.add_output("tech_stack.json", "file", path="tech_stack/tech_stack.json", description="Tech stack data")
+                _update_scheduled_stage_cost("tech_stack")
+            except Exception as e:
+                print(f"   [ERROR] Stage 7 (Tech Stack) failed: {e}")
+                _update_scheduled_stage_cost("tech_stack")
+            if tech_stack:
+                _save_checkpoint(output_dir, 7, {
+                    "tech_stack": tech_stack.to_dict() if hasattr(tech_stack, 'to_dict') else {},
+                })
+        elif dry_run:
+            manifest.skip_stage(7, "tech_stack", "Generating Tech Stack Recommendations", reason="dry_run")
+            print("\n[7/20] [DRY RUN] Skipping Tech Stack generation")
 
-            # Emit test cases to dashboard
-            if emitter:
-                for tc in test_cases:
-                    await emitter.test_generated(
-                        tc.id,
-                        tc.title,
-                        tc.test_type,
-                        tc.parent_user_story_id
+    # ── Step 7.5: Architecture Design ─────────────────────────
+    async def _stage_architecture():
+        nonlocal arch_spec
+        arch_cfg = config.get("generators", {}).get("architecture", {})
+        if _has_checkpoint(output_dir, "7.5"):
+            cp = _load_checkpoint(output_dir, "7.5")
+            arch_spec = ArchitectureSpec.from_dict(cp["arch_spec"]) if cp.get("arch_spec") else None
+            if arch_spec:
+                save_architecture(arch_spec, output_dir)
+            manifest.skip_stage("7.5", "architecture", "Resumed from checkpoint")
+            print("\n[7.5/20] [CHECKPOINT] Loaded Architecture from checkpoint")
+        elif not dry_run and arch_cfg.get("enabled", True) and requirements and tech_stack:
+            try:
+                with manifest.stage("7.5", "architecture", "Generating Architecture Design") as stg:
+                    stg.add_input("requirements", "data", count=len(requirements), description="Requirements")
+                    stg.add_input("tech_stack", "data", description="Tech stack recommendations")
+                    stg.add_input("api_endpoints", "data", count=len(api_endpoints), description="API endpoints")
+                    stg.add_input("entities", "data", count=len(data_dict.entities) if data_dict else 0, description="Data entities")
+
+                    print("\n[7.5/20] Generating Architecture Design (C4 diagrams)...")
+                    await _emit_progress("7.5", "Generating Architecture Design...")
+                    llm_config = config.get("kilo_agent", {})
+                    arch_generator = ArchitectureGenerator(
+                        model=arch_cfg.get("model", llm_config.get("model", "openai/gpt-4o-mini")),
+                        base_url=llm_config.get("base_url", "https://openrouter.ai/api/v1"),
+                        api_key=os.environ.get("OPENROUTER_API_KEY"),
+                        config=arch_cfg,
+                    )
+                    arch_spec = await arch_generator.generate_architecture(
+                        requirements=requirements,
+                        tech_stack_dict=tech_stack.to_dict() if hasattr(tech_stack, 'to_dict') else {},
+                        api_endpoint_count=len(api_endpoints),
+                        entity_count=len(data_dict.entities) if data_dict else 0,
+                        project_name=project_name,
+                        domain=domain,
                     )
+                    if arch_spec:
+                        save_architecture(arch_spec, output_dir)
+                        print(f"   Saved {len(arch_spec.services)} services, 4 C4/deployment diagrams")
+                        stg.add_output("architecture_overview.md", "file", path="architecture/architecture_overview.md", description="Architecture overview")
+                        stg.add_output("c4_context.mmd", "file", path="architecture/c4_context.mmd", description="C4 Context diagram")
+                        stg.add_output("c4_container.mmd", "file", path="architecture/c4_container.mmd", description="C4 Container diagram")
+                        stg.add_output("deployment.mmd", "file", path="architecture/deployment.mmd", description="Deployment diagram")
+                        stg.add_output("data_flow.mmd", "file", path="architecture/data_flow.mmd", description="Data flow diagram")
+                        _save_checkpoint(output_dir, "7.5", {"arch_spec": arch_spec.to_dict()})
+                _update_scheduled_stage_cost("architecture")
+            except Exception as e:
+                print(f"   [ERROR] Stage 7.5 (Architecture) failed: {e}")
+                _update_scheduled_stage_cost("architecture")
+        elif dry_run and arch_cfg.get("enabled", True):
+            manifest.skip_stage("7.5", "architecture", "Generating Architecture Design", reason="dry_run")
+            print("\n[7.5/20] [DRY RUN] Skipping Architecture Design")
+        else:
+            manifest.skip_stage("7.5", "architecture", "Generating Architecture Design", reason="disabled or missing inputs")
 
-            # Save individual feature files
-            for story_id, feature in test_generator.features.items():
+    # Generate Gherkin Test Cases
+    async def _stage_test_cases():
+        nonlocal test_cases, test_generator
+        if _has_checkpoint(output_dir, 8):
+            cp = _load_checkpoint(output_dir, 8)
+            from requirements_engineer.generators.test_case_generator import TestCase, GherkinFeature
+            test_cases = [TestCase.from_dict(tc) for tc in cp["test_cases"]]
+            # Re-save test files from checkpoint
+            test_gen_temp = TestCaseGenerator.__new__(TestCaseGenerator)
+            test_gen_temp.test_cases = {tc.id: tc for tc in test_cases}
+            test_gen_temp.features = {sid: GherkinFeature.from_dict(f) for sid, f in cp.get("features", {}).items()}
+            test_gen_temp.config = config
+            # Save feature files
+            for story_id, feature in test_gen_temp.features.items():
                 filename = f"{story_id.replace('-', '_').lower()}.feature"
                 with open(output_dir / "testing" / filename, "w", encoding="utf-8") as f:
                     f.write(feature.to_gherkin())
-
             # Save test documentation
-            test_md = test_generator.to_markdown()
+            test_md = test_gen_temp.to_markdown()
             with open(output_dir / "testing" / "test_documentation.md", "w", encoding="utf-8") as f:
                 f.write(test_md)
-
-            # Generate step definition stubs
-            step_defs = test_generator.to_step_definitions()
+            # Re-save step definition stubs
+            step_defs = test_gen_temp.to_step_definitions()
             steps_dir = output_dir / "testing" / "step_defs"
             steps_dir.mkdir(parents=True, exist_ok=True)
             for filename, content in step_defs.items():
-                target = steps_dir / filename
-                target.parent.mkdir(parents=True, exist_ok=True)
-                with open(target, "w", encoding="utf-8") as f:
+                with open(steps_dir / filename, "w", encoding="utf-8") as f:
                     f.write(content)
+            manifest.skip_stage(8, "test_cases", "Resumed from checkpoint")
+            print(f"\n[8/20] [RESUMED] Loaded {len(test_cases)} test cases, {len(test_gen_temp.features)} features")
+        elif with_gherkin and user_stories and not dry_run:
+            with manifest.stage(8, "test_cases", "Generating Gherkin Test Cases") as stg:
+                stg.add_input("user_stories", "data", count=len(user_stories), description="User stories for test derivation")
+
+                print("\n[8/20] Generating Gherkin Test Cases...")
+                await _emit_progress(8, "Generating Gherkin Test Cases...")
+                if emitter:
+                    await emitter.pass_started("testing", 4)
+                    await emitter.log_info("Generating Gherkin Test Cases...")
 
-            print(f"   Generated {len(features)} feature files, {len(test_cases)} test cases, {len(step_defs)} step definition files")
+                test_generator = TestCaseGenerator(
+                    model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
+                    base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1")
+                )
+                await test_generator.initialize()
 
-            if emitter:
-                await emitter.pass_complete("testing", 4, {
-                    "features": len(features),
-                    "test_cases": len(test_cases)
-                })
+                features = await test_generator.generate_all_gherkin(user_stories)
+                test_cases = await test_generator.generate_all_test_cases(user_stories)
 
-            # Quality Gate: Testing -> Final (real traceability from artifact links)
-            from requirements_engineer.gates.quality_gate import QualityGate as QG
-            trace = QG.compute_traceability(requirements, user_stories, test_cases)
-            gate_result = quality_gate.check_testing_gate(
-                test_coverage=min(len(test_cases) / max(len(user_stories), 1), 1.0),
-                traceability=trace["overall"],
-                test_cases_count=len(test_cases)
-            )
-            print(f"   Quality Gate: {gate_result.status.value.upper()}")
-            print(f"   Traceability: req->story={trace['req_to_story']:.0%}, story->test={trace['story_to_test']:.0%}")
-            stg.set_quality_gate(gate_result.status.value.upper(),
-                                 test_coverage=min(len(test_cases) / max(len(user_stories), 1), 1.0),
-                                 traceability=trace["overall"])
+                # Emit test cases to dashboard
+                if emitter:
+                    for tc in test_cases:
+                        await emitter.test_generated(
+                            tc.id,
+                            tc.title,
+                            tc.test_type,
+                            tc.parent_user_story_id
+                        )
 
-            if emitter:
-                await emitter.quality_gate(
-                    "testing",
-                    gate_result.status.value,
-                    {"test_coverage": min(len(test_cases) / max(len(user_stories), 1), 1.0), "traceability": trace["overall"]}
+                # Save individual feature files
+                for story_id, feature in test_generator.features.items():
+                    filename = f"{story_id.replace('-', '_').lower()}.feature"
+                    with open(output_dir / "testing" / filename, "w", encoding="utf-8") as f:
+                        f.write(feature.to_gherkin())
+
+                # Save test documentation
+                test_md = test_generator.to_markdown()
+                with open(output_dir / "testing" / "test_documentation.md", "w", encoding="utf-8") as f:
+                    f.write(test_md)
+
+                # Generate step definition stubs
+                step_defs = test_generator.to_step_definitions()
+                steps_dir = output_dir / "testing" / "step_defs"
+                steps_dir.mkdir(parents=True, exist_ok=True)
+                for filename, content in step_defs.items():
+                    target = steps_dir / filename
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with open(target, "w", encoding="utf-8") as f:
+                        f.write(content)
+
+                print(f"   Generated {len(features)} feature files, {len(test_cases)} test cases, {len(step_defs)} step definition files")
+
+                if emitter:
+                    await emitter.pass_complete("testing", 4, {
+                        "features": len(features),
+                        "test_cases": len(test_cases)
+                    })
+
+                # Quality Gate: Testing -> Final (real traceability from artifact links)
+                from requirements_engineer.gates.quality_gate import QualityGate as QG
+                trace = QG.compute_traceability(requirements, user_stories, test_cases)
+                gate_result = quality_gate.check_testing_gate(
+                    test_coverage=min(len(test_cases) / max(len(user_stories), 1), 1.0),
+                    traceability=trace["overall"],
+                    test_cases_count=len(test_cases)
                 )
+                print(f"   Quality Gate: {gate_result.status.value.upper()}")
+                print(f"   Traceability: req->story={trace['req_to_story']:.0%}, story->test={trace['story_to_test']:.0%}")
+                stg.set_quality_gate(gate_result.status.value.upper(),
+                                     test_coverage=min(len(test_cases) / max(len(user_stories), 1), 1.0),
+                                     traceability=trace["overall"])
 
-            # Per-stage critique: testability + traceability fix
-            if critique_engine:
-                try:
-                    stage_critique = await critique_engine.run_stage_critique(
-                        "validation", requirements=requirements, user_stories=user_stories,
-                        test_cases=test_cases, auto_fix=True, output_dir=str(output_dir)
+                if emitter:
+                    await emitter.quality_gate(
+                        "testing",
+                        gate_result.status.value,
+                        {"test_coverage": min(len(test_cases) / max(len(user_stories), 1), 1.0), "traceability": trace["overall"]}
                     )
-                    if stage_critique["issues_fixed"] > 0:
-                        print(f"   Critique: fixed {stage_critique['issues_fixed']} issues (stub tests, acceptance criteria)")
-                        # Recalculate traceability after fixes
-                        trace_post = QG.compute_traceability(requirements, user_stories, test_cases)
-                        print(f"   Post-fix traceability: req->story={trace_post['req_to_story']:.0%}, story->test={trace_post['story_to_test']:.0%}")
-                    elif stage_critique["issues_found"] > 0:
-                        print(f"   Critique: {stage_critique['issues_found']} issues found (no auto-fixes applicable)")
-                except Exception as e:
-                    print(f"   [WARN] Validation critique failed: {e}")
 
-            stg.add_output("feature_files", "file", count=len(features), description="Gherkin feature files")
-            stg.add_output("test_documentation.md", "file", path="testing/test_documentation.md", description="Test documentation")
-            stg.add_output("test_cases", "data", count=len(test_cases), description="Generated test cases")
-        _update_stage_cost(_snap)
-        if test_cases:
-            _save_checkpoint(output_dir, 8, {
-                "test_cases": [tc.to_dict() for tc in test_cases],
-                "features": {sid: f.to_dict() for sid, f in test_generator.features.items()} if hasattr(test_generator, 'features') else {},
-            })
-    elif dry_run:
-        manifest.skip_stage(8, "test_cases", "Generating Gherkin Test Cases", reason="dry_run")
-        print("\n[8/20] [DRY RUN] Skipping Gherkin Test Cases")
-    else:
-        manifest.skip_stage(8, "test_cases", "Generating Gherkin Test Cases", reason="disabled or no user stories")
-        print("\n[8/20] Skipping Gherkin Test Cases (disabled or no user stories)")
+                # Per-stage critique: testability + traceability fix
+                if critique_engine:
+                    try:
+                        stage_critique = await critique_engine.run_stage_critique(
+                            "validation", requirements=requirements, user_stories=user_stories,
+                            test_cases=test_cases, auto_fix=True, output_dir=str(output_dir)
+                        )
+                        if stage_critique["issues_fixed"] > 0:
+                            print(f"   Critique: fixed {stage_critique['issues_fixed']} issues (stub tests, acceptance criteria)")
+                            # Recalculate traceability after fixes
+                            trace_post = QG.compute_traceability(requirements, user_stories, test_cases)
+                            print(f"   Post-fix traceability: req->story={trace_post['req_to_story']:.0%}, story->test={trace_post['story_to_test']:.0%}")
+                        elif stage_critique["issues_found"] > 0:
+                            print(f"   Critique: {stage_critique['issues_found']} issues found (no auto-fixes applicable)")
+                    except Exception as e:
+                        print(f"   [WARN] Validation critique failed: {e}")
+
+                stg.add_output("feature_files", "file", count=len(features), description="Gherkin feature files")
+                stg.add_output("test_documentation.md", "file", path="testing/test_documentation.md", description="Test documentation")
+                stg.add_output("test_cases", "data", count=len(test_cases), description="Generated test cases")
+            _update_scheduled_stage_cost("test_cases")
+            if test_cases:
+                _save_checkpoint(output_dir, 8, {
+                    "test_cases": [tc.to_dict() for tc in test_cases],
+                    "features": {sid: f.to_dict() for sid, f in test_generator.features.items()} if hasattr(test_generator, 'features') else {},
+                })
+        elif dry_run:
+            manifest.skip_stage(8, "test_cases", "Generating Gherkin Test Cases", reason="dry_run")
+            print("\n[8/20] [DRY RUN] Skipping Gherkin Test Cases")
+        else:
+            manifest.skip_stage(8, "test_cases", "Generating Gherkin Test Cases", reason="disabled or no user stories")
+            print("\n[8/20] Skipping Gherkin Test Cases (disabled or no user stories)")
 
-    _validate_stage_output(8, {"test_cases": test_cases}, manifest)
+        _validate_stage_output(8, {"test_cases": test_cases}, manifest, "test_cases")
+
+    perf_cfg = config.get("performance", {}) or {}
+    scheduler = StageScheduler(
+        available=["requirements", "user_stories"],
+        max_parallel=perf_cfg.get("max_parallel_stages", 3) if perf_cfg.get("parallel_stages", True) else 1,
+    )
+    scheduler.add("api_spec", _stage_api_spec,
+                  inputs=["requirements"], outputs=["api_endpoints"])
+    scheduler.add("realtime_spec", _stage_realtime_spec,
+                  inputs=["requirements"], outputs=["realtime_spec"])
+    scheduler.add("data_dictionary", _stage_data_dictionary,
+                  inputs=["requirements"], outputs=["data_dict"])
+    scheduler.add("tech_stack", _stage_tech_stack,
+                  inputs=["requirements", "api_endpoints", "data_dict"], outputs=["tech_stack"])
+    scheduler.add("architecture", _stage_architecture,
+                  inputs=["requirements", "tech_stack", "api_endpoints", "data_dict"], outputs=["arch_spec"])
+    scheduler.add("test_cases", _stage_test_cases,
+                  inputs=["user_stories"], outputs=["test_cases"])
+    await scheduler.run()
 
     # ── Step 8.2: Security & Load Test Generation ──────────────────
     if not dry_run and test_cases and api_endpoints:
@@ -2621,7 +2685,7 @@ async def run_enterprise_mode(
 
             try:
                 # Reuse test_generator if available, otherwise create new
-                if 'test_generator' not in dir():
+                if test_generator is None:
                     test_generator = TestCaseGenerator(
                         model_name=config.get("kilo_agent", {}).get("model", "openai/gpt-4o-mini"),
                         base_url=config.get("kilo_agent", {}).get("base_url", "https://openrouter.ai/api/v1"),
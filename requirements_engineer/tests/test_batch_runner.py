@@ -0,0 +1,153 @@
+"""
+Unit tests for BatchRunner — parallel multi-project pipeline runs.
+
+The worker functions below stand in for run_enterprise_mode; they live at
+module level so spawned worker processes can import them.
+"""
+
+import asyncio
+import os
+import queue as queue_module
+import time
+from types import SimpleNamespace
+from pathlib import Path
+
+import pytest
+
+# Ensure the package is importable
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from requirements_engineer.dashboard.batch_runner import BatchRunner
+from requirements_engineer.dashboard.event_emitter import DashboardEventEmitter, EventType
+
+
+def _quick_worker(project_path, config_path, index, messages, call_limit):
+    started = time.time()
+    messages.put(("event", index, EventType.PIPELINE_PROGRESS.value,
+                  {"step": 1, "total": 15, "description": "Working", "cost_usd": 0.25,
+                   "call_limit": call_limit}))
+    time.sleep(1.5)
+    messages.put(("event", index, EventType.LOG_INFO.value,
+                  {"message": "interval", "started": started, "ended": time.time()}))
+    messages.put(("done", index, f"/out/{Path(project_path).stem}", 0.5))
+
+
+def _costly_worker(project_path, config_path, index, messages, call_limit):
+    messages.put(("event", index, EventType.PIPELINE_PROGRESS.value,
+                  {"step": 3, "total": 15, "description": "Spending", "cost_usd": 1.0}))
+    time.sleep(30)
+    messages.put(("done", index, None, 1.0))
+
+
+def _crashing_worker(project_path, config_path, index, messages, call_limit):
+    os._exit(3)
+
+
+def _exiting_worker(project_path, config_path, index, messages, call_limit):
+    messages.put(("done", index, f"/out/{Path(project_path).stem}", 0.1))
+
+
+class _LateQueue:
+    """Queue whose "done" messages show up one poll late, after the worker exited."""
+
+    def __init__(self, queue):
+        self._queue = queue
+        self._held = []
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def get(self, timeout=None):
+        if self._held:
+            return self._held.pop(0)
+        item = self._queue.get(timeout=timeout)
+        if item[0] == "done":
+            self._held.append(item)
+            time.sleep(1)  # the worker exits right after sending it
+            raise queue_module.Empty
+        return item
+
+
+def _run(coro):
+    # Private loop: leaves the thread's current event loop alone for other tests
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _collect(emitter):
+    events = []
+    emitter.add_callback(lambda event: events.append(event))
+    return events
+
+
+def _projects(n):
+    return [{"project_path": f"/specs/project_{i}.json", "config_path": "re_config.yaml"} for i in range(n)]
+
+
+class TestBatchRunner:
+    def test_runs_projects_in_parallel(self):
+        emitter = DashboardEventEmitter()
+        events = _collect(emitter)
+        runner = BatchRunner(emitter, max_workers=2, max_llm_calls=8, worker=_quick_worker)
+
+        results = _run(runner.run(_projects(3)))
+
+        assert [r["project"] for r in results] == ["project_0", "project_1", "project_2"]
+        assert all(r["status"] == "complete" for r in results)
+        assert results[1]["output_dir"] == "/out/project_1"
+        assert runner.total_cost == pytest.approx(1.5)
+
+        progress = [e.data for e in events if e.type == EventType.PIPELINE_PROGRESS and e.data["step"] == 1]
+        assert sorted(d["project_index"] for d in progress) == [1, 2, 3]
+        assert all(d["project_total"] == 3 for d in progress)
+        assert all(d["call_limit"] == 4 for d in progress)
+
+        intervals = {e.data["project_index"]: e.data for e in events if e.type == EventType.LOG_INFO}
+        first, second = intervals[1], intervals[2]
+        assert first["started"] < second["ended"] and second["started"] < first["ended"]
+
+    def test_cost_budget_stops_batch(self):
+        emitter = DashboardEventEmitter()
+        events = _collect(emitter)
+        runner = BatchRunner(emitter, max_workers=2, cost_budget_usd=1.5, worker=_costly_worker)
+
+        started = time.time()
+        results = _run(runner.run(_projects(3)))
+
+        assert time.time() - started < 20, "Running workers should be terminated"
+        assert [r["status"] for r in results] == ["budget_exceeded", "budget_exceeded", "skipped"]
+        assert any(e.type == EventType.PIPELINE_ERROR and "Cost budget" in e.data["error"] for e in events)
+
+    def test_crashed_worker_reported(self):
+        emitter = DashboardEventEmitter()
+        events = _collect(emitter)
+        runner = BatchRunner(emitter, max_workers=2, worker=_crashing_worker)
+
+        results = _run(runner.run(_projects(2)))
+
+        assert all(r["status"] == "error" for r in results)
+        assert "code 3" in results[0]["error"]
+        assert sum(e.type == EventType.PIPELINE_ERROR for e in events) == 2
+
+    def test_exit_after_last_message_is_not_an_error(self):
+        emitter = DashboardEventEmitter()
+        events = _collect(emitter)
+        runner = BatchRunner(emitter, max_workers=2, worker=_exiting_worker)
+        ctx = runner._ctx
+        runner._ctx = SimpleNamespace(Queue=lambda: _LateQueue(ctx.Queue()), Process=ctx.Process)
+
+        results = _run(runner.run(_projects(2)))
+
+        assert [r["status"] for r in results] == ["complete", "complete"]
+        assert results[0]["output_dir"] == "/out/project_0"
+        assert not any(e.type == EventType.PIPELINE_ERROR for e in events)
+
+    def test_worker_call_limit(self):
+        emitter = DashboardEventEmitter()
+        assert BatchRunner(emitter, max_workers=3).worker_call_limit is None
+        assert BatchRunner(emitter, max_workers=3, max_llm_calls=10).worker_call_limit == 3
+        assert BatchRunner(emitter, max_workers=4, max_llm_calls=2).worker_call_limit == 1
@@ -0,0 +1,108 @@
+"""
+Unit tests for ProjectListing — cached project summaries for /api/projects.
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Ensure the package is importable
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from requirements_engineer.dashboard import project_listing
+from requirements_engineer.dashboard.project_listing import (
+    LISTING_CACHE_FILE,
+    ProjectListing,
+)
+
+
+def _make_project(root: Path, name: str, nodes: int = 2, diagrams: int = 1) -> Path:
+    project = root / name
+    project.mkdir()
+    journal = {"nodes": {f"node-{i}": {} for i in range(nodes)}}
+    (project / "journal.json").write_text(json.dumps(journal), encoding="utf-8")
+    (project / "diagrams").mkdir()
+    for i in range(diagrams):
+        (project / "diagrams" / f"D{i}.mmd").write_text("graph TD", encoding="utf-8")
+    return project
+
+
+def _bump_mtime(path: Path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    _make_project(tmp_path, "Alpha_20240101_120000")
+    _make_project(tmp_path, "Beta_20240202_120000", nodes=5, diagrams=3)
+    (tmp_path / "empty_project").mkdir()
+    return tmp_path
+
+
+class TestProjectListing:
+    def test_lists_non_empty_projects_newest_first(self, output_dir):
+        projects = ProjectListing(output_dir).list_projects()
+        assert [p["id"] for p in projects] == ["Beta_20240202_120000", "Alpha_20240101_120000"]
+        beta = projects[0]
+        assert beta["name"] == "Beta"
+        assert beta["created"] == "20240202_120000"
+        assert beta["node_count"] == 5
+        assert beta["diagram_count"] == 3
+        assert beta["format"] == "journal"
+        assert not beta["has_tests"]
+
+    def test_unchanged_projects_not_rescanned(self, output_dir):
+        listing = ProjectListing(output_dir)
+        listing.list_projects()
+        with patch.object(project_listing, "summarize_project") as summarize:
+            listing.list_projects()
+        summarize.assert_not_called()
+
+    def test_changed_journal_rescanned(self, output_dir):
+        listing = ProjectListing(output_dir)
+        listing.list_projects()
+        journal = output_dir / "Alpha_20240101_120000" / "journal.json"
+        journal.write_text(json.dumps({"nodes": {"a": {}, "b": {}, "c": {}}}), encoding="utf-8")
+        _bump_mtime(journal)
+        alpha = [p for p in listing.list_projects() if p["id"].startswith("Alpha")][0]
+        assert alpha["node_count"] == 3
+
+    def test_added_and_removed_projects(self, output_dir):
+        listing = ProjectListing(output_dir)
+        listing.list_projects()
+        _make_project(output_dir, "Gamma_20240303_120000")
+        (output_dir / "Alpha_20240101_120000" / "journal.json").unlink()
+        for f in (output_dir / "Alpha_20240101_120000" / "diagrams").iterdir():
+            f.unlink()
+        ids = [p["id"] for p in listing.list_projects()]
+        assert ids == ["Gamma_20240303_120000", "Beta_20240202_120000"]
+
+    def test_cache_persisted_across_instances(self, output_dir):
+        ProjectListing(output_dir).list_projects()
+        assert (output_dir / LISTING_CACHE_FILE).exists()
+        with patch.object(project_listing, "summarize_project") as summarize:
+            projects = ProjectListing(output_dir).list_projects()
+        summarize.assert_not_called()
+        assert len(projects) == 2
+
+    def test_missing_output_dir(self, tmp_path):
+        assert ProjectListing(tmp_path / "nope").list_projects() == []
+
+    def test_invalidate_forces_rescan(self, output_dir):
+        listing = ProjectListing(output_dir)
+        listing.list_projects()
+        journal = output_dir / "Alpha_20240101_120000" / "journal.json"
+        st = journal.stat()
+        journal.write_text(json.dumps({"nodes": {"a": {}}}), encoding="utf-8")
+        # same mtime: the stamp alone cannot see this write
+        os.utime(journal, ns=(st.st_atime_ns, st.st_mtime_ns))
+        alpha = [p for p in listing.list_projects() if p["id"].startswith("Alpha")][0]
+        assert alpha["node_count"] == 2
+        listing.invalidate("Alpha_20240101_120000")
+        alpha = [p for p in listing.list_projects() if p["id"].startswith("Alpha")][0]
+        assert alpha["node_count"] == 1
@@ -298,6 +298,203 @@ def test_journal_tree_methods():
     return True
 
 
+def test_llm_executor_bounded_and_ordered():
+    """Test LLMExecutor: results in input order, concurrency bounded."""
+    import asyncio
+    import random
+    from requirements_engineer.core.llm_concurrency import LLMExecutor
+    print("Test 11: LLM Executor Bounded Concurrency...")
+
+    async def run():
+        executor = LLMExecutor(max_concurrent_calls=3)
+        state = {"running": 0, "peak": 0}
+
+        async def call(i):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(random.uniform(0, 0.01))
+            state["running"] -= 1
+            return i * 2
+
+        results = await executor.map(call, range(20))
+        return results, state["peak"]
+
+    results, peak = asyncio.run(run())
+    assert results == [i * 2 for i in range(20)], "Results should keep input order"
+    assert peak == 3, f"Peak concurrency should be 3, got {peak}"
+
+    print(f"  [OK] 20 calls, peak concurrency {peak}, order preserved")
+    return True
+
+
+def test_llm_executor_settings():
+    """Test per-model concurrency settings and shared executors."""
+    import asyncio
+    from requirements_engineer.core.llm_concurrency import concurrency_settings, get_llm_executor
+    print("Test 12: LLM Executor Settings...")
+
+    config = {"performance": {"llm_concurrency": {
+        "max_concurrent_calls": 5,
+        "models": {"fast-model": {"max_concurrent_calls": 10, "requests_per_minute": 600}},
+    }}}
+    assert concurrency_settings(config, "other") == {"max_concurrent_calls": 5, "requests_per_minute": 0}
+    assert concurrency_settings(config, "fast-model") == {"max_concurrent_calls": 10, "requests_per_minute": 600}
+    assert concurrency_settings(None, "x")["max_concurrent_calls"] == 4
+
+    from requirements_engineer.core.llm_concurrency import set_call_limit
+    set_call_limit(3)
+    try:
+        assert concurrency_settings(config, "fast-model")["max_concurrent_calls"] == 3
+        assert concurrency_settings(None, "x")["max_concurrent_calls"] == 3
+    finally:
+        set_call_limit(None)
+    assert concurrency_settings(config, "fast-model")["max_concurrent_calls"] == 10
+
+    async def run():
+        a = get_llm_executor(config, "fast-model")
+        b = get_llm_executor(config, "fast-model")
+        c = get_llm_executor(config, "other")
+        return a is b, a is c
+
+    same, shared_with_other = asyncio.run(run())
+    assert same, "Same model should share one executor"
+    assert not shared_with_other, "Different models should not share an executor"
+
+    print("  [OK] Per-model settings and shared executors")
+    return True
+
+
+def test_concurrent_task_ids_deterministic():
+    """Test that concurrently generated tasks get IDs in feature order."""
+    import asyncio
+    import json
+    import random
+    from types import SimpleNamespace
+    from unittest.mock import patch
+    from requirements_engineer.generators.task_generator import TaskGenerator
+    print("Test 13: Deterministic Concurrent Task IDs...")
+
+    class FakeCompletions:
+        async def create(self, model, messages, temperature, max_tokens):
+            await asyncio.sleep(random.uniform(0, 0.01))
+            content = json.dumps({"tasks": [{"title": "First"}, {"title": "Second"}]})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    # No real client (needs OPENROUTER_API_KEY) and no llm_costs.jsonl in the cwd
+    with patch("requirements_engineer.generators.task_generator.AsyncOpenAI"), \
+            patch("requirements_engineer.generators.task_generator.log_llm_call"):
+        gen = TaskGenerator(config={"performance": {"llm_concurrency": {"max_concurrent_calls": 8}}})
+        gen.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+        features = [{"id": f"FEAT-{i:03d}", "name": f"Feature {i}"} for i in range(1, 11)]
+
+        breakdown = asyncio.run(gen.generate_all_tasks(features))
+    ids = [t.id for t in breakdown.tasks]
+    assert ids == [f"TASK-{n:03d}" for n in range(1, 21)], f"IDs out of order: {ids}"
+    assert list(breakdown.features) == [f["id"] for f in features], "Features should keep input order"
+
+    print(f"  [OK] {len(ids)} tasks with sequential IDs in feature order")
+    return True
+
+
+def test_stage_scheduler_dependencies():
+    """Test StageScheduler: independent stages overlap, dependents wait."""
+    import asyncio
+    from requirements_engineer.core.llm_logger import current_stage
+    from requirements_engineer.core.stage_scheduler import StageScheduler
+    print("Test 14: Stage Scheduler Dependencies...")
+
+    events = []
+    state = {"running": 0, "peak": 0}
+
+    def stage(name, delay):
+        async def run():
+            events.append(("start", name, current_stage.get()))
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(delay)
+            state["running"] -= 1
+            events.append(("end", name, current_stage.get()))
+        return run
+
+    scheduler = StageScheduler(available=["requirements", "user_stories"])
+    scheduler.add("api_spec", stage("api_spec", 0.02), inputs=["requirements"], outputs=["api_endpoints"])
+    scheduler.add("data_dictionary", stage("data_dictionary", 0.01), inputs=["requirements"], outputs=["data_dict"])
+    scheduler.add("tech_stack", stage("tech_stack", 0), inputs=["api_endpoints", "data_dict"], outputs=["tech_stack"])
+    scheduler.add("test_cases", stage("test_cases", 0.01), inputs=["user_stories"], outputs=["test_cases"])
+    asyncio.run(scheduler.run())
+
+    position = {(kind, name): i for i, (kind, name, _) in enumerate(events)}
+    assert position[("start", "tech_stack")] > position[("end", "api_spec")], "tech_stack must wait for api_spec"
+    assert position[("start", "tech_stack")] > position[("end", "data_dictionary")], "tech_stack must wait for data_dictionary"
+    assert state["peak"] == 3, f"Independent stages should overlap, peak was {state['peak']}"
+    assert all(name == tag for _, name, tag in events), "Each stage should run with its own stage tag"
+
+    sequential = StageScheduler(available=["requirements", "user_stories"], max_parallel=1)
+    events.clear()
+    state["peak"] = 0
+    sequential.add("api_spec", stage("api_spec", 0), inputs=["requirements"], outputs=["api_endpoints"])
+    sequential.add("test_cases", stage("test_cases", 0), inputs=["user_stories"], outputs=["test_cases"])
+    asyncio.run(sequential.run())
+    assert [name for kind, name, _ in events if kind == "start"] == ["api_spec", "test_cases"]
+    assert state["peak"] == 1, "max_parallel=1 should run stages one at a time"
+
+    print("  [OK] Dependencies respected, independent stages overlapped")
+    return True
+
+
+def test_stage_scheduler_errors():
+    """Test StageScheduler: bad graphs rejected, stage errors propagate."""
+    import asyncio
+    from requirements_engineer.core.stage_scheduler import StageScheduler
+    print("Test 15: Stage Scheduler Errors...")
+
+    async def noop():
+        pass
+
+    scheduler = StageScheduler(available=["requirements"])
+    scheduler.add("tech_stack", noop, inputs=["api_endpoints"], outputs=["tech_stack"])
+    try:
+        scheduler.order()
+        assert False, "Unknown input should be rejected"
+    except ValueError:
+        pass
+
+    scheduler = StageScheduler()
+    scheduler.add("a", noop, inputs=["y"], outputs=["x"])
+    scheduler.add("b", noop, inputs=["x"], outputs=["y"])
+    try:
+        scheduler.order()
+        assert False, "Cycle should be rejected"
+    except ValueError:
+        pass
+
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def failing():
+        raise RuntimeError("stage failed")
+
+    scheduler = StageScheduler(available=["requirements"])
+    scheduler.add("slow", slow, inputs=["requirements"], outputs=["a"])
+    scheduler.add("failing", failing, inputs=["requirements"], outputs=["b"])
+    scheduler.add("after", noop, inputs=["b"], outputs=["c"])
+    try:
+        asyncio.run(scheduler.run())
+        assert False, "Stage error should propagate"
+    except RuntimeError as e:
+        assert str(e) == "stage failed"
+    assert cancelled == ["slow"], "Running stages should be cancelled on error"
+
+    print("  [OK] Unknown inputs, cycles and stage errors handled")
+    return True
+
+
 def run_all_tests():
     """Run all unit tests."""
     print("\n" + "="*60)
@@ -315,6 +512,11 @@ def run_all_tests():
         test_diagnosis,
         test_mermaid_validation,
         test_journal_tree_methods,
+        test_llm_executor_bounded_and_ordered,
+        test_llm_executor_settings,
+        test_concurrent_task_ids_deterministic,
+        test_stage_scheduler_dependencies,
+        test_stage_scheduler_errors,
     ]
 
     passed = 0
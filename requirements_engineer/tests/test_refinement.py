@@ -12,6 +12,7 @@ Tests cover:
 import asyncio
 import json
 import os
+import re
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -43,7 +44,10 @@ from requirements_engineer.refinement.gap_classifier import (
 )
 from requirements_engineer.refinement.generator_invoker import (
     GeneratorInvoker,
+    _conflict_waves,
     _estimate_cost,
+    _gaps_overlap,
+    _generators_conflict,
 )
 from requirements_engineer.refinement.refinement_report import (
     generate_dry_run_report,
@@ -532,6 +536,114 @@ class TestCompletenessChecker:
         assert report.overall_score > 0.5
 
 
+def _signature(report):
+    return [
+        (rr.rule_id, rr.current_value, rr.score, rr.passed,
+         [(g.gap_id, g.title, tuple(g.affected_ids)) for g in rr.gaps])
+        for rr in report.rule_results
+    ]
+
+
+class TestIncrementalCompleteness:
+    def _bundle(self):
+        return _make_bundle(
+            requirements=[
+                _make_req("REQ-001", title="User Login", desc="Login with password"),
+                _make_req("REQ-002", title="Payment Checkout", desc="Pay for an order"),
+                _make_req("REQ-003", title="Reporting", desc="Monthly reports"),
+            ],
+            user_stories=[_make_story("US-001", parent_req="REQ-001"),
+                          _make_story("US-002", parent_req="REQ-002")],
+            test_cases=[_make_test_case("TC-001", parent_story="US-001")],
+            api_endpoints=[_make_endpoint("POST", "/api/login", summary="User login"),
+                           _make_endpoint("POST", "/api/invoices", summary="Create invoice")],
+            entities={"Invoice": _make_entity("Invoice"),
+                      "Order": _make_entity("Order", fields=[{"name": "status"}])},
+            screens=[_make_screen("SCR-001", parent_story="US-001", components=["LoginForm"])],
+            epics=[_make_epic("EPIC-001", title="User Login Security")],
+            user_flows=[_make_flow("Checkout Flow")],
+        )
+
+    def test_incremental_matches_full_recheck(self):
+        """Incremental checks should equal full checks after every kind of change."""
+        bundle = self._bundle()
+        checker = CompletenessChecker()
+        checker.check_all(bundle)
+
+        def mutate_steps():
+            # Added items
+            bundle.user_stories.append(_make_story("US-003", parent_req="REQ-003"))
+            bundle.state_machines.append(_make_state_machine("Order"))
+            yield
+            # In-place edits, marked via touch()
+            req = bundle.requirements[1]
+            req.description += " [Entity: Invoice]"
+            bundle.touch("requirements", req)
+            tc = bundle.test_cases[0]
+            tc.title = "Test user login endpoint"
+            bundle.touch("test_cases", tc)
+            screen = bundle.screens[0]
+            screen.linked_user_stories = ["US-002"]
+            bundle.touch("screens", screen)
+            yield
+            # Removed items (the test that covered the login endpoint)
+            bundle.test_cases.pop()
+            bundle.user_flows.append(_make_flow("User Login Security Flow"))
+            yield
+            # A witness that stops matching
+            flow = bundle.user_flows[-1]
+            flow.name = flow.title = "Unrelated"
+            flow.description = "Nothing"
+            bundle.touch("user_flows", flow)
+            yield
+
+        for _ in mutate_steps():
+            incremental = checker.check_all(bundle, incremental=True)
+            full = CompletenessChecker().check_all(bundle)
+            assert _signature(incremental) == _signature(full)
+
+        scores = {rr.rule_id: rr for rr in incremental.rule_results}
+        assert scores["entity_to_req"].passed
+        assert not scores["flow_coverage"].passed
+        assert not scores["story_to_test"].passed
+
+    def test_untouched_edit_needs_full_recheck(self):
+        """In-place edits without touch() are only seen by a full re-check."""
+        bundle = self._bundle()
+        checker = CompletenessChecker()
+        checker.check_all(bundle)
+
+        bundle.requirements[1].description += " [Entity: Invoice]"
+        stale = checker.check_all(bundle, incremental=True)
+        full = checker.check_all(bundle)
+        rule = lambda report: next(r for r in report.rule_results if r.rule_id == "entity_to_req")
+        assert not rule(stale).passed
+        assert rule(full).passed
+
+    def test_loop_verification_uses_full_recheck(self, caplog):
+        """verify_incremental_check should log divergence and return the full report."""
+        from requirements_engineer.refinement.refinement_loop import RefinementLoop
+
+        bundle = self._bundle()
+        checker = CompletenessChecker()
+        checker.check_all(bundle)
+        bundle.requirements[1].description += " [Entity: Invoice]"  # not touched
+        stale = checker.check_all(bundle, incremental=True)
+
+        loop = RefinementLoop({"verify_incremental_check": True})
+        with caplog.at_level("WARNING"):
+            verified = loop._verify_report(stale, bundle)
+        assert "diverged" in caplog.text
+        assert verified.overall_score > stale.overall_score
+
+    def test_touch_is_consumed_by_check(self):
+        bundle = self._bundle()
+        bundle.touch("requirements", bundle.requirements[0])
+        assert bundle.touched == {"requirements": {id(bundle.requirements[0])}}
+        CompletenessChecker().check_all(bundle)
+        assert bundle.touched == {}
+
+
 # ============================================================================
 # GapClassifier Tests
 # ============================================================================
@@ -1282,6 +1394,538 @@ class TestSemanticMatcher:
         assert invoker.matcher_stats() is None
 
 
+# ============================================================================
+# Embedding Store + Local Embeddings Tests
+# ============================================================================
+
+class TestEmbeddingStore:
+    """Tests for the persistent embedding store and the offline backend."""
+
+    def test_store_roundtrip_and_reopen(self, tmp_path):
+        """Stored vectors should survive a new store instance (new run)."""
+        from requirements_engineer.memory.embedding_store import EmbeddingStore
+        import numpy as np
+
+        store = EmbeddingStore(tmp_path, "text-embedding-3-small")
+        assert store.put_many(["k1", "k2"], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]) == 2
+        assert store.put_many(["k2", "k3"], [[9.0, 9.0, 9.0], [0.0, 0.0, 1.0]]) == 1
+
+        reopened = EmbeddingStore(tmp_path, "text-embedding-3-small")
+        assert len(reopened) == 3
+        found = reopened.get_many(["k1", "k2", "k3", "missing"])
+        assert set(found) == {"k1", "k2", "k3"}
+        np.testing.assert_allclose(found["k2"], [0.0, 1.0, 0.0])  # first write wins
+        np.testing.assert_allclose(found["k3"], [0.0, 0.0, 1.0])
+
+    def test_store_keyed_by_model(self, tmp_path):
+        """Vectors of one model should not be returned for another."""
+        from requirements_engineer.memory.embedding_store import EmbeddingStore
+
+        EmbeddingStore(tmp_path, "model-a").put_many(["k1"], [[1.0, 2.0]])
+        assert EmbeddingStore(tmp_path, "model-b").get_many(["k1"]) == {}
+
+    def test_store_sees_appends_from_other_instance(self, tmp_path):
+        """An open store should pick up rows appended by another writer."""
+        from requirements_engineer.memory.embedding_store import EmbeddingStore
+
+        reader = EmbeddingStore(tmp_path, "m")
+        writer = EmbeddingStore(tmp_path, "m")
+        writer.put_many(["k1"], [[1.0, 2.0]])
+        assert reader.get_many(["k1"])["k1"].tolist() == [1.0, 2.0]
+        writer.put_many(["k2"], [[3.0, 4.0]])
+        assert reader.get_many(["k2"])["k2"].tolist() == [3.0, 4.0]
+
+    def test_store_rejects_dimension_change(self, tmp_path):
+        from requirements_engineer.memory.embedding_store import EmbeddingStore
+
+        store = EmbeddingStore(tmp_path, "m")
+        store.put_many(["k1"], [[1.0, 2.0]])
+        with pytest.raises(ValueError):
+            store.put_many(["k2"], [[1.0, 2.0, 3.0]])
+
+    def test_store_truncates_orphan_rows(self, tmp_path):
+        """Rows written without keys (interrupted write) should be overwritten."""
+        from requirements_engineer.memory.embedding_store import EmbeddingStore
+
+        store = EmbeddingStore(tmp_path, "m")
+        store.put_many(["k1"], [[1.0, 2.0]])
+        with open(store.vectors_path, "ab") as f:
+            f.write(b"\x00" * 8)  # one orphan 2-d float32 row
+        store.put_many(["k2"], [[3.0, 4.0]])
+        found = EmbeddingStore(tmp_path, "m").get_many(["k1", "k2"])
+        assert found["k2"].tolist() == [3.0, 4.0]
+
+    def test_store_truncates_partial_key_line(self, tmp_path):
+        """A key line cut off by an interrupted write must not prefix the next key."""
+        from requirements_engineer.memory.embedding_store import EmbeddingStore
+
+        store = EmbeddingStore(tmp_path, "m")
+        store.put_many(["k1"], [[1.0, 2.0]])
+        with open(store.vectors_path, "ab") as f:
+            f.write(b"\x00" * 8)
+        with open(store.keys_path, "a", encoding="utf-8") as f:
+            f.write("k9")  # no newline: the write stopped mid-line
+        store.put_many(["k2"], [[3.0, 4.0]])
+        assert store.keys_path.read_text(encoding="utf-8") == "k1\nk2\n"
+        found = EmbeddingStore(tmp_path, "m").get_many(["k1", "k2"])
+        assert found["k2"].tolist() == [3.0, 4.0]
+
+    def test_hashing_embedder_deterministic_and_lexical(self):
+        """Local embeddings should be stable and reflect word overlap."""
+        from requirements_engineer.memory.local_embeddings import HashingEmbedder
+        import numpy as np
+
+        embedder = HashingEmbedder(dim=256)
+        vecs = asyncio.run(embedder.embed([
+            "User login with password",
+            "Password based login for users",
+            "Invoice payment processing",
+        ]))
+        again = asyncio.run(embedder.embed(["User login with password"]))
+        assert vecs[0] == again[0]
+        a, b, c = (np.array(v) for v in vecs)
+        assert abs(np.linalg.norm(a) - 1.0) < 1e-5
+        assert a @ b > a @ c
+
+    def test_matcher_uses_store_across_instances(self, tmp_path):
+        """A second matcher should read vectors from the store, not re-embed."""
+        from requirements_engineer.memory.local_embeddings import HashingEmbedder
+        from requirements_engineer.memory.semantic_matcher import SemanticMatcher
+
+        backend = HashingEmbedder(dim=64)
+        items = [("REQ-001", "User authentication and login"),
+                 ("REQ-002", "Payment processing and billing")]
+
+        first = SemanticMatcher(backend=backend, store_dir=str(tmp_path))
+        assert first.available
+        asyncio.run(first.build_index(items))
+
+        second = SemanticMatcher(backend=MagicMock(model=backend.model, embed=AsyncMock()),
+                                 store_dir=str(tmp_path))
+        asyncio.run(second.build_index(items))
+        second.backend.embed.assert_not_called()
+        assert second.stats()["store_hits"] == 2
+
+        second.backend = backend
+        results = asyncio.run(second.find_similar("login", top_k=1))
+        assert results[0][0] == "REQ-001"
+
+    def test_find_similar_with_warm_store_query(self, tmp_path):
+        """Query vectors read back from the store (numpy rows) must be usable."""
+        from requirements_engineer.memory.local_embeddings import HashingEmbedder
+        from requirements_engineer.memory.semantic_matcher import SemanticMatcher
+
+        backend = HashingEmbedder(dim=64)
+        items = [("REQ-001", "User authentication and login"),
+                 ("REQ-002", "Payment processing and billing")]
+
+        first = SemanticMatcher(backend=backend, store_dir=str(tmp_path))
+        asyncio.run(first.build_index(items))
+        expected = asyncio.run(first.find_similar("login", top_k=1))
+        assert expected[0][0] == "REQ-001"
+
+        second = SemanticMatcher(backend=MagicMock(model=backend.model, embed=AsyncMock()),
+                                 store_dir=str(tmp_path))
+        asyncio.run(second.build_index(items))
+        for _ in range(2):  # store hit, then in-memory cache hit
+            results = asyncio.run(second.find_similar("login", top_k=1))
+            assert results[0][0] == "REQ-001"
+            assert results[0][1] == pytest.approx(expected[0][1], rel=1e-5)
+        second.backend.embed.assert_not_called()
+        assert second.stats()["store_hits"] == 3
+
+    def test_invoker_local_backend(self, tmp_path):
+        """embedding_backend=local should enable matching without an API key."""
+        invoker = GeneratorInvoker({"rag": {"embedding_backend": "local",
+                                            "embedding_store": str(tmp_path)}})
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("OPENAI_API_KEY", None)
+            assert asyncio.run(invoker._ensure_matcher()) is True
+        assert invoker._matcher.model.startswith("local-hashing")
+        assert invoker._matcher.store is not None
+
+
+# ============================================================================
+# Batched Similarity / ANN Tests
+# ============================================================================
+
+def _clustered_vectors(n_items, n_queries, dim=16, n_centers=40, seed=7):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_centers, dim))
+    items = centers[rng.integers(0, n_centers, n_items)] + 0.3 * rng.normal(size=(n_items, dim))
+    queries = centers[rng.integers(0, n_centers, n_queries)] + 0.3 * rng.normal(size=(n_queries, dim))
+    return items, queries
+
+
+def _matcher_over(items, queries, **kwargs):
+    from requirements_engineer.memory.semantic_matcher import SemanticMatcher
+
+    table = {f"item {i}": v.tolist() for i, v in enumerate(items)}
+    table.update({f"query {i}": v.tolist() for i, v in enumerate(queries)})
+    calls = []
+
+    async def mock_embed(texts):
+        calls.append(list(texts))
+        return [table[t] for t in texts]
+
+    matcher = SemanticMatcher(api_key="test-key", **kwargs)
+    matcher.embed_batch = mock_embed
+    asyncio.run(matcher.build_index([(f"ID-{i}", f"item {i}") for i in range(len(items))]))
+    calls.clear()
+    return matcher, calls
+
+
+class TestSemanticBatchQueries:
+    """Tests for find_similar_batch, the IVF index and invoker prefetching."""
+
+    def test_batch_matches_single_queries(self):
+        """One batched call should give the same results as per-query calls."""
+        items, queries = _clustered_vectors(200, 12)
+        matcher, calls = _matcher_over(items, queries, ann_min_items=0)
+        texts = [f"query {i}" for i in range(len(queries))]
+
+        batch = asyncio.run(matcher.find_similar_batch(texts, top_k=4, threshold=0.2))
+        assert len(calls) == 1 and len(calls[0]) == len(texts)
+
+        for text, results in zip(texts, batch):
+            single = asyncio.run(matcher.find_similar(text, top_k=4, threshold=0.2))
+            assert [r[0] for r in results] == [r[0] for r in single]
+            assert all(score >= 0.2 for _, score in results)
+            assert [s for _, s in results] == sorted((s for _, s in results), reverse=True)
+
+    def test_batch_chunks_score_matrix(self):
+        """Results should not depend on how queries are chunked."""
+        import requirements_engineer.memory.semantic_matcher as sm
+
+        items, queries = _clustered_vectors(100, 9)
+        matcher, _ = _matcher_over(items, queries, ann_min_items=0)
+        texts = [f"query {i}" for i in range(len(queries))]
+        expected = asyncio.run(matcher.find_similar_batch(texts, top_k=3))
+        with patch.object(sm, "MAX_SCORE_ELEMENTS", 250):  # 2 queries per chunk
+            chunked = asyncio.run(matcher.find_similar_batch(texts, top_k=3))
+        assert [[i for i, _ in r] for r in chunked] == [[i for i, _ in r] for r in expected]
+
+    def test_batch_empty_queries_and_index(self):
+        from requirements_engineer.memory.semantic_matcher import SemanticMatcher
+
+        assert asyncio.run(SemanticMatcher(api_key="k").find_similar_batch(["a", "b"])) == [[], []]
+        items, queries = _clustered_vectors(10, 1)
+        matcher, calls = _matcher_over(items, queries, ann_min_items=0)
+        results = asyncio.run(matcher.find_similar_batch(["", "query 0"], top_k=20, threshold=-1.0))
+        assert results[0] == [] and len(results[1]) == 10
+        assert calls == [["query 0"]]
+
+    def test_ivf_index_recall(self):
+        """The IVF index should find (nearly) the same neighbours as an exact scan."""
+        items, queries = _clustered_vectors(2000, 50)
+        texts = [f"query {i}" for i in range(len(queries))]
+        exact, _ = _matcher_over(items, queries, ann_min_items=0)
+        approx, _ = _matcher_over(items, queries, ann_min_items=1000, ann_nprobe=8)
+        assert exact.stats()["ann_lists"] == 0
+        assert approx.stats()["ann_lists"] == 44
+
+        expected = asyncio.run(exact.find_similar_batch(texts, top_k=5))
+        found = asyncio.run(approx.find_similar_batch(texts, top_k=5))
+        overlap = sum(len({i for i, _ in a} & {i for i, _ in b}) for a, b in zip(found, expected))
+        assert overlap / (5 * len(texts)) >= 0.9
+        # Scores of IVF hits are exact cosine scores
+        top_exact = dict(expected[0])
+        for item_id, score in found[0]:
+            if item_id in top_exact:
+                assert score == pytest.approx(top_exact[item_id], abs=1e-5)
+
+    def test_invoker_prefetches_auto_link_queries(self):
+        """apply_auto_link_fixes should resolve all semantic queries in one batch."""
+        invoker = GeneratorInvoker()
+        invoker.api_key = None
+        mock_matcher = MagicMock()
+        mock_matcher.available = True
+        mock_matcher.find_similar_batch = AsyncMock(
+            side_effect=lambda queries, top_k: [[("REQ-001", 0.9)] for _ in queries]
+        )
+        mock_matcher.find_similar = AsyncMock(return_value=[])
+        invoker._matcher = mock_matcher
+        invoker._index_built = True
+
+        endpoints = {}
+        gaps = []
+        for i in range(5):
+            ep = MagicMock()
+            ep.path = f"/api/items/{i}"
+            ep.summary = f"Item endpoint {i}"
+            ep.parent_requirement_id = None
+            endpoints[f"GET /api/items/{i}"] = ep
+            gaps.append(Gap(gap_id=f"GAP-{i}", rule_id="api_to_req",
+                            affected_ids=[f"GET /api/items/{i}"],
+                            fix_strategy=GapFixStrategy.AUTO_LINK))
+        bundle = _make_bundle(requirements=[_make_req("REQ-001", title="Items")],
+                              api_endpoints=list(endpoints.values()))
+        bundle.endpoint_by_key = endpoints
+
+        fixed = asyncio.run(invoker.apply_auto_link_fixes(gaps, bundle))
+
+        assert fixed == 5
+        assert mock_matcher.find_similar_batch.await_count == 1
+        assert len(mock_matcher.find_similar_batch.await_args.args[0]) == 5
+        mock_matcher.find_similar.assert_not_called()
+        assert all(ep.parent_requirement_id == "REQ-001" for ep in endpoints.values())
+
+
+# ============================================================================
+# Backup Store Tests
+# ============================================================================
+
+class TestBackupStore:
+    """Tests for content-addressed iteration backups."""
+
+    def _write(self, root, rel_path, text):
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def test_unchanged_files_stored_once(self, tmp_path):
+        from requirements_engineer.refinement.backup_store import BackupStore
+
+        self._write(tmp_path, "tasks/task_list.json", '{"tasks": []}')
+        self._write(tmp_path, "journal.json", '{"nodes": {}}')
+        store = BackupStore(tmp_path)
+        files = ["tasks/task_list.json", "journal.json", "missing.json"]
+
+        first = store.snapshot(1, files)
+        assert first["stats"] == {"files": 2, "new_blobs": 2, "bytes_written": 26}
+        second = store.snapshot(2, files)
+        assert second["stats"]["new_blobs"] == 0
+
+        self._write(tmp_path, "journal.json", '{"nodes": {"a": 1}}')
+        third = store.snapshot(3, files)
+        assert third["stats"]["new_blobs"] == 1
+        assert store.iterations() == [1, 2, 3]
+        assert len(list((tmp_path / ".backups" / "refinement" / "objects").glob("*/*"))) == 3
+
+    def test_restore_any_iteration(self, tmp_path):
+        from requirements_engineer.refinement.backup_store import BackupStore
+
+        store = BackupStore(tmp_path)
+        for i in (1, 2, 3):
+            self._write(tmp_path, "tasks/task_list.json", f"version {i}")
+            store.snapshot(i, ["tasks/task_list.json"])
+
+        assert store.restore(2) == ["tasks/task_list.json"]
+        assert (tmp_path / "tasks" / "task_list.json").read_text() == "version 2"
+
+        other = tmp_path / "restored"
+        store.restore(1, target_dir=other)
+        assert (other / "tasks" / "task_list.json").read_text() == "version 1"
+
+        sha = store.load_manifest(3)["files"]["tasks/task_list.json"]["sha256"]
+        (store.objects_dir / sha[:2] / sha[2:]).write_text("tampered")
+        with pytest.raises(ValueError):
+            store.restore(3)
+        assert (tmp_path / "tasks" / "task_list.json").read_text() == "version 2"
+
+    def test_gc_removes_unreferenced_blobs(self, tmp_path):
+        from requirements_engineer.refinement.backup_store import BackupStore
+
+        store = BackupStore(tmp_path)
+        self._write(tmp_path, "journal.json", "shared")
+        for i in (1, 2, 3):
+            self._write(tmp_path, "tasks/task_list.json", f"version {i}")
+            store.snapshot(i, ["tasks/task_list.json", "journal.json"])
+
+        assert store.gc()["blobs_removed"] == 0
+        removed = store.gc(keep_iterations=1)
+        assert removed["manifests_removed"] == 2
+        assert removed["blobs_removed"] == 2  # version 1 and 2; "shared" is still referenced
+        assert store.iterations() == [3]
+        store.restore(3, target_dir=tmp_path / "check")
+        assert (tmp_path / "check" / "journal.json").read_text() == "shared"
+
+    def test_loop_backup_uses_store(self, tmp_path):
+        from requirements_engineer.refinement.refinement_loop import RefinementLoop
+
+        self._write(tmp_path, "testing/test_documentation.md", "# Tests")
+        loop = RefinementLoop({"backup_keep_iterations": 2})
+        for i in (1, 2, 3):
+            loop._backup(tmp_path, i)
+        store_dir = tmp_path / ".backups" / "refinement"
+        assert sorted(p.name for p in (store_dir / "iterations").iterdir()) == [
+            "iter_0002.json", "iter_0003.json"]
+        assert not (tmp_path / ".backups" / "iter_1").exists()
+
+
+# ============================================================================
+# Parallel Fix Application Tests
+# ============================================================================
+
+class TestParallelFixes:
+    """Tests for batched, concurrent LLM fixes under a shared budget."""
+
+    def _client(self, links_for, delay=0.0):
+        """Mock client answering each prompt with links_for(prompt); tracks concurrency."""
+        state = {"active": 0, "peak": 0, "prompts": []}
+
+        async def create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            state["prompts"].append(prompt)
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(delay)
+            state["active"] -= 1
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = json.dumps({"links": links_for(prompt)})
+            return response
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        return client, state
+
+    def _task_bundle(self, n):
+        reqs = [_make_req("REQ-001", title="Order Management")]
+        tasks = [_make_task(f"T-{i:03d}") for i in range(n)]
+        gaps = [
+            Gap(gap_id=f"GAP-{i:03d}", rule_id="task_backlinks", affected_ids=[t.id],
+                fix_strategy=GapFixStrategy.AUTO_LINK)
+            for i, t in enumerate(tasks)
+        ]
+        return _make_bundle(requirements=reqs, tasks=tasks), tasks, gaps
+
+    @staticmethod
+    def _task_links(prompt):
+        return [{"task_id": tid, "requirement_id": "REQ-001", "reason": "r"}
+                for tid in sorted(set(re.findall(r"T-\d{3}", prompt)))]
+
+    def test_entity_gaps_share_one_prompt(self):
+        invoker = GeneratorInvoker({"model": "test-model"})
+        names = ["Order", "Invoice", "Customer"]
+        invoker._client, state = self._client(
+            lambda prompt: [{"entity": n, "requirement_id": "REQ-001", "reason": "r"} for n in names]
+        )
+        bundle = _make_bundle(
+            requirements=[_make_req("REQ-001", title="Billing")],
+            entities={n: _make_entity(n) for n in names},
+        )
+        gaps = [
+            Gap(gap_id=f"GAP-{i}", rule_id="entity_to_req", affected_ids=[n],
+                fix_strategy=GapFixStrategy.LLM_EXTEND)
+            for i, n in enumerate(names)
+        ]
+
+        fixed = asyncio.run(invoker.apply_llm_fixes(gaps, bundle))
+
+        assert fixed == 3
+        assert invoker.llm_calls == 1
+        assert all(f"- {n}" in state["prompts"][0] for n in names)
+        assert all(f"[Entity: {n}]" in bundle.req_by_id["REQ-001"].description for n in names)
+
+    def test_link_batches_run_concurrently(self):
+        invoker = GeneratorInvoker({"model": "test-model", "fix_batch_size": 2, "max_parallel_fixes": 4})
+        invoker._client, state = self._client(self._task_links, delay=0.05)
+        bundle, tasks, gaps = self._task_bundle(6)
+
+        fixed = asyncio.run(invoker.apply_auto_link_fixes(gaps, bundle))
+
+        assert fixed == 6
+        assert invoker.llm_calls == 3
+        assert state["peak"] == 3
+        assert all(t.parent_requirement_id == "REQ-001" for t in tasks)
+        assert sum("[LLM]" in log for log in invoker.fix_log) == 6
+
+    def test_budget_holds_under_concurrency(self):
+        invoker = GeneratorInvoker({
+            "model": "test-model", "fix_batch_size": 1, "max_parallel_fixes": 8, "max_llm_calls": 2,
+        })
+        invoker._client, state = self._client(self._task_links, delay=0.05)
+        bundle, tasks, gaps = self._task_bundle(5)
+
+        fixed = asyncio.run(invoker.apply_auto_link_fixes(gaps, bundle))
+
+        # Two LLM calls fit the budget; the other gaps fall back to keywords
+        assert len(state["prompts"]) == 2
+        assert invoker.llm_calls == 2
+        assert invoker.budget_exhausted()
+        assert fixed == 5
+        assert all(t.parent_requirement_id == "REQ-001" for t in tasks)
+
+    def test_conflicting_fixes_in_separate_waves(self):
+        gaps = [
+            Gap(gap_id="G1", rule_id="task_backlinks", affected_ids=["T-1"]),
+            Gap(gap_id="G2", rule_id="task_backlinks", affected_ids=["T-2"]),
+            Gap(gap_id="G3", rule_id="task_backlinks", affected_ids=["T-1"]),
+        ]
+        waves = _conflict_waves(gaps, _gaps_overlap)
+        assert [[g.gap_id for g in wave] for wave in waves] == [["G1", "G2"], ["G3"]]
+
+        order = ["user_story", "test_case", "screen", "state_machine"]
+        waves = _conflict_waves(order, _generators_conflict)
+        # Everything reading user_stories waits for the user story generator
+        assert waves == [["user_story"], ["test_case", "screen", "state_machine"]]
+
+    def test_failed_generators_do_not_count_against_max_calls(self):
+        invoker = GeneratorInvoker({"model": "test-model"})
+        invoker._client = MagicMock()
+        invoker.api_key = "test-key"
+        invoked = []
+
+        async def invoke(gen_name, gaps, bundle):
+            invoked.append(gen_name)
+            if gen_name == "task":
+                raise RuntimeError("boom")
+            return 1
+
+        invoker._invoke_generator = invoke
+        gaps = [
+            Gap(gap_id=f"G{i}", rule_id="r", affected_ids=[f"X-{i}"],
+                fix_strategy=GapFixStrategy.GENERATOR, generator_name=name)
+            for i, name in enumerate(["task", "state_machine", "screen", "user_flow"])
+        ]
+
+        fixed = asyncio.run(invoker.apply_generator_fixes(gaps, _make_bundle(), max_calls=2))
+
+        assert invoked == ["task", "state_machine", "screen"]
+        assert fixed == 2
+        assert any("Generator task failed" in log for log in invoker.fix_log)
+
+    def test_generated_test_case_ids_follow_story_order(self):
+        import random
+
+        class FakeTestCaseGenerator:
+            def __init__(self, **kwargs):
+                self.counter = 0
+
+            async def initialize(self):
+                pass
+
+            async def _request_test_cases(self, story):
+                await asyncio.sleep(random.uniform(0, 0.02))
+                return {"test_cases": [{"title": "a"}, {"title": "b"}]}
+
+            def _build_test_cases(self, story, data):
+                built = []
+                for _ in data["test_cases"]:
+                    self.counter += 1
+                    tc = MagicMock()
+                    tc.id = f"TC-{self.counter:03d}"
+                    tc.story = story.id
+                    built.append(tc)
+                return built
+
+        invoker = GeneratorInvoker({"model": "test-model", "max_parallel_fixes": 8})
+        stories = [_make_story(f"US-{i:03d}") for i in range(1, 7)]
+        bundle = _make_bundle(user_stories=stories, test_cases=[])
+        gap = Gap(gap_id="G1", rule_id="story_to_test", affected_ids=[s.id for s in stories],
+                  fix_strategy=GapFixStrategy.GENERATOR, generator_name="test_case")
+
+        with patch("requirements_engineer.generators.test_case_generator.TestCaseGenerator",
+                   FakeTestCaseGenerator):
+            fixed = asyncio.run(invoker._gen_test_cases([gap], bundle))
+
+        assert fixed == 6
+        assert [tc.id for tc in bundle.test_cases] == [f"TC-{n:03d}" for n in range(1, 13)]
+        assert [tc.story for tc in bundle.test_cases] == [s.id for s in stories for _ in range(2)]
+
+
 # ============================================================================
 # Integration Test (requires real output directory)
 # ============================================================================
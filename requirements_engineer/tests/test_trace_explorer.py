@@ -2,9 +2,11 @@
 Unit tests for TraceIndex — server-side artifact index for the Trace Explorer tab.
 """
 
+import asyncio
 import json
 import os
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -165,10 +167,9 @@ class TestBuild:
 
     def test_build_creates_search_index(self, trace_index):
         """build() should create a search index for all artifacts."""
-        assert len(trace_index._search_idx) == len(trace_index._artifacts)
-        # Search index entries should be lowercase
-        for text in trace_index._search_idx.values():
-            assert text == text.lower()
+        assert len(trace_index._search) == len(trace_index._artifacts)
+        for aid in trace_index._artifacts:
+            assert aid in trace_index._search
 
     def test_build_empty_project_data(self, sample_project):
         """build() should handle empty project_data gracefully."""
@@ -218,7 +219,8 @@ class TestQuery:
         assert result["total"] > 0
         for item in result["items"]:
             # Should match in title or description
-            full_text = trace_index._search_idx.get(item["id"], "")
+            art = trace_index._artifacts[item["id"]]
+            full_text = f"{art.get('title', '')} {art.get('description', '')}".lower()
             assert "auth" in full_text
 
     def test_query_search_no_match(self, trace_index):
@@ -245,6 +247,42 @@ class TestQuery:
             assert "downstream_count" in item
             assert "upstream_count" in item
 
+    def test_query_pages_match_full_sort(self, trace_index):
+        """Paging over the pre-sorted views should equal sorting everything."""
+        for sort_by in ("id", "title", "priority"):
+            for sort_dir in ("asc", "desc"):
+                full = trace_index.query(sort_by=sort_by, sort_dir=sort_dir, page_size=1000)
+                paged = []
+                for page in range(1, full["total"] // 3 + 2):
+                    paged += trace_index.query(
+                        sort_by=sort_by, sort_dir=sort_dir, page=page, page_size=3
+                    )["items"]
+                assert [i["id"] for i in paged] == [i["id"] for i in full["items"]]
+                values = [str(i[sort_by]).lower() for i in full["items"]]
+                assert values == sorted(values, reverse=sort_dir == "desc")
+
+    def test_query_sort_by_link_count(self, trace_index):
+        """Link counts should sort numerically."""
+        result = trace_index.query(sort_by="downstream_count", sort_dir="desc", page_size=1000)
+        counts = [item["downstream_count"] for item in result["items"]]
+        assert counts == sorted(counts, reverse=True)
+
+    def test_query_type_and_filter_total(self, trace_index):
+        """Type, search and filters combine; total counts all matches."""
+        result = trace_index.query(artifact_type="test", search="login", page_size=1)
+        assert result["total"] == 2
+        assert result["total_pages"] == 2
+        assert all(item["type"] == "test" for item in result["items"])
+
+    def test_query_sees_updates(self, trace_index):
+        """update_artifact() should keep sort orders and filters current."""
+        trace_index.update_artifact("TC-003", "title", "AAA first")
+        result = trace_index.query(sort_by="title", page_size=1)
+        assert result["items"][0]["id"] == "TC-003"
+        trace_index.update_artifact("TC-003", "priority", "must")
+        result = trace_index.query(filters={"priority": "must"}, page_size=1000)
+        assert "TC-003" in [item["id"] for item in result["items"]]
+
 
 # ── Detail Tests ──────────────────────────────────────────────────
 
@@ -379,10 +417,9 @@ class TestSearch:
         """search() should find artifacts by title match."""
         results = trace_index.search("Login")
         assert len(results) > 0
-        # Results with title match should have score 2
-        for r in results:
-            if "login" in r.get("title", "").lower():
-                assert r["score"] == 2
+        # Results with title match should rank above description-only matches
+        title_hit = ["login" in r.get("title", "").lower() for r in results]
+        assert title_hit == sorted(title_hit, reverse=True)
 
     def test_search_by_description(self, trace_index):
         """search() should find artifacts by description match."""
@@ -418,6 +455,108 @@ class TestSearch:
             assert "score" in r
 
 
+    def test_search_prefix_match(self, trace_index):
+        """search() should match word prefixes while typing."""
+        ids = {r["id"] for r in trace_index.search("authent")}
+        assert "REQ-001" in ids
+
+    def test_search_infix_match(self, trace_index):
+        """search() should match inside words."""
+        ids = {r["id"] for r in trace_index.search("thentic")}
+        assert "REQ-001" in ids
+
+    def test_search_requires_all_words(self, trace_index):
+        """Every query word must match."""
+        results = trace_index.search("password reset")
+        assert results
+        for r in results:
+            art = trace_index._artifacts[r["id"]]
+            text = f"{art.get('title', '')} {art.get('description', '')}".lower()
+            assert "password" in text and "reset" in text
+
+    def test_search_after_update(self, trace_index):
+        """Edited titles should be searchable immediately."""
+        trace_index.update_artifact("TC-001", "title", "Quokka onboarding")
+        assert [r["id"] for r in trace_index.search("quokka")] == ["TC-001"]
+
+
+class TestSearchIndex:
+    def test_bm25_prefers_title_hits(self):
+        from requirements_engineer.dashboard.search_index import SearchIndex
+        idx = SearchIndex()
+        idx.build([
+            ("A", "Billing export", "Monthly invoices"),
+            ("B", "Reports", "Export of billing data to CSV"),
+        ])
+        assert [d for d, _ in idx.top("billing", 10)] == ["A", "B"]
+
+    def test_exact_beats_prefix(self):
+        from requirements_engineer.dashboard.search_index import SearchIndex
+        idx = SearchIndex()
+        idx.build([("A", "user", ""), ("B", "username", "")])
+        assert [d for d, _ in idx.top("user", 10)] == ["A", "B"]
+
+    def test_remove_and_readd(self):
+        from requirements_engineer.dashboard.search_index import SearchIndex
+        idx = SearchIndex()
+        idx.build([("A", "Alpha gateway", ""), ("B", "Beta gateway", "")])
+        idx.remove("A")
+        assert idx.match("alpha") == set()
+        assert idx.match("gateway") == {"B"}
+        idx.add("B", "Gamma", "")
+        assert idx.match("gateway") == set()
+        assert idx.match("gam") == {"B"}
+        assert len(idx) == 1
+
+    def test_short_token_infix(self):
+        from requirements_engineer.dashboard.search_index import SearchIndex
+        idx = SearchIndex()
+        idx.build([("A", "MongoDB adapter", ""), ("B", "Redis cache", "")])
+        assert idx.match("db") == {"A"}
+        assert [d for d, _ in idx.top("db", 10)] == ["A"]
+
+    def test_match_is_not_capped_by_expansions(self):
+        from requirements_engineer.dashboard.search_index import MAX_EXPANSIONS, SearchIndex
+        idx = SearchIndex()
+        n = MAX_EXPANSIONS * 2
+        idx.build([(f"D{i}", f"report{i:03d}", "") for i in range(n)])
+        assert len(idx.match("report")) == n
+        assert len(idx.top("report", n)) <= MAX_EXPANSIONS
+
+
+class TestArtifactViews:
+    def _views(self, artifacts):
+        from requirements_engineer.dashboard.artifact_views import ArtifactViews
+        return ArtifactViews(artifacts, lambda aid: (0, 0))
+
+    def test_add_remove_keep_order(self):
+        arts = {
+            "B": {"id": "B", "type": "task", "title": "beta", "status": "done"},
+            "A": {"id": "A", "type": "task", "title": "gamma", "status": "open"},
+        }
+        views = self._views(arts)
+        assert views.order("title") == ["B", "A"]
+        arts["C"] = {"id": "C", "type": "task", "title": "alpha", "status": "open"}
+        views.add("C")
+        assert views.order("title", "task") == ["C", "B", "A"]
+        views.remove("B")
+        del arts["B"]
+        assert views.order("title") == ["C", "A"]
+        mask = views.filter_mask("status", "open")
+        assert views.page("id", False, 0, 10, mask=mask) == ["A", "C"]
+
+    def test_field_change_repositions(self):
+        arts = {
+            "A": {"id": "A", "type": "task", "title": "alpha"},
+            "B": {"id": "B", "type": "task", "title": "beta"},
+        }
+        views = self._views(arts)
+        arts["A"]["title"] = "zeta"
+        views.on_field_change("A", "title", "alpha")
+        assert views.order("title") == ["B", "A"]
+        assert views.page("title", True, 0, 1) == ["A"]
+
+
 # ── Update Tests ──────────────────────────────────────────────────
 
 class TestUpdate:
@@ -430,7 +569,7 @@ class TestUpdate:
     def test_update_search_index(self, trace_index):
         """update_artifact() should update the search index."""
         trace_index.update_artifact("TC-001", "title", "UniqueSearchTerm123")
-        assert "uniquesearchterm123" in trace_index._search_idx["TC-001"]
+        assert "TC-001" in trace_index._search.match("uniquesearchterm123")
 
     def test_update_nonexistent(self, trace_index):
         """update_artifact() for missing artifact should return error."""
@@ -762,3 +901,314 @@ class TestCrossLinking:
         idx2 = TraceIndex()
         idx2.build(crosslink_project, crosslink_data)
         assert len(idx2.link_graph.edges) > baseline_edges
+
+
+class TestLinkMatching:
+    """Lookup structures behind _build_cross_links()."""
+
+    def test_aho_corasick_overlapping(self):
+        from requirements_engineer.dashboard.link_matching import AhoCorasick
+        ac = AhoCorasick(["user", "users", "ser", "api/users", ""])
+        assert ac.find_all("get /api/users/{id}") == {0, 1, 2, 3, 4}
+        assert ac.find_all("profile") == {4}
+
+    def test_related_strings_first(self):
+        from requirements_engineer.dashboard.link_matching import RelatedStrings
+        rs = RelatedStrings(["manage profile", "login", "register account"])
+        assert rs.first("profile") == 0          # query inside a string
+        assert rs.first("login with email") == 1  # string inside the query
+        assert rs.first("checkout") is None
+
+    def test_id_finder_matches_linear_scan(self):
+        from requirements_engineer.dashboard.link_matching import IdFinder
+        by_type = {"entity": ["ENT-Order", "ENT-OrderItem", "ENT-User"],
+                   "requirement": ["REQ-001", "REQ-010"]}
+        arts = {aid: {} for ids in by_type.values() for aid in ids}
+        find = IdFinder(arts, by_type).find
+        assert find("entity", "ENT-User") == "ENT-User"
+        assert find("entity", "orderitem") == "ENT-OrderItem"
+        assert find("entity", "ENTITY-Order") == "ENT-Order"
+        assert find("requirement", "01") == "REQ-001"
+        assert find("requirement", "REQ-999") is None
+
+    def test_partial_title_and_flow_matches(self, sample_project):
+        """Task→story and flow→screen/persona partial matches pick the first hit."""
+        data = {
+            "user_stories": [
+                {"id": "US-001", "title": "Manage profile settings"},
+                {"id": "US-002", "title": "Manage profile"},
+            ],
+            "tasks": {"misc": [{"id": "TASK-009", "title": "Implement profile"}]},
+            "screens": [{"id": "SCREEN-001", "name": "Profile Page"}],
+            "personas": [{"id": "PERSONA-001", "name": "Alice Smith", "role": "Admin"}],
+            "user_flows": [{"id": "FLOW-001", "actor": "alice",
+                            "steps": [{"screen": "Profile"}]}],
+        }
+        idx = TraceIndex()
+        idx.build(sample_project, data)
+        edges = idx.link_graph._edge_types
+        assert edges.get(("US-001", "TASK-009")) == "story_task"
+        assert ("US-002", "TASK-009") not in edges
+        assert edges.get(("FLOW-001", "SCREEN-001")) == "flow_screen"
+        assert edges.get(("PERSONA-001", "FLOW-001")) == "flow_persona"
+
+
+class TestIncrementalUpdate:
+    """apply_file_change() re-indexes one file instead of rebuilding."""
+
+    @staticmethod
+    def _edges(idx):
+        return {(s, t) for s, targets in idx.link_graph._adjacency.items() for t in targets}
+
+    def _assert_matches_fresh_build(self, idx, project_dir, data):
+        fresh = TraceIndex()
+        fresh.build(project_dir, data)
+        assert set(idx._artifacts) == set(fresh._artifacts)
+        assert self._edges(idx) == self._edges(fresh)
+        for t, ids in fresh._by_type.items():
+            assert idx._by_type.get(t, []) == ids
+        assert idx.query(page_size=1000) == fresh.query(page_size=1000)
+
+    def test_journal_edit(self, trace_index, sample_project, project_data):
+        journal_path = sample_project / "journal.json"
+        journal = json.loads(journal_path.read_text(encoding="utf-8"))
+        journal["nodes"]["node-REQ-002"]["title"] = "Throttling quotas"
+        journal["nodes"]["node-REQ-003"] = {
+            "requirement_id": "REQ-003", "title": "Audit log", "type": "functional",
+            "dependencies": ["REQ-001"],
+        }
+        journal_path.write_text(json.dumps(journal), encoding="utf-8")
+
+        result = trace_index.apply_file_change("modified", str(journal_path))
+        assert result["handled"]
+        assert "REQ-003" in trace_index._artifacts
+        assert [r["id"] for r in trace_index.search("throttling")] == ["REQ-002"]
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+    def test_journal_node_removed(self, trace_index, sample_project, project_data):
+        journal_path = sample_project / "journal.json"
+        journal = json.loads(journal_path.read_text(encoding="utf-8"))
+        del journal["nodes"]["node-REQ-002"]
+        journal_path.write_text(json.dumps(journal), encoding="utf-8")
+
+        result = trace_index.apply_file_change("modified", str(journal_path))
+        assert "REQ-002" in result["removed_ids"]
+        assert trace_index.query(search="rate limiting")["total"] == 0
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+    def test_diagram_created_and_deleted(self, trace_index, sample_project, project_data):
+        diagram = sample_project / "diagrams" / "REQ-002_sequence.mmd"
+        diagram.write_text("sequenceDiagram\n  A->>B: hi", encoding="utf-8")
+        trace_index.apply_file_change("created", str(diagram))
+        assert trace_index.link_graph.get_link_type(
+            "diagram_REQ-002_sequence", "REQ-002") == "diagram_of"
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+        diagram.unlink()
+        result = trace_index.apply_file_change("deleted", str(diagram))
+        assert result["removed_ids"] == ["diagram_REQ-002_sequence"]
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+    def test_user_stories_markdown(self, trace_index, sample_project, project_data):
+        md = sample_project / "user_stories" / "user_stories.md"
+        md.parent.mkdir()
+        md.write_text(
+            "## EPIC-001: Accounts\n"
+            "**Verknüpfte Requirements:** [REQ-001]\n"
+            "### US-101: Sign up\n"
+            "**Parent Requirement:** REQ-001\n",
+            encoding="utf-8",
+        )
+        trace_index.apply_file_change("created", str(md))
+        assert trace_index._artifacts["US-101"]["type"] == "user-story"
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+        md.write_text("## EPIC-001: Accounts\n", encoding="utf-8")
+        result = trace_index.apply_file_change("modified", str(md))
+        assert result["removed_ids"] == ["US-101"]
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+    def test_server_listener_parses_in_io_pool(self, trace_index, sample_project, project_data):
+        from requirements_engineer.dashboard.server import create_dashboard_server
+
+        server = create_dashboard_server(port=8096, open_browser=False)
+        server._trace_index = trace_index
+        journal_path = sample_project / "journal.json"
+        journal = json.loads(journal_path.read_text(encoding="utf-8"))
+        journal["nodes"]["node-REQ-003"] = {
+            "requirement_id": "REQ-003", "title": "Audit log", "type": "functional",
+        }
+        journal_path.write_text(json.dumps(journal), encoding="utf-8")
+
+        parsed_on = []
+        parse_reload = trace_index.link_graph.parse_reload
+
+        def _parse(pending):
+            parsed_on.append(threading.current_thread().name)
+            parse_reload(pending)
+
+        with patch.object(trace_index.link_graph, "parse_reload", _parse):
+            asyncio.run(server._on_project_file_change("modified", str(journal_path)))
+        server._io_pool.shutdown(wait=True)
+        assert parsed_on and parsed_on[0].startswith("dashboard-io")
+        assert "REQ-003" in trace_index._artifacts
+        self._assert_matches_fresh_build(trace_index, sample_project, project_data)
+
+    def test_unhandled_file(self, trace_index, sample_project):
+        path = sample_project / "api_documentation.md"
+        path.write_text("# API", encoding="utf-8")
+        assert trace_index.apply_file_change("created", str(path))["handled"] is False
+
+    def test_remove_artifact_drops_derived_links(self, trace_index):
+        trace_index.add_edge("TC-001", "API-001", "test_api")
+        assert trace_index.query(filters={"id": "API-001"})["items"][0]["upstream_count"] == 1
+        trace_index.remove_artifact("TC-001")
+        assert "TC-001" not in trace_index._artifacts
+        assert "TC-001" not in trace_index.link_graph._reverse_adjacency.get("API-001", set())
+        assert trace_index.query(filters={"id": "API-001"})["items"][0]["upstream_count"] == 0
+
+
+class TestSnapshot:
+    """Project snapshots for fast reopen."""
+
+    @pytest.fixture(autouse=True)
+    def snapshot_key_dir(self, tmp_path_factory, monkeypatch):
+        # outside sample_project, whose files make up the fingerprint
+        cache_dir = tmp_path_factory.mktemp("cache")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir))
+        return cache_dir
+
+    def test_round_trip(self, trace_index, sample_project, project_data):
+        from requirements_engineer.dashboard.project_snapshot import (
+            load_project_snapshot, project_fingerprint, save_project_snapshot,
+        )
+        fp = project_fingerprint(sample_project)
+        assert save_project_snapshot(sample_project, fp, project_data, trace_index)
+        project, idx = load_project_snapshot(sample_project, project_fingerprint(sample_project))
+        assert project == project_data
+        assert idx.query(page_size=1000) == trace_index.query(page_size=1000)
+        assert idx.search("login") == trace_index.search("login")
+        assert idx.get_trace_chain("REQ-001") == trace_index.get_trace_chain("REQ-001")
+        # the restored index stays updatable
+        idx.update_artifact("TC-001", "title", "AAA first")
+        assert idx.query(sort_by="title", page_size=1)["items"][0]["id"] == "TC-001"
+
+    def test_link_graph_edges_restored(self, trace_index):
+        import pickle
+        graph = trace_index.link_graph
+        restored = pickle.loads(pickle.dumps(graph))
+        assert restored.edges == graph.edges
+        assert restored._edge_set == graph._edge_set
+        assert restored._edge_sources == graph._edge_sources
+        assert restored._adjacency == graph._adjacency
+
+    def test_file_change_invalidates(self, trace_index, sample_project, project_data):
+        from requirements_engineer.dashboard.project_snapshot import (
+            load_project_snapshot, project_fingerprint, save_project_snapshot,
+        )
+        save_project_snapshot(sample_project, project_fingerprint(sample_project),
+                              project_data, trace_index)
+        (sample_project / "diagrams" / "REQ-002_flow.mmd").write_text("graph TD", encoding="utf-8")
+        assert load_project_snapshot(sample_project, project_fingerprint(sample_project)) is None
+
+    def test_corrupt_snapshot_ignored(self, sample_project):
+        from requirements_engineer.dashboard.project_snapshot import (
+            SNAPSHOT_FILE, load_project_snapshot, project_fingerprint,
+        )
+        (sample_project / SNAPSHOT_FILE).write_bytes(b"garbage")
+        assert load_project_snapshot(sample_project, project_fingerprint(sample_project)) is None
+
+    def test_tampered_snapshot_not_unpickled(self, trace_index, sample_project, project_data):
+        from requirements_engineer.dashboard.project_snapshot import (
+            SNAPSHOT_FILE, load_project_snapshot, project_fingerprint, save_project_snapshot,
+        )
+        fp = project_fingerprint(sample_project)
+        assert save_project_snapshot(sample_project, fp, project_data, trace_index)
+        path = sample_project / SNAPSHOT_FILE
+        data = bytearray(path.read_bytes())
+        data[-2] ^= 0xFF
+        path.write_bytes(bytes(data))
+        assert load_project_snapshot(sample_project, project_fingerprint(sample_project)) is None
+
+    def test_foreign_key_rejected(self, trace_index, sample_project, project_data,
+                                  snapshot_key_dir, monkeypatch):
+        from requirements_engineer.dashboard.project_snapshot import (
+            load_project_snapshot, project_fingerprint, save_project_snapshot,
+        )
+        fp = project_fingerprint(sample_project)
+        assert save_project_snapshot(sample_project, fp, project_data, trace_index)
+        # same file, read by another user (different key)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(snapshot_key_dir / "other"))
+        assert load_project_snapshot(sample_project, project_fingerprint(sample_project)) is None
+
+    def test_code_digest_covers_loader_modules(self):
+        from requirements_engineer.dashboard import project_snapshot
+        files = {
+            path.name
+            for code_dir in project_snapshot._CODE_DIRS
+            for path in code_dir.glob("*.py")
+        }
+        assert {"server.py", "markdown_parser.py", "trace_index.py",
+                "link_graph.py", "models.py"} <= files
+
+
+# ── Write Queue Tests ─────────────────────────────────────────────
+
+class TestWriteQueue:
+    """Coalesced write-back of Trace Explorer edits."""
+
+    def test_apply_edits_single_write(self, tmp_path):
+        from requirements_engineer.dashboard.write_queue import apply_edits
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+
+        def set_key(key):
+            def edit(doc):
+                doc[key] = True
+                return doc
+            return edit
+
+        results = apply_edits(path, "json", [set_key("b"), lambda doc: None, set_key("c")])
+        assert results == [True, False, True]
+        assert json.loads(path.read_text(encoding="utf-8")) == {"a": 1, "b": True, "c": True}
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.json"]
+
+    def test_queue_coalesces_edits(self, trace_index, sample_project):
+        from requirements_engineer.dashboard import write_queue
+        queue = write_queue.WriteQueue(max_workers=2)
+        writes = []
+        original = write_queue._write_atomic
+
+        def counting_write(path, fmt, doc):
+            writes.append(path)
+            original(path, fmt, doc)
+
+        with patch.object(write_queue, "_write_atomic", counting_write):
+            # hold the file's first flush so later edits pile up behind it
+            started, gate = threading.Event(), threading.Event()
+
+            def blocking_edit(doc):
+                started.set()
+                gate.wait()
+                return None
+
+            first = queue.submit(sample_project / "journal.json", blocking_edit)
+            assert started.wait(timeout=5)
+            futures = []
+            for i, aid in enumerate(["REQ-001", "REQ-002"] * 5):
+                trace_index.edit_artifact(aid, "title", f"Title {i}")
+                path, fmt, edit = trace_index.write_back_target(aid, "title", f"Title {i}")
+                futures.append(queue.submit(path, edit, fmt))
+            gate.set()
+            assert first.result(timeout=5) is False
+            assert all(f.result(timeout=5) for f in futures)
+            queue.shutdown()
+
+        assert len(writes) == 1
+        nodes = json.loads((sample_project / "journal.json").read_text(encoding="utf-8"))["nodes"]
+        assert nodes["node-REQ-001"]["title"] == "Title 8"
+        assert nodes["node-REQ-002"]["title"] == "Title 9"
+
+    def test_no_write_back_target(self, trace_index):
+        assert trace_index.write_back_target("TC-001", "title", "x") is None
+        assert trace_index.write_back_target("MISSING-999", "title", "x") is None
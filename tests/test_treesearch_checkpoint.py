@@ -0,0 +1,182 @@
+"""Round-trip tests for the append-only treesearch checkpoint."""
+
+import json
+
+from omegaconf import OmegaConf
+
+from ai_scientist.treesearch.agent_manager import AgentManager
+from ai_scientist.treesearch.checkpoint import (
+    IncrementalCheckpoint,
+    _journal_log_name,
+    load_incremental_checkpoint,
+)
+from ai_scientist.treesearch.journal import Journal, Node
+from ai_scientist.treesearch.utils.metric import MetricValue
+
+
+def _two_stage_journals():
+    stage1 = Journal()
+    draft = Node(plan="draft", code="print(1)")
+    stage1.append(draft)
+    child = Node(plan="improve", code="print(2)", parent=draft)
+    stage1.append(child)
+
+    stage2 = Journal()
+    root = Node(plan="next stage", code="print(3)", parent=child)
+    stage2.append(root)
+    return {"1_initial": stage1, "2_baseline": stage2}, draft, child, root
+
+
+def test_round_trip_links_parents_across_journals(tmp_path):
+    journals, draft, child, root = _two_stage_journals()
+    ckpt = IncrementalCheckpoint(tmp_path)
+    assert ckpt.save(journals, {"current_stage": "2_baseline"}) == 3
+
+    state, loaded = load_incremental_checkpoint(tmp_path)
+    assert state == {"current_stage": "2_baseline"}
+    assert list(loaded) == ["1_initial", "2_baseline"]
+
+    stage1, stage2 = loaded["1_initial"], loaded["2_baseline"]
+    assert [n.id for n in stage1.nodes] == [draft.id, child.id]
+    assert [n.id for n in stage2.nodes] == [root.id]
+
+    loaded_child = stage1.nodes[1]
+    loaded_root = stage2.nodes[0]
+    assert loaded_child.parent is stage1.nodes[0]
+    assert loaded_root.parent is loaded_child
+    assert loaded_root in loaded_child.children
+    assert stage2.draft_nodes == []
+
+
+def test_only_new_or_changed_nodes_are_rewritten(tmp_path):
+    journals, draft, child, root = _two_stage_journals()
+    ckpt = IncrementalCheckpoint(tmp_path)
+    ckpt.save(journals, {})
+
+    assert ckpt.save(journals, {}) == 0
+
+    # a new child must not rewrite its parent
+    grandchild = Node(plan="debug", code="print(4)", parent=child)
+    journals["1_initial"].append(grandchild)
+    assert ckpt.save(journals, {}) == 1
+
+    # assigned fields mark the node for the next save
+    child.metric = MetricValue(value=0.5, maximize=True)
+    assert ckpt.save(journals, {}) == 1
+    child.metric = MetricValue(value=0.9, maximize=True)
+    assert ckpt.save(journals, {}) == 1
+    # assigning an equal value does not rewrite the node
+    child.metric = MetricValue(value=0.9, maximize=True)
+    assert ckpt.save(journals, {}) == 0
+    child.analysis = "looks good"
+    assert ckpt.save(journals, {}) == 1
+
+    _, loaded = load_incremental_checkpoint(tmp_path)
+    loaded_child = loaded["1_initial"].nodes[1]
+    assert loaded_child.metric.value == 0.9
+    assert loaded_child.analysis == "looks good"
+    assert [n.id for n in loaded["1_initial"].nodes] == [
+        draft.id,
+        child.id,
+        grandchild.id,
+    ]
+
+
+def test_torn_tail_is_skipped_and_truncated(tmp_path):
+    journals, draft, child, root = _two_stage_journals()
+    IncrementalCheckpoint(tmp_path).save(journals, {})
+
+    log_path = tmp_path / _journal_log_name("1_initial")
+    with open(log_path, "a") as f:
+        f.write('{"id": "torn", "plan": "cut off mid-wr')
+
+    _, loaded = load_incremental_checkpoint(tmp_path)
+    assert [n.id for n in loaded["1_initial"].nodes] == [draft.id, child.id]
+    assert loaded["2_baseline"].nodes[0].parent is loaded["1_initial"].nodes[1]
+
+    # reopening cuts the torn line so the next record starts on a fresh line
+    ckpt = IncrementalCheckpoint(tmp_path)
+    assert log_path.read_text().endswith("\n")
+    fix = Node(plan="fix", code="print(4)", parent=loaded["1_initial"].nodes[1])
+    loaded["1_initial"].append(fix)
+    assert ckpt.save(loaded, {}) == 1
+    _, reloaded = load_incremental_checkpoint(tmp_path)
+    assert [n.id for n in reloaded["1_initial"].nodes] == [draft.id, child.id, fix.id]
+
+
+def test_reopened_checkpoint_does_not_rewrite_loaded_nodes(tmp_path):
+    journals, draft, child, root = _two_stage_journals()
+    IncrementalCheckpoint(tmp_path).save(journals, {})
+
+    _, loaded = load_incremental_checkpoint(tmp_path)
+    ckpt = IncrementalCheckpoint(tmp_path)
+    assert ckpt.save(loaded, {}) == 0
+
+    loaded["2_baseline"].append(
+        Node(plan="tune", code="print(5)", parent=loaded["2_baseline"].nodes[0])
+    )
+    assert ckpt.save(loaded, {}) == 1
+    lines = (tmp_path / _journal_log_name("1_initial")).read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [draft.id, child.id]
+
+
+def _manager(tmp_path):
+    cfg = OmegaConf.create(
+        {
+            "checkpoint_format": "incremental",
+            "agent": {"steps": 1, "stages": {}, "search": {"num_drafts": 1}},
+        }
+    )
+    task_desc = {
+        key: key.lower()
+        for key in [
+            "Title",
+            "Abstract",
+            "Short Hypothesis",
+            "Experiments",
+            "Risk Factors and Limitations",
+        ]
+    }
+    return AgentManager(json.dumps(task_desc), cfg, tmp_path / "workspaces" / "run")
+
+
+class _StopRun(Exception):
+    pass
+
+
+def test_agent_manager_resumes_after_last_finished_main_stage(tmp_path, monkeypatch):
+    first = _manager(tmp_path)
+    stage1 = first.current_stage
+    draft = Node(plan="draft", code="print(1)")
+    first.journals[stage1.name].append(draft)
+    first.journals[stage1.name].append(Node(plan="fix", code="print(2)", parent=draft))
+    first.ledger_manager.progress_ledger.total_steps = 7
+    first._save_checkpoint()
+
+    resumed = _manager(tmp_path)
+    resumed.load_checkpoint(first._checkpoint_dir())
+    assert [s.name for s in resumed.stages] == [stage1.name]
+    assert resumed.current_stage is resumed.stages[0]
+    assert resumed.ledger_manager.progress_ledger.total_steps == 7
+    nodes = resumed.journals[stage1.name].nodes
+    assert [n.id for n in nodes] == [n.id for n in first.journals[stage1.name].nodes]
+    assert nodes[1].parent is nodes[0]
+
+    def stop(stage):
+        raise _StopRun(stage.name)
+
+    monkeypatch.setattr(resumed, "_create_agent_for_stage", stop)
+    try:
+        resumed.run(exec_callback=None)
+    except _StopRun as e:
+        started = e.args[0]
+    assert started.startswith("2_baseline_tuning")
+    assert resumed.stage_history[-1].from_stage == stage1.name
+
+    # the loaded nodes are not appended again, only what the new stage adds
+    log_path = first._checkpoint_dir() / _journal_log_name(stage1.name)
+    before = log_path.read_text()
+    resumed._save_checkpoint()
+    assert log_path.read_text() == before
+    _, journals = load_incremental_checkpoint(first._checkpoint_dir())
+    assert list(journals) == [stage1.name, started]